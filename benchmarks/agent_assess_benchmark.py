@@ -0,0 +1,217 @@
+"""
+Compares the two execution modes of ResumeAssessorAgentRunner:
+
+  - react: the LangGraph ReAct agent, which calls ResumeAssessorTool and
+    LocationAssessorTool one after another with an LLM reasoning step before
+    each tool call and one to write the final answer
+  - planned: PlannedToolExecutor, which runs both tools at once and merges
+    their assessments without an LLM step
+
+It reports wall time per assessment and the LLM calls each mode makes.
+
+By default the OpenAI and Tavily latencies are simulated: the agent runs
+with a scripted chat model that calls one tool per step, and the tools sleep
+for the given latencies (scaled down by --time-scale so the run is quick;
+times are reported at full scale). With --live the real tools and model are
+used on the given documents (needs OPENAI_API_KEY, TAVILY_API_KEY and
+LLM_MODEL).
+
+    python -m benchmarks.agent_assess_benchmark --rounds 5
+    python -m benchmarks.agent_assess_benchmark --live --job-description jd.md --criteria criteria.md --resume resume.md
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain.tools import BaseTool  # noqa: E402
+from langchain_core.language_models.chat_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, ToolMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatResult  # noqa: E402
+from langgraph.prebuilt import create_react_agent  # noqa: E402
+
+from genfoundry.km.api.assess.planned_tool_executor import (  # noqa: E402
+    LOCATION_TOOL, RESUME_TOOL, PlannedToolExecutor, agent_input, merge_assessments, plan_tools
+)
+
+QUESTION = ("Please assess the resume against the job description and criteria. You may use the tools provided "
+            "to assist you. The final answer should combine the results of the tools.")
+SYSTEM_MESSAGE = ("You are a helpful recruitment assistant. Please assess the resume against the job description "
+                  "and criteria. You may use the tools provided to assist you. The final answer should combine the "
+                  "results of individual tools that are called.")
+
+JOB_DESCRIPTION = "Senior Data Engineer building streaming pipelines with Kafka and Spark."
+CRITERIA = "Technical Skills: Kafka, Spark, Python. Work Experience: 5+ years. Location: Toronto, hybrid."
+RESUME = "Jane Doe, Mississauga, ON. Data Engineer at Globex 2018 - Present: built Kafka and Spark pipelines."
+
+RESUME_ASSESSMENT = {"evaluation": [{"criteria": "Technical Skills", "score": 8.5, "explanation": "Kafka, Spark"},
+                                    {"criteria": "Work Experience", "score": 8.0, "explanation": "6 years"}],
+                     "summary": "Strong streaming data engineer."}
+LOCATION_ASSESSMENT = {"evaluation": [{"criteria": "Location", "score": 8.0, "explanation": "Within 30 km"}]}
+
+
+class Clock():
+    """Sleeps simulated milliseconds and counts the LLM calls they stand for."""
+
+    def __init__(self, time_scale):
+        self.time_scale = time_scale
+        self.llm_calls = 0
+        self._lock = threading.Lock()
+
+    def llm(self, ms):
+        with self._lock:
+            self.llm_calls += 1
+        self.wait(ms)
+
+    def wait(self, ms):
+        time.sleep(ms / 1000 * self.time_scale)
+
+
+class SimulatedResumeAssessorTool(BaseTool):
+    name: str = "Resume Credentials Assessor"
+    description: str = "Use this tool when you need to assess a resume against a job description and criteria."
+    clock: Any = None
+    assess_ms: float = 0
+
+    def _run(self, job_description, criteria, resume, question):
+        self.clock.llm(self.assess_ms)
+        return json.dumps(RESUME_ASSESSMENT)
+
+
+class SimulatedLocationAssessorTool(BaseTool):
+    name: str = "Location Assessor"
+    description: str = ("Use this tool when you need to assess a location provided in the resume against the "
+                        "location specified in the job description.")
+    clock: Any = None
+    llm_ms: float = 0
+    search_ms: float = 0
+
+    def _run(self, resume, criteria):
+        # Candidate location, job location, Tavily search, then the score
+        self.clock.llm(self.llm_ms)
+        self.clock.llm(self.llm_ms)
+        self.clock.wait(self.search_ms)
+        self.clock.llm(self.llm_ms)
+        return json.dumps(LOCATION_ASSESSMENT)
+
+
+class ScriptedReActModel(BaseChatModel):
+    """Calls the bound tools one per step, like the ReAct agent does, then answers with their combined output."""
+
+    clock: Any = None
+    reasoning_ms: float = 0
+    tool_specs: list = []
+
+    @property
+    def _llm_type(self):
+        return "scripted-react"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={"tool_specs": [(tool.name, tool.args) for tool in tools]})
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.clock.llm(self.reasoning_ms)
+        outputs = [message.content for message in messages if isinstance(message, ToolMessage)]
+        if len(outputs) < len(self.tool_specs):
+            name, args = self.tool_specs[len(outputs)]
+            arguments = {"job_description": JOB_DESCRIPTION, "criteria": CRITERIA, "resume": RESUME,
+                         "question": QUESTION}
+            message = AIMessage(content="", tool_calls=[
+                {"name": name, "args": {key: arguments[key] for key in args}, "id": f"call_{len(outputs)}"}
+            ])
+        else:
+            message = AIMessage(content=json.dumps(merge_assessments(json.loads(output) for output in outputs)))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def simulated_setup(args):
+    clock = Clock(args.time_scale)
+    resume_tool = SimulatedResumeAssessorTool(clock=clock, assess_ms=args.assess_ms)
+    location_tool = SimulatedLocationAssessorTool(clock=clock, llm_ms=args.location_llm_ms, search_ms=args.search_ms)
+    model = ScriptedReActModel(clock=clock, reasoning_ms=args.reasoning_ms)
+    documents = (JOB_DESCRIPTION, CRITERIA, RESUME)
+    return clock, model, resume_tool, location_tool, documents
+
+
+def live_setup(args):
+    from langchain_openai import ChatOpenAI
+    from genfoundry.km.api.assess.location_assessor_tool import LocationAssessorTool
+    from genfoundry.km.api.assess.resume_assessor_tool import ResumeAssessorTool
+
+    documents = []
+    for path in (args.job_description, args.criteria, args.resume):
+        with open(path, encoding="utf-8") as f:
+            documents.append(f.read())
+    model = ChatOpenAI(model_name=os.environ["LLM_MODEL"], temperature=0)
+    return None, model, ResumeAssessorTool(), LocationAssessorTool(), tuple(documents)
+
+
+def measure(run, rounds, clock, time_scale):
+    times = []
+    calls = []
+    for _ in range(rounds):
+        before = clock.llm_calls if clock else 0
+        started = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - started) * 1000 / time_scale)
+        calls.append((clock.llm_calls - before) if clock else None)
+    return times, calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=3, help="assessments per mode")
+    parser.add_argument("--reasoning-ms", type=float, default=1500, help="simulated ReAct reasoning step")
+    parser.add_argument("--assess-ms", type=float, default=8000, help="simulated resume assessment LLM call")
+    parser.add_argument("--location-llm-ms", type=float, default=800, help="simulated location tool LLM call")
+    parser.add_argument("--search-ms", type=float, default=1200, help="simulated Tavily search")
+    parser.add_argument("--time-scale", type=float, default=0.02, help="sleep this fraction of simulated time")
+    parser.add_argument("--live", action="store_true", help="use OpenAI and Tavily on the given documents")
+    parser.add_argument("--job-description")
+    parser.add_argument("--criteria")
+    parser.add_argument("--resume")
+    args = parser.parse_args()
+
+    if args.live:
+        if not (args.job_description and args.criteria and args.resume):
+            parser.error("--live needs --job-description, --criteria and --resume")
+        args.time_scale = 1.0
+        clock, model, resume_tool, location_tool, documents = live_setup(args)
+    else:
+        clock, model, resume_tool, location_tool, documents = simulated_setup(args)
+    job_description, criteria, resume = documents
+
+    agent = create_react_agent(model, [resume_tool, location_tool], prompt=SYSTEM_MESSAGE)
+    executor = PlannedToolExecutor({RESUME_TOOL: resume_tool, LOCATION_TOOL: location_tool})
+    plan = plan_tools(job_description, criteria, resume, QUESTION)
+
+    def run_react():
+        agent.invoke(agent_input(job_description, criteria, resume, QUESTION))
+
+    def run_planned():
+        assessments, failures = executor.run(plan)
+        if failures:
+            raise RuntimeError(f"Planned assessment failed: {failures}")
+        merge_assessments(assessments.values())
+
+    print(f"{'simulated' if clock else 'live'} run, {args.rounds} assessments per mode, "
+          f"{len(plan)} planned tools")
+    print(f"{'mode':<10}{'median ms':>12}{'max ms':>12}{'LLM calls':>12}")
+    medians = {}
+    for mode, run in (("react", run_react), ("planned", run_planned)):
+        times, calls = measure(run, args.rounds, clock, args.time_scale)
+        medians[mode] = statistics.median(times)
+        llm_calls = calls[0] if calls[0] is not None else "n/a"
+        print(f"{mode:<10}{medians[mode]:>12.0f}{max(times):>12.0f}{llm_calls:>12}")
+    print(f"planned saves {medians['react'] - medians['planned']:.0f} ms per assessment "
+          f"({1 - medians['planned'] / medians['react']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
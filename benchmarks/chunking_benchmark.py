@@ -0,0 +1,254 @@
+"""
+Compares the section-aware ResumeChunker with the previous
+SentenceSplitter(chunk_size=512, chunk_overlap=20) on:
+
+  - vector count and tokens per chunk
+  - role integrity: share of experience entries that land in a single chunk
+  - upsert cost: Pinecone upsert requests and embedded tokens, or measured
+    upsert time when --pinecone-index is given (needs PINECONE_API_KEY)
+  - retrieval quality: hit@1, hit@5 and MRR of resume-level retrieval for
+    role queries, ranked by TF-IDF cosine (offline) or OpenAI embeddings
+    with --embeddings (needs OPENAI_API_KEY)
+
+By default it runs on a seeded synthetic corpus, written in the collapsed
+single-line form the PyMuPDF parser produces. Use --resumes-dir to run on
+parsed resumes (*.md / *.txt); retrieval is then scored against
+--queries, a JSON list of {"query": ..., "resume": <file stem>}.
+
+Limitations: the synthetic corpus is generated by this script, and TF-IDF
+favours the section chunker's shorter, role-sized chunks, so the default run
+overstates what embeddings will gain. The section chunker also stores about
+twice as many vectors (894 against 424 on the default corpus). Only --embeddings
+on --resumes-dir reflects production retrieval.
+
+    python -m benchmarks.chunking_benchmark --resumes 200
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llama_index.core import Document  # noqa: E402
+from llama_index.core.node_parser import SentenceSplitter  # noqa: E402
+
+from genfoundry.km.preprocess.resume_chunker import ResumeChunker  # noqa: E402
+from genfoundry.km.utils.token_counter import count_tokens, get_encoding  # noqa: E402
+
+MODEL = "text-embedding-ada-002"
+PINECONE_UPSERT_BATCH = 100
+
+TITLES = ["Software Engineer", "Senior Software Engineer", "Engineering Manager", "Director of Engineering",
+          "Data Scientist", "Product Manager", "DevOps Engineer", "Solutions Architect", "VP Engineering",
+          "Financial Analyst", "Controller", "Sales Director", "Marketing Manager", "HR Business Partner"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Health", "Stark Industries", "Wayne Financial",
+             "Hooli", "Pied Piper", "Vandelay Imports", "Soylent Foods", "Tyrell Systems", "Cyberdyne",
+             "Wonka Labs", "Oscorp", "Nakatomi Trading", "Gringotts Bank", "Monarch Logistics", "Aperture AI"]
+DOMAINS = ["payments platform", "fraud detection", "supply chain analytics", "clinical trials data",
+           "mobile banking app", "ad bidding engine", "retail forecasting", "claims processing",
+           "recommendation system", "customer onboarding", "trade settlement", "fleet telematics"]
+TECH = ["Kafka", "Kubernetes", "Snowflake", "PyTorch", "Terraform", "React", "Spark", "Salesforce",
+        "SAP", "Tableau", "Go", "Rust", "Airflow", "dbt", "Workday", "HubSpot"]
+VERBS = ["Led", "Built", "Scaled", "Redesigned", "Launched", "Migrated", "Automated", "Owned"]
+OUTCOMES = ["cutting costs by {n}%", "growing revenue by {n}%", "reducing latency by {n}%",
+            "serving {n} million users", "with a team of {n} engineers", "across {n} countries"]
+SCHOOLS = ["University of Toronto", "McGill University", "University of Waterloo", "UBC", "Queen's University"]
+
+
+def make_synthetic_corpus(count, seed):
+    """Returns [(resume_id, text, roles, queries)] where roles are the experience entries."""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(count):
+        name = f"Candidate {i}"
+        roles = []
+        queries = []
+        year = 2024
+        for _ in range(rng.randint(3, 6)):
+            title, company, domain = rng.choice(TITLES), rng.choice(COMPANIES), rng.choice(DOMAINS)
+            tech = rng.sample(TECH, 2)
+            start = year - rng.randint(2, 5)
+            bullets = " ".join(
+                f"- {rng.choice(VERBS)} the {domain} using {rng.choice(tech)}, "
+                f"{rng.choice(OUTCOMES).format(n=rng.randint(5, 90))}."
+                for _ in range(rng.randint(4, 12))
+            )
+            end = "Present" if year == 2024 else str(year)
+            roles.append(f"**{title}** **{company}** {start} - {end} {bullets}")
+            queries.append(f"{title} at {company} working on {domain} with {tech[0]} and {tech[1]}")
+            year = start
+        skills = ", ".join(rng.sample(TECH, 6))
+        text = (
+            f"# {name} Toronto, ON | candidate{i}@example.com | (416) 555-{i:04d} "
+            f"## PROFESSIONAL SUMMARY {rng.choice(TITLES)} with {2024 - year} years of experience "
+            f"in {rng.choice(DOMAINS)} and {rng.choice(DOMAINS)}. "
+            f"## WORK EXPERIENCE {' '.join(roles)} "
+            f"## SKILLS {skills} "
+            f"## EDUCATION B.Sc. Computer Science, {rng.choice(SCHOOLS)}, {year - 4} "
+            f"## CERTIFICATIONS AWS Solutions Architect, PMP"
+        )
+        corpus.append((f"resume-{i}", text, roles, queries))
+    return corpus
+
+
+def load_corpus(resumes_dir, queries_file):
+    corpus = {}
+    for file_name in sorted(os.listdir(resumes_dir)):
+        stem, ext = os.path.splitext(file_name)
+        if ext.lower() in (".md", ".txt"):
+            with open(os.path.join(resumes_dir, file_name), encoding="utf-8") as f:
+                corpus[stem] = (stem, f.read(), [], [])
+    if queries_file:
+        with open(queries_file, encoding="utf-8") as f:
+            for item in json.load(f):
+                corpus[item["resume"]][3].append(item["query"])
+    return list(corpus.values())
+
+
+def sentence_chunks(text):
+    encoding = get_encoding(MODEL)
+    tokenizer = encoding.encode if encoding is not None else (lambda t: [0] * count_tokens(t, MODEL))
+    splitter = SentenceSplitter(chunk_size=512, chunk_overlap=20, tokenizer=tokenizer)
+    return [node.get_content() for node in splitter.get_nodes_from_documents([Document(text=text)])]
+
+
+def section_chunks(text):
+    return [chunk["text"] for chunk in ResumeChunker(max_tokens=512, model=MODEL).chunk(text)]
+
+
+def _terms(text):
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+class TfidfIndex:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.vectors = [Counter(_terms(text)) for _, text in chunks]
+        df = Counter(term for vector in self.vectors for term in vector)
+        self.idf = {term: math.log(len(chunks) / (1 + count)) + 1 for term, count in df.items()}
+        self.vectors = [self._weigh(vector) for vector in self.vectors]
+
+    def _weigh(self, counts):
+        weights = {t: c * self.idf.get(t, 0.0) for t, c in counts.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {t: w / norm for t, w in weights.items()}
+
+    def search(self, query):
+        q = self._weigh(Counter(_terms(query)))
+        scores = [sum(w * vector.get(t, 0.0) for t, w in q.items()) for vector in self.vectors]
+        return sorted(range(len(scores)), key=lambda i: -scores[i])
+
+
+class EmbeddingIndex:
+    def __init__(self, chunks):
+        from llama_index.embeddings.openai import OpenAIEmbedding
+        self.embed_model = OpenAIEmbedding(model=MODEL, embed_batch_size=256)
+        self.chunks = chunks
+        self.vectors = self.embed_model.get_text_embedding_batch([text for _, text in chunks])
+
+    def search(self, query):
+        q = self.embed_model.get_query_embedding(query)
+        scores = [sum(a * b for a, b in zip(q, vector)) for vector in self.vectors]
+        return sorted(range(len(scores)), key=lambda i: -scores[i])
+
+
+def score_retrieval(index, corpus):
+    hits1 = hits5 = reciprocal = total = 0
+    for resume_id, _, _, queries in corpus:
+        for query in queries:
+            ranked_resumes = []
+            for i in index.search(query):
+                owner = index.chunks[i][0]
+                if owner not in ranked_resumes:
+                    ranked_resumes.append(owner)
+                if len(ranked_resumes) >= 10:
+                    break
+            total += 1
+            if resume_id in ranked_resumes:
+                rank = ranked_resumes.index(resume_id) + 1
+                hits1 += rank == 1
+                hits5 += rank <= 5
+                reciprocal += 1.0 / rank
+    if not total:
+        return {}
+    return {"queries": total, "hit@1": round(hits1 / total, 3), "hit@5": round(hits5 / total, 3),
+            "mrr": round(reciprocal / total, 3)}
+
+
+def measure_upsert(chunks, index_name, dimension):
+    from pinecone import Pinecone
+    index = Pinecone(api_key=os.environ["PINECONE_API_KEY"]).Index(index_name)
+    namespace = f"chunking_benchmark_{int(time.time())}"
+    rng = random.Random(0)
+    vectors = [{"id": f"{owner}#chunk-{i}", "values": [rng.random() for _ in range(dimension)],
+                "metadata": {"doc_id": owner}} for i, (owner, _) in enumerate(chunks)]
+    started = time.perf_counter()
+    for i in range(0, len(vectors), PINECONE_UPSERT_BATCH):
+        index.upsert(vectors=vectors[i:i + PINECONE_UPSERT_BATCH], namespace=namespace)
+    elapsed = time.perf_counter() - started
+    index.delete(delete_all=True, namespace=namespace)
+    return round(elapsed, 3)
+
+
+def run(corpus, chunk_fn, args):
+    started = time.perf_counter()
+    chunks = [(resume_id, chunk) for resume_id, text, _, _ in corpus for chunk in chunk_fn(text)]
+    chunk_seconds = time.perf_counter() - started
+
+    tokens = [count_tokens(text, MODEL) for _, text in chunks]
+    by_resume = {}
+    for resume_id, text in chunks:
+        by_resume.setdefault(resume_id, []).append(text)
+    roles = [(resume_id, role) for resume_id, _, resume_roles, _ in corpus for role in resume_roles]
+    intact = sum(1 for resume_id, role in roles if any(role in chunk for chunk in by_resume.get(resume_id, [])))
+
+    result = {
+        "vectors": len(chunks),
+        "vectors_per_resume": round(len(chunks) / max(1, len(corpus)), 2),
+        "avg_chunk_tokens": round(sum(tokens) / max(1, len(tokens)), 1),
+        "max_chunk_tokens": max(tokens, default=0),
+        "embedded_tokens": sum(tokens),
+        "upsert_requests": math.ceil(len(chunks) / PINECONE_UPSERT_BATCH),
+        "chunking_seconds": round(chunk_seconds, 3),
+    }
+    if roles:
+        result["roles_in_one_chunk"] = round(intact / len(roles), 3)
+    if args.pinecone_index:
+        result["upsert_seconds"] = measure_upsert(chunks, args.pinecone_index, args.dimension)
+    index = EmbeddingIndex(chunks) if args.embeddings else TfidfIndex(chunks)
+    result.update(score_retrieval(index, corpus))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=100, help="synthetic resumes to generate")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--resumes-dir", help="directory of parsed resumes instead of the synthetic corpus")
+    parser.add_argument("--queries", help="JSON file of {query, resume} pairs for --resumes-dir")
+    parser.add_argument("--embeddings", action="store_true", help="rank with OpenAI embeddings instead of TF-IDF")
+    parser.add_argument("--pinecone-index", help="measure upsert time in a scratch namespace of this index")
+    parser.add_argument("--dimension", type=int, default=1536)
+    args = parser.parse_args()
+
+    if args.resumes_dir:
+        corpus = load_corpus(args.resumes_dir, args.queries)
+    else:
+        corpus = make_synthetic_corpus(args.resumes, args.seed)
+
+    results = {
+        "sentence_splitter_512_20": run(corpus, sentence_chunks, args),
+        "section_chunker": run(corpus, section_chunks, args),
+    }
+    print(json.dumps({"resumes": len(corpus), "ranking": "embeddings" if args.embeddings else "tfidf",
+                      "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
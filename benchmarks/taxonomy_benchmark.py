@@ -0,0 +1,138 @@
+"""
+Compares the two ways soft filters match skills and job titles:
+
+  - fuzzy: fuzz.token_set_ratio between every filter value and every resume
+    value, as _score_soft_filters does for resumes without taxonomy IDs
+    (a pair at or above --threshold counts as a match)
+  - taxonomy: filter values mapped to taxonomy IDs once per query, resumes
+    carrying IDs from ingest, matching by set intersection
+
+Resumes and queries are generated from the taxonomy itself, each mention
+written with a randomly chosen synonym and casing ("K8s", "kubernetes",
+"EKS"), so the ground truth is known. Reported per method: precision and
+recall of the match decisions, and time per resume-filter evaluation.
+The one-off ingest cost of computing the IDs is reported separately.
+
+    python -m benchmarks.taxonomy_benchmark --resumes 500 --queries 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzzywuzzy import fuzz  # noqa: E402
+
+from genfoundry.km.utils.taxonomy import SKILLS, TITLES, get_taxonomy  # noqa: E402
+
+
+def surface_forms(taxonomy, kind, entry_id):
+    entry = taxonomy.entries[kind][entry_id]
+    return [entry["name"], *entry["synonyms"]]
+
+
+def leaf_ids(taxonomy, kind):
+    # Categories are parents of something; resumes mention concrete skills and titles
+    parents = {p for entry in taxonomy.entries[kind].values() for p in entry["parents"]}
+    return [i for i in taxonomy.entries[kind] if i not in parents]
+
+
+def write_as(rng, taxonomy, kind, entry_id):
+    form = rng.choice(surface_forms(taxonomy, kind, entry_id))
+    return rng.choice([form, form.lower(), form.upper(), form.title()])
+
+
+def make_cases(taxonomy, resumes, queries, seed):
+    rng = random.Random(seed)
+    skills, titles = leaf_ids(taxonomy, SKILLS), leaf_ids(taxonomy, TITLES)
+    corpus = []
+    for _ in range(resumes):
+        skill_ids = rng.sample(skills, rng.randint(5, 12))
+        title_ids = rng.sample(titles, rng.randint(1, 3))
+        corpus.append({
+            "skill_ids": set(skill_ids), "title_ids": set(title_ids),
+            "technical_skills": [write_as(rng, taxonomy, SKILLS, i) for i in skill_ids],
+            "titles": [write_as(rng, taxonomy, TITLES, i) for i in title_ids],
+        })
+    filters = []
+    for _ in range(queries):
+        kind = rng.choice([SKILLS, TITLES])
+        entry_id = rng.choice(skills if kind == SKILLS else titles)
+        filters.append((kind, entry_id, write_as(rng, taxonomy, kind, entry_id)))
+    return corpus, filters
+
+
+def score(decisions):
+    tp = sum(1 for predicted, actual in decisions if predicted and actual)
+    fp = sum(1 for predicted, actual in decisions if predicted and not actual)
+    fn = sum(1 for predicted, actual in decisions if not predicted and actual)
+    return {
+        "precision": round(tp / max(1, tp + fp), 3),
+        "recall": round(tp / max(1, tp + fn), 3),
+        "matches": tp + fp,
+    }
+
+
+def run_fuzzy(corpus, filters, threshold):
+    decisions = []
+    started = time.perf_counter()
+    for kind, entry_id, value in filters:
+        field, ids = ("technical_skills", "skill_ids") if kind == SKILLS else ("titles", "title_ids")
+        req = value.lower()
+        for resume in corpus:
+            best = max((fuzz.token_set_ratio(req, cand.lower()) for cand in resume[field]), default=0)
+            decisions.append((best >= threshold, entry_id in resume[ids]))
+    elapsed = time.perf_counter() - started
+    return {**score(decisions), "us_per_evaluation": round(elapsed / len(decisions) * 1e6, 2)}
+
+
+def run_taxonomy(taxonomy, corpus, filters):
+    started = time.perf_counter()
+    stored = [
+        {"skill_ids": set(taxonomy.resume_ids(SKILLS, r["technical_skills"])),
+         "title_ids": set(taxonomy.resume_ids(TITLES, r["titles"]))}
+        for r in corpus
+    ]
+    ingest_elapsed = time.perf_counter() - started
+
+    decisions = []
+    started = time.perf_counter()
+    for kind, entry_id, value in filters:
+        ids_key = "skill_ids" if kind == SKILLS else "title_ids"
+        value_ids = set(taxonomy.find_ids(kind, value))
+        for resume, resume_ids in zip(corpus, stored):
+            decisions.append((bool(value_ids & resume_ids[ids_key]), entry_id in resume[ids_key]))
+    elapsed = time.perf_counter() - started
+    return {
+        **score(decisions),
+        "us_per_evaluation": round(elapsed / len(decisions) * 1e6, 2),
+        "ingest_ms_per_resume": round(ingest_elapsed / len(corpus) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200, help="single-value skill or title filters")
+    parser.add_argument("--threshold", type=int, default=80, help="fuzzy match threshold")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    taxonomy = get_taxonomy()
+    corpus, filters = make_cases(taxonomy, args.resumes, args.queries, args.seed)
+    fuzzy = run_fuzzy(corpus, filters, args.threshold)
+    exact = run_taxonomy(taxonomy, corpus, filters)
+    print(json.dumps({
+        "resumes": len(corpus),
+        "filters": len(filters),
+        "evaluations": len(corpus) * len(filters),
+        "results": {f"fuzzy_token_set_ratio_{args.threshold}": fuzzy, "taxonomy_ids": exact},
+        "speedup": round(fuzzy["us_per_evaluation"] / max(exact["us_per_evaluation"], 1e-9), 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Measures what keeping only the filterable metadata keys on vectors saves,
+against the previous layout where every chunk carried the full resume
+metadata (and a second copy of it in its SOURCE relationship):
+
+  - payload bytes per chunk vector, as PineconeVectorStore would upsert it,
+    and bytes for a top-10 query response
+  - time to rebuild the top-10 nodes from their payloads at query time
+  - the added cost of the post-retrieval join through ResumeMetadataStore,
+    for LRU hits and for misses (an in-memory collection by default, or a
+    scratch collection in a real MongoDB with --mongo-uri)
+
+It runs on the seeded synthetic corpus of benchmarks.chunking_benchmark,
+with metadata shaped like the resume_transformer extraction output.
+
+    python -m benchmarks.vector_metadata_benchmark --resumes 200
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llama_index.core import Document  # noqa: E402
+from llama_index.core.schema import NodeRelationship, NodeWithScore  # noqa: E402
+from llama_index.core.vector_stores.utils import metadata_dict_to_node, node_to_metadata_dict  # noqa: E402
+
+from benchmarks.chunking_benchmark import COMPANIES, SCHOOLS, TECH, TITLES, make_synthetic_corpus  # noqa: E402
+from genfoundry.km.persist.resume_metadata_store import ResumeMetadataStore  # noqa: E402
+from genfoundry.km.persist.vector_db_proxy import build_resume_nodes  # noqa: E402
+from genfoundry.km.query.helper.metadata_joiner import ResumeMetadataJoiner  # noqa: E402
+
+TOP_K = 10
+LEADERSHIP = ["Team Management", "Mentoring", "Strategy", "Agile", "Hiring", "Stakeholder Management",
+              "Budgeting", "Change Management"]
+DOMAINS = ["Technology", "Finance & Accounting", "Healthcare", "Sales & Marketing", "Engineering"]
+
+
+def make_metadata(index, rng):
+    titles = rng.sample(TITLES, 4)
+    return {
+        "candidate_name": f"Candidate {index}",
+        "latest_job_title": titles[0],
+        "other_job_titles": titles[1:],
+        "career_domain": rng.choice(DOMAINS),
+        "years_of_experience": rng.randint(2, 25),
+        "technical_skills": rng.sample(TECH, rng.randint(6, 10)),
+        "leadership_skills": rng.sample(LEADERSHIP, rng.randint(2, 4)),
+        "highest_education_level": rng.choice(["Bachelor's", "Master's", "PhD"]),
+        "education": [f"B.Sc. Computer Science, {rng.choice(SCHOOLS)}", f"MBA, {rng.choice(SCHOOLS)}"],
+        "certifications": ["AWS Certified Solutions Architect", "PMP", f"{rng.choice(COMPANIES)} Leadership Program"],
+        "location": "Toronto, Canada",
+    }
+
+
+def full_metadata_nodes(resume_id, text, metadata):
+    """The previous layout: full metadata on each chunk and in its SOURCE relationship."""
+    nodes = build_resume_nodes(resume_id, text, dict(metadata))
+    source = Document(text=text, metadata={**metadata, "doc_id": resume_id}, id_=resume_id)
+    for node in nodes:
+        node.metadata = {**source.metadata, "section_type": node.metadata.get("section_type")}
+        node.relationships = {NodeRelationship.SOURCE: source.as_related_node_info()}
+    return nodes
+
+
+def payload_bytes(node):
+    return len(json.dumps(node_to_metadata_dict(node, remove_text=False, flat_metadata=False)).encode("utf-8"))
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def measure_layout(nodes_by_resume, rng, rounds):
+    nodes = [node for nodes in nodes_by_resume.values() for node in nodes]
+    sizes = [payload_bytes(node) for node in nodes]
+    payloads = [node_to_metadata_dict(node, remove_text=False, flat_metadata=False) for node in nodes]
+
+    # Query time: the top-10 payloads are read back into nodes for every search
+    timings = []
+    for _ in range(rounds):
+        sample = [json.dumps(p) for p in rng.sample(payloads, TOP_K)]
+        started = time.perf_counter()
+        for raw in sample:
+            metadata_dict_to_node(json.loads(raw))
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "vectors": len(nodes),
+        "avg_payload_bytes": round(statistics.mean(sizes)),
+        "max_payload_bytes": max(sizes),
+        "avg_metadata_keys": round(statistics.mean(len(node.metadata) for node in nodes), 1),
+        "top10_response_bytes": round(statistics.mean(sizes) * TOP_K),
+        "top10_deserialize_ms_p50": round(percentile(timings, 50), 3),
+        "top10_deserialize_ms_p95": round(percentile(timings, 95), 3),
+    }
+
+
+class InMemoryCollection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None):
+        return [{"_id": i, "metadata": self.docs[i]} for i in query["_id"]["$in"] if i in self.docs]
+
+
+class CollectionProxy:
+    """The one MongoProxy method ResumeMetadataStore uses."""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get_tenant_resume_collection(self, tenant_id):
+        return self.collection
+
+
+def measure_join(slim_by_resume, metadata_by_resume, collection, rng, rounds):
+    nodes = [node for nodes in slim_by_resume.values() for node in nodes]
+    result = {}
+    for label, warm in (("lru_miss", False), ("lru_hit", True)):
+        store = ResumeMetadataStore(mongo_proxy=CollectionProxy(collection), max_entries=len(metadata_by_resume) + 1)
+        joiner = ResumeMetadataJoiner(tenant_id="bench", store=store)
+        if warm:
+            store.get_many("bench", list(metadata_by_resume))
+        timings = []
+        for _ in range(rounds):
+            hits = [NodeWithScore(node=node.model_copy(deep=True), score=0.8) for node in rng.sample(nodes, TOP_K)]
+            if not warm:
+                store._cache.clear()
+            started = time.perf_counter()
+            joiner.postprocess_nodes(hits)
+            timings.append((time.perf_counter() - started) * 1000)
+        result[f"join_{label}_ms_p50"] = round(percentile(timings, 50), 3)
+        result[f"join_{label}_ms_p95"] = round(percentile(timings, 95), 3)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=100, help="synthetic resumes to generate")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--rounds", type=int, default=500, help="simulated top-10 queries per measurement")
+    parser.add_argument("--mongo-uri", help="measure join misses against a scratch collection in this MongoDB")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = make_synthetic_corpus(args.resumes, args.seed)
+    metadata_by_resume = {resume_id: make_metadata(i, rng) for i, (resume_id, _, _, _) in enumerate(corpus)}
+    full = {rid: full_metadata_nodes(rid, text, metadata_by_resume[rid]) for rid, text, _, _ in corpus}
+    slim = {rid: build_resume_nodes(rid, text, dict(metadata_by_resume[rid])) for rid, text, _, _ in corpus}
+
+    results = {
+        "full_metadata": measure_layout(full, rng, args.rounds),
+        "filterable_metadata": measure_layout(slim, rng, args.rounds),
+    }
+
+    collection = InMemoryCollection(metadata_by_resume)
+    scratch = None
+    if args.mongo_uri:
+        from pymongo import MongoClient
+        scratch = MongoClient(args.mongo_uri)["vector_metadata_benchmark"]["bench_Resumes"]
+        scratch.drop()
+        scratch.insert_many([{"_id": rid, "metadata": m} for rid, m in metadata_by_resume.items()])
+        collection = scratch
+    try:
+        results["filterable_metadata"].update(measure_join(slim, metadata_by_resume, collection, rng, args.rounds))
+    finally:
+        if scratch is not None:
+            scratch.drop()
+
+    full_bytes = results["full_metadata"]["avg_payload_bytes"]
+    slim_bytes = results["filterable_metadata"]["avg_payload_bytes"]
+    print(json.dumps({
+        "resumes": len(corpus),
+        "join_backend": "mongodb" if args.mongo_uri else "in-memory",
+        "payload_reduction": round(1 - slim_bytes / full_bytes, 3),
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
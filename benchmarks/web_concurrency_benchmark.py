@@ -0,0 +1,102 @@
+"""
+Load-tests the API container's serving model: how many LLM-bound requests
+one container serves at once with the previous sync gunicorn workers
+(gunicorn -w 4) and with the threaded workers of gunicorn.conf.py.
+
+The endpoint under load stands in for /assess, /search, /smart-search and
+/pitchnotes: it blocks on network I/O for --io-ms (an OpenAI call) and does
+a little CPU work. gunicorn is started for each serving model with the same
+number of worker processes, then --concurrency clients send --requests
+requests in total. The report shows throughput, latency percentiles and the
+effective concurrency (throughput x I/O time), i.e. requests in flight.
+
+    python -m benchmarks.web_concurrency_benchmark --concurrency 64 --requests 256
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IO_MS = float(os.getenv("BENCH_IO_MS", "1000"))
+
+
+def app(environ, start_response):
+    """WSGI app: one LLM-bound request."""
+    time.sleep(IO_MS / 1000)
+    body = str(sum(i * i for i in range(2000))).encode()
+    start_response("200 OK", [("Content-Type", "text/plain"), ("Content-Length", str(len(body)))])
+    return [body]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(worker_class, workers, threads, io_ms):
+    port = free_port()
+    command = [sys.executable, "-m", "gunicorn", "-c", os.path.join(ROOT, "gunicorn.conf.py"),
+               "--bind", f"127.0.0.1:{port}", "--workers", str(workers), "--worker-class", worker_class,
+               "--log-level", "warning", "benchmarks.web_concurrency_benchmark:app"]
+    env = {**os.environ, "WEB_THREADS": str(threads), "BENCH_IO_MS": str(io_ms)}
+    server = subprocess.Popen(command, cwd=ROOT, env=env)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return server, f"http://127.0.0.1:{port}/"
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("gunicorn did not start")
+
+
+def load(url, concurrency, requests):
+    def one(_):
+        started = time.perf_counter()
+        with urllib.request.urlopen(url, timeout=600) as response:
+            response.read()
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(one, range(requests)))
+    return time.perf_counter() - started, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn worker processes")
+    parser.add_argument("--threads", type=int, default=16, help="threads per gthread worker")
+    parser.add_argument("--io-ms", type=float, default=1000, help="simulated OpenAI call per request")
+    parser.add_argument("--concurrency", type=int, default=64, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=256)
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers, {args.io_ms:.0f} ms I/O per request, "
+          f"{args.concurrency} concurrent clients, {args.requests} requests")
+    print(f"{'serving model':<22}{'req/s':>8}{'p50 ms':>10}{'p95 ms':>10}{'in flight':>11}")
+    for label, worker_class, threads in (("sync (before)", "sync", 1),
+                                         (f"gthread x{args.threads}", "gthread", args.threads)):
+        server, url = start_server(worker_class, args.workers, threads, args.io_ms)
+        try:
+            load(url, args.workers, args.workers)  # warm up
+            elapsed, latencies = load(url, args.concurrency, args.requests)
+        finally:
+            server.terminate()
+            server.wait()
+        throughput = args.requests / elapsed
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"{label:<22}{throughput:>8.1f}{statistics.median(latencies):>10.0f}{p95:>10.0f}"
+              f"{throughput * args.io_ms / 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
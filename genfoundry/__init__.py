@@ -5,6 +5,7 @@ from flask_cors import CORS
 from genfoundry.config import config
 from genfoundry.firebase_setup import db  # Import Firestore setup#from app.api.user import User
 from genfoundry.middleware import jwt_authentication, log_api_usage
+from genfoundry.km.utils.request_deadline import start_request_deadline, end_request_deadline
 import logging
 from genfoundry.llama_init import init_llama
 from genfoundry.llama_init import init_llama
@@ -65,6 +66,8 @@ def create_app(config_name):
     jwt = JWTManager(app)
 
     # Register Middleware
+    app.before_request(start_request_deadline)  # Per-request latency budget
+    app.teardown_request(end_request_deadline)
     app.before_request(jwt_authentication)  # Apply JWT Authentication globally
     #app.after_request(log_api_usage)  # Log API usage after each request
                                                                 
@@ -1,6 +1,7 @@
 import ssl
 from celery import Celery
-from genfoundry.config import get_redis_config_dict
+from kombu import Queue
+from genfoundry.config import get_redis_config_dict, get_celery_config
 
 
 # def make_celery(config):
@@ -56,7 +57,11 @@ from genfoundry.config import get_redis_config_dict
 #         logger.error(f"Error while creating and configuring Celery: {e}")
 #         raise e
 
-def make_celery(config):
+def make_celery(config, queue_config=None):
+    queue_config = queue_config or get_celery_config()
+    interactive_queue = queue_config['INTERACTIVE_QUEUE']
+    bulk_queue = queue_config['BULK_QUEUE']
+
     redis_host = config['REDIS_HOST']
     redis_port = config['REDIS_PORT']
     redis_password = config.get('REDIS_PASSWORD')
@@ -99,6 +104,32 @@ def make_celery(config):
             accept_content=['json'],
             timezone='UTC',
             enable_utc=True,
+            # Interactive uploads and bulk loads get separate queues (and workers),
+            # so a bulk load never sits in front of a recruiter's single upload.
+            task_queues=(
+                Queue(interactive_queue, routing_key=interactive_queue),
+                Queue(bulk_queue, routing_key=bulk_queue),
+            ),
+            task_default_queue=interactive_queue,
+            task_routes={
+                'genfoundry.km.api.standardize.celery_resume_processor_task.dispatch_bulk_resumes': {'queue': interactive_queue},
+                'genfoundry.km.api.standardize.celery_resume_processor_task.reindex_tenant_vectors': {'queue': bulk_queue},
+            },
+            # Tasks are long and LLM-bound: reserve one at a time, ack only after
+            # completion and requeue if the worker dies mid-task.
+            worker_prefetch_multiplier=1,
+            task_acks_late=True,
+            task_reject_on_worker_lost=True,
+            # Backstop for bulk dispatch: picks up pending bulk uploads even if
+            # no enqueue or finished bulk task triggers a dispatch
+            beat_schedule={
+                'dispatch-bulk-resumes': {
+                    'task': 'genfoundry.km.api.standardize.celery_resume_processor_task.dispatch_bulk_resumes',
+                    'schedule': queue_config.get('BULK_DISPATCH_INTERVAL', 60),
+                },
+            },
+            broker_transport_options={'visibility_timeout': queue_config['VISIBILITY_TIMEOUT']},
+            result_backend_transport_options={'visibility_timeout': queue_config['VISIBILITY_TIMEOUT']},
         )
 
         # logger.debug("Celery app successfully created and configured.")
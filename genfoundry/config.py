@@ -28,6 +28,8 @@ class Config:
     MONGO_DB = "DocumentTracker"
     MONGO_COLLECTION = "Resumes"
     MONGO_TENANT_COLLECTION = "Tenants"
+    MONGO_COUNTER_COLLECTION = "Counters"  # Per-tenant ID allocation counters
+    RESUME_COMPRESSION_MIN_BYTES = 1024  # Standardized resumes this size or larger are stored lz4-compressed; None disables
 
     REDIS_HOST = "deep-possum-14201.upstash.io"
     REDIS_PORT = 6379
@@ -45,6 +47,8 @@ class Config:
     
     #RESUME_DETAILS_POPUP_URL = "https://api.recruitr.genfoundry.ca/resumedetails"
     RESUME_DETAILS_POPUP_URL = "http://localhost:5001/resumedetails"
+    RESUME_DETAILS_CACHE_MAX_AGE = 300  # Seconds browsers reuse /resumedetails responses before revalidating
+    RESUME_DETAILS_BULK_MAX_IDS = 100
 
     JWT_SECRET_KEY = ""
 
@@ -52,6 +56,176 @@ class Config:
 
     SIMILARITY_CUTOFF = 0.7
 
+    # Parsed document cache ("disk", "redis" or "none")
+    PARSE_CACHE_BACKEND = "disk"
+    PARSE_CACHE_DIR = os.path.join("/tmp", "genfoundry_parse_cache")
+    PARSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+    PARSE_CACHE_MAX_ENTRIES = 5000
+
+    # Resume ingestion checkpoints ("redis" or "memory") and Celery retry policy
+    INGEST_CHECKPOINT_BACKEND = "redis"
+    INGEST_CHECKPOINT_TTL_SECONDS = 7 * 24 * 3600
+    INGEST_MAX_RETRIES = 5
+    INGEST_RETRY_BACKOFF_MAX = 600
+
+    # Upload blob store ("local" or "s3"). The local directory must be a volume
+    # shared with the Celery workers when they run on other nodes; the s3
+    # backend needs boto3 and works with any S3-compatible endpoint.
+    BLOB_STORE_BACKEND = "local"
+    BLOB_STORE_LOCAL_DIR = os.path.join("/tmp", "genfoundry_blobs")
+    BLOB_STORE_S3_BUCKET = ""
+    BLOB_STORE_S3_PREFIX = ""
+    BLOB_STORE_S3_ENDPOINT_URL = ""
+
+    # Celery queues. Single uploads go to the interactive queue; bulk loads are
+    # held in per-tenant pending lists and fed into the bulk queue round-robin.
+    CELERY_INTERACTIVE_QUEUE = "interactive"
+    CELERY_BULK_QUEUE = "bulk"
+    CELERY_VISIBILITY_TIMEOUT = 2 * 3600  # Must exceed the longest task, since tasks are acked late
+    BULK_QUEUE_TARGET_DEPTH = 20
+    BULK_TENANT_WEIGHTS = {}  # tenant_id -> weight, default 1
+    BULK_DISPATCH_INTERVAL_SECONDS = 60  # Celery beat backstop for bulk dispatch
+
+    # Vector re-index backfill. Each Celery task handles REINDEX_BATCHES_PER_TASK
+    # Mongo batches and then re-queues itself, so no task outlives the visibility timeout.
+    REINDEX_BATCH_SIZE = 100  # Resumes read from Mongo per batch
+    REINDEX_BATCHES_PER_TASK = 10
+    REINDEX_EMBED_BATCH_SIZE = 256  # Texts per embeddings request (OpenAI allows up to 2048)
+    REINDEX_EMBED_CONCURRENCY = 4  # Embeddings requests in flight per worker
+    REINDEX_LOCK_SECONDS = 15 * 60
+    VECTOR_NAMESPACE_CACHE_SECONDS = 5  # How long a process caches a tenant's active namespace
+
+    # Resume chunking for the vector store: "section" (ResumeChunker) or
+    # "sentence" (the previous SentenceSplitter(512, 20)). "section" stores about
+    # twice the vectors; its retrieval gain is so far only measured with TF-IDF
+    # on the synthetic corpus of benchmarks/chunking_benchmark.py, so check it
+    # with --embeddings on real resumes before relying on it.
+    VECTOR_CHUNKER = "section"
+    VECTOR_CHUNK_MAX_TOKENS = 512
+    VECTOR_CHUNK_MIN_TOKENS = 80  # Smaller sections are merged into a neighbour
+
+    # Metadata stored on each chunk vector: the keys searches filter on, plus the
+    # doc_id join key. The full metadata is joined in after retrieval from the
+    # resume's Mongo document, through an in-process LRU.
+    VECTOR_METADATA_KEYS = [
+        "doc_id", "section_type", "sections", "candidate_name", "latest_job_title", "other_job_titles",
+        "career_domain", "years_of_experience", "location", "location_codes",
+        "highest_education_level", "technical_skills", "leadership_skills",
+        "skill_ids", "title_ids",
+    ]
+    RESUME_METADATA_CACHE_SIZE = 10000
+    RESUME_METADATA_CACHE_TTL_SECONDS = 600
+
+    # One normalized centroid of each resume's chunk vectors is kept in the
+    # namespace "<chunk namespace><suffix>", for ranking whole resumes in one query
+    VECTOR_DOC_NAMESPACE_SUFFIX = "__docs"
+
+    # Standardized resumes the assess/analyze/pitch notes/research endpoints
+    # load by resume_id, kept decompressed in an in-process LRU
+    STORED_RESUME_CACHE_SIZE = 500
+    STORED_RESUME_CACHE_TTL_SECONDS = 600
+
+    # Extra skills/title taxonomy entries merged over genfoundry/km/utils/taxonomy.json
+    TAXONOMY_EXTENSION_PATH = None
+
+    # /extract-filters: queries the rule-based extractor covers at least this
+    # well (share of meaningful words recognized) skip the LLM extractor
+    FILTER_RULES_CONFIDENCE_THRESHOLD = 0.85
+
+    # Request threads per web worker process (gunicorn.conf.py reads the same variable)
+    WEB_THREADS = int(os.getenv("WEB_THREADS", "16"))
+
+    # Filter processor pipeline: threads shared by all requests for stages that
+    # run processors concurrently (enough for two per request thread, so none
+    # waits in the queue against its timeout), and how long each processor may
+    # take before the pipeline carries on without it
+    FILTER_PIPELINE_MAX_WORKERS = 2 * WEB_THREADS
+    FILTER_PROCESSOR_DEFAULT_TIMEOUT_SECONDS = 15
+    FILTER_PROCESSOR_TIMEOUTS = {
+        "RuleBasedFilterProcessor": 1,
+        "BaseFilterProcessor": 30,
+        "GeoExpansionProcessor": 10,
+    }
+
+    # OpenAI rate limiting ("redis" shares budgets across processes, "local" is per process).
+    # Limits are per model, in requests and tokens per minute; keep them a little
+    # under the organization's OpenAI limits.
+    OPENAI_RATE_LIMIT_BACKEND = "redis"
+    OPENAI_RATE_LIMITS = {
+        "gpt-4o-mini": {"rpm": 4500, "tpm": 1800000},
+        "gpt-4o": {"rpm": 4500, "tpm": 720000},
+        "text-embedding-ada-002": {"rpm": 4500, "tpm": 900000},
+    }
+    OPENAI_DEFAULT_RATE_LIMIT = {"rpm": 450, "tpm": 180000}
+    OPENAI_DEFAULT_COMPLETION_TOKENS = 1024  # Assumed when a request sets no max_tokens
+    OPENAI_INTERACTIVE_RESERVE = 0.2  # Share of each budget bulk traffic may not use
+    OPENAI_MAX_CONCURRENCY = 16  # In-flight requests per process
+    OPENAI_MIN_CONCURRENCY = 1
+    OPENAI_LATENCY_TARGET_SECONDS = 30
+    OPENAI_ACQUIRE_TIMEOUT_SECONDS = 120
+    OPENAI_REQUEST_TIMEOUT_SECONDS = 120
+
+    # Per-request latency budget: the header (milliseconds) or the endpoint's
+    # default, capped below the gunicorn worker timeout. None means no deadline.
+    REQUEST_DEADLINE_HEADER = "X-Request-Timeout-Ms"
+    REQUEST_DEADLINE_DEFAULT_SECONDS = 100
+    REQUEST_DEADLINE_MAX_SECONDS = 110
+    REQUEST_DEADLINE_SECONDS = {
+        "/search": 45,
+        "/smart-search": 30,
+        "/similar-candidates": 10,
+        "/extract-filters": 20,
+        "/resumedetails": 10,
+        "/resumedetails/bulk": 15,
+        "/candidateresearch": 60,
+        "/assess/batch": None,  # Streams its results; each assessment has its own timeouts
+        "/reindex": None,
+    }
+    # Budget a search tier needs to be worth starting; with less left, the
+    # remaining tiers are skipped and what was found so far is returned
+    SEARCH_TIER_MIN_SECONDS = 5
+    # Downstream call timeouts, also capped at what is left of the request budget
+    PINECONE_QUERY_TIMEOUT_SECONDS = 10
+    MONGO_QUERY_TIMEOUT_SECONDS = 10
+    TAVILY_SEARCH_TIMEOUT_SECONDS = 30
+
+    # Prompt token ceilings per prompt type (template + inputs). Resumes are
+    # compressed section by section to fit; other inputs are never trimmed.
+    PROMPT_TOKEN_CEILINGS = {
+        "metadata": 3000,
+        "analyze": 6000,
+        "assess": 9000,
+        "pitch_notes": 7000,
+    }
+    PROMPT_MIN_RESUME_TOKENS = 800  # Floor for the resume even when other inputs are long
+
+    # /assess/batch: resumes per request, and how many of them are assessed at once
+    ASSESS_BATCH_MAX_RESUMES = 50
+    ASSESS_BATCH_MAX_CONCURRENCY = 4
+
+    # Agent assessment: "planned" runs the independent tools concurrently and uses
+    # the ReAct loop only for follow-ups; "react" always runs the agent loop
+    AGENT_ASSESS_MODE = "planned"
+    AGENT_ASSESS_MAX_CONCURRENCY = 2
+
+    # Embedding pre-screen ahead of batch assessment: only the best PRESCREEN_TOP_K
+    # resumes scoring at least PRESCREEN_MIN_SCORE are sent to the LLM
+    PRESCREEN_TOP_K = 10
+    PRESCREEN_MIN_SCORE = 0.75
+    PRESCREEN_MAX_POOL = 1000  # resume_ids a pre-screened batch may name
+    PRESCREEN_CHUNK_TOP_K = 1000  # Chunk vectors fetched per job description (Pinecone's limit with metadata)
+    PRESCREEN_CHUNKS_PER_RESUME = 3  # Best chunks averaged into a resume's similarity
+    PRESCREEN_METADATA_WEIGHT = 0.3  # Share of the score from search filter fit, when filters are given
+    PRESCREEN_QUERY_MAX_TOKENS = 2000  # Job description tokens embedded
+
+    # /similar-candidates: neighbours returned, chunk vectors matched per lookup,
+    # and best chunks averaged into a neighbour's similarity
+    SIMILAR_CANDIDATES_TOP_K = 20
+    SIMILAR_CANDIDATES_MAX_TOP_K = 100
+    SIMILAR_CANDIDATES_CHUNK_TOP_K = 1000
+    SIMILAR_CANDIDATES_CHUNKS_PER_RESUME = 3
+    SIMILAR_CANDIDATES_MAX_SOURCE_CHUNKS = 200  # Chunk vectors of the source resume read for its centroid
+
 class DevelopmentConfig(Config):
     DEBUG = True
 
@@ -78,6 +252,15 @@ def get_redis_config_dict():
         'REDIS_SSL_CA_CERTS': Config.ssl_ca_certs
     }
 
+def get_celery_config():
+    """Returns Celery queue config as a dictionary."""
+    return {
+        'INTERACTIVE_QUEUE': Config.CELERY_INTERACTIVE_QUEUE,
+        'BULK_QUEUE': Config.CELERY_BULK_QUEUE,
+        'VISIBILITY_TIMEOUT': Config.CELERY_VISIBILITY_TIMEOUT,
+        'BULK_DISPATCH_INTERVAL': Config.BULK_DISPATCH_INTERVAL_SECONDS
+    }
+
 def get_api_key_config():
     """Returns the configuration for API Keys."""
     return {
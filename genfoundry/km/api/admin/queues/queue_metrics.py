@@ -0,0 +1,33 @@
+from flask_restful import Resource, current_app
+import logging
+from flask_jwt_extended import jwt_required
+from genfoundry.middleware import role_required
+
+from genfoundry.km.api.standardize.bulk_ingest_scheduler import get_bulk_ingest_scheduler
+
+class QueueMetricsRunner(Resource):
+
+    def __init__(self):
+        logging.debug("Inside QueueMetricsRunner.__init__()")
+
+    @jwt_required()  # Ensure the user is authenticated via JWT token
+    @role_required(["superadmin"])
+    def get(self):
+        """
+        Returns the number of messages waiting in each Celery queue and the
+        bulk uploads still held back per tenant.
+        """
+        try:
+            scheduler = get_bulk_ingest_scheduler()
+            queues = [current_app.config['CELERY_INTERACTIVE_QUEUE'], current_app.config['CELERY_BULK_QUEUE']]
+            pending = scheduler.pending_counts()
+            return {
+                "queues": {queue: scheduler.queue_depth(queue) for queue in queues},
+                "bulk_pending": {
+                    "total": sum(pending.values()),
+                    "by_tenant": pending
+                }
+            }, 200
+        except Exception as e:
+            logging.error(f"Error reading queue metrics: {e}")
+            return {"error": "Server Error"}, 500
@@ -0,0 +1,66 @@
+from flask import request
+from flask_restful import Resource, current_app
+import logging
+from flask_jwt_extended import jwt_required
+from genfoundry.middleware import role_required
+
+from genfoundry.km.api.admin.reindex.resume_reindexer import get_resume_reindexer, ReindexInProgressError
+from genfoundry.km.api.standardize.celery_resume_processor_task import reindex_tenant_vectors
+
+class ReindexRunner(Resource):
+
+    def __init__(self):
+        logging.debug("Inside ReindexRunner.__init__()")
+
+    @jwt_required()  # Ensure the user is authenticated via JWT token
+    @role_required(["superadmin"])
+    def post(self):
+        """
+        Starts, activates or cancels a vector re-index for a tenant.
+        Body: {"tenant_id": "...", "action": "start" | "activate" | "cancel"}
+        """
+        data = request.get_json() or {}
+        tenant_id = data.get("tenant_id")
+        action = (data.get("action") or "start").lower()
+        if not tenant_id:
+            return {"error": "Tenant ID is required"}, 400
+
+        try:
+            reindexer = get_resume_reindexer()
+            if action == "start":
+                progress = reindexer.start(tenant_id)
+                reindex_tenant_vectors.apply_async(
+                    args=[tenant_id, progress["build_id"]],
+                    queue=current_app.config['CELERY_BULK_QUEUE']
+                )
+                logging.info(f"Submitted re-index {progress['build_id']} for tenant {tenant_id}")
+                return progress, 202
+            elif action == "activate":
+                return reindexer.activate(tenant_id), 200
+            elif action == "cancel":
+                return reindexer.cancel(tenant_id), 200
+            return {"error": f"Unknown action: {action}"}, 400
+        except ReindexInProgressError as e:
+            return {"error": str(e)}, 409
+        except ValueError as e:
+            return {"error": str(e)}, 404
+        except Exception as e:
+            logging.error(f"Error handling re-index {action} for tenant {tenant_id}: {e}")
+            return {"error": "Server Error"}, 500
+
+    @jwt_required()
+    @role_required(["superadmin"])
+    def get(self):
+        """Returns the progress and throughput of the tenant's latest re-index."""
+        tenant_id = request.args.get("tenant_id")
+        if not tenant_id:
+            return {"error": "Tenant ID is required"}, 400
+
+        try:
+            progress = get_resume_reindexer().get_progress(tenant_id)
+            if not progress:
+                return {"error": "No re-index found for tenant"}, 404
+            return progress, 200
+        except Exception as e:
+            logging.error(f"Error reading re-index progress for tenant {tenant_id}: {e}")
+            return {"error": "Server Error"}, 500
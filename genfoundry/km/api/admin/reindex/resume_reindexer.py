@@ -0,0 +1,302 @@
+import contextvars
+import json
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from genfoundry.config import Config
+from genfoundry.km.persist.resume_content_codec import resume_markdown
+from genfoundry.km.persist.vector_namespace_registry import default_namespace
+from genfoundry.km.preprocess.resume_metadata_schema import normalize_resume_metadata
+
+logger = logging.getLogger(__name__)
+
+STATUS_RUNNING = "running"
+STATUS_SWITCHED = "switched"
+STATUS_NEEDS_REVIEW = "needs_review"
+STATUS_CANCELLED = "cancelled"
+
+
+class ReindexInProgressError(Exception):
+    """Raised when a re-index is requested for a tenant that already has one running."""
+
+
+class ResumeReindexer():
+    """
+    Rebuilds a tenant's Pinecone vectors from the resumes stored in MongoDB.
+
+    Resumes are read from the tenant's collection in _id order, re-chunked,
+    embedded in large batches with a bounded number of requests in flight, and
+    upserted into a shadow namespace. New uploads and deletes are applied to the
+    shadow namespace too while it is being built. When every resume has been
+    processed, searches switch to the shadow namespace in one step; the old
+    namespace is left in place for rollback.
+
+    Progress is checkpointed in Redis after every batch (the last _id done plus
+    counters and timings), so the job can stop and resume at any point. Chunk IDs
+    are deterministic, so a batch repeated after a failure overwrites its vectors.
+    """
+
+    PROGRESS_PREFIX = "reindex:progress:"
+    LOCK_PREFIX = "reindex:lock:"
+    MAX_FAILED_IDS = 100
+
+    def __init__(self, redis_client, mongo_proxy, vectorizer, registry, embed_model=None,
+                 batch_size=None, embed_batch_size=None, embed_concurrency=None, standardizer_factory=None) -> None:
+        self.redis_client = redis_client
+        self.mongo_proxy = mongo_proxy
+        self.vectorizer = vectorizer
+        self.registry = registry
+        self.embed_model = embed_model
+        self.batch_size = batch_size or Config.REINDEX_BATCH_SIZE
+        self.embed_batch_size = embed_batch_size or Config.REINDEX_EMBED_BATCH_SIZE
+        self.embed_concurrency = embed_concurrency or Config.REINDEX_EMBED_CONCURRENCY
+        self.standardizer_factory = standardizer_factory
+        self._standardizer = None
+
+    def start(self, tenant_id):
+        """Creates a new shadow namespace for the tenant and returns the initial progress."""
+        progress = self.get_progress(tenant_id)
+        if progress and progress.get("status") == STATUS_RUNNING:
+            raise ReindexInProgressError(f"Re-index {progress['build_id']} is already running for tenant {tenant_id}")
+
+        build_id = time.strftime("%Y%m%d%H%M%S", time.gmtime())
+        now = time.time()
+        progress = {
+            "build_id": build_id,
+            "tenant_id": tenant_id,
+            "namespace": f"{default_namespace(tenant_id)}_{build_id}",
+            "source_namespace": self.registry.get_active_namespace_uncached(tenant_id),
+            "embedding_model": Config.TEXT_EMBEDDING_MODEL,
+            "status": STATUS_RUNNING,
+            "total": self.mongo_proxy.count_resumes(tenant_id),
+            "processed": 0,
+            "vectors": 0,
+            "failed": 0,
+            "failed_ids": [],
+            "metadata_recovered": 0,
+            "metadata_normalized": 0,
+            "last_id": None,
+            "started_at": now,
+            "updated_at": now,
+            "elapsed_seconds": 0.0,
+            "mongo_seconds": 0.0,
+            "embed_seconds": 0.0,
+            "upsert_seconds": 0.0,
+            "last_error": None,
+        }
+        self.registry.start_build(tenant_id, progress["namespace"])
+        self._save_progress(tenant_id, progress)
+        logger.info(f"Started re-index {build_id} for tenant {tenant_id} into {progress['namespace']}")
+        return progress
+
+    def run(self, tenant_id, build_id, max_batches=None):
+        """
+        Processes up to max_batches batches of the given build. Returns the
+        progress (status "running" while work remains), or None if another
+        worker holds the tenant's re-index lock.
+        """
+        lock_key = f"{self.LOCK_PREFIX}{tenant_id}"
+        lock_token = str(uuid.uuid4())
+        if not self.redis_client.set(lock_key, lock_token, nx=True, ex=Config.REINDEX_LOCK_SECONDS):
+            logger.info(f"Re-index for tenant {tenant_id} is already running elsewhere, skipping")
+            return None
+
+        try:
+            progress = self.get_progress(tenant_id)
+            if not progress or progress.get("build_id") != build_id or progress.get("status") != STATUS_RUNNING:
+                logger.info(f"Re-index {build_id} for tenant {tenant_id} is no longer running, stopping")
+                return progress
+
+            batches = 0
+            while max_batches is None or batches < max_batches:
+                started = time.monotonic()
+                try:
+                    docs = self.mongo_proxy.get_resume_batch(tenant_id, progress["last_id"], self.batch_size)
+                    progress["mongo_seconds"] += time.monotonic() - started
+                    if not docs:
+                        self._finish(tenant_id, progress)
+                        break
+                    self._process_batch(tenant_id, progress, docs)
+                except Exception as e:
+                    progress["last_error"] = str(e)
+                    self._save_progress(tenant_id, progress)
+                    raise
+                progress["last_id"] = docs[-1]["_id"]
+                progress["last_error"] = None
+                progress["elapsed_seconds"] += time.monotonic() - started
+                self._update_throughput(progress)
+                self._save_progress(tenant_id, progress)
+                batches += 1
+                logger.info(
+                    f"Re-index {build_id} for tenant {tenant_id}: {progress['processed']}/{progress['total']} resumes, "
+                    f"{progress['vectors']} vectors, {progress['resumes_per_second']} resumes/s"
+                )
+            return progress
+        finally:
+            if self._decode(self.redis_client.get(lock_key)) == lock_token:
+                self.redis_client.delete(lock_key)
+
+    def activate(self, tenant_id):
+        """Switches searches to the build's namespace, e.g. after reviewing a build with failures."""
+        progress = self.get_progress(tenant_id)
+        if not progress or progress.get("status") not in (STATUS_RUNNING, STATUS_NEEDS_REVIEW):
+            raise ValueError(f"No re-index to activate for tenant {tenant_id}")
+        if progress["status"] == STATUS_RUNNING:
+            raise ReindexInProgressError(f"Re-index {progress['build_id']} has not finished")
+        progress["previous_namespace"] = self.registry.activate(tenant_id, progress["namespace"])
+        progress["status"] = STATUS_SWITCHED
+        self._save_progress(tenant_id, progress)
+        return progress
+
+    def cancel(self, tenant_id):
+        """Stops the tenant's re-index; the partial shadow namespace is left for cleanup."""
+        progress = self.get_progress(tenant_id)
+        if not progress or progress.get("status") not in (STATUS_RUNNING, STATUS_NEEDS_REVIEW):
+            raise ValueError(f"No re-index to cancel for tenant {tenant_id}")
+        self.registry.abandon_build(tenant_id)
+        progress["status"] = STATUS_CANCELLED
+        self._save_progress(tenant_id, progress)
+        return progress
+
+    def get_progress(self, tenant_id):
+        raw = self.redis_client.get(f"{self.PROGRESS_PREFIX}{tenant_id}")
+        return json.loads(self._decode(raw)) if raw else None
+
+    def _process_batch(self, tenant_id, progress, docs):
+        nodes = []
+        failed_ids = []
+        for doc in docs:
+            try:
+                text, metadata = self._resume_inputs(tenant_id, progress, doc)
+            except ValueError as e:
+                # Unreadable stored resumes are skipped and listed; retrying will not help
+                logger.warning(f"Skipping resume {doc.get('_id')} in re-index: {e}")
+                failed_ids.append(doc.get("_id"))
+                continue
+            nodes.extend(self.vectorizer.build_resume_nodes(doc["_id"], text, metadata))
+
+        started = time.monotonic()
+        self._embed(nodes)
+        progress["embed_seconds"] += time.monotonic() - started
+
+        started = time.monotonic()
+        if nodes:
+            self.vectorizer.get_namespace_vectorstore(progress["namespace"]).add(nodes)
+            self.vectorizer.store_resume_centroids(progress["namespace"], nodes)
+        progress["upsert_seconds"] += time.monotonic() - started
+
+        # Counters only move once the batch is stored, so a retried batch is not counted twice
+        progress["processed"] += len(docs) - len(failed_ids)
+        progress["vectors"] += len(nodes)
+        progress["failed"] += len(failed_ids)
+        progress["failed_ids"] = (progress["failed_ids"] + failed_ids)[:self.MAX_FAILED_IDS]
+
+    def _resume_inputs(self, tenant_id, progress, doc):
+        """Returns the text to embed and the metadata for a stored resume."""
+        text = doc.get("parsed_text") or resume_markdown(doc)
+        if not text:
+            raise ValueError("resume has no content")
+
+        metadata = doc.get("metadata")
+        if metadata is None:
+            # Resumes stored before metadata was kept in Mongo: reuse what the
+            # current vectors carry, and only ask the LLM if there are none
+            metadata = self.vectorizer.fetch_resume_metadata(progress["source_namespace"], doc["_id"])
+            if metadata is None:
+                metadata = self._get_standardizer().extract_metadata(text, raise_on_error=True)
+            metadata = normalize_resume_metadata(metadata)
+            self.mongo_proxy.update_resume_metadata(tenant_id, doc["_id"], metadata)
+            progress["metadata_recovered"] += 1
+        else:
+            # Metadata stored before it was typed: the rebuilt vectors need the
+            # canonical values for filters to match
+            typed = normalize_resume_metadata(metadata)
+            if typed != metadata:
+                self.mongo_proxy.update_resume_metadata(tenant_id, doc["_id"], typed)
+                progress["metadata_normalized"] = progress.get("metadata_normalized", 0) + 1
+            metadata = typed
+        return text, dict(metadata)
+
+    def _embed(self, nodes):
+        if not nodes:
+            return
+        groups = [nodes[i:i + self.embed_batch_size] for i in range(0, len(nodes), self.embed_batch_size)]
+        if len(groups) == 1 or self.embed_concurrency <= 1:
+            for group in groups:
+                self.vectorizer.embed_nodes(group, self.embed_model)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.embed_concurrency, len(groups))) as executor:
+            # Each batch runs in a copy of the caller's context so it keeps the bulk OpenAI priority
+            futures = [
+                executor.submit(contextvars.copy_context().run, self.vectorizer.embed_nodes, group, self.embed_model)
+                for group in groups
+            ]
+            # result() surfaces the first embedding error, if any
+            for future in futures:
+                future.result()
+
+    def _finish(self, tenant_id, progress):
+        if progress["failed"]:
+            progress["status"] = STATUS_NEEDS_REVIEW
+            logger.warning(
+                f"Re-index {progress['build_id']} for tenant {tenant_id} finished with {progress['failed']} "
+                f"skipped resumes; not switching namespaces until it is activated"
+            )
+        else:
+            progress["previous_namespace"] = self.registry.activate(tenant_id, progress["namespace"])
+            progress["status"] = STATUS_SWITCHED
+        progress["finished_at"] = time.time()
+        self._save_progress(tenant_id, progress)
+
+    @staticmethod
+    def _update_throughput(progress):
+        elapsed = progress["elapsed_seconds"]
+        rate = progress["processed"] / elapsed if elapsed > 0 else 0.0
+        progress["resumes_per_second"] = round(rate, 2)
+        progress["vectors_per_second"] = round(progress["vectors"] / elapsed, 2) if elapsed > 0 else 0.0
+        remaining = max(0, progress["total"] - progress["processed"] - progress["failed"])
+        progress["eta_seconds"] = round(remaining / rate) if rate > 0 else None
+
+    def _save_progress(self, tenant_id, progress):
+        progress["updated_at"] = time.time()
+        self.redis_client.set(f"{self.PROGRESS_PREFIX}{tenant_id}", json.dumps(progress))
+
+    def _get_standardizer(self):
+        if self._standardizer is None:
+            self._standardizer = self.standardizer_factory()
+        return self._standardizer
+
+    @staticmethod
+    def _decode(value):
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def get_resume_reindexer():
+    from llama_index.embeddings.openai import OpenAIEmbedding
+    from genfoundry.km.persist.mongo_proxy import MongoProxy
+    from genfoundry.km.persist.redis_proxy import get_redis_client
+    from genfoundry.km.persist.vector_db_proxy import PineconeVectorizer
+    from genfoundry.km.persist.vector_namespace_registry import get_vector_namespace_registry
+    from genfoundry.km.preprocess.resume_transformer import ResumeStandardizer
+    from genfoundry.km.utils.openai_rate_limiter import llama_index_client_kwargs
+
+    embed_model = OpenAIEmbedding(
+        model=Config.TEXT_EMBEDDING_MODEL,
+        api_key=Config.OPENAI_API_KEY,
+        embed_batch_size=Config.REINDEX_EMBED_BATCH_SIZE,
+        **llama_index_client_kwargs()
+    )
+    return ResumeReindexer(
+        get_redis_client(),
+        MongoProxy(),
+        PineconeVectorizer(),
+        get_vector_namespace_registry(),
+        embed_model=embed_model,
+        standardizer_factory=lambda: ResumeStandardizer(
+            openai_api_key=Config.OPENAI_API_KEY,
+            langchain_api_key=Config.LANGCHAIN_API_KEY,
+            llm_model=Config.LLM_MODEL
+        ),
+    )
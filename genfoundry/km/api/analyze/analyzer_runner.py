@@ -9,6 +9,9 @@ import uuid
 from langchain_openai import ChatOpenAI
 from genfoundry.km.preprocess.pymupdf_doc_parser import PyMuPDFDocumentParser
 from genfoundry.km.api.analyze.resume_analyzer import ResumeAnalyzer
+from genfoundry.km.persist.stored_resume_loader import get_stored_resume_loader
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
+from genfoundry.km.utils.request_deadline import DeadlineExceeded, deadline_stage
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +31,8 @@ class ResumeAnalyzerRunner(Resource):
         self.llm = ChatOpenAI(
             model_name=current_app.config['LLM_MODEL'], 
             temperature=0, 
-            api_key=os.getenv("OPENAI_API_KEY"))
+            api_key=os.getenv("OPENAI_API_KEY"),
+            **langchain_client_kwargs())
 
     @jwt_required()
     def post(self):
@@ -40,8 +44,15 @@ class ResumeAnalyzerRunner(Resource):
         if not tenant_id:
             return jsonify({"error": "Tenant ID is required"}), 400
 
+        resume_id = request.form.get('resume_id', '').strip()
+        if resume_id:
+            resume = get_stored_resume_loader().get(tenant_id, resume_id)
+            if resume is None:
+                return jsonify({"error": f"Resume {resume_id} not found"}), 404
+            return self.analyze_resume(resume)
+
         if 'resume' not in request.files:
-            return jsonify({"error": "Resume is required for assessment"}), 400
+            return jsonify({"error": "Resume or resume_id is required for assessment"}), 400
 
         # Get uploaded file
         resume_file = request.files['resume']
@@ -67,7 +78,8 @@ class ResumeAnalyzerRunner(Resource):
 
     def analyze_resume(self, resume):
         try:
-            assess_response = self.analyzer.assess(resume)
+            with deadline_stage("resume analysis"):
+                assess_response = self.analyzer.assess(resume)
 
             if assess_response.startswith("json"):
                 assess_response = assess_response[4:].strip()
@@ -82,6 +94,8 @@ class ResumeAnalyzerRunner(Resource):
 
             # Return the parsed JSON as the HTTP response
             return parsed_response
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"Assessment failed: {e}")
             return "Server Error", 500
@@ -1,9 +1,10 @@
 import logging
 import json
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 from langchain_openai import ChatOpenAI
 from genfoundry.km.utils.doc_parser import DocumentParser
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
+from genfoundry.km.preprocess.prompt_budget import PromptBudget, invoke_with_usage
 
 logger = logging.getLogger(__name__)
 
@@ -70,13 +71,15 @@ class ResumeAnalyzer:
         self.openai_api_key = openai_api_key
         self.langchain_api_key = langchain_api_key
         self.llm_model = llm_model
-        self.llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key)
+        self.llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key, **langchain_client_kwargs())
+        self.prompt_budget = PromptBudget(llm_model)
  
     def assess(self, resume):
         try:
             logger.debug("Assessing resume...")
             prompt = PromptTemplate(input_variables=["resume"], 
             template=answerTemplate)
+            resume = self.prompt_budget.fit_resume("analyze", resume, answerTemplate)
             response = self.get_llm_response(prompt,resume)
             return response
         except Exception as ex:
@@ -96,8 +99,7 @@ class ResumeAnalyzer:
             if not isinstance(prompt, PromptTemplate):
                 raise ValueError("Prompt must be an instance of PromptTemplate")
             
-            chain = prompt| self.llm | StrOutputParser()
-            response = chain.invoke(inputs) 
+            response = invoke_with_usage(prompt, self.llm, inputs, "analyze")
             logger.debug(f"LLM response: {response}")
             return response
         except Exception as e:
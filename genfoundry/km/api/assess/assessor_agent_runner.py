@@ -5,10 +5,19 @@ from langchain_openai import ChatOpenAI
 from genfoundry.km.utils.doc_parser import DocumentParser
 from .resume_assessor_tool import ResumeAssessorTool
 from .location_assessor_tool import LocationAssessorTool
+from .planned_tool_executor import (
+    LOCATION_TOOL, RESUME_TOOL, PlannedToolExecutor, agent_input, merge_assessments, plan_tools
+)
+from .resume_assessor import parse_assessment
 from langgraph.prebuilt import create_react_agent
 from langchain.agents import AgentExecutor
 import os
 import json
+from genfoundry.config import Config
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
+
+MODE_PLANNED = "planned"
+MODE_REACT = "react"
 
 class ResumeAssessorAgentRunner(Resource):
     def __init__(self):
@@ -20,15 +29,28 @@ class ResumeAssessorAgentRunner(Resource):
         self.llm = ChatOpenAI(
             model_name=current_app.config['LLM_MODEL'], 
             temperature=0, 
-            api_key=os.getenv("OPENAI_API_KEY"))
-        
-        tools = [ResumeAssessorTool(), LocationAssessorTool()]
+            api_key=os.getenv("OPENAI_API_KEY"),
+            **langchain_client_kwargs())
         
+        resume_tool, location_tool = ResumeAssessorTool(), LocationAssessorTool()
+        tools = [resume_tool, location_tool]
+        self.planned_executor = PlannedToolExecutor({RESUME_TOOL: resume_tool, LOCATION_TOOL: location_tool})
+
         system_message = "You are a helpful recruitment assistant. Please assess the resume against the job description and criteria. You may use the tools provided to assist you. The final answer should combine the results of individual tools that are called."
 
         self.agent_executor = create_react_agent(self.llm, tools, state_modifier=system_message)
 
-    def post(self):        
+    def post(self):
+        """
+        Assesses the resume with the tools. In "planned" mode (the default,
+        Config.AGENT_ASSESS_MODE, or the form field mode) the tools run
+        concurrently and the agent is only invoked to follow up on a tool that
+        failed; "react" runs the agent loop throughout.
+        """
+        mode = (request.form.get('mode') or Config.AGENT_ASSESS_MODE).strip().lower()
+        if mode not in (MODE_PLANNED, MODE_REACT):
+            return jsonify({"error": f"mode must be '{MODE_PLANNED}' or '{MODE_REACT}'"}), 400
+
         if 'job_description' not in request.files or 'resume' not in request.files:
             return jsonify({"error": "Both job_description and resume files are required"}), 400
 
@@ -51,18 +73,28 @@ class ResumeAssessorAgentRunner(Resource):
         try:
             question = "Please assess the resume against the job description and criteria. You may use the tools provided to assist you. The final answer should combine the results of the tools."
 
-            assess_response = self.agent_executor.invoke({"job_description": job_description, "criteria": criteria, "resume": resume, "question": question})
+            completed = {}
+            if mode == MODE_PLANNED:
+                completed, failures = self.planned_executor.run(plan_tools(job_description, criteria, resume, question))
+                if not failures:
+                    return jsonify({"AIResponse": merge_assessments(completed.values()), "mode": MODE_PLANNED})
+                logging.warning(f"Following up on failed planned assessments {list(failures)} with the agent")
+
+            agent_response = self.agent_executor.invoke(
+                agent_input(job_description, criteria, resume, question, completed.values()))
+            assess_response = agent_response["messages"][-1].content
             logging.debug(f"Answer: {assess_response}")
 
             # If the response is a JSON string, parse it
             try:
-                if isinstance(assess_response, str):
-                    assess_response = json.loads(assess_response)
-            except json.JSONDecodeError:
+                assess_response = parse_assessment(assess_response)
+                if completed:
+                    assess_response = merge_assessments([*completed.values(), assess_response])
+            except ValueError:
                 logging.warning("Agent response is not valid JSON. Returning raw response.")
 
             # Return the parsed JSON as the HTTP response
-            return jsonify({"AIResponse": assess_response})
+            return jsonify({"AIResponse": assess_response, "mode": mode})
         except Exception as e:
             logging.error(f"Assessment failed: {e}")
             return "Server Error", 500
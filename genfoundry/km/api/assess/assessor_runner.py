@@ -9,6 +9,7 @@ import os
 import json
 
 from .resume_assessor import ResumeAssessor
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
 
 class ResumeAssessorRunner(Resource):
     def __init__(self):
@@ -32,7 +33,8 @@ class ResumeAssessorRunner(Resource):
         self.llm = ChatOpenAI(
             model_name=current_app.config['LLM_MODEL'], 
             temperature=0, 
-            api_key=os.getenv("OPENAI_API_KEY"))
+            api_key=os.getenv("OPENAI_API_KEY"),
+            **langchain_client_kwargs())
 
     @jwt_required()  # Ensure the user is authenticated via JWT token
     def post(self):
@@ -8,7 +8,10 @@ import tempfile
 import uuid
 from langchain_openai import ChatOpenAI
 from genfoundry.km.preprocess.pymupdf_doc_parser import PyMuPDFDocumentParser
-from genfoundry.km.api.assess.resume_assessor import ResumeAssessor
+from genfoundry.km.api.assess.resume_assessor import ResumeAssessor, parse_assessment
+from genfoundry.km.persist.stored_resume_loader import get_stored_resume_loader
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
+from genfoundry.km.utils.request_deadline import DeadlineExceeded, deadline_stage
 
 class TextInputResumeAssessorRunner(Resource):
     def __init__(self):
@@ -26,7 +29,8 @@ class TextInputResumeAssessorRunner(Resource):
         self.llm = ChatOpenAI(
             model_name=current_app.config['LLM_MODEL'], 
             temperature=0, 
-            api_key=os.getenv("OPENAI_API_KEY"))
+            api_key=os.getenv("OPENAI_API_KEY"),
+            **langchain_client_kwargs())
 
     @jwt_required()
     def post(self):
@@ -38,8 +42,10 @@ class TextInputResumeAssessorRunner(Resource):
         if not tenant_id:
             return jsonify({"error": "Tenant ID is required"}), 400
 
-        if 'resume' not in request.files:
-            return jsonify({"error": "Resume is required for assessment"}), 400
+        # A stored resume (e.g. from search results) needs no upload or parse
+        resume_id = request.form.get('resume_id', '').strip()
+        if not resume_id and 'resume' not in request.files:
+            return jsonify({"error": "Resume or resume_id is required for assessment"}), 400
 
         # Use request.form to get the job description and criteria
         job_description = request.form.get('job_description_text', '')
@@ -48,6 +54,12 @@ class TextInputResumeAssessorRunner(Resource):
         if not job_description:
             return {'error': 'Job description is required.'}, 400
 
+        if resume_id:
+            resume = get_stored_resume_loader().get(tenant_id, resume_id)
+            if resume is None:
+                return jsonify({"error": f"Resume {resume_id} not found"}), 404
+            return self.assess_resume(job_description, resume, selection_criteria)
+
         # Get uploaded file
         resume_file = request.files['resume']
         resume_filename = resume_file.filename
@@ -70,23 +82,20 @@ class TextInputResumeAssessorRunner(Resource):
     def assess_resume(self, job_description, resume, criteria):
         try:
             question = "Please assess the resume against the job description and criteria."
-            assess_response = self.assessor.assess(job_description, criteria, resume, question)
-
-            if assess_response.startswith("json"):
-                assess_response = assess_response[4:].strip()
-            
+            with deadline_stage("assessment"):
+                assess_response = self.assessor.assess(job_description, criteria, resume, question)
             logging.debug(f"Answer: {assess_response}")
 
-            if not assess_response or not assess_response.strip():
+            if isinstance(assess_response, str) and not assess_response.strip():
                 logging.error("Empty response received")
                 return jsonify({"error": "Empty response from assessment tool"}), 500
 
-            # If the response is a JSON string, parse it
-            if isinstance(assess_response, str):
-                parsed_response = json.loads(assess_response)
+            parsed_response = parse_assessment(assess_response)
 
             # Return the parsed JSON as the HTTP response
             return jsonify({"AIResponse": parsed_response})
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logging.error(f"Assessment failed: {e}")
             return "Server Error", 500
@@ -0,0 +1,142 @@
+from flask import request, jsonify, g, Response
+from flask_restful import Resource, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+import json
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+
+from genfoundry.config import Config
+from genfoundry.km.api.assess.batch_resume_assessor import (
+    BatchResumeAssessor, SOURCE_STORED, SOURCE_UPLOAD, batch_candidate, ndjson
+)
+from genfoundry.km.api.assess.resume_assessor import ResumeAssessor
+from genfoundry.km.persist.stored_resume_loader import get_stored_resume_loader
+from genfoundry.km.preprocess.pymupdf_doc_parser import PyMuPDFDocumentParser
+from genfoundry.km.query.candidate_prescreen import CandidatePreScreener
+from genfoundry.km.query.tiered_resume_search import TieredResumeSearcher
+
+
+class BatchResumeAssessorRunner(Resource):
+    """
+    POST /assess/batch (multipart form): job_description_text, criteria_text,
+    any number of "resumes" files and/or "resume_ids" of stored resumes
+    (repeated or comma-separated). Streams application/x-ndjson: one line per
+    candidate as its assessment completes, then a summary line with the
+    ranking.
+
+    With prescreen=true the stored resumes (resume_ids, or with neither
+    resumes nor resume_ids every resume of the tenant) are first ranked by
+    embedding similarity to the job description, plus the fit with the
+    optional search "filters" (JSON, as /smart-search takes them), and only
+    the best prescreen_top_k scoring at least prescreen_min_score are
+    assessed. Uploads are always assessed.
+    """
+
+    def __init__(self):
+        logging.debug("Initializing Batch Resume Assessor HTTP handler")
+        self.assessor = ResumeAssessor(
+            openai_api_key=current_app.config['OPENAI_API_KEY'],
+            langchain_api_key=current_app.config['LANGCHAIN_API_KEY'],
+            llm_model=current_app.config['LLM_MODEL'],
+        )
+        self.parser = PyMuPDFDocumentParser()
+        self.resume_loader = get_stored_resume_loader()
+
+    @jwt_required()
+    def post(self):
+        user_id = get_jwt_identity()
+        if not user_id:
+            return jsonify({"error": "Unauthorized"}), 401
+
+        tenant_id = g.tenant_id
+        if not tenant_id:
+            return jsonify({"error": "Tenant ID is required"}), 400
+
+        job_description = request.form.get('job_description_text', '')
+        selection_criteria = request.form.get('criteria_text', '')
+        if not job_description:
+            return jsonify({"error": "Job description is required."}), 400
+
+        uploads = [f for f in request.files.getlist('resumes') if f.filename]
+        resume_ids = list(dict.fromkeys(
+            resume_id.strip() for value in request.form.getlist('resume_ids') for resume_id in value.split(',')
+            if resume_id.strip()
+        ))
+        prescreen = request.form.get('prescreen', '').lower() in ("1", "true", "yes")
+        if not uploads and not resume_ids and not prescreen:
+            return jsonify({"error": "At least one resume or resume_id is required for assessment"}), 400
+        if prescreen and len(resume_ids) > Config.PRESCREEN_MAX_POOL:
+            return jsonify({"error": f"At most {Config.PRESCREEN_MAX_POOL} resume_ids per pre-screened batch"}), 400
+        if len(uploads) + (0 if prescreen else len(resume_ids)) > Config.ASSESS_BATCH_MAX_RESUMES:
+            return jsonify({"error": f"At most {Config.ASSESS_BATCH_MAX_RESUMES} resumes per batch"}), 400
+
+        screening = None
+        if prescreen and (resume_ids or not uploads):
+            try:
+                filters = json.loads(request.form.get('filters') or '[]')
+                top_k = int(request.form.get('prescreen_top_k') or Config.PRESCREEN_TOP_K)
+                min_score = request.form.get('prescreen_min_score')
+                min_score = float(min_score) if min_score else None
+            except ValueError:
+                return jsonify({"error": "filters must be JSON, prescreen_top_k and prescreen_min_score numbers"}), 400
+            # The shortlist and the uploads together stay within the batch limit
+            top_k = max(1, min(top_k, Config.ASSESS_BATCH_MAX_RESUMES - len(uploads)))
+            try:
+                screener = CandidatePreScreener(TieredResumeSearcher())
+                screening = screener.screen(tenant_id, job_description, resume_ids or None, filters, top_k, min_score)
+            except Exception as e:
+                logging.error(f"BatchResumeAssessorRunner.post(): Pre-screen failed: {e}")
+                return jsonify({"error": "Server Error"}), 500
+            resume_ids = [candidate["resume_id"] for candidate in screening["shortlist"]]
+            if not uploads and not resume_ids:
+                return jsonify({"error": "No candidate passed the pre-screen", "prescreen": screening}), 404
+
+        # Uploads are gone once the request returns, and the response streams after that
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            candidates = load_candidates(self.resume_loader, tenant_id, uploads, resume_ids, tmp_dir)
+        except Exception as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            logging.error(f"BatchResumeAssessorRunner.post(): Error loading resumes: {e}")
+            return jsonify({"error": "Server Error"}), 500
+
+        batch = BatchResumeAssessor(self.assessor, self.parser)
+
+        def stream():
+            try:
+                yield from ndjson(batch.run(job_description, selection_criteria, candidates, screening))
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        # X-Accel-Buffering stops nginx from holding lines back until the batch ends
+        return Response(stream(), mimetype="application/x-ndjson",
+                        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"})
+
+
+def load_candidates(resume_loader, tenant_id, uploads, resume_ids, tmp_dir):
+    """
+    Saves the uploads to tmp_dir (they are parsed by the batch workers) and
+    reads the stored resumes through the StoredResumeLoader. A resume ID that
+    is missing or unreadable becomes a candidate with an error, reported in
+    its line.
+    """
+    candidates = []
+    for upload in uploads:
+        path = os.path.join(tmp_dir, f"{uuid.uuid4().hex}_{os.path.basename(upload.filename)}")
+        upload.save(path)
+        candidates.append(batch_candidate(upload.filename, SOURCE_UPLOAD, path=path))
+
+    resumes = resume_loader.get_many(tenant_id, resume_ids) if resume_ids else {}
+    for resume_id in resume_ids:
+        if resume_id not in resumes:
+            candidates.append(batch_candidate(resume_id, SOURCE_STORED, error="Resume not found"))
+            continue
+        resume = resumes[resume_id]
+        if resume:
+            candidates.append(batch_candidate(resume_id, SOURCE_STORED, resume=resume))
+        else:
+            candidates.append(batch_candidate(resume_id, SOURCE_STORED, error="Resume has no content"))
+    return candidates
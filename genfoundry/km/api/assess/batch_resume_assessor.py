@@ -0,0 +1,129 @@
+"""
+Assessment of many resumes against one job description.
+
+BatchResumeAssessor runs ResumeAssessor.assess for each candidate on a small
+thread pool (Config.ASSESS_BATCH_MAX_CONCURRENCY per batch) and yields each
+candidate's result as soon as it is ready, then a summary ranking the
+candidates by average criteria score. The job description and criteria are
+tokenized once per batch, and since they precede the resume in the prompt,
+OpenAI can serve them from its prompt cache after the first candidate.
+
+The calls are marked bulk for the OpenAI rate limiter, so a large batch shares
+the cluster-wide budget without using up the interactive reserve.
+"""
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from genfoundry.config import Config
+from genfoundry.km.api.assess.resume_assessor import average_score, parse_assessment
+from genfoundry.km.utils.openai_rate_limiter import openai_priority, PRIORITY_BULK
+
+logger = logging.getLogger(__name__)
+
+SOURCE_UPLOAD = "upload"
+SOURCE_STORED = "resume_id"
+
+QUESTION = "Please assess the resume against the job description and criteria."
+
+
+def batch_candidate(candidate, source, resume=None, path=None, error=None):
+    """
+    One resume of a batch: its text, or the path of an upload still to be
+    parsed, or the error that kept it from being loaded.
+    """
+    return {"candidate": candidate, "source": source, "resume": resume, "path": path, "error": error}
+
+
+class BatchResumeAssessor():
+    def __init__(self, assessor, parser=None, max_concurrency=None) -> None:
+        self.assessor = assessor
+        self.parser = parser
+        self.max_concurrency = max_concurrency or Config.ASSESS_BATCH_MAX_CONCURRENCY
+
+    def run(self, job_description, criteria, candidates, prescreen=None):
+        """
+        Yields a "result" or "error" line per candidate, in completion order,
+        then the "summary" line, which includes the prescreen report
+        (CandidatePreScreener.screen) when the candidates were pre-screened.
+        Closing the generator early cancels the assessments that have not
+        started.
+        """
+        started = time.perf_counter()
+        fixed_tokens = self.assessor.fixed_tokens(job_description, criteria, QUESTION)
+        results = []
+        pool = ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(candidates))),
+                                  thread_name_prefix="assess-batch")
+        try:
+            futures = [
+                pool.submit(self._assess_one, index, candidate, job_description, criteria, fixed_tokens)
+                for index, candidate in enumerate(candidates)
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                yield result
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        yield ranked_summary(results, round((time.perf_counter() - started) * 1000, 1), prescreen)
+
+    def _assess_one(self, index, candidate, job_description, criteria, fixed_tokens):
+        line = {"type": "result", "index": index, "candidate": candidate["candidate"], "source": candidate["source"]}
+        if candidate.get("error"):
+            return {**line, "type": "error", "error": candidate["error"]}
+        try:
+            with openai_priority(PRIORITY_BULK):
+                resume = candidate.get("resume")
+                if resume is None:
+                    resume = self.parser.parse_document(candidate["path"])
+                assessment = parse_assessment(
+                    self.assessor.assess(job_description, criteria, resume, QUESTION, fixed_tokens=fixed_tokens)
+                )
+        except Exception as e:
+            logger.error(f"Batch assessment of {candidate['candidate']} failed: {e}")
+            return {**line, "type": "error", "error": str(e)}
+        return {
+            **line,
+            "candidate_name": assessment.get("candidate_name"),
+            "average_score": average_score(assessment),
+            "AIResponse": assessment,
+        }
+
+
+def ranked_summary(results, elapsed_ms=None, prescreen=None):
+    """The closing line of a batch: assessed candidates best first, then the failures."""
+    prescreen_scores = {c["resume_id"]: c["score"] for c in (prescreen or {}).get("shortlist", [])}
+    assessed = sorted(
+        (r for r in results if r["type"] == "result"),
+        key=lambda r: (r["average_score"] is None, -(r["average_score"] or 0), r["index"]),
+    )
+    ranking = []
+    for rank, r in enumerate(assessed, start=1):
+        entry = {"rank": rank, "index": r["index"], "candidate": r["candidate"],
+                 "candidate_name": r["candidate_name"], "average_score": r["average_score"]}
+        if r["candidate"] in prescreen_scores:
+            entry["prescreen_score"] = prescreen_scores[r["candidate"]]
+        ranking.append(entry)
+    summary = {
+        "type": "summary",
+        "assessed": len(assessed),
+        "ranking": ranking,
+        "failed": sorted(
+            ({"index": r["index"], "candidate": r["candidate"], "error": r["error"]}
+             for r in results if r["type"] == "error"),
+            key=lambda r: r["index"],
+        ),
+        "elapsed_ms": elapsed_ms,
+    }
+    if prescreen is not None:
+        summary["prescreen"] = {
+            key: prescreen[key] for key in ("candidates", "llm_calls_saved", "top_k", "min_score", "screened_out")
+        }
+        summary["prescreen"]["shortlisted"] = len(prescreen["shortlist"])
+    return summary
+
+
+def ndjson(lines):
+    for line in lines:
+        yield json.dumps(line, ensure_ascii=False) + "\n"
@@ -6,6 +6,9 @@ from tavily import TavilyClient
 import logging, os
 from pydantic import Field
 from typing import Literal
+from genfoundry.config import Config
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
+from genfoundry.km.utils.request_deadline import call_timeout
 
 locatonSearchAnswerTemplate = '''
         You are a helpful assistant. You are analyzing whether the candidate's location as provided in the resume is in the vicinity of the job location as per the criteria. You must use tavily_search_results_json tool for information search. You will provide a score against the location criteria.The criteria scores should be between 0 and 10. For example, 9 or above means the candidate's location fully matches the job location; between 7.5 and 9.0 means the candidate is within 50 kilometers of the job location; between 6.0 and 7.5 means the candidate is within 100 kilometers of the job location. If the candidate mentions "willing to relocate", score it as 8. If the candidate does not match the criteria, score it as 0.
@@ -23,7 +26,7 @@ locatonSearchAnswerTemplate = '''
                     "score": 10,
                     "explanation": "The candidate's location is in the vicinity of the job location."
                 }}
-            ],
+            ]
         }}
 
         "Distance": {distance}
@@ -34,6 +37,7 @@ class LocationAssessorTool(BaseTool):
     description: str = "Use this tool when you need to assess a location provided in the resume against the location specified in the job description."
 
     def __init__(self):
+        super().__init__()
         logging.debug("Initializing LocationAssessorTool...")
 
     def _run(self, resume, criteria):
@@ -41,15 +45,17 @@ class LocationAssessorTool(BaseTool):
         openai_api_key = os.getenv("OPENAI_API_KEY")
         tavily_api_key = os.getenv("TAVILY_API_KEY")
         llm_model = os.getenv("LLM_MODEL")
-        llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key)
+        llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key, **langchain_client_kwargs())
 
         candidate_location = self.get_location(resume, llm)
         job_location = self.get_location(criteria, llm)
         
-        question = "How far is candidate's location from the job location? Provide the approximate distance in kilometers. The candidate's location is {candidate_location} and the job location is {job_location}."
+        question = "How far is candidate's location from the job location? Provide the approximate distance in kilometers. The candidate's location is {candidate_location} and the job location is {job_location}.".format(
+            candidate_location=candidate_location, job_location=job_location)
 
         tavily_client = TavilyClient(api_key=tavily_api_key)
-        distance = tavily_client.search(question)
+        distance = tavily_client.search(
+            question, timeout=call_timeout(Config.TAVILY_SEARCH_TIMEOUT_SECONDS, "Tavily search"))
         prompt = PromptTemplate(input_variables=["distance"], template=locatonSearchAnswerTemplate)
         response = self.get_location_score(llm, prompt, distance=distance)
         return response
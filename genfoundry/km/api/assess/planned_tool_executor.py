@@ -0,0 +1,110 @@
+"""
+Planned execution of the assessment tools behind ResumeAssessorAgentRunner.
+
+ResumeAssessorTool and LocationAssessorTool assess independent things, so
+rather than letting the ReAct agent call them one after another with an LLM
+reasoning step before each, the plan is fixed up front: the resume assessment
+always, the location assessment when the criteria mention location. The
+planned tools run concurrently and their outputs are merged in plan order, so
+the response does not depend on which tool finished first.
+
+The agent loop is only needed for a follow-up: when a planned tool fails or
+does not return an assessment, the agent is given the assessments that did
+succeed and asked to complete the rest.
+"""
+import contextvars
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from genfoundry.config import Config
+from genfoundry.km.api.assess.resume_assessor import parse_assessment
+
+logger = logging.getLogger(__name__)
+
+RESUME_TOOL = "resume"
+LOCATION_TOOL = "location"
+
+# Criteria wording that makes the location assessment worth running
+LOCATION_CRITERIA = re.compile(
+    r"\b(location|located|relocat\w*|on-?site|in-?office|hybrid|commut\w*|based in)\b", re.IGNORECASE
+)
+
+
+def plan_tools(job_description, criteria, resume, question):
+    """The [(tool key, tool arguments)] to run for an assessment, in merge order."""
+    plan = [(RESUME_TOOL, {"job_description": job_description, "criteria": criteria,
+                           "resume": resume, "question": question})]
+    if LOCATION_CRITERIA.search(criteria or ""):
+        plan.append((LOCATION_TOOL, {"resume": resume, "criteria": criteria}))
+    return plan
+
+
+def merge_assessments(assessments):
+    """
+    One assessment from several, taken in order: their criteria evaluations
+    in sequence (the first evaluation of a criterion wins) and the first
+    summary.
+    """
+    evaluation = []
+    seen = set()
+    summary = None
+    for assessment in assessments:
+        for item in assessment.get("evaluation") or []:
+            criterion = str(item.get("criteria", "")).strip().lower()
+            if criterion in seen:
+                continue
+            seen.add(criterion)
+            evaluation.append(item)
+        if summary is None and assessment.get("summary"):
+            summary = assessment["summary"]
+    merged = {"evaluation": evaluation}
+    if summary is not None:
+        merged["summary"] = summary
+    return merged
+
+
+def agent_input(job_description, criteria, resume, question, completed=None):
+    """
+    The ReAct agent's input: the question and documents as the user message,
+    plus, for a follow-up, the assessments the planned tools already made.
+    """
+    parts = [question, f'"Job Description": {job_description}', f'"Criteria": {criteria}', f'"Resume": {resume}']
+    if completed:
+        parts.append("These assessments are already done; do not repeat them. Complete the rest and "
+                     f"combine all of them in the final answer: {json.dumps(list(completed))}")
+    return {"messages": [("user", "\n\n".join(parts))]}
+
+
+class PlannedToolExecutor():
+    def __init__(self, tools, max_workers=None) -> None:
+        # {tool key: tool}, the tools plan_tools refers to
+        self.tools = tools
+        self.max_workers = max_workers or Config.AGENT_ASSESS_MAX_CONCURRENCY
+
+    def run(self, plan):
+        """
+        Runs the planned tools concurrently and returns ({tool key: parsed
+        assessment}, {tool key: error message}), both in plan order.
+        """
+        assessments = {}
+        failures = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(plan))),
+                                thread_name_prefix="assess-tool") as pool:
+            # Each tool runs in a copy of the caller's context, so the OpenAI
+            # request priority carries over to the pool threads
+            futures = [
+                (key, pool.submit(contextvars.copy_context().run, self._run_tool, key, arguments))
+                for key, arguments in plan
+            ]
+            for key, future in futures:
+                try:
+                    assessments[key] = future.result()
+                except Exception as e:
+                    logger.warning(f"Planned {key} assessment failed: {e}")
+                    failures[key] = str(e)
+        return assessments, failures
+
+    def _run_tool(self, key, arguments):
+        return parse_assessment(self.tools[key]._run(**arguments))
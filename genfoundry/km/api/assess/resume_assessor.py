@@ -1,10 +1,13 @@
 import logging
 import json
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 from langchain_openai import ChatOpenAI
 from genfoundry.km.utils.doc_parser import DocumentParser
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
+from genfoundry.km.preprocess.prompt_budget import PromptBudget, invoke_with_usage
 
+# The resume comes last so that everything before it is the same for every
+# candidate assessed against a job, which lets OpenAI reuse its cached prefix.
 answerTemplate = '''
 You are a talent acquisition expert. You are analyzing resumes in response to a job posting. Your job is to grade resumes against the job description and provide criteria scores, a summary of the resume, a gap analysis, and suggested follow-up questions.
 
@@ -88,9 +91,9 @@ The response must be a pure JSON object in the format below:
 Remember, DO NOT wrap the JSON response string with any prefix. Just return the raw JSON.
 
 "Job Description": {job_description}
-"Resume": {resume}
 "Criteria": {criteria}
 "Question": {question}
+"Resume": {resume}
 '''
 
 
@@ -100,13 +103,21 @@ class ResumeAssessor:
         self.openai_api_key = openai_api_key
         self.langchain_api_key = langchain_api_key
         self.llm_model = llm_model
-        self.llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key)
+        self.llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key, **langchain_client_kwargs())
+        self.prompt_budget = PromptBudget(llm_model)
  
-    def assess(self, job_description, criteria, resume, question):
+    def fixed_tokens(self, job_description, criteria, question):
+        """Prompt tokens other than the resume's, for assessing many resumes against one job."""
+        return self.prompt_budget.fixed_tokens(answerTemplate, job_description=job_description,
+                                               criteria=criteria, question=question)
+
+    def assess(self, job_description, criteria, resume, question, fixed_tokens=None):
         try:
             logging.debug("Assessing resume...")
             prompt = PromptTemplate(input_variables=["job_description", "resume", "criteria", "question"], 
             template=answerTemplate)
+            resume = self.prompt_budget.fit_resume("assess", resume, answerTemplate, fixed_tokens=fixed_tokens,
+                                                   job_description=job_description, criteria=criteria, question=question)
             response = self.get_llm_response(prompt, job_description, resume, criteria, question)
             return response
         except Exception as ex:
@@ -129,10 +140,31 @@ class ResumeAssessor:
             if not isinstance(prompt, PromptTemplate):
                 raise ValueError("Prompt must be an instance of PromptTemplate")
             
-            chain = prompt| self.llm | StrOutputParser()
-            response = chain.invoke(inputs) 
+            response = invoke_with_usage(prompt, self.llm, inputs, "assess")
             return response
         except Exception as e:
             logging.error(f"Error in get_llm_response: {str(e)}")
             raise
 
+
+
+def parse_assessment(response):
+    """The assessment JSON in an assess() response. Raises ValueError if there is none."""
+    if not isinstance(response, str):
+        raise ValueError(f"Assessment failed: {response}")
+    if response.startswith("json"):
+        response = response[4:].strip()
+    if not response.strip():
+        raise ValueError("Empty response from assessment tool")
+    return json.loads(response)
+
+
+def average_score(assessment):
+    """Mean of the criteria scores in an assessment, or None if it has none."""
+    scores = []
+    for item in assessment.get("evaluation") or []:
+        try:
+            scores.append(float(item.get("score")))
+        except (TypeError, ValueError):
+            continue
+    return round(sum(scores) / len(scores), 2) if scores else None
@@ -6,6 +6,7 @@ from langchain_openai import ChatOpenAI
 from genfoundry.km.utils.doc_parser import DocumentParser
 from pydantic import Field
 from typing import Literal
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
 
 
 answerTemplate = '''
@@ -51,6 +52,7 @@ class ResumeAssessorTool(BaseTool):
     )
     
     def __init__(self):
+        super().__init__()
         logging.debug("Initializing ResumeAssessor...")
 
     def _run(self, job_description, criteria, resume, question):    
@@ -72,7 +74,7 @@ class ResumeAssessorTool(BaseTool):
         try:
             openai_api_key = os.getenv("OPENAI_API_KEY")
             llm_model = os.getenv("LLM_MODEL")
-            llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key)
+            llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key, **langchain_client_kwargs())
 
             inputs = {
                 "job_description": job_description,
@@ -3,6 +3,7 @@ from langchain.prompts import PromptTemplate
 from langchain.output_parsers import StrOutputParser
 from langchain_openai import ChatOpenAI
 import logging, os
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
 
 answerTemplate = '''
         You are a talent acquisition expert. You are analyzing resumes in response to a job posting. Your job is to grade resumes against the job description and provide criteria scores, and a summary of the resume. The criteria scores should be between 0 and 10. For example, 9 or above means the candidate is very good in the criteria; between 7.5 and 9.0 means a good match against the criteria; between 6.0 and 7.5 means a fair match, etc. If the candidate does not match the criteria, score it as 0.
@@ -56,7 +57,7 @@ class ResumeCredentialsAssessorTool(BaseTool):
         self.openai_api_key = os.getenv["OPENAI_API_KEY"]
         self.langchain_api_key = os.getenv["LANGCHAIN_API_KEY"]
         self.llm_model = os.getenv["LLM_MODEL"]
-        self.llm = ChatOpenAI(model_name=self.llm_model, temperature=0, api_key=self.openai_api_key)
+        self.llm = ChatOpenAI(model_name=self.llm_model, temperature=0, api_key=self.openai_api_key, **langchain_client_kwargs())
 
     def _run(self, job_description: str, resume: str, criterion: str, question: str) -> str:
         try:
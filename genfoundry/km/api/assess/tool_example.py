@@ -11,6 +11,7 @@ from llama_index.core import Settings
 from llama_index.llms.openai import OpenAI
 
 import os
+from genfoundry.km.utils.openai_rate_limiter import llama_index_client_kwargs
 
 ROACalculatorToolDesc = (
     """
@@ -65,11 +66,11 @@ class ROACalculatorTool(BaseTool):
     """
     def __init__(self):
         from llama_index.embeddings.openai import OpenAIEmbedding
-        embed_model = OpenAIEmbedding(model="text-embedding-ada-002")
+        embed_model = OpenAIEmbedding(model="text-embedding-ada-002", **llama_index_client_kwargs())
 
         llm_model = os.getenv("llm_model")
         logging.debug(f"====> LLM Model: {llm_model}")
-        Settings.llm = OpenAI(model=llm_model, temperature=0.0)
+        Settings.llm = OpenAI(model=llm_model, temperature=0.0, **llama_index_client_kwargs())
         Settings.embed_model = embed_model
 
     def _run(self, file_id: str, namespace: str):
@@ -6,6 +6,7 @@ from typing import List, Dict, Optional
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from genfoundry.km.api.business_development.insight import Insight, InsightList
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
 
 # Initialize logging
 logger = logging.getLogger(__name__)
@@ -80,7 +81,7 @@ Content:
 
 class InsightEnricher:
     def __init__(self, llm_model: Optional[ChatOpenAI] = None):
-        self.llm = ChatOpenAI(model=llm_model, temperature=0.0)
+        self.llm = ChatOpenAI(model=llm_model, temperature=0.0, **langchain_client_kwargs())
         self.prompt = prompt_template
         self.enrichment_chain = self.prompt | self.llm
 
@@ -1,7 +1,7 @@
 from langchain_community.tools.tavily_search.tool import TavilySearchResults
 #from langchain.output_parsers import PydanticOutputParser
 from langchain.prompts import ChatPromptTemplate
-from langchain_community.chat_models import ChatOpenAI
+from langchain_openai import ChatOpenAI
 #from tavily import TavilyClient
 from genfoundry.km.api.business_development.insight_enricher import InsightEnricher
 from genfoundry.km.api.business_development.insight import Insight, InsightList
@@ -15,13 +15,17 @@ from urllib.parse import urlparse
 import asyncio
 from tavily import AsyncTavilyClient
 import os
+from genfoundry.config import Config
+from genfoundry.km.utils.event_loop import run_coroutine
+from genfoundry.km.utils.request_deadline import call_timeout
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
 
 logger = logging.getLogger(__name__)
 
         
 class TavilySearcher:
     def __init__(self, llm_model: Optional[ChatOpenAI] = None):
-        self.llm = ChatOpenAI(model=llm_model, temperature=0.3)
+        self.llm = ChatOpenAI(model=llm_model, temperature=0.3, **langchain_client_kwargs())
 
         self.company_prompt = ChatPromptTemplate.from_messages([
             ("system", "You are an expert business analyst. Review search results about a company and provide business development insights."),
@@ -266,7 +270,8 @@ class TavilySearcher:
         # Run async batch search
         try:
             logger.info(f"TavilySearcher: Running batch search for: {queries}")
-            raw_results = asyncio.run(self.batch_search(queries, time_range=since))
+            raw_results = run_coroutine(self.batch_search(queries, time_range=since),
+                                        timeout=call_timeout(None, "Tavily search"))
             logger.info(f"TavilySearcher: Batch search results: {raw_results}")
         except Exception as e:
             logger.error(f"Unrecoverable error during batch search: {e}")
@@ -374,7 +379,8 @@ class TavilySearcher:
 
         try:
             logger.info(f"TavilySearcher: Running batch search for: {queries}")
-            raw_results = asyncio.run(self.batch_search(queries, time_range=since))
+            raw_results = run_coroutine(self.batch_search(queries, time_range=since),
+                                        timeout=call_timeout(None, "Tavily search"))
             logger.info(f"TavilySearcher: Batch search results: {raw_results}")
         except Exception as e:
             logger.error(f"Unrecoverable error during batch search: {e}")
@@ -470,7 +476,8 @@ class TavilySearcher:
 
         try:
             logger.info("TavilySearcher: Running 'Feeling Lucky' batch search...")
-            raw_results = asyncio.run(self.batch_search(queries, time_range=since))
+            raw_results = run_coroutine(self.batch_search(queries, time_range=since),
+                                        timeout=call_timeout(None, "Tavily search"))
             logger.info(f"TavilySearcher: Received 'Feeling Lucky' search results.")
         except Exception as e:
             logger.error(f"Unrecoverable error during 'Feeling Lucky' search: {e}")
@@ -523,6 +530,7 @@ class TavilySearcher:
                         # topic="news",
                         max_results=5,
                         time_range=time_range,
+                        timeout=call_timeout(Config.TAVILY_SEARCH_TIMEOUT_SECONDS, "Tavily search"),
                     ) for q in queries
                 ),
                 return_exceptions=True
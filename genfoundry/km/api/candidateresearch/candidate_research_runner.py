@@ -1,4 +1,4 @@
-from flask import request, jsonify
+from flask import request, jsonify, g
 from flask_restful import Resource, current_app
 import logging
 from langchain_openai import ChatOpenAI
@@ -9,6 +9,8 @@ from genfoundry.km.preprocess.pymupdf_doc_parser import PyMuPDFDocumentParser
 import os
 import json
 import uuid
+from genfoundry.km.persist.stored_resume_loader import get_stored_resume_loader
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
 
 class CandidateResearchRunner(Resource):
     def __init__(self):
@@ -35,15 +37,24 @@ class CandidateResearchRunner(Resource):
         self.llm = ChatOpenAI(
             model_name=current_app.config['LLM_MODEL'], 
             temperature=0, 
-            api_key=os.getenv("OPENAI_API_KEY"))
+            api_key=os.getenv("OPENAI_API_KEY"),
+            **langchain_client_kwargs())
  
     def post(self):
-        if 'resume' not in request.files:
-            return jsonify({"error": "Resume file is required"}), 400
-
-        # Get uploaded file
-        resume_file = request.files['resume']
-        resume_string = self.doc_parser.parse_document(resume_file)
+        resume_id = request.form.get('resume_id', '').strip()
+        if resume_id:
+            tenant_id = getattr(g, "tenant_id", None)
+            if not tenant_id:
+                return jsonify({"error": "Tenant ID is required"}), 400
+            resume_string = get_stored_resume_loader().get(tenant_id, resume_id)
+            if resume_string is None:
+                return jsonify({"error": f"Resume {resume_id} not found"}), 404
+        elif 'resume' not in request.files:
+            return jsonify({"error": "Resume file or resume_id is required"}), 400
+        else:
+            # Get uploaded file
+            resume_file = request.files['resume']
+            resume_string = self.doc_parser.parse_document(resume_file)
 
         try:
             # Perform resume research
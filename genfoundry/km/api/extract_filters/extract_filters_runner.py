@@ -7,10 +7,22 @@ import os
 from genfoundry.km.query.helper.filter_extractor import FilterExtractor
 from genfoundry.km.query.processors.processor_pipeline import FilterProcessorPipeline
 from genfoundry.km.query.processors.processor_registry import build_processor_pipeline
+from genfoundry.km.utils.request_deadline import DeadlineExceeded, deadline_stage
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 
+
+def server_timing(timings, errors):
+    """Server-Timing header value with one metric per filter processor, e.g. 'GeoExpansionProcessor;dur=812.4'."""
+    metrics = []
+    for name, duration in timings.items():
+        metric = f"{name};dur={duration}"
+        if name in errors:
+            metric += ';desc="' + ("timeout" if errors[name] == "timeout" else "error") + '"'
+        metrics.append(metric)
+    return ", ".join(metrics)
+
 class FilterExtractorRunner(Resource):
 
     def __init__(self, llm=None) -> None:
@@ -24,7 +36,7 @@ class FilterExtractorRunner(Resource):
         #        api_key=current_app.config['OPENAI_API_KEY']
         #    )
         #self.filter_extractor = FilterExtractor(llm=llm)
-        PROCESSORS = ["BaseFilterProcessor", "GeoExpansionProcessor"]
+        PROCESSORS = ["RuleBasedFilterProcessor", "BaseFilterProcessor", "GeoExpansionProcessor"]
         self.filter_processor_pipeline = build_processor_pipeline(PROCESSORS)
  
     @jwt_required()  # Ensure the user is authenticated via JWT token
@@ -42,18 +54,25 @@ class FilterExtractorRunner(Resource):
         try:
             logging.debug(f"[User {user_id}] Extracting filters for question: {question}")
             #extracted_filters = self.filter_extractor.extract(question)
-            extracted_filters = self.filter_processor_pipeline.run(question)
+            with deadline_stage("filter extraction"):
+                extracted_filters = self.filter_processor_pipeline.run(question)
             extracted_filters.pop("question", None)  # remove question if present
+            logging.info(f"[FilterExtractorRunner] Filters from {extracted_filters.get('filter_source')} "
+                         f"(rule confidence {extracted_filters.get('filter_confidence')})")
+            headers = {"Server-Timing": server_timing(extracted_filters.get("processor_timings", {}),
+                                                      extracted_filters.get("processor_errors", {}))}
             final_filters = extracted_filters.get("filters", {})
             logging.debug(f"[FilterExtractorRunner] Final extracted filters: {final_filters}")
 
             if not final_filters:
                 logging.info(f"[User {user_id}] No filters extracted from question.")
-                return {}, 204  # No Content
+                return {}, 204, headers  # No Content
 
             logging.debug(f"Type of extracted_filters: {type(final_filters)}")
-            return final_filters, 200
+            return final_filters, 200, headers
 
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logging.exception(f"[User {user_id}] Unexpected error during filter extraction.")
             return {"error": "Internal server error"}, 500
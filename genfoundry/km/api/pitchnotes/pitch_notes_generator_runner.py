@@ -11,6 +11,9 @@ import re
 import tempfile
 import uuid
 import unicodedata
+from genfoundry.km.persist.stored_resume_loader import get_stored_resume_loader
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
+from genfoundry.km.utils.request_deadline import DeadlineExceeded, deadline_stage
 
 class PitchNotesGeneratorRunner(Resource):
     def __init__(self):
@@ -21,7 +24,8 @@ class PitchNotesGeneratorRunner(Resource):
         self.llm = ChatOpenAI(
             model_name=current_app.config['LLM_MODEL'], 
             temperature=0, 
-            api_key=os.getenv("OPENAI_API_KEY"))
+            api_key=os.getenv("OPENAI_API_KEY"),
+            **langchain_client_kwargs())
                 
         system_message = "You are a helpful recruitment assistant. Please assess the resume and recruiter notes against the  criteria. You may use the tools provided to assist you. The final answer should combine the results of individual tools that are called."
         
@@ -30,7 +34,8 @@ class PitchNotesGeneratorRunner(Resource):
         self.llm = ChatOpenAI(
             model_name=current_app.config['LLM_MODEL'], 
             temperature=0, 
-            api_key=os.getenv("OPENAI_API_KEY"))
+            api_key=os.getenv("OPENAI_API_KEY"),
+            **langchain_client_kwargs())
 
 
     @jwt_required()  # Ensure the user is authenticated via JWT token
@@ -48,8 +53,9 @@ class PitchNotesGeneratorRunner(Resource):
        # if 'criteria' not in request.files or 'resume' not in request.files or 'recruiterNotes' not in request.files:
         #     return jsonify({"error": "Resume, recruiter's note and criteria files are required"}), 400
 
-        if 'resume' not in request.files or not request.form.get('criteriaText'):
-            return {"error": "Resume (file) and criteria (text) are required"}, 400
+        resume_id = request.form.get('resume_id', '').strip()
+        if (not resume_id and 'resume' not in request.files) or not request.form.get('criteriaText'):
+            return {"error": "Resume (file or resume_id) and criteria (text) are required"}, 400
 
         criteria = request.form.get('criteriaText')
 
@@ -59,27 +65,33 @@ class PitchNotesGeneratorRunner(Resource):
         else:
             recruiter_notes = self.clean_pasted_text(recruiter_notes)
 
-        # Get uploaded files
-        #recruiter_note_file = request.files['recruiterNotes']
-        resume_file = request.files['resume']
-        resume_filename = resume_file.filename
-
         criteria = request.form.get('criteriaText')
         criteria = self.clean_pasted_text(criteria)
-        try:
-            tmp_dir = tempfile.mkdtemp()
-            unique_filename = f"{tenant_id}_{uuid.uuid4().hex}_{resume_filename}"
-            tmp_path = os.path.join(tmp_dir, unique_filename)
-            resume_file.save(tmp_path) 
-            resume = self.parser.parse_document(tmp_path)
-        except Exception as e:
-            logging.error(f"Document parsing failed: {e}")
-            return jsonify({"error": "Failed to parse uploaded files"}), 500
+
+        if resume_id:
+            resume = get_stored_resume_loader().get(tenant_id, resume_id)
+            if resume is None:
+                return jsonify({"error": f"Resume {resume_id} not found"}), 404
+        else:
+            # Get uploaded files
+            #recruiter_note_file = request.files['recruiterNotes']
+            resume_file = request.files['resume']
+            resume_filename = resume_file.filename
+            try:
+                tmp_dir = tempfile.mkdtemp()
+                unique_filename = f"{tenant_id}_{uuid.uuid4().hex}_{resume_filename}"
+                tmp_path = os.path.join(tmp_dir, unique_filename)
+                resume_file.save(tmp_path) 
+                resume = self.parser.parse_document(tmp_path)
+            except Exception as e:
+                logging.error(f"Document parsing failed: {e}")
+                return jsonify({"error": "Failed to parse uploaded files"}), 500
                 
         try:
             question = "Please assess the candidate's information provided in the resume and recruiter's note against the criteria. You may use the tools provided to assist you. The final answer should combine the results of the tools."
 
-            pitch_note_response = self.pitch_note_generator.assess(resume, recruiter_notes, criteria, question)
+            with deadline_stage("pitch notes generation"):
+                pitch_note_response = self.pitch_note_generator.assess(resume, recruiter_notes, criteria, question)
             if pitch_note_response.startswith("json"):
                 pitch_note_response = pitch_note_response[4:].strip()
 
@@ -92,6 +104,8 @@ class PitchNotesGeneratorRunner(Resource):
 
             # Return the parsed JSON as the HTTP response
             return jsonify({"AIResponse": pitch_note_response})
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logging.error(f"Assessment failed: {e}")
             return "Server Error", 500
@@ -1,7 +1,8 @@
 import logging, os
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 from langchain_openai import ChatOpenAI
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
+from genfoundry.km.preprocess.prompt_budget import PromptBudget, invoke_with_usage
 
 prompt_template = '''
         You are a talent acquisition expert. You are analyzing candidates' credentials based on their resumes in response to a job posting. Your job is to grade resumes against the provided criteria scores and generate a structured summary.
@@ -78,7 +79,8 @@ class PitchNotesGenerator():
         openai_api_key = os.getenv("OPENAI_API_KEY")
         langchain_api_key = os.getenv("LANGCHAIN_API_KEY")
         llm_model = os.getenv("LLM_MODEL")
-        self.llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key)
+        self.llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key, **langchain_client_kwargs())
+        self.prompt_budget = PromptBudget(llm_model)
 
 
     def assess(self, resume, notes, criteria, question):    
@@ -86,6 +88,8 @@ class PitchNotesGenerator():
             logging.debug("Assessing resume...")
             prompt = PromptTemplate(input_variables=["resume", "notes", "criteria", "question"], 
             template=prompt_template)
+            resume = self.prompt_budget.fit_resume("pitch_notes", resume, prompt_template,
+                                                   notes=notes, criteria=criteria, question=question)
             response = self.get_llm_response(prompt, resume, notes, criteria, question)
             return response
         except Exception as ex:
@@ -96,7 +100,7 @@ class PitchNotesGenerator():
         try:
             openai_api_key = os.getenv("OPENAI_API_KEY")
             llm_model = os.getenv("LLM_MODEL")
-            llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key)
+            llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key, **langchain_client_kwargs())
 
             inputs = {
                 "resume": resume,
@@ -111,8 +115,7 @@ class PitchNotesGenerator():
             if not isinstance(prompt, PromptTemplate):
                 raise ValueError("Prompt must be an instance of PromptTemplate")
             
-            chain = prompt| llm | StrOutputParser()
-            response = chain.invoke(inputs) 
+            response = invoke_with_usage(prompt, llm, inputs, "pitch_notes")
             return response
         except Exception as e:
             logging.error(f"Error in get_llm_response: {str(e)}")
@@ -8,6 +8,7 @@ from langchain_core.output_parsers import StrOutputParser
 from genfoundry import cache
 import os
 import logging
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
 
 
 logger = logging.getLogger(__name__)
@@ -31,7 +32,7 @@ class RecruitingInsight(Resource):
         openai_api_key = current_app.config.get("OPENAI_API_KEY")
         #self.langchain_api_key = langchain_api_key
         llm_model = current_app.config.get("LLM_MODEL")
-        self.llm = ChatOpenAI(model_name=llm_model, temperature=0.3, api_key=openai_api_key)
+        self.llm = ChatOpenAI(model_name=llm_model, temperature=0.3, api_key=openai_api_key, **langchain_client_kwargs())
 
     @jwt_required()
     def get(self):
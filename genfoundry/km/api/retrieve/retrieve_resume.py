@@ -1,12 +1,16 @@
 # Description: This file contains the implementation of the ResumeRetrieverRunner class which is responsible for retrieving the resume from the database. The class inherits from the Resource class of the Flask-RESTful library and implements the get method to handle HTTP GET requests. The get method retrieves the resume ID from the query parameters, checks if the resume ID is provided, and then calls the rag_query function to retrieve the resume from the database. If successful, the method returns the retrieved resume as a JSON response. If an error occurs during the retrieval process, the method returns an error message with the corresponding HTTP status code.
-from flask import request, jsonify, g
+from flask import request, jsonify, g, make_response
 from flask_restful import Resource, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 import logging
 import os
 import re
 
+from genfoundry.config import Config
 from genfoundry.km.persist.mongo_proxy import MongoProxy
+from genfoundry.km.persist.resume_content_codec import (
+    HASH_PROJECTION, NO_DETAILS, content_hash, resume_display, resume_etag
+)
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -47,31 +51,97 @@ class ResumeRetrieverRunner(Resource):
 
         # retrieve resume from database
         try:
-            answer = self.mongo_proxy.get_resume(tenant_id, resume_id)
-            answer = self.clean_markdown_content(answer)
+            etag, resumes = load_resumes(self.mongo_proxy, tenant_id, [resume_id])
+            if resumes is None:
+                return not_modified(etag)
+            # Stored frontend-ready, so there is nothing to clean up here
+            answer = resumes.get(resume_id) or NO_DETAILS
             logging.debug("Answer: " + answer)
-            return jsonify({"AIResponse": answer})
+            return cacheable(jsonify({"AIResponse": answer}), etag)
         except Exception as e:
             logging.error(f"ResumeRetrieverRunner.get(): Error retrieving resume: {str(e)}")
             return jsonify({"error": str(e)}), 500
-        
 
-    def clean_markdown_content(self, md_content: str) -> str:
-        """Sanitize and clean markdown content before sending to frontend."""
-        if not md_content:
-            return "No details available."
 
-        # Remove surrounding quotes if present
-        md_content = md_content.strip().strip('"')
+class BulkResumeRetrieverRunner(Resource):
+    """
+    GET /resumedetails/bulk?ID=Doc:1&ID=Doc:2 (or ID=Doc:1,Doc:2): the details
+    of every candidate on a search result page in one request and one query.
+    """
+
+    def __init__(self) -> None:
+      logging.debug("Inside BulkResumeRetrieverRunner instance init")
+      self.mongo_proxy = MongoProxy()
+
+    @jwt_required()  # Ensure the user is authenticated via JWT token
+    def get(self):
+        user_id = get_jwt_identity()
+        if not user_id:
+            return jsonify({"error": "Unauthorized"}), 401
 
-        # Convert escaped newlines into actual newlines
-        md_content = md_content.replace('\\n', '\n')
+        tenant_id = g.tenant_id
+        if not tenant_id:
+            return jsonify({"error": "Tenant ID is required"}), 400
 
-        # Convert escaped double quotes
-        md_content = md_content.replace('\\"', '"')
+        resume_ids = list(dict.fromkeys(
+            resume_id.strip() for value in request.args.getlist('ID') for resume_id in value.split(',')
+            if resume_id.strip()
+        ))
+        if not resume_ids:
+            return jsonify({"error": "ID parameter is required"}), 400
+        if len(resume_ids) > Config.RESUME_DETAILS_BULK_MAX_IDS:
+            return jsonify({"error": f"At most {Config.RESUME_DETAILS_BULK_MAX_IDS} IDs per request"}), 400
 
-        # Handle Unicode escape sequences (like emojis)
-        md_content = md_content.encode().decode('unicode_escape')
+        try:
+            etag, resumes = load_resumes(self.mongo_proxy, tenant_id, resume_ids)
+            if resumes is None:
+                return not_modified(etag)
+            return cacheable(jsonify({
+                "AIResponse": resumes,
+                "missing": [resume_id for resume_id in resume_ids if resume_id not in resumes],
+            }), etag)
+        except Exception as e:
+            logging.error(f"BulkResumeRetrieverRunner.get(): Error retrieving resumes: {str(e)}")
+            return jsonify({"error": str(e)}), 500
 
-        return md_content
 
+def _combined_etag(resume_ids, documents):
+    if len(resume_ids) == 1 and resume_ids[0] in documents:
+        return resume_etag(documents[resume_ids[0]])
+    parts = [f"{resume_id}:{resume_etag(documents[resume_id]) if resume_id in documents else '-'}"
+             for resume_id in resume_ids]
+    return content_hash("|".join(parts))
+
+
+def load_resumes(mongo_proxy, tenant_id, resume_ids):
+    """
+    Returns (etag, {resume_id: display markdown}), or (etag, None) when the
+    request's If-None-Match already has that ETag. A conditional request
+    first fetches only the stored content hashes, so a 304 costs no content
+    transfer or decompression.
+    """
+    if request.if_none_match:
+        stamps = mongo_proxy.get_resume_documents(tenant_id, resume_ids, HASH_PROJECTION)
+        # Legacy documents have no stored hash; theirs needs the content
+        if all(doc.get("content_hash") for doc in stamps.values()):
+            etag = _combined_etag(resume_ids, stamps)
+            if request.if_none_match.contains(etag):
+                return etag, None
+
+    documents = mongo_proxy.get_resume_documents(tenant_id, resume_ids)
+    etag = _combined_etag(resume_ids, documents)
+    if request.if_none_match.contains(etag):
+        return etag, None
+    return etag, {resume_id: resume_display(doc) for resume_id, doc in documents.items()}
+
+
+def cacheable(response, etag):
+    response.set_etag(etag)
+    # Resumes are tenant data behind a JWT: browsers may keep them, shared caches may not
+    response.headers["Cache-Control"] = f"private, max-age={Config.RESUME_DETAILS_CACHE_MAX_AGE}"
+    response.headers["Vary"] = "Authorization"
+    return response
+
+
+def not_modified(etag):
+    return cacheable(make_response("", 304), etag)
@@ -8,6 +8,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 import logging
 import os
 from genfoundry.km.query.search import ResumeSearcher
+from genfoundry.km.utils.request_deadline import deadline_stage
 #from genfoundry.km.query.fusion_search import FusionRetrieverSearcher
 
 
@@ -53,7 +54,8 @@ class ResumeQuery(Resource):
             logging.debug("Running search with question.")
             logging.debug(f"Question: {question}")
             logging.debug(f"Namespace: {os.getenv('PINECONE_NAMESPACE')}")
-            ai_response = searcher.search(tenant_id, question)
+            with deadline_stage("search"):
+                ai_response = searcher.search(tenant_id, question)
             #logging.debug(f"AI Response: {ai_response}")
             # Extract only the text attribute
             """
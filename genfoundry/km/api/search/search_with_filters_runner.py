@@ -6,6 +6,7 @@ import os
 import json
 
 from genfoundry.km.query.tiered_resume_search import TieredResumeSearcher
+from genfoundry.km.utils.request_deadline import DeadlineExceeded, deadline_stage
 
 class ResumeSearchWithFilterRunner(Resource):
 
@@ -63,7 +64,8 @@ class ResumeSearchWithFilterRunner(Resource):
 
             searcher = TieredResumeSearcher(self.similarity_cutoff)
             logging.debug("Initialized ResumeFilterSemanticSearcher.")
-            results = searcher.search(tenant_id=tenant_id, question=question, filter_dict=filters)
+            with deadline_stage("search"):
+                results = searcher.search(tenant_id=tenant_id, question=question, filter_dict=filters)
             json.dumps({"results": results})
             logging.debug("Search Result:  + %s", json.dumps(results, indent=2))
 
@@ -71,6 +73,8 @@ class ResumeSearchWithFilterRunner(Resource):
             response.headers["Content-Type"] = "application/json"
             return response
 
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logging.exception("Unexpected error occurred during resume search.")
             return jsonify({"error": str(e)}), 500
\ No newline at end of file
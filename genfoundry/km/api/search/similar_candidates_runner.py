@@ -0,0 +1,51 @@
+from flask import request, jsonify, g
+from flask_restful import Resource, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+import logging
+
+from genfoundry.config import Config
+from genfoundry.km.query.similar_candidates import SimilarCandidateFinder
+from genfoundry.km.utils.request_deadline import DeadlineExceeded, deadline_stage
+
+
+class SimilarCandidatesRunner(Resource):
+    """
+    GET /similar-candidates?ID=Doc:1[&top_k=20]: the candidates most like the
+    given one, in the shape of /smart-search results. Built from the stored
+    vectors and metadata only, so it makes no OpenAI calls.
+    """
+
+    def __init__(self) -> None:
+        logging.debug("Inside SimilarCandidatesRunner instance init")
+        self.finder = SimilarCandidateFinder(resume_details_popup_url=current_app.config['RESUME_DETAILS_POPUP_URL'])
+
+    @jwt_required()  # Ensure the user is authenticated via JWT token
+    def get(self):
+        user_id = get_jwt_identity()
+        if not user_id:
+            return jsonify({"error": "Unauthorized"}), 401
+
+        tenant_id = g.tenant_id
+        if not tenant_id:
+            return jsonify({"error": "Tenant ID is required"}), 400
+
+        resume_id = (request.args.get('ID') or '').strip()
+        if not resume_id:
+            return jsonify({"error": "ID parameter is required"}), 400
+        try:
+            top_k = int(request.args.get('top_k') or Config.SIMILAR_CANDIDATES_TOP_K)
+        except ValueError:
+            return jsonify({"error": "top_k must be a number"}), 400
+        top_k = max(1, min(top_k, Config.SIMILAR_CANDIDATES_MAX_TOP_K))
+
+        try:
+            with deadline_stage("similar candidates search"):
+                matches = self.finder.find(tenant_id, resume_id, top_k)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logging.error(f"SimilarCandidatesRunner.get(): Error finding similar candidates: {str(e)}")
+            return jsonify({"error": str(e)}), 500
+        if matches is None:
+            return jsonify({"error": f"Resume {resume_id} not found"}), 404
+        return jsonify({"results": {"resume_id": resume_id, "matches": matches}})
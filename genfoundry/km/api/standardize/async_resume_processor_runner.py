@@ -3,13 +3,14 @@ from flask_restful import Resource, current_app
 from flask_jwt_extended import jwt_required
 import logging
 import os
-import tempfile
 import uuid
 from celery.result import AsyncResult
 from genfoundry.config import get_api_key_config, get_llm_config
 
 
-from genfoundry.km.api.standardize.celery_resume_processor_task import process_resume  # Import the Celery task
+from genfoundry.km.api.standardize.celery_resume_processor_task import process_resume, dispatch_bulk_resumes  # Import the Celery tasks
+from genfoundry.km.api.standardize.bulk_ingest_scheduler import get_bulk_ingest_scheduler, SOURCE_BULK, SOURCE_INTERACTIVE
+from genfoundry.km.persist.blob_store import get_blob_store
 
 class AsyncResumeStandardizerRunner(Resource):
     def __init__(self):
@@ -36,19 +37,28 @@ class AsyncResumeStandardizerRunner(Resource):
             return jsonify({"error": "Resume file is required"}), 400
 
         resume_file = request.files['resume']
-        resume_filename = resume_file.filename
 
         try:
-            # Save to temporary file
-            tmp_dir = tempfile.mkdtemp()
-            unique_filename = f"{tenant_id}_{uuid.uuid4().hex}_{resume_filename}"
-            tmp_path = os.path.join(tmp_dir, unique_filename)
-
-            resume_file.save(tmp_path)
+            # Store the upload under its content hash so any worker node can read it.
+            # The task ID doubles as the upload ID that leases the blob and keys
+            # the task's checkpoints, so duplicate uploads never share either.
+            upload_id = str(uuid.uuid4())
+            blob_key, _ = get_blob_store().put_upload(tenant_id, resume_file, upload_id)
+
+            # Bulk loads wait in a per-tenant list and are fed to the bulk queue
+            # fairly across tenants; everything else goes to the interactive queue
+            source = (request.form.get("source") or request.headers.get("X-Request-Source") or SOURCE_INTERACTIVE).lower()
+            if source == SOURCE_BULK:
+                task_id = get_bulk_ingest_scheduler().enqueue(tenant_id, [blob_key, tenant_id, upload_id], task_id=upload_id)
+                dispatch_bulk_resumes.delay()
+                logging.info(f"Queued bulk resume processing task. Task ID: {task_id}")
+                return {'message': 'Resume queued for bulk processing.', 'task_id': task_id}, 200
 
             # Submit async Celery task
             task = process_resume.apply_async(
-                args=[tmp_path, tenant_id]
+                args=[blob_key, tenant_id, upload_id],
+                task_id=upload_id,
+                queue=current_app.config['CELERY_INTERACTIVE_QUEUE']
             )
 
             logging.info(f"Submitted resume processing task. Task ID: {task.id}")
@@ -0,0 +1,147 @@
+import json
+import logging
+import uuid
+
+from genfoundry.config import Config
+from genfoundry.km.persist.redis_proxy import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+SOURCE_INTERACTIVE = "interactive"
+SOURCE_BULK = "bulk"
+
+
+class BulkIngestScheduler():
+    """
+    Holds bulk resume uploads in per-tenant Redis lists and feeds them into the
+    Celery bulk queue with weighted round-robin across tenants.
+
+    Only enough work to keep the bulk queue at BULK_QUEUE_TARGET_DEPTH is
+    released at a time, so one tenant loading thousands of resumes cannot push
+    every other tenant's bulk work to the back of a single FIFO queue.
+    Dispatch runs on every enqueue, after every bulk task and on a Celery beat
+    schedule (Config.BULK_DISPATCH_INTERVAL_SECONDS) as a backstop.
+    """
+
+    PENDING_PREFIX = "bulk_ingest:pending:"
+    TENANTS_KEY = "bulk_ingest:tenants"
+    CURSOR_KEY = "bulk_ingest:cursor"
+    LOCK_KEY = "bulk_ingest:dispatch_lock"
+    REQUESTED_KEY = "bulk_ingest:dispatch_requested"
+    LOCK_TIMEOUT_SECONDS = 30
+
+    def __init__(self, redis_client, bulk_queue=None, target_depth=None, tenant_weights=None) -> None:
+        self.redis_client = redis_client
+        self.bulk_queue = bulk_queue or Config.CELERY_BULK_QUEUE
+        self.target_depth = target_depth if target_depth is not None else Config.BULK_QUEUE_TARGET_DEPTH
+        self.tenant_weights = tenant_weights if tenant_weights is not None else Config.BULK_TENANT_WEIGHTS
+
+    def enqueue(self, tenant_id, task_args, task_id=None):
+        """
+        Adds a task to the tenant's pending list and returns the Celery task ID
+        it will be submitted under, so clients can poll it right away.
+        """
+        task_id = task_id or str(uuid.uuid4())
+        entry = json.dumps({"task_id": task_id, "args": task_args})
+        pipe = self.redis_client.pipeline()
+        pipe.rpush(self._pending_key(tenant_id), entry)
+        pipe.sadd(self.TENANTS_KEY, tenant_id)
+        pipe.execute()
+        logger.debug(f"Queued bulk task {task_id} for tenant {tenant_id}")
+        return task_id
+
+    def dispatch(self, submit):
+        """
+        Moves pending tasks into the bulk queue until it reaches the target depth.
+        submit(task_id, args) must send the task to the bulk queue. Returns the
+        number of tasks dispatched.
+
+        A dispatch that finds another one running leaves a request for it and
+        returns; the running one checks for requests after releasing the lock
+        and dispatches again, so a slot freed meanwhile is never left unused.
+        """
+        dispatched = 0
+        while True:
+            self.redis_client.set(self.REQUESTED_KEY, 1, ex=self.LOCK_TIMEOUT_SECONDS)
+            lock_token = str(uuid.uuid4())
+            if not self.redis_client.set(self.LOCK_KEY, lock_token, nx=True, ex=self.LOCK_TIMEOUT_SECONDS):
+                logger.debug("Bulk dispatch already running elsewhere, leaving it a request")
+                return dispatched
+            try:
+                self.redis_client.delete(self.REQUESTED_KEY)
+                dispatched += self._dispatch_locked(submit)
+            finally:
+                if self._decode(self.redis_client.get(self.LOCK_KEY)) == lock_token:
+                    self.redis_client.delete(self.LOCK_KEY)
+            if self.redis_client.get(self.REQUESTED_KEY) is None:
+                return dispatched
+
+    def _dispatch_locked(self, submit):
+        budget = self.target_depth - self.queue_depth(self.bulk_queue)
+        tenants = sorted(self._decode(t) for t in self.redis_client.smembers(self.TENANTS_KEY))
+        if budget <= 0 or not tenants:
+            return 0
+
+        # Rotate the starting tenant on every dispatch so nobody is always first
+        cursor = int(self.redis_client.incr(self.CURSOR_KEY)) % len(tenants)
+        active = tenants[cursor:] + tenants[:cursor]
+
+        dispatched = 0
+        while budget > 0 and active:
+            for tenant_id in list(active):
+                for _ in range(self._weight(tenant_id)):
+                    if budget <= 0:
+                        break
+                    raw = self.redis_client.lpop(self._pending_key(tenant_id))
+                    if raw is None:
+                        self._retire_tenant(tenant_id)
+                        active.remove(tenant_id)
+                        break
+                    entry = json.loads(self._decode(raw))
+                    try:
+                        submit(entry["task_id"], entry["args"])
+                    except Exception:
+                        # Put it back at the head so it is not lost
+                        self.redis_client.lpush(self._pending_key(tenant_id), raw)
+                        raise
+                    budget -= 1
+                    dispatched += 1
+                if budget <= 0:
+                    break
+
+        logger.debug(f"Dispatched {dispatched} bulk tasks")
+        return dispatched
+
+    def queue_depth(self, queue_name):
+        """Number of messages waiting in a Celery queue on the Redis broker."""
+        return int(self.redis_client.llen(queue_name) or 0)
+
+    def pending_counts(self):
+        """Returns {tenant_id: pending bulk task count}."""
+        counts = {}
+        for tenant in self.redis_client.smembers(self.TENANTS_KEY):
+            tenant_id = self._decode(tenant)
+            pending = int(self.redis_client.llen(self._pending_key(tenant_id)) or 0)
+            if pending:
+                counts[tenant_id] = pending
+        return counts
+
+    def _retire_tenant(self, tenant_id):
+        self.redis_client.srem(self.TENANTS_KEY, tenant_id)
+        # An enqueue may have landed between the empty pop and the removal
+        if self.redis_client.llen(self._pending_key(tenant_id)):
+            self.redis_client.sadd(self.TENANTS_KEY, tenant_id)
+
+    def _weight(self, tenant_id):
+        return max(1, int(self.tenant_weights.get(tenant_id, 1)))
+
+    def _pending_key(self, tenant_id):
+        return f"{self.PENDING_PREFIX}{tenant_id}"
+
+    @staticmethod
+    def _decode(value):
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def get_bulk_ingest_scheduler():
+    return BulkIngestScheduler(get_redis_client())
@@ -1,44 +1,105 @@
 # resume_tasks.py
 from genfoundry.celery_app import celery_app
-from genfoundry.km.api.standardize.resume_processing_task import ResumeTaskProcessor
+from genfoundry.km.api.standardize.resume_processing_task import ResumeTaskProcessor, ResumeProcessingError, discard_upload
+from genfoundry.km.api.standardize.bulk_ingest_scheduler import get_bulk_ingest_scheduler, SOURCE_BULK, SOURCE_INTERACTIVE
+from genfoundry.km.api.admin.reindex.resume_reindexer import get_resume_reindexer, STATUS_RUNNING
+from genfoundry.km.utils.openai_rate_limiter import openai_priority, PRIORITY_BULK, PRIORITY_INTERACTIVE
 import logging
 from genfoundry.config import Config
 
 logger = logging.getLogger(__name__)
 
-@celery_app.task(bind=True)
-def process_resume(self, resume_filepath, tenant_id):
-    logger.debug(f"Processing resume file: {resume_filepath} for tenant: {tenant_id}")
+# Transient failures (OpenAI, Mongo, Pinecone, Redis) are retried with exponential
+# backoff; completed stages are checkpointed so a retry resumes where it stopped.
+@celery_app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    dont_autoretry_for=(ResumeProcessingError,),
+    retry_backoff=True,
+    retry_backoff_max=Config.INGEST_RETRY_BACKOFF_MAX,
+    retry_jitter=True,
+    max_retries=Config.INGEST_MAX_RETRIES,
+)
+def process_resume(self, blob_key, tenant_id, upload_id=None, source=SOURCE_INTERACTIVE):
+    logger.debug(f"Processing resume blob: {blob_key} for tenant: {tenant_id}")
     openai_api_key = Config.OPENAI_API_KEY
     llm_model = Config.LLM_MODEL
     langchain_api_key = Config.LANGCHAIN_API_KEY
     pinecone_api_key = Config.PINECONE_API_KEY
     processor = ResumeTaskProcessor(llm_model=llm_model, openai_api_key=openai_api_key, langchain_api_key=langchain_api_key, pinecone_api_key=pinecone_api_key)
-    
+
     try:
-        logger.debug(f"Starting task for tenant: {tenant_id}")
+        logger.debug(f"Starting task for tenant: {tenant_id}, attempt: {self.request.retries + 1}")
         self.update_state(state='STARTED', meta={'status': 'Task started, processing resume.'})
 
         self.update_state(state='PROCESSING', meta={'status': 'Processing resume content.'})
-        result = processor.process_task(resume_filepath, tenant_id)
+        # Bulk loads may not use the OpenAI budget reserved for interactive traffic
+        with openai_priority(PRIORITY_BULK if source == SOURCE_BULK else PRIORITY_INTERACTIVE):
+            result = processor.process_task(blob_key, tenant_id, upload_id)
 
         # Flatten result with top-level status and message
         result["status"] = "success"
         result["message"] = result.get("message", "Resume processed successfully")
 
         self.update_state(state='SUCCESS', meta=result)
+        _release_bulk_slot(source)
         return result
 
     except Exception as e:
-        logger.error(f"Error processing resume for tenant {tenant_id}: {e}")
-        self.update_state(state='FAILURE', meta={'status': 'Error during task processing', 'exc': str(e)})
+        final_attempt = isinstance(e, ResumeProcessingError) or self.request.retries >= self.max_retries
+        if final_attempt:
+            logger.error(f"Error processing resume for tenant {tenant_id}: {e}")
+            discard_upload(blob_key, upload_id)
+            self.update_state(state='FAILURE', meta={'status': 'Error during task processing', 'exc': str(e)})
+            _release_bulk_slot(source)
+        else:
+            logger.warning(f"Retrying resume processing for tenant {tenant_id} after error: {e}")
         raise
 
 
+@celery_app.task
+def dispatch_bulk_resumes():
+    """Feeds pending per-tenant bulk uploads into the bulk queue, round-robin."""
+    scheduler = get_bulk_ingest_scheduler()
 
+    def submit(task_id, args):
+        process_resume.apply_async(
+            args=args,
+            kwargs={'source': SOURCE_BULK},
+            task_id=task_id,
+            queue=Config.CELERY_BULK_QUEUE,
+        )
 
+    return scheduler.dispatch(submit)
 
 
+@celery_app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=Config.INGEST_RETRY_BACKOFF_MAX,
+    retry_jitter=True,
+    max_retries=Config.INGEST_MAX_RETRIES,
+)
+def reindex_tenant_vectors(self, tenant_id, build_id):
+    """
+    Rebuilds a slice of the tenant's vectors from MongoDB, then re-queues itself
+    until the build is done. Progress is checkpointed per batch, so a retry or a
+    continuation picks up after the last stored batch.
+    """
+    reindexer = get_resume_reindexer()
+    with openai_priority(PRIORITY_BULK):
+        progress = reindexer.run(tenant_id, build_id, max_batches=Config.REINDEX_BATCHES_PER_TASK)
 
+    if progress and progress.get("build_id") == build_id and progress.get("status") == STATUS_RUNNING:
+        reindex_tenant_vectors.apply_async(args=[tenant_id, build_id], queue=Config.CELERY_BULK_QUEUE)
+    return progress
 
 
+def _release_bulk_slot(source):
+    # A finished bulk task frees a slot in the bulk queue for the next tenant
+    if source == SOURCE_BULK:
+        try:
+            dispatch_bulk_resumes.delay()
+        except Exception as e:
+            logger.warning(f"Failed to trigger bulk dispatch: {e}")
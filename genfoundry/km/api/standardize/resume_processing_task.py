@@ -1,14 +1,17 @@
 import os
 import uuid
 import logging
-import shutil
 
 from genfoundry.km.preprocess.resume_transformer import ResumeStandardizer
 from genfoundry.km.preprocess.pymupdf_doc_parser import PyMuPDFDocumentParser
 from genfoundry.km.persist.vector_db_proxy import PineconeVectorizer
 from genfoundry.km.persist.mongo_proxy import MongoProxy
+from genfoundry.km.persist.ingestion_checkpoint_store import get_ingestion_checkpoint_store
+from genfoundry.km.persist.blob_store import get_blob_store, remove_local_copy
+from genfoundry.km.persist.upload_lease_store import get_upload_lease_store
 from langchain_openai import ChatOpenAI
 from genfoundry.config import Config
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
 
 
 
@@ -40,6 +43,20 @@ from genfoundry.config import Config
 """
 logger = logging.getLogger(__name__)
 
+# Ingestion stages, in pipeline order, as stored in the checkpoint
+STAGE_PARSED = "parsed"
+STAGE_STANDARDIZED = "standardized"
+STAGE_METADATA = "metadata"
+STAGE_RESUME_ID = "resume_id"
+STAGE_MONGO_STORED = "mongo_stored"
+STAGE_VECTORS_ATTEMPTED = "vectors_attempted"
+STAGE_VECTORS_STORED = "vectors_stored"
+
+
+class ResumeProcessingError(Exception):
+    """Raised for ingestion failures that retrying the task cannot fix."""
+
+
 class ResumeTaskProcessor:
     def __init__(self, llm_model=None, openai_api_key=None, langchain_api_key=None, pinecone_api_key=None):
         logging.debug("Initializing ResumeTaskProcessor...")
@@ -84,58 +101,109 @@ class ResumeTaskProcessor:
         self.doc_parser = PyMuPDFDocumentParser()
         self.vectorizer = PineconeVectorizer()
         self.mongo_proxy = MongoProxy()
+        self.checkpoint_store = get_ingestion_checkpoint_store()
+        self.blob_store = get_blob_store()
 
         self.llm = ChatOpenAI(
             model_name=llm_model,
             temperature=0,
-            api_key=openai_api_key
+            api_key=openai_api_key,
+            **langchain_client_kwargs()
         )
 
-    def process_task(self, resume_filepath, tenant_id):
-        tmp_dir = None
-        try:
-            logger.debug(f"Processing resume for tenant: {tenant_id}")
-            
-            # Parse the uploaded document
-            resume_string = self.doc_parser.parse_document(resume_filepath)
-
-            response = self.standardizer.standardize(resume_string, "markdown")
-            if not response or "error" in response:
-                raise Exception(response.get("error", "Unknown error during standardization"))
-
-            resume_id = f"Doc:{uuid.uuid4()}"
-            standardized_resume = response.get("standardized_resume", {})
-            #logger.debug(f"====>ResumeTaskProcessor: Standardized Resume: \n{standardized_resume}")
-            metadata = response.get("metadata", {})
-
-            # Save into MongoDB
-            self.mongo_proxy.insert_resume(resume_id, standardized_resume, tenant_id)
-
-            # Save into Vector DB
-            self.vectorizer.vectorize_and_store_text_resume(resume_id, resume_string, metadata, tenant_id)
-
-            return {
-                "resume_id": resume_id,
-                "message": "Resume processed successfully",
-                "standardized_resume": standardized_resume,
-                "metadata": metadata
-            }
-        
-        except Exception as e:
-            logger.error(f"Error in ResumeTaskProcessor: {e}")
-            return {"error": str(e)}
-
-        finally:
-            # Clean up the uploaded file
-            if resume_filepath and os.path.exists(resume_filepath):
-                try:
-                    os.remove(resume_filepath)
-                    logger.debug(f"Temporary file {resume_filepath} deleted.")
-                    
-                    # Clean the temp dir if empty
-                    tmp_dir = os.path.dirname(resume_filepath)
-                    if tmp_dir and os.path.isdir(tmp_dir) and not os.listdir(tmp_dir):
-                        shutil.rmtree(tmp_dir)
-                        logger.debug(f"Temporary directory {tmp_dir} deleted.")
-                except Exception as cleanup_error:
-                    logger.warning(f"Failed to clean up temporary files: {cleanup_error}")
+    def process_task(self, blob_key, tenant_id, upload_id=None):
+        """
+        Runs the ingestion stages for one uploaded resume, read from the blob store
+        under blob_key:
+            parse -> standardize -> metadata -> Mongo insert -> Pinecone upsert
+
+        Each stage's output is checkpointed under (tenant_id, upload_id), so a
+        retried task skips the stages that already completed, including the two
+        LLM calls. Duplicate uploads of a file share its content-addressed blob
+        but each has its own upload ID, checkpoint and blob lease. Transient
+        errors are raised for Celery to retry; errors that a retry cannot fix
+        are raised as ResumeProcessingError.
+        """
+        if not upload_id:
+            # Upload keys are content addressed: uploads/<tenant_id>/<sha256><ext>
+            upload_id = os.path.splitext(os.path.basename(blob_key))[0]
+
+        logger.debug(f"Processing resume for tenant: {tenant_id}, upload: {upload_id}")
+        checkpoint = self.checkpoint_store.load(tenant_id, upload_id)
+        if checkpoint:
+            logger.info(f"Resuming ingestion of {upload_id} after stages: {sorted(checkpoint.keys())}")
+
+        # Stage 1: parse the uploaded document
+        if STAGE_PARSED not in checkpoint:
+            if not self.blob_store.exists(blob_key):
+                raise ResumeProcessingError(f"Uploaded resume not found: {blob_key}")
+            local_path = self.blob_store.download_to_tempfile(blob_key)
+            try:
+                resume_string = self.doc_parser.parse_document(local_path)
+            finally:
+                remove_local_copy(local_path)
+            if not resume_string:
+                raise ResumeProcessingError("Unable to parse the uploaded resume")
+            self._save_stage(checkpoint, tenant_id, upload_id, STAGE_PARSED, resume_string)
+        resume_string = checkpoint[STAGE_PARSED]
+
+        # Stage 2: standardize into Markdown (LLM call)
+        if STAGE_STANDARDIZED not in checkpoint:
+            standardized_resume = self.standardizer.standardize_content(resume_string, "markdown")
+            self._save_stage(checkpoint, tenant_id, upload_id, STAGE_STANDARDIZED, standardized_resume)
+        standardized_resume = checkpoint[STAGE_STANDARDIZED]
+
+        # Stage 3: extract metadata (LLM call)
+        if STAGE_METADATA not in checkpoint:
+            metadata = self.standardizer.extract_metadata(resume_string, raise_on_error=True)
+            self._save_stage(checkpoint, tenant_id, upload_id, STAGE_METADATA, metadata)
+        metadata = checkpoint[STAGE_METADATA]
+
+        # The resume ID is fixed before any write so retries target the same records
+        if STAGE_RESUME_ID not in checkpoint:
+            self._save_stage(checkpoint, tenant_id, upload_id, STAGE_RESUME_ID, f"Doc:{uuid.uuid4()}")
+        resume_id = checkpoint[STAGE_RESUME_ID]
+
+        # Stage 4: save into MongoDB (insert is a no-op if the ID already exists)
+        if STAGE_MONGO_STORED not in checkpoint:
+            self.mongo_proxy.insert_resume(resume_id, standardized_resume, tenant_id,
+                                           metadata=metadata, parsed_text=resume_string)
+            self._save_stage(checkpoint, tenant_id, upload_id, STAGE_MONGO_STORED, True)
+
+        # Stage 5: save into Vector DB, removing any nodes a failed attempt left behind
+        if STAGE_VECTORS_STORED not in checkpoint:
+            if STAGE_VECTORS_ATTEMPTED in checkpoint:
+                logger.debug(f"Removing partial vectors for {resume_id} before retrying upsert")
+                self.vectorizer.delete_resume(resume_id, tenant_id)
+            self._save_stage(checkpoint, tenant_id, upload_id, STAGE_VECTORS_ATTEMPTED, True)
+            self.vectorizer.vectorize_and_store_text_resume(resume_id, resume_string, dict(metadata), tenant_id)
+            self._save_stage(checkpoint, tenant_id, upload_id, STAGE_VECTORS_STORED, True)
+
+        self.checkpoint_store.clear(tenant_id, upload_id)
+        discard_upload(blob_key, upload_id)
+
+        return {
+            "resume_id": resume_id,
+            "message": "Resume processed successfully",
+            "standardized_resume": standardized_resume,
+            "metadata": metadata
+        }
+
+    def _save_stage(self, checkpoint, tenant_id, upload_id, stage, output):
+        self.checkpoint_store.save_stage(tenant_id, upload_id, stage, output)
+        checkpoint[stage] = output
+        logger.debug(f"Checkpointed stage '{stage}' for upload {upload_id}")
+
+
+def discard_upload(blob_key, upload_id=None):
+    """
+    Returns upload_id's lease on the uploaded resume and removes the blob from
+    the blob store once no other upload of the same file still needs it.
+    """
+    if not blob_key:
+        return
+    try:
+        if get_upload_lease_store().release(blob_key, upload_id or blob_key, lambda: get_blob_store().delete(blob_key)):
+            logger.debug(f"Upload blob {blob_key} deleted.")
+    except Exception as cleanup_error:
+        logger.warning(f"Failed to delete upload blob {blob_key}: {cleanup_error}")
@@ -13,6 +13,7 @@ from genfoundry.km.persist.mongo_proxy import MongoProxy
 import os
 import json
 import uuid
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
 
 class ResumeStandardizerRunner(Resource):
     def __init__(self):
@@ -41,7 +42,8 @@ class ResumeStandardizerRunner(Resource):
         self.llm = ChatOpenAI(
             model_name=current_app.config['LLM_MODEL'], 
             temperature=0, 
-            api_key=os.getenv("OPENAI_API_KEY"))
+            api_key=os.getenv("OPENAI_API_KEY"),
+            **langchain_client_kwargs())
  
     @jwt_required()
     def post(self):
@@ -74,12 +76,13 @@ class ResumeStandardizerRunner(Resource):
             metadata = response.get("metadata", {})
 
 
-            self.mongo_proxy.insert_resume(resume_id,  standardized_resume, tenant_id)
+            self.mongo_proxy.insert_resume(resume_id,  standardized_resume, tenant_id,
+                                           metadata=metadata, parsed_text=resume_string)
             logging.debug(f"Resume {resume_id} inserted into MongoDB")
 
             # Vectorize and store the resume in Pinecone
             #self.vectorizer.vectorize_and_store_resume(resume_id, standardized_resume, metadata)
-            self.vectorizer.vectorize_and_store_text_resume(resume_id, resume_string, metadata, tenant_id)
+            self.vectorizer.vectorize_and_store_text_resume(resume_id, resume_string, dict(metadata), tenant_id)
             logging.debug(f"Resume {resume_id} vectorized and stored in Pinecone")
             
             # Return both standardized resume and metadata as the API response
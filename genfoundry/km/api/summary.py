@@ -14,6 +14,7 @@ from flask_restful import Resource, current_app
 import logging
 import os
 import json
+from genfoundry.km.utils.openai_rate_limiter import llama_index_client_kwargs
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -29,7 +30,7 @@ class SummarizerOld(Resource):
       self.pinecone_index = current_app.config['PINECONE_INDEX']
       self.llm_model = current_app.config['LLM_MODEL']
       os.environ["OPENAI_API_KEY"] = self.openai_api_key
-      Settings.llm = OpenAI(model=self.llm_model, temperature=0.0)
+      Settings.llm = OpenAI(model=self.llm_model, temperature=0.0, **llama_index_client_kwargs())
 
       # Initialize Pinecone and OpenAI
       #pinecone.init(api_key=current_app.config['PINECONE_API_KEY'])
@@ -9,6 +9,7 @@ from llama_index.core.vector_stores import MetadataFilter, MetadataFilters
 from llama_index.embeddings.openai import OpenAIEmbedding
 
 import os
+from genfoundry.km.utils.openai_rate_limiter import llama_index_client_kwargs
 
 class FinancialSummarizer:
     def __init__(self, openai_api_key, pinecone_api_key, pinecone_index, llm_model):
@@ -23,8 +24,8 @@ class FinancialSummarizer:
         from llama_index.llms.openai import OpenAI
         os.environ["OPENAI_API_KEY"] = self.openai_api_key
         from llama_index.core import Settings
-        Settings.llm = OpenAI(model=self.llm_model, temperature=0.0)
-        embed_model = OpenAIEmbedding(model="text-embedding-ada-002")
+        Settings.llm = OpenAI(model=self.llm_model, temperature=0.0, **llama_index_client_kwargs())
+        embed_model = OpenAIEmbedding(model="text-embedding-ada-002", **llama_index_client_kwargs())
         Settings.embed_model = embed_model
 
 
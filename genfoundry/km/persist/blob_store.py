@@ -0,0 +1,172 @@
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+
+from genfoundry.config import Config
+from genfoundry.km.persist.upload_lease_store import get_upload_lease_store
+
+logger = logging.getLogger(__name__)
+
+
+class BlobStore():
+    """
+    Content-addressed store for uploaded files.
+
+    Uploads are stored under uploads/<tenant_id>/<sha256><ext>, so the web tier
+    can hand a Celery worker on another machine a key instead of a local path,
+    and re-uploads of the same file land on the same key. Each ingestion task
+    leases the blob it reads, so it is only deleted once no task needs it.
+    """
+
+    def put_bytes(self, key, data):
+        raise NotImplementedError
+
+    def get_bytes(self, key):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def exists(self, key):
+        raise NotImplementedError
+
+    @staticmethod
+    def make_upload_key(tenant_id, content_hash, filename=None):
+        ext = os.path.splitext(filename or "")[1].lower()
+        return f"uploads/{tenant_id}/{content_hash}{ext}"
+
+    def put_upload(self, tenant_id, file_storage, upload_id=None):
+        """
+        Stores a werkzeug FileStorage upload and returns (blob_key, content_hash).
+        With an upload_id, the blob is also leased to that upload until
+        discard_upload returns the lease.
+        """
+        data = file_storage.read()
+        content_hash = hashlib.sha256(data).hexdigest()
+        key = self.make_upload_key(tenant_id, content_hash, file_storage.filename)
+
+        def store_blob():
+            if not self.exists(key):
+                self.put_bytes(key, data)
+                logger.debug(f"Stored upload {file_storage.filename} as blob {key}")
+            else:
+                logger.debug(f"Upload {file_storage.filename} already stored as blob {key}")
+
+        if upload_id:
+            get_upload_lease_store().acquire(key, upload_id, store_blob)
+        else:
+            store_blob()
+        return key, content_hash
+
+    def download_to_tempfile(self, key):
+        """
+        Copies the blob to a new temp directory and returns the local file path.
+        The file keeps the blob's extension, which the document parsers rely on.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        local_path = os.path.join(tmp_dir, os.path.basename(key))
+        with open(local_path, "wb") as f:
+            f.write(self.get_bytes(key))
+        return local_path
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Stores blobs in a local directory. Point BLOB_STORE_LOCAL_DIR at a volume
+    shared by the web and worker containers to run them on separate nodes.
+    """
+
+    def __init__(self, root_dir) -> None:
+        self.root_dir = root_dir
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def _path(self, key):
+        path = os.path.abspath(os.path.join(self.root_dir, key))
+        if not path.startswith(os.path.abspath(self.root_dir) + os.sep):
+            raise ValueError(f"Invalid blob key: {key}")
+        return path
+
+    def put_bytes(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file first so readers never see a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get_bytes(self, key):
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def exists(self, key):
+        return os.path.exists(self._path(key))
+
+
+class S3BlobStore(BlobStore):
+    """
+    Stores blobs in an S3-compatible bucket. Any client exposing put_object,
+    get_object, head_object and delete_object with the boto3 call signatures
+    works, which lets tests and local setups pass in a stand-in.
+    """
+
+    def __init__(self, bucket, client=None, prefix="") -> None:
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        if client is None:
+            import boto3  # Only needed when the S3 backend is configured
+            client = boto3.client(
+                "s3",
+                endpoint_url=Config.BLOB_STORE_S3_ENDPOINT_URL or None,
+            )
+        self.client = client
+
+    def _key(self, key):
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put_bytes(self, key, data):
+        self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=data)
+
+    def get_bytes(self, key):
+        response = self.client.get_object(Bucket=self.bucket, Key=self._key(key))
+        return response["Body"].read()
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def exists(self, key):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except Exception:
+            return False
+
+
+_blob_store = None
+
+
+def get_blob_store():
+    """Returns the process-wide BlobStore configured by Config.BLOB_STORE_BACKEND ("local" or "s3")."""
+    global _blob_store
+    if _blob_store is None:
+        backend_name = (Config.BLOB_STORE_BACKEND or "local").lower()
+        if backend_name == "s3":
+            _blob_store = S3BlobStore(Config.BLOB_STORE_S3_BUCKET, prefix=Config.BLOB_STORE_S3_PREFIX)
+        else:
+            _blob_store = LocalBlobStore(Config.BLOB_STORE_LOCAL_DIR)
+        logger.debug(f"Using {backend_name} blob store")
+    return _blob_store
+
+
+def remove_local_copy(local_path):
+    """Removes a file returned by download_to_tempfile along with its temp directory."""
+    if local_path and os.path.exists(local_path):
+        shutil.rmtree(os.path.dirname(local_path), ignore_errors=True)
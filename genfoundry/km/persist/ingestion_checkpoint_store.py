@@ -0,0 +1,97 @@
+import json
+import logging
+import threading
+import time
+
+from genfoundry.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCheckpointStore():
+    """
+    Persists per-upload ingestion stage outputs in a Redis hash so a retried
+    Celery task, possibly on another worker, can resume where the last attempt
+    stopped. Each field is one stage and holds that stage's JSON output.
+    """
+
+    KEY_PREFIX = "ingest_checkpoint:"
+
+    def __init__(self, redis_client, ttl_seconds) -> None:
+        self.redis_client = redis_client
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, tenant_id, upload_id):
+        return f"{self.KEY_PREFIX}{tenant_id}:{upload_id}"
+
+    def load(self, tenant_id, upload_id):
+        raw = self.redis_client.hgetall(self._key(tenant_id, upload_id)) or {}
+        checkpoint = {}
+        for field, value in raw.items():
+            field = field.decode("utf-8") if isinstance(field, bytes) else field
+            value = value.decode("utf-8") if isinstance(value, bytes) else value
+            checkpoint[field] = json.loads(value)
+        return checkpoint
+
+    def save_stage(self, tenant_id, upload_id, stage, output):
+        key = self._key(tenant_id, upload_id)
+        pipe = self.redis_client.pipeline()
+        pipe.hset(key, stage, json.dumps(output))
+        pipe.expire(key, self.ttl_seconds)
+        pipe.execute()
+
+    def clear(self, tenant_id, upload_id):
+        self.redis_client.delete(self._key(tenant_id, upload_id))
+
+
+class InMemoryCheckpointStore():
+    """
+    Process-local checkpoint store. Only useful when retries run in the same
+    worker process, e.g. in development or tests without Redis.
+    """
+
+    def __init__(self, ttl_seconds) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._checkpoints = {}
+        self._lock = threading.Lock()
+
+    def load(self, tenant_id, upload_id):
+        with self._lock:
+            entry = self._checkpoints.get((tenant_id, upload_id))
+            if not entry or entry["expires_at"] < time.time():
+                self._checkpoints.pop((tenant_id, upload_id), None)
+                return {}
+            return dict(entry["stages"])
+
+    def save_stage(self, tenant_id, upload_id, stage, output):
+        with self._lock:
+            entry = self._checkpoints.setdefault((tenant_id, upload_id), {"stages": {}})
+            # Round-trip through JSON so both stores hand back the same shapes
+            entry["stages"][stage] = json.loads(json.dumps(output))
+            entry["expires_at"] = time.time() + self.ttl_seconds
+
+    def clear(self, tenant_id, upload_id):
+        with self._lock:
+            self._checkpoints.pop((tenant_id, upload_id), None)
+
+
+_in_memory_store = None
+
+
+def get_ingestion_checkpoint_store():
+    """
+    Returns the checkpoint store configured by Config.INGEST_CHECKPOINT_BACKEND
+    ("redis" or "memory"). Falls back to the in-memory store if Redis cannot be set up.
+    """
+    ttl_seconds = Config.INGEST_CHECKPOINT_TTL_SECONDS
+    if (Config.INGEST_CHECKPOINT_BACKEND or "").lower() == "redis":
+        try:
+            from genfoundry.km.persist.redis_proxy import get_redis_client
+            return RedisCheckpointStore(get_redis_client(), ttl_seconds)
+        except Exception as e:
+            logger.error(f"Failed to initialize Redis checkpoint store, using in-memory store: {e}")
+
+    global _in_memory_store
+    if _in_memory_store is None:
+        _in_memory_store = InMemoryCheckpointStore(ttl_seconds)
+    return _in_memory_store
@@ -0,0 +1,76 @@
+"""
+One-off migration of stored resumes from the legacy "content" string
+(json.dumps of the markdown) to the resume_content_codec format: raw
+markdown, frontend rendition, lz4 above the size threshold. Resumes already
+migrated are skipped, so it can be re-run or interrupted. Reads keep working
+on both formats throughout.
+
+    python -m genfoundry.km.persist.migrate_resume_content             # every tenant
+    python -m genfoundry.km.persist.migrate_resume_content --tenant acme --dry-run
+"""
+import argparse
+import logging
+
+from pymongo import UpdateOne
+
+from genfoundry.km.persist.mongo_proxy import MongoProxy
+from genfoundry.km.persist.resume_content_codec import CONTENT_FORMAT, encode_resume_content, legacy_markdown
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 200
+
+
+def _stored_bytes(fields):
+    return sum(len(v) if isinstance(v, (bytes, str)) else 0 for v in fields.values())
+
+
+def migrate_tenant(mongo_proxy, tenant_id, batch_size=BATCH_SIZE, dry_run=False):
+    """Returns counts and stored content bytes before and after, for one tenant."""
+    coll = mongo_proxy.get_tenant_resume_collection(tenant_id)
+    stats = {"migrated": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0}
+    after_id = None
+    while True:
+        filter = {"content": {"$exists": True}, "content_format": {"$ne": CONTENT_FORMAT}}
+        if after_id is not None:
+            filter["_id"] = {"$gt": after_id}
+        docs = list(coll.find(filter, {"content": 1}).sort("_id", 1).limit(batch_size))
+        if not docs:
+            break
+        after_id = docs[-1]["_id"]
+
+        updates = []
+        for doc in docs:
+            try:
+                fields = encode_resume_content(legacy_markdown(doc["content"]))
+            except ValueError as e:
+                logger.warning(f"Tenant {tenant_id}: leaving resume {doc['_id']} as it is: {e}")
+                stats["failed"] += 1
+                continue
+            stats["bytes_before"] += len(doc["content"].encode("utf-8"))
+            stats["bytes_after"] += _stored_bytes({k: v for k, v in fields.items() if k != "content_format"})
+            updates.append(UpdateOne({"_id": doc["_id"], "content": doc["content"]},
+                                     {"$set": fields, "$unset": {"content": ""}}))
+        if updates and not dry_run:
+            stats["migrated"] += coll.bulk_write(updates, ordered=False).modified_count
+        elif dry_run:
+            stats["migrated"] += len(updates)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenant", action="append", help="tenant to migrate (repeatable); default all")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="report the savings without writing")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    mongo_proxy = MongoProxy()
+    for tenant_id in args.tenant or mongo_proxy.list_tenant_ids():
+        stats = migrate_tenant(mongo_proxy, tenant_id, args.batch_size, args.dry_run)
+        print(f"{tenant_id}\t{stats}")
+
+
+if __name__ == "__main__":
+    main()
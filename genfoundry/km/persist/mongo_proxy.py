@@ -1,9 +1,28 @@
-from pymongo import MongoClient
-import logging, os, json, re
+import pymongo
+from pymongo import MongoClient, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+import contextlib
+import logging, os, re
 from genfoundry.config import Config
+from genfoundry.km.persist.resume_content_codec import DISPLAY_PROJECTION, encode_resume_content, resume_display
+from genfoundry.km.utils.request_deadline import call_timeout, remaining_seconds
 
 logger = logging.getLogger(__name__)
 
+RESUME_COLLECTION_SUFFIX = "_Resumes"
+
+
+def query_timeout():
+    """
+    Timeout for the Mongo operations in the block when serving an API request:
+    Config.MONGO_QUERY_TIMEOUT_SECONDS, capped at what is left of its budget.
+    Outside a request (Celery tasks) the client's own settings apply.
+    """
+    if remaining_seconds() is None:
+        return contextlib.nullcontext()
+    return pymongo.timeout(call_timeout(Config.MONGO_QUERY_TIMEOUT_SECONDS, "Mongo query"))
+
+
 class MongoProxy():
 
     def __init__(self) -> None:
@@ -16,23 +35,31 @@ class MongoProxy():
       #logging.debug(f"Connected to MongoDB database: {mongo_db}, collection: {mongo_collection}")
       #self.collection = self.db[os.getenv('MONGO_COLLECTION')]  # Collection name
 
-    def insert_resume(self, resume_id, resume_json, tenant_id):
+    def insert_resume(self, resume_id, resume_json, tenant_id, metadata=None, parsed_text=None):
         # Check if a document with the same file_name exists in the collection
         coll = self.get_tenant_resume_collection(tenant_id)
         #existing_document = self.collection.find_one({"doc_id": resume_id})
-        existing_document = coll.find_one({"doc_id": resume_id})
+        existing_document = coll.find_one({"_id": resume_id}, {"_id": 1})
 
         if existing_document:
             logger.debug(f"Document with document ID '{resume_id}' already exists. Skipping insertion.")
         else:
             # Proceed to insert the file's metadata since it doesn't already exist
-            resume_str = json.dumps(resume_json)
             resume_doc = {
                 "_id": resume_id,
-                "content": resume_str
+                **encode_resume_content(resume_json)
             }
-            coll.insert_one(resume_doc)
-            logger.debug(f"Successfully inserted resume with id: {resume_id}")
+            # Kept so the vectors can be rebuilt without re-parsing or another LLM call
+            if metadata is not None:
+                resume_doc["metadata"] = metadata
+            if parsed_text is not None:
+                resume_doc["parsed_text"] = parsed_text
+            try:
+                coll.insert_one(resume_doc)
+                logger.debug(f"Successfully inserted resume with id: {resume_id}")
+            except DuplicateKeyError:
+                # A concurrent or retried insert got there first; the write is idempotent
+                logger.debug(f"Document with document ID '{resume_id}' already exists. Skipping insertion.")
 
 
     def delete_resume(self, resume_id, tenant_id):
@@ -49,70 +76,150 @@ class MongoProxy():
             logger.debug(f"No document found with file_id: {resume_id}")
 
     def get_resume(self, tenant_id, resume_id):
+        """Returns the frontend-ready markdown of a resume, or None if there is no such resume."""
         # Define the filter based on file_id
         filter = {"_id": resume_id}
         
         # Attempt to retrieve the document
         #result = self.collection.find_one(filter)
-        result = self.get_tenant_resume_collection(tenant_id).find_one(filter)
+        with query_timeout():
+            result = self.get_tenant_resume_collection(tenant_id).find_one(filter, DISPLAY_PROJECTION)
         if result:
             logger.debug(f"Successfully retrieved document with file_id: {resume_id}")
-            return result.get("content")
+            return resume_display(result)
         else:
             logger.debug(f"No document found with file_id: {resume_id}")
             return None
         
+    def get_resume_documents(self, tenant_id, resume_ids, projection=DISPLAY_PROJECTION):
+        """Returns {resume_id: document} for the given IDs that exist, fetched with one $in query."""
+        with query_timeout():
+            cursor = self.get_tenant_resume_collection(tenant_id).find({"_id": {"$in": list(resume_ids)}}, projection)
+            return {doc["_id"]: doc for doc in cursor}
+
+    def get_resume_batch(self, tenant_id, after_id=None, batch_size=100):
+        """
+        Returns up to batch_size resume documents with _id greater than after_id,
+        in _id order, for jobs that walk the whole collection.
+        """
+        filter = {"_id": {"$gt": after_id}} if after_id else {}
+        cursor = self.get_tenant_resume_collection(tenant_id).find(filter).sort("_id", 1).limit(batch_size)
+        return list(cursor)
+
+    def update_resume_metadata(self, tenant_id, resume_id, metadata):
+        self.get_tenant_resume_collection(tenant_id).update_one({"_id": resume_id}, {"$set": {"metadata": metadata}})
+
+    def count_resumes(self, tenant_id):
+        return self.get_tenant_resume_collection(tenant_id).count_documents({})
+
     def get_tenant_resume_collection(self, tenant_id):
         """Returns the MongoDB collection for the tenant."""
-        collection_name = f"{tenant_id}_Resumes"  # Per-tenant collection
+        collection_name = f"{tenant_id}{RESUME_COLLECTION_SUFFIX}"  # Per-tenant collection
         return self.db[collection_name]
+
+    def list_tenant_ids(self):
+        """Tenants that have a resume collection."""
+        return sorted(
+            name[:-len(RESUME_COLLECTION_SUFFIX)]
+            for name in self.db.list_collection_names()
+            if name.endswith(RESUME_COLLECTION_SUFFIX)
+        )
     
 
     def get_next_resume_id(self, tenant_id: str) -> str:
-        """Gets the last valid custom-format resume ID and generates the next one."""
-        coll = self.get_tenant_resume_collection(tenant_id)
-
-        # Regex to match strictly: 2 uppercase letters + 5 digits
-        regex_pattern = r"^[A-Z]{2}\d{5}$"
-
-        # Find candidates that could match
-        candidates = coll.find(
-            {"resume_id": {"$regex": regex_pattern}}
-        ).sort("resume_id", -1)
-
-        # Find the actual highest valid ID
-        for doc in candidates:
-            resume_id = doc.get("resume_id", "")
-            if re.fullmatch(regex_pattern, resume_id):
-                return MongoProxy.generate_next_resume_id(resume_id)
-
-        # No valid ID found
-        return MongoProxy.generate_next_resume_id(None)
+        """Allocates the tenant's next custom-format resume ID (AA00000, AA00001, ...)."""
+        return self.reserve_resume_ids(tenant_id, 1)[0]
+
+    def reserve_resume_ids(self, tenant_id: str, count: int = 1) -> list:
+        """
+        Atomically reserves a block of count consecutive resume IDs, e.g. for a
+        batch ingestion. The tenant's counter document holds how many IDs were
+        ever handed out, so concurrent callers never get the same ID; IDs of a
+        block that is not used up are skipped, not reused.
+
+        A tenant without a counter document yet has it seeded past its highest
+        existing ID first, so allocation never depends on the seeding migration
+        having run before the first ingestion.
+        """
+        if count < 1:
+            raise ValueError(f"Invalid resume ID count: {count}")
+        counters = self.db[Config.MONGO_COUNTER_COLLECTION]
+        counter = counters.find_one_and_update(
+            {"_id": resume_id_counter_key(tenant_id)},
+            {"$inc": {"seq": count}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if counter is None:
+            # Concurrent first callers may all seed; $max makes that harmless
+            self.seed_resume_id_counter(tenant_id)
+            counter = counters.find_one_and_update(
+                {"_id": resume_id_counter_key(tenant_id)},
+                {"$inc": {"seq": count}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        end = counter["seq"]
+        if end > RESUME_ID_SPACE:
+            raise ValueError("Resume ID space exhausted.")
+        return [format_resume_id(seq) for seq in range(end - count, end)]
+
+    def seed_resume_id_counter(self, tenant_id: str) -> int:
+        """
+        Moves the tenant's counter past its highest existing custom-format ID.
+        reserve_resume_ids calls it for a tenant's first allocation and the
+        seed_resume_id_counters migration for every tenant. $max makes it safe
+        to run while IDs are being allocated, and to run again. Returns the seq.
+        """
+        highest = -1
+        for doc in self.get_tenant_resume_collection(tenant_id).find(
+                {"$or": [{"_id": {"$regex": RESUME_ID_PATTERN}}, {"resume_id": {"$regex": RESUME_ID_PATTERN}}]},
+                {"_id": 1, "resume_id": 1}):
+            for value in (doc.get("_id"), doc.get("resume_id")):
+                if isinstance(value, str) and re.fullmatch(RESUME_ID_PATTERN, value):
+                    highest = max(highest, parse_resume_id(value))
+        counter = self.db[Config.MONGO_COUNTER_COLLECTION].find_one_and_update(
+            {"_id": resume_id_counter_key(tenant_id)},
+            {"$max": {"seq": highest + 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        logger.info(f"Resume ID counter for tenant {tenant_id} is at {counter['seq']}")
+        return counter["seq"]
 
     @staticmethod
     def generate_next_resume_id(last_id: str) -> str:
         """Generate the next resume ID in the format [AA00000 to ZZ99999]."""
         if not last_id:
-            return "AA00000"
+            return format_resume_id(0)
 
         try:
-            prefix, number = last_id[:2], int(last_id[2:])
+            seq = parse_resume_id(last_id)
         except ValueError:
             raise ValueError(f"Invalid resume ID format: {last_id}")
 
-        number += 1
-
-        if number > 99999:
-            # Increment prefix
-            first_char, second_char = prefix
-            if second_char == 'Z':
-                if first_char == 'Z':
-                    raise ValueError("Resume ID space exhausted.")
-                first_char = chr(ord(first_char) + 1)
-                second_char = 'A'
-            else:
-                second_char = chr(ord(second_char) + 1)
-            prefix = f"{first_char}{second_char}"
-            number = 0
-
-        return f"{prefix}{number:05d}"
+        if seq + 1 >= RESUME_ID_SPACE:
+            raise ValueError("Resume ID space exhausted.")
+        return format_resume_id(seq + 1)
+
+
+# Custom-format resume IDs: 2 uppercase letters + 5 digits, AA00000 to ZZ99999
+RESUME_ID_PATTERN = r"^[A-Z]{2}\d{5}$"
+RESUME_ID_SPACE = 26 * 26 * 100000
+
+
+def resume_id_counter_key(tenant_id: str) -> str:
+    return f"{tenant_id}:resume_id"
+
+
+def format_resume_id(seq: int) -> str:
+    """0 -> AA00000, 99999 -> AA99999, 100000 -> AB00000."""
+    prefix, number = divmod(seq, 100000)
+    first, second = divmod(prefix, 26)
+    return f"{chr(ord('A') + first)}{chr(ord('A') + second)}{number:05d}"
+
+
+def parse_resume_id(resume_id: str) -> int:
+    if not re.fullmatch(RESUME_ID_PATTERN, resume_id or ""):
+        raise ValueError(f"Invalid resume ID format: {resume_id}")
+    first, second = ord(resume_id[0]) - ord("A"), ord(resume_id[1]) - ord("A")
+    return (first * 26 + second) * 100000 + int(resume_id[2:])
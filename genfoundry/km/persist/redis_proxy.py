@@ -0,0 +1,35 @@
+import logging
+import threading
+
+import redis
+
+from genfoundry.config import get_redis_config_dict
+
+logger = logging.getLogger(__name__)
+
+_redis_client = None
+_redis_lock = threading.Lock()
+
+
+def get_redis_client():
+    """
+    Returns a process-wide Redis client built from get_redis_config_dict().
+
+    The client is created lazily and shared, since redis-py clients hold a
+    connection pool and are safe to use from multiple threads.
+    """
+    global _redis_client
+    if _redis_client is None:
+        with _redis_lock:
+            if _redis_client is None:
+                redis_config_dict = get_redis_config_dict()
+                logger.debug(f"Creating Redis client for host: {redis_config_dict['REDIS_HOST']}")
+                _redis_client = redis.Redis(
+                    host=redis_config_dict['REDIS_HOST'],
+                    port=int(redis_config_dict['REDIS_PORT']),
+                    password=redis_config_dict.get('REDIS_PASSWORD') or None,
+                    ssl=redis_config_dict.get('REDIS_SSL', True),
+                    ssl_cert_reqs=redis_config_dict.get('REDIS_SSL_CERT_REQS', 'required'),
+                    ssl_ca_certs=redis_config_dict.get('REDIS_SSL_CA_CERTS'),
+                )
+    return _redis_client
@@ -0,0 +1,114 @@
+"""
+Storage format of standardized resumes in the tenant's Resumes collection.
+
+Format 1 (legacy) kept json.dumps() of the markdown in "content", which every
+read had to unescape. Format 2 keeps:
+
+    content_format: 2
+    markdown:       the standardized markdown as produced
+    display:        the rendition sent to the frontend, only when it differs
+                    from markdown
+    content_codec:  "lz4" when the fields above are lz4 frames (bytes), set
+                    for resumes over Config.RESUME_COMPRESSION_MIN_BYTES
+    content_hash:   hash of the display text, the resume's HTTP ETag
+
+Reads decompress at most one field and do no string processing.
+"""
+import hashlib
+import json
+import logging
+
+import lz4.frame
+
+from genfoundry.config import Config
+
+logger = logging.getLogger(__name__)
+
+CONTENT_FORMAT = 2
+CODEC_LZ4 = "lz4"
+NO_DETAILS = "No details available."
+
+# Fields get_resume needs, so the metadata and parsed text stay on the server
+DISPLAY_PROJECTION = {
+    "content_format": 1, "content_codec": 1, "display": 1, "markdown": 1, "content": 1, "content_hash": 1,
+}
+HASH_PROJECTION = {"content_hash": 1}
+# Fields resume_markdown needs, for prompts built from a stored resume
+MARKDOWN_PROJECTION = {"content_format": 1, "content_codec": 1, "markdown": 1, "content": 1}
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def render_display(markdown: str) -> str:
+    """The frontend rendition of a resume's markdown."""
+    return markdown.strip() or NO_DETAILS
+
+
+def encode_resume_content(resume) -> dict:
+    """Returns the fields to store for a standardized resume (markdown string, or a dict for structured output)."""
+    markdown = resume if isinstance(resume, str) else json.dumps(resume, ensure_ascii=False)
+    display = render_display(markdown)
+    fields = {"markdown": markdown}
+    if display != markdown:
+        fields["display"] = display
+
+    size = len(markdown.encode("utf-8"))
+    if Config.RESUME_COMPRESSION_MIN_BYTES is not None and size >= Config.RESUME_COMPRESSION_MIN_BYTES:
+        fields = {k: lz4.frame.compress(v.encode("utf-8")) for k, v in fields.items()}
+        fields["content_codec"] = CODEC_LZ4
+    fields["content_format"] = CONTENT_FORMAT
+    fields["content_hash"] = content_hash(display)
+    return fields
+
+
+def _decode(doc: dict, field: str):
+    value = doc.get(field)
+    if value is None:
+        return None
+    if doc.get("content_codec") == CODEC_LZ4:
+        return lz4.frame.decompress(bytes(value)).decode("utf-8")
+    return value
+
+
+def legacy_markdown(content: str) -> str:
+    """The markdown inside a format 1 content string. Raises ValueError if it is not valid JSON."""
+    try:
+        value = json.loads(content)
+    except (TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"resume content is not valid JSON: {e}")
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def _legacy_display(content: str) -> str:
+    try:
+        return render_display(legacy_markdown(content))
+    except ValueError:
+        # Undo the escaping the way the resume endpoint used to
+        return render_display(content.strip().strip('"').replace('\\n', '\n').replace('\\"', '"'))
+
+
+def resume_markdown(doc: dict):
+    """
+    The standardized markdown of a stored resume document, in either format,
+    or None if it has none. Raises ValueError for unreadable legacy content.
+    """
+    if doc.get("content_format") == CONTENT_FORMAT:
+        return _decode(doc, "markdown")
+    content = doc.get("content")
+    return legacy_markdown(content) if content else None
+
+
+def resume_display(doc: dict) -> str:
+    """The frontend rendition of a stored resume document, in either format."""
+    if doc.get("content_format") == CONTENT_FORMAT:
+        display = _decode(doc, "display")
+        return display if display is not None else _decode(doc, "markdown")
+    content = doc.get("content")
+    return _legacy_display(content) if content else NO_DETAILS
+
+
+def resume_etag(doc: dict) -> str:
+    """Content hash of a stored resume document (legacy documents have none stored, so it is computed)."""
+    return doc.get("content_hash") or content_hash(resume_display(doc))
@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from genfoundry.config import Config
+from genfoundry.km.persist.mongo_proxy import query_timeout
+
+logger = logging.getLogger(__name__)
+
+
+def slim_vector_metadata(metadata, keys=None):
+    """Returns only the metadata keys that belong on vectors (Config.VECTOR_METADATA_KEYS)."""
+    keys = keys or Config.VECTOR_METADATA_KEYS
+    return {key: value for key, value in metadata.items() if key in keys and value not in (None, "", [])}
+
+
+class ResumeMetadataStore():
+    """
+    Document-level resume metadata, read from the "metadata" field of the
+    tenant's {tenant_id}_Resumes collection (only that field is fetched) and
+    kept in a process-wide LRU, so search results can be joined with the full
+    metadata without storing it on every chunk vector.
+    """
+
+    def __init__(self, mongo_proxy=None, max_entries=None, ttl_seconds=None) -> None:
+        self._mongo_proxy = mongo_proxy
+        self.max_entries = max_entries or Config.RESUME_METADATA_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else Config.RESUME_METADATA_CACHE_TTL_SECONDS
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def mongo_proxy(self):
+        if self._mongo_proxy is None:
+            from genfoundry.km.persist.mongo_proxy import MongoProxy
+            self._mongo_proxy = MongoProxy()
+        return self._mongo_proxy
+
+    def get_many(self, tenant_id, resume_ids):
+        """Returns {resume_id: metadata} for the resume IDs that have stored metadata."""
+        found = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for resume_id in dict.fromkeys(resume_ids):
+                entry = self._cache.get((tenant_id, resume_id))
+                if entry and entry[1] > now:
+                    self._cache.move_to_end((tenant_id, resume_id))
+                    found[resume_id] = entry[0]
+                    self.hits += 1
+                else:
+                    missing.append(resume_id)
+                    self.misses += 1
+
+        if missing:
+            coll = self.mongo_proxy.get_tenant_resume_collection(tenant_id)
+            with query_timeout():
+                documents = list(coll.find({"_id": {"$in": missing}}, {"metadata": 1}))
+            for doc in documents:
+                metadata = doc.get("metadata")
+                if metadata is not None:
+                    found[doc["_id"]] = metadata
+                    self._remember(tenant_id, doc["_id"], metadata)
+        return found
+
+    def get(self, tenant_id, resume_id):
+        return self.get_many(tenant_id, [resume_id]).get(resume_id)
+
+    def invalidate(self, tenant_id, resume_id):
+        with self._lock:
+            self._cache.pop((tenant_id, resume_id), None)
+
+    def _remember(self, tenant_id, resume_id, metadata):
+        with self._lock:
+            self._cache[(tenant_id, resume_id)] = (metadata, time.monotonic() + self.ttl_seconds)
+            self._cache.move_to_end((tenant_id, resume_id))
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_resume_metadata_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResumeMetadataStore()
+    return _store
@@ -0,0 +1,39 @@
+"""
+One-off migration for the resume ID counters: seeds each tenant's counter
+document from the highest custom-format (AA00000) resume ID it already has,
+so MongoProxy.reserve_resume_ids continues after it. Safe to re-run, and to
+run while workers are allocating IDs. Optional since reserve_resume_ids seeds
+a missing counter itself on the tenant's first allocation.
+
+    python -m genfoundry.km.persist.seed_resume_id_counters            # every tenant
+    python -m genfoundry.km.persist.seed_resume_id_counters --tenant acme
+"""
+import argparse
+import logging
+
+from genfoundry.km.persist.mongo_proxy import MongoProxy, format_resume_id
+
+logger = logging.getLogger(__name__)
+
+
+def seed_counters(mongo_proxy, tenants=None):
+    """Returns {tenant_id: next ID to be allocated}."""
+    seeded = {}
+    for tenant_id in tenants or mongo_proxy.list_tenant_ids():
+        seeded[tenant_id] = format_resume_id(mongo_proxy.seed_resume_id_counter(tenant_id))
+        logger.info(f"Tenant {tenant_id}: next resume ID is {seeded[tenant_id]}")
+    return seeded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenant", action="append", help="tenant to seed (repeatable); default all")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    for tenant_id, next_id in seed_counters(MongoProxy(), args.tenant).items():
+        print(f"{tenant_id}\t{next_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from genfoundry.config import Config
+from genfoundry.km.persist.resume_content_codec import MARKDOWN_PROJECTION, resume_markdown
+
+logger = logging.getLogger(__name__)
+
+
+class StoredResumeLoader():
+    """
+    Standardized markdown of stored resumes, for the endpoints that take a
+    resume_id instead of an upload. Read from the tenant's {tenant_id}_Resumes
+    collection (only the content fields are fetched) and kept decompressed in
+    a process-wide LRU. A resume's content never changes under its ID, so the
+    TTL only bounds how long a deleted resume stays readable.
+    """
+
+    def __init__(self, mongo_proxy=None, max_entries=None, ttl_seconds=None) -> None:
+        self._mongo_proxy = mongo_proxy
+        self.max_entries = max_entries or Config.STORED_RESUME_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else Config.STORED_RESUME_CACHE_TTL_SECONDS
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def mongo_proxy(self):
+        if self._mongo_proxy is None:
+            from genfoundry.km.persist.mongo_proxy import MongoProxy
+            self._mongo_proxy = MongoProxy()
+        return self._mongo_proxy
+
+    def get_many(self, tenant_id, resume_ids):
+        """
+        Returns {resume_id: markdown} for the resume IDs that exist; the
+        markdown is None for a resume whose content is empty or unreadable.
+        """
+        found = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for resume_id in dict.fromkeys(resume_ids):
+                entry = self._cache.get((tenant_id, resume_id))
+                if entry and entry[1] > now:
+                    self._cache.move_to_end((tenant_id, resume_id))
+                    found[resume_id] = entry[0]
+                    self.hits += 1
+                else:
+                    missing.append(resume_id)
+                    self.misses += 1
+
+        if missing:
+            documents = self.mongo_proxy.get_resume_documents(tenant_id, missing, MARKDOWN_PROJECTION)
+            for resume_id, doc in documents.items():
+                try:
+                    markdown = resume_markdown(doc)
+                except ValueError as e:
+                    logger.warning(f"Tenant {tenant_id}: resume {resume_id} is unreadable: {e}")
+                    markdown = None
+                found[resume_id] = markdown or None
+                if markdown:
+                    self._remember(tenant_id, resume_id, markdown)
+        return found
+
+    def get(self, tenant_id, resume_id):
+        """The resume's markdown, or None if there is no such resume or it has no content."""
+        return self.get_many(tenant_id, [resume_id]).get(resume_id)
+
+    def invalidate(self, tenant_id, resume_id):
+        with self._lock:
+            self._cache.pop((tenant_id, resume_id), None)
+
+    def _remember(self, tenant_id, resume_id, markdown):
+        with self._lock:
+            self._cache[(tenant_id, resume_id)] = (markdown, time.monotonic() + self.ttl_seconds)
+            self._cache.move_to_end((tenant_id, resume_id))
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+
+_loader = None
+_loader_lock = threading.Lock()
+
+
+def get_stored_resume_loader():
+    global _loader
+    if _loader is None:
+        with _loader_lock:
+            if _loader is None:
+                _loader = StoredResumeLoader()
+    return _loader
@@ -0,0 +1,120 @@
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from genfoundry.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class RedisUploadLeaseStore():
+    """
+    Tracks which ingestion tasks still need a content-addressed upload blob.
+
+    Re-uploads of the same file share one blob, so each task takes a lease on
+    it under its own upload ID and gives the lease back when it is done. The
+    blob is deleted only when the last lease is returned. Taking a lease with
+    the blob write and returning the last one with the blob delete both run
+    under a per-blob lock, so a new upload can never land between the final
+    release and the delete.
+    """
+
+    KEY_PREFIX = "upload_leases:"
+    LOCK_PREFIX = "upload_leases_lock:"
+    LOCK_TIMEOUT_SECONDS = 30
+    LOCK_POLL_SECONDS = 0.05
+
+    def __init__(self, redis_client, ttl_seconds) -> None:
+        self.redis_client = redis_client
+        self.ttl_seconds = ttl_seconds
+
+    def acquire(self, blob_key, upload_id, store_blob):
+        """Leases blob_key to upload_id and calls store_blob() to make sure the blob exists."""
+        with self._locked(blob_key):
+            pipe = self.redis_client.pipeline()
+            pipe.sadd(self.KEY_PREFIX + blob_key, upload_id)
+            pipe.expire(self.KEY_PREFIX + blob_key, self.ttl_seconds)
+            pipe.execute()
+            store_blob()
+
+    def release(self, blob_key, upload_id, delete_blob):
+        """
+        Returns upload_id's lease and calls delete_blob() if no other upload
+        holds one. Returning a lease twice is harmless. Returns True if the
+        blob was deleted.
+        """
+        with self._locked(blob_key):
+            self.redis_client.srem(self.KEY_PREFIX + blob_key, upload_id)
+            if self.redis_client.smembers(self.KEY_PREFIX + blob_key):
+                logger.debug(f"Upload blob {blob_key} is still leased, keeping it")
+                return False
+            self.redis_client.delete(self.KEY_PREFIX + blob_key)
+            delete_blob()
+            return True
+
+    @contextmanager
+    def _locked(self, blob_key):
+        lock_key = self.LOCK_PREFIX + blob_key
+        lock_token = str(uuid.uuid4())
+        deadline = time.monotonic() + self.LOCK_TIMEOUT_SECONDS
+        while not self.redis_client.set(lock_key, lock_token, nx=True, ex=self.LOCK_TIMEOUT_SECONDS):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Timed out waiting for the lease lock on {blob_key}")
+            time.sleep(self.LOCK_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            current = self.redis_client.get(lock_key)
+            if isinstance(current, bytes):
+                current = current.decode("utf-8")
+            if current == lock_token:
+                self.redis_client.delete(lock_key)
+
+
+class InMemoryUploadLeaseStore():
+    """
+    Process-local lease store, used when Redis is not available. It only
+    protects blobs shared by tasks in the same process as the uploads.
+    """
+
+    def __init__(self) -> None:
+        self._leases = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, blob_key, upload_id, store_blob):
+        with self._lock:
+            self._leases.setdefault(blob_key, set()).add(upload_id)
+            store_blob()
+
+    def release(self, blob_key, upload_id, delete_blob):
+        with self._lock:
+            holders = self._leases.get(blob_key, set())
+            holders.discard(upload_id)
+            if holders:
+                return False
+            self._leases.pop(blob_key, None)
+            delete_blob()
+            return True
+
+
+_in_memory_store = None
+
+
+def get_upload_lease_store():
+    """
+    Returns the lease store for upload blobs, kept in Redis alongside the
+    ingestion checkpoints. Falls back to the in-memory store if Redis cannot be set up.
+    """
+    if (Config.INGEST_CHECKPOINT_BACKEND or "").lower() == "redis":
+        try:
+            from genfoundry.km.persist.redis_proxy import get_redis_client
+            return RedisUploadLeaseStore(get_redis_client(), Config.INGEST_CHECKPOINT_TTL_SECONDS)
+        except Exception as e:
+            logger.error(f"Failed to initialize Redis upload lease store, using in-memory store: {e}")
+
+    global _in_memory_store
+    if _in_memory_store is None:
+        _in_memory_store = InMemoryUploadLeaseStore()
+    return _in_memory_store
@@ -0,0 +1,124 @@
+"""
+Duplicate-vector audit for tenant namespaces.
+
+Vectors stored before chunk IDs were deterministic have random node IDs, so a
+resume that was ingested twice has two full sets of chunks. The audit walks a
+tenant's namespace, groups vectors by resume (doc_id) and chunk text, and
+reports every group with more than one vector. With --fix it deletes the
+extra copies, keeping the vector with the canonical chunk ID where there is one.
+
+    python -m genfoundry.km.persist.vector_audit --tenant <tenant_id> [--fix]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import re
+
+from genfoundry.config import Config
+
+logger = logging.getLogger(__name__)
+
+FETCH_BATCH_SIZE = 100
+DELETE_BATCH_SIZE = 1000
+
+# "<resume_id>#chunk-<ordinal>-<content hash>", as written by build_resume_nodes
+CANONICAL_ID = re.compile(r"#chunk-\d+-[0-9a-f]{12}$")
+
+
+def chunk_content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+
+def list_vector_ids(index, namespace, prefix=None):
+    """
+    Returns the IDs of the vectors in namespace, optionally only those starting
+    with prefix. Works with the page shapes of both old and new Pinecone clients.
+    """
+    ids = []
+    for page in index.list(prefix=prefix, namespace=namespace):
+        entries = page.vectors if hasattr(page, "vectors") else page
+        ids.extend(entry if isinstance(entry, str) else entry.id for entry in entries)
+    return ids
+
+
+def delete_vector_ids(index, namespace, ids):
+    ids = list(ids)
+    for i in range(0, len(ids), DELETE_BATCH_SIZE):
+        index.delete(ids=ids[i:i + DELETE_BATCH_SIZE], namespace=namespace)
+
+
+def _vector_text(metadata):
+    # LlamaIndex keeps the node, including its text, as JSON in _node_content
+    try:
+        return json.loads(metadata.get("_node_content") or "{}").get("text") or ""
+    except (TypeError, ValueError):
+        return ""
+
+
+class VectorAuditor():
+    """Finds (and optionally removes) duplicate chunk vectors in one namespace."""
+
+    def __init__(self, index, namespace) -> None:
+        self.index = index
+        self.namespace = namespace
+
+    def audit(self, fix=False):
+        ids = list_vector_ids(self.index, self.namespace)
+        groups = {}
+        for i in range(0, len(ids), FETCH_BATCH_SIZE):
+            response = self.index.fetch(ids=ids[i:i + FETCH_BATCH_SIZE], namespace=self.namespace)
+            vectors = response.vectors if hasattr(response, "vectors") else response.get("vectors", {})
+            for vector_id, vector in vectors.items():
+                metadata = (vector.metadata if hasattr(vector, "metadata") else vector.get("metadata")) or {}
+                doc_id = metadata.get("doc_id") or vector_id.split("#", 1)[0]
+                key = (doc_id, chunk_content_hash(_vector_text(metadata)))
+                groups.setdefault(key, []).append(vector_id)
+
+        duplicates = {}
+        to_delete = []
+        for (doc_id, _), group in groups.items():
+            if len(group) < 2:
+                continue
+            # Keep a canonical ID if there is one, otherwise the first ID in sort order
+            keep = sorted(group, key=lambda v: (not CANONICAL_ID.search(v), v))[0]
+            extra = sorted(v for v in group if v != keep)
+            duplicates.setdefault(doc_id, []).extend(extra)
+            to_delete.extend(extra)
+
+        report = {
+            "namespace": self.namespace,
+            "vectors": len(ids),
+            "resumes": len({doc_id for doc_id, _ in groups}),
+            "legacy_ids": sum(1 for v in ids if not CANONICAL_ID.search(v)),
+            "duplicate_vectors": len(to_delete),
+            "resumes_with_duplicates": len(duplicates),
+            "duplicates_by_resume": {doc_id: len(extra) for doc_id, extra in sorted(duplicates.items())},
+            "deleted": 0,
+        }
+        if fix and to_delete:
+            delete_vector_ids(self.index, self.namespace, to_delete)
+            report["deleted"] = len(to_delete)
+            logger.info(f"Deleted {len(to_delete)} duplicate vectors from {self.namespace}")
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report duplicate resume vectors in a tenant's namespace.")
+    parser.add_argument("--tenant", required=True, help="tenant ID")
+    parser.add_argument("--namespace", help="namespace to audit (default: the tenant's active namespace)")
+    parser.add_argument("--fix", action="store_true", help="delete the duplicate vectors")
+    args = parser.parse_args()
+
+    from pinecone import Pinecone
+    from genfoundry.km.persist.vector_namespace_registry import get_tenant_namespace
+
+    namespace = args.namespace or get_tenant_namespace(args.tenant)
+    index = Pinecone(api_key=Config.PINECONE_API_KEY).Index(Config.PINECONE_INDEX)
+    report = VectorAuditor(index, namespace).audit(fix=args.fix)
+    report["tenant_id"] = args.tenant
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,103 @@
+import json
 import logging
-import uuid
+import math
 from pinecone import Pinecone
 from llama_index.vector_stores.pinecone import PineconeVectorStore
 from llama_index.llms.openai import OpenAI
-from llama_index.core import VectorStoreIndex, StorageContext, Document
+from llama_index.core import Document
 from llama_index.core.node_parser import SentenceSplitter
-from llama_index.core.schema import IndexNode
+from llama_index.core.schema import IndexNode, MetadataMode, TextNode, NodeRelationship, RelatedNodeInfo
 from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.llms.openai import OpenAI
 from llama_index.core import Settings
 from genfoundry.config import Config
+from genfoundry.km.utils.openai_rate_limiter import llama_index_client_kwargs
+from genfoundry.km.persist.vector_namespace_registry import doc_namespace, get_vector_namespace_registry, get_tenant_namespace
+from genfoundry.km.persist.vector_audit import chunk_content_hash, list_vector_ids, delete_vector_ids
+from genfoundry.km.persist.resume_metadata_store import slim_vector_metadata
+from genfoundry.km.preprocess.resume_chunker import ResumeChunker
+from genfoundry.km.utils.token_counter import count_tokens
 
 logger = logging.getLogger(__name__)
 
+
+def build_resume_nodes(resume_id: str, resume: str, metadata: dict, chunker=None):
+    """
+    Returns the nodes for a resume, chunked as configured by Config.VECTOR_CHUNKER
+    ("section" or "sentence"), with IDs "chunk-<ordinal>-<content hash>".
+
+    Nodes carry only the filterable metadata keys; the full metadata is kept
+    with the resume in Mongo and joined after retrieval (ResumeMetadataJoiner).
+    """
+    metadata["doc_id"] = resume_id
+    resume_doc = Document(
+        text=resume,
+        metadata=slim_vector_metadata(metadata),
+        id_=resume_id
+    )
+    # A bare reference: as_related_node_info() would copy the metadata into
+    # every chunk's payload a second time
+    source = RelatedNodeInfo(node_id=resume_id)
+    if (chunker or Config.VECTOR_CHUNKER) == "sentence":
+        node_parser = SentenceSplitter(chunk_size=512, chunk_overlap=20)
+        nodes = node_parser.get_nodes_from_documents([resume_doc])
+        for node in nodes:
+            node.relationships = {NodeRelationship.SOURCE: source}
+    else:
+        section_chunker = ResumeChunker()
+        # The metadata is embedded with every chunk, so it counts against the chunk size
+        metadata_tokens = count_tokens(resume_doc.get_metadata_str(MetadataMode.EMBED), section_chunker.model)
+        max_tokens = max(section_chunker.max_tokens // 2, section_chunker.max_tokens - metadata_tokens)
+        nodes = []
+        for chunk in section_chunker.chunk(resume, max_tokens):
+            nodes.append(TextNode(
+                text=chunk["text"],
+                # section_type names the chunk; sections lists every section merged into it,
+                # so small skills and education sections stay findable by tag
+                metadata={**resume_doc.metadata, "section_type": chunk["section_type"], "sections": chunk["sections"]},
+                excluded_embed_metadata_keys=["sections"],
+                excluded_llm_metadata_keys=["sections"],
+                relationships={NodeRelationship.SOURCE: source},
+            ))
+    for ordinal, node in enumerate(nodes):
+        # Pinecone stores these as "<resume_id>#chunk-<n>-<hash>": the same resume
+        # text always maps to the same IDs, so re-ingesting overwrites in place
+        node.id_ = f"chunk-{ordinal}-{chunk_content_hash(node.get_content())}"
+    return nodes
+
+
+CENTROID_UPSERT_BATCH_SIZE = 100
+
+
+def centroid(vectors):
+    """The normalized mean of vectors, or None if there are none."""
+    vectors = [v for v in vectors if v]
+    if not vectors:
+        return None
+    mean = [sum(values) / len(vectors) for values in zip(*vectors)]
+    norm = math.sqrt(sum(x * x for x in mean))
+    return [x / norm for x in mean] if norm else None
+
+
+def resume_centroid_records(nodes):
+    """
+    One Pinecone record per resume among the embedded nodes: ID the resume ID,
+    values the normalized centroid of its chunk embeddings, metadata the
+    resume's vector metadata without the chunk's section type.
+    """
+    grouped = {}
+    for node in nodes:
+        grouped.setdefault(node.ref_doc_id, []).append(node)
+    records = []
+    for resume_id, resume_nodes in grouped.items():
+        values = centroid([node.embedding for node in resume_nodes])
+        if values is None:
+            continue
+        metadata = {k: v for k, v in resume_nodes[0].metadata.items() if k not in ("section_type", "sections")}
+        records.append({"id": resume_id, "values": values, "metadata": {**metadata, "doc_id": resume_id}})
+    return records
+
+
 class PineconeVectorizer:
     def __init__(self) -> None:
         logger.debug("Initializing PineconeVectorizer")
@@ -22,11 +107,12 @@ class PineconeVectorizer:
         openai_api_key = Config.OPENAI_API_KEY
         pinecone_api_key = Config.PINECONE_API_KEY
 
-        self.openai_llm = OpenAI(api_key=openai_api_key, model=llm_model, temperature=0.0)
+        self.openai_llm = OpenAI(api_key=openai_api_key, model=llm_model, temperature=0.0, **llama_index_client_kwargs())
 
-        Settings.llm = OpenAI(model=llm_model, temperature=0.0)
-        embed_model = OpenAIEmbedding(model=Config.TEXT_EMBEDDING_MODEL, api_key=openai_api_key)        
+        Settings.llm = OpenAI(model=llm_model, temperature=0.0, **llama_index_client_kwargs())
+        embed_model = OpenAIEmbedding(model=Config.TEXT_EMBEDDING_MODEL, api_key=openai_api_key, **llama_index_client_kwargs())        
         Settings.embed_model = embed_model
+        self.embed_model = embed_model
 
         # Pinecone settings
         self.pinecone_api_key = Config.PINECONE_API_KEY
@@ -57,33 +143,11 @@ class PineconeVectorizer:
             logger.debug(f"Text resume:\n {text_resume}")
             logger.debug(f"Metadata:\n {metadata}")
             metadata["doc_id"] = resume_id
-            logger.debug("Creating Document object for resume and metadata")
-            resume_doc = Document(
-                text=text_resume,
-                metadata=metadata,
-                id_=str(uuid.uuid4())
-            )            
-
-            # Initialize JsonNodeParser with custom settings
-            logger.debug("Initializing Parser...")
-            #json_node_parser = JSONNodeParser(
-            #    include_metadata=True,      # Include metadata in each node
-            #    include_prev_next_rel=True  # Maintain node relationships
-            #)
-            node_parser = SentenceSplitter(chunk_size=512, chunk_overlap=20)
-
-            # Parse nodes using JSONNodeParser
-            logger.debug("Parsing nodes from document...")
-            nodes = node_parser.get_nodes_from_documents([resume_doc])
-            logger.debug(f"Nodes parsed successfully: {len(nodes)} nodes found.")
-
-            # Store nodes in Pinecone
-            logger.debug("Storing nodes in Pinecone...")
-            vectorstore = self.get_tenant_vectorestore(tenant_id)
-            storage_ctx = StorageContext.from_defaults(vector_store=vectorstore)
-            index = VectorStoreIndex(storage_context=storage_ctx, 
-                                     nodes=[])
-            index.insert_nodes(nodes)
+            # Same chunk IDs and reconciliation as the text path, so storing a
+            # resume again overwrites its vectors instead of adding new ones
+            if not isinstance(text_resume, str):
+                text_resume = json.dumps(text_resume)
+            self.vectorize_and_store_text_resume(resume_id, text_resume, metadata, tenant_id)
 
             logger.debug(f"Resume {resume_id} successfully stored in Pinecone.")
         except Exception as e:
@@ -109,32 +173,22 @@ class PineconeVectorizer:
             logger.debug(f"Metadata:\n {metadata}")
             metadata["doc_id"] = resume_id
             #resume_str = json.dumps(resume)
-            logger.debug("Creating Document object for resume and metadata")
-            resume_doc = Document(
-                text=resume,
-                metadata=metadata,
-                id_=resume_id
-            )            
-
             logger.debug("Parsing nodes from document...")
-            node_parser = SentenceSplitter(chunk_size=512, chunk_overlap=20)
-
-            # Parse nodes using SentenceSplitter
-            nodes = node_parser.get_nodes_from_documents([resume_doc])
+            nodes = self.build_resume_nodes(resume_id, resume, metadata)
             ##############
             # Parse nodes recursively - added as a substitution for the above code
             #nodes = self._parse_recursively([resume_doc])
             ##############
             logger.debug(f"Nodes parsed successfully: {len(nodes)} nodes found.")
 
-            # Store nodes in Pinecone
-            logger.debug("Storing nodes in Pinecone...")
-            vectorstore = self.get_tenant_vectorestore(tenant_id)
-
-            storage_ctx = StorageContext.from_defaults(vector_store=vectorstore)
-            index = VectorStoreIndex(storage_context=storage_ctx, 
-                                     nodes=[])
-            index.insert_nodes(nodes)
+            # Embed once, then store in every namespace the tenant writes to
+            # (the active one, plus a shadow namespace while a re-index builds it)
+            self.embed_nodes(nodes)
+            for namespace in get_vector_namespace_registry().get_write_namespaces(tenant_id):
+                logger.debug(f"Storing nodes in Pinecone namespace {namespace}...")
+                self.get_namespace_vectorstore(namespace).add(nodes)
+                self.reconcile_resume(namespace, resume_id, nodes)
+                self.store_resume_centroids(namespace, nodes)
 
             logger.debug(f"Resume {resume_id} successfully stored in Pinecone.")
 
@@ -152,15 +206,84 @@ class PineconeVectorizer:
         """
         try:
             logger.debug(f"Deleting resume {resume_id}")
-            vectorstore = self.get_tenant_vectorestore(tenant_id)
-            storage_ctx = StorageContext.from_defaults(vector_store=vectorstore)
-            pinecone_index = VectorStoreIndex(storage_context=storage_ctx, nodes=[])
-            pinecone_index.delete(resume_id)
+            index = self.pinecone_client.Index(self.pinecone_index_name)
+            for namespace in get_vector_namespace_registry().get_write_namespaces(tenant_id):
+                self.get_namespace_vectorstore(namespace).delete(resume_id)
+                index.delete(ids=[resume_id], namespace=doc_namespace(namespace))
             logger.debug(f"Resume {resume_id} successfully deleted from Pinecone.")
         except Exception as e:
             logger.error(f"Error deleting resume {resume_id}: {e}")
             raise
 
+    def build_resume_nodes(self, resume_id: str, resume: str, metadata: dict):
+        """
+        Splits a resume into the nodes stored in Pinecone. Node IDs are the chunk
+        ordinals, so storing the same resume again overwrites its vectors
+        instead of adding a second copy.
+        """
+        return build_resume_nodes(resume_id, resume, metadata)
+
+    def reconcile_resume(self, namespace: str, resume_id: str, nodes):
+        """
+        Deletes the resume's vectors in namespace that are not among nodes: chunks
+        left from an earlier version of the resume, or legacy random-ID copies.
+        Returns the number of vectors deleted.
+        """
+        keep_ids = {f"{resume_id}#{node.node_id}" for node in nodes}
+        index = self.pinecone_client.Index(self.pinecone_index_name)
+        try:
+            existing = list_vector_ids(index, namespace, prefix=f"{resume_id}#")
+        except Exception as e:
+            # Listing by prefix is only available on serverless indexes
+            logger.warning(f"Could not list vectors for {resume_id} in {namespace}, skipping reconciliation: {e}")
+            return 0
+        stale = [vector_id for vector_id in existing if vector_id not in keep_ids]
+        if stale:
+            delete_vector_ids(index, namespace, stale)
+            logger.debug(f"Removed {len(stale)} stale vectors for {resume_id} from {namespace}")
+        return len(stale)
+
+    def store_resume_centroids(self, namespace, nodes):
+        """
+        Upserts the centroid of each resume's embedded nodes into the doc-level
+        namespace of namespace. Resumes are keyed by ID, so storing a resume
+        again replaces its centroid.
+        """
+        records = resume_centroid_records(nodes)
+        index = self.pinecone_client.Index(self.pinecone_index_name)
+        for i in range(0, len(records), CENTROID_UPSERT_BATCH_SIZE):
+            index.upsert(vectors=records[i:i + CENTROID_UPSERT_BATCH_SIZE], namespace=doc_namespace(namespace))
+        return len(records)
+
+    def embed_nodes(self, nodes, embed_model=None):
+        """Sets each node's embedding from the text VectorStoreIndex would embed."""
+        embed_model = embed_model or self.embed_model
+        texts = [node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes]
+        embeddings = embed_model.get_text_embedding_batch(texts) if texts else []
+        for node, embedding in zip(nodes, embeddings):
+            node.embedding = embedding
+        return nodes
+
+    def fetch_resume_metadata(self, namespace: str, resume_id: str):
+        """
+        Reads the metadata stored with one of a resume's vectors, for resumes
+        whose metadata was never saved in MongoDB. Returns None if not found.
+        """
+        index = self.pinecone_client.Index(self.pinecone_index_name)
+        dimension = index.describe_index_stats().dimension
+        # Any non-zero vector will do; the filter picks the resume
+        probe = [1.0] + [0.0] * (dimension - 1)
+        response = index.query(vector=probe, top_k=1, namespace=namespace, include_metadata=True,
+                               filter={"doc_id": {"$eq": resume_id}})
+        matches = response.matches if hasattr(response, "matches") else response.get("matches", [])
+        if not matches:
+            return None
+        match_metadata = matches[0].metadata if hasattr(matches[0], "metadata") else matches[0].get("metadata", {})
+        return {
+            key: value for key, value in (match_metadata or {}).items()
+            if not key.startswith("_") and key not in ("doc_id", "ref_doc_id", "document_id")
+        }
+
     def _parse_recursively(self, base_nodes):
         sub_chunk_sizes = [256, 512]
         sub_node_parsers = [
@@ -183,8 +306,10 @@ class PineconeVectorizer:
         return all_nodes
     
     def get_tenant_vectorestore(self, tenant_id):
-        """Returns the Pinecone namespace for the tenant."""
-        pinecone_namespace = f"{tenant_id}_Resumes_NS"  # Per-tenant namespace
+        """Returns the vector store for the tenant's active Pinecone namespace."""
+        return self.get_namespace_vectorstore(get_tenant_namespace(tenant_id))
+
+    def get_namespace_vectorstore(self, pinecone_namespace):
         vector_store = PineconeVectorStore(
             index_name=self.pinecone_index_name,
             api_key=self.pinecone_api_key,
@@ -0,0 +1,160 @@
+import logging
+import threading
+import time
+
+from genfoundry.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def default_namespace(tenant_id):
+    """The namespace a tenant's resumes live in until a re-index switches it."""
+    return f"{tenant_id}_Resumes_NS"  # Per-tenant namespace
+
+
+def doc_namespace(namespace):
+    """The namespace holding one centroid vector per resume for the chunk vectors in namespace."""
+    return f"{namespace}{Config.VECTOR_DOC_NAMESPACE_SUFFIX}"
+
+
+class VectorNamespaceRegistry():
+    """
+    Records which Pinecone namespace serves each tenant's searches, and which
+    shadow namespace (if any) a re-index is currently building.
+
+    Switching a tenant to a rebuilt namespace is a single Redis transaction, so
+    every process sees either the old or the new namespace, never a mix. The
+    namespace it replaced is kept under the "previous" key for rollback.
+    """
+
+    ACTIVE_PREFIX = "vector_ns:active:"
+    BUILDING_PREFIX = "vector_ns:building:"
+    PREVIOUS_PREFIX = "vector_ns:previous:"
+    CENTROIDS_PREFIX = "vector_ns:centroids:"
+
+    def __init__(self, redis_client, cache_seconds=None) -> None:
+        self.redis_client = redis_client
+        self.cache_seconds = cache_seconds if cache_seconds is not None else Config.VECTOR_NAMESPACE_CACHE_SECONDS
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get_active_namespace(self, tenant_id):
+        """Namespace searches should read. Falls back to the default namespace if Redis is unavailable."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(tenant_id)
+            if cached and cached[1] > now:
+                return cached[0]
+        try:
+            namespace = self._decode(self.redis_client.get(self._key(self.ACTIVE_PREFIX, tenant_id)))
+        except Exception as e:
+            logger.warning(f"Could not read active namespace for tenant {tenant_id}, using default: {e}")
+            return default_namespace(tenant_id)
+        namespace = namespace or default_namespace(tenant_id)
+        with self._lock:
+            self._cache[tenant_id] = (namespace, now + self.cache_seconds)
+        return namespace
+
+    def get_building_namespace(self, tenant_id):
+        return self._decode(self.redis_client.get(self._key(self.BUILDING_PREFIX, tenant_id)))
+
+    def get_write_namespaces(self, tenant_id):
+        """
+        Namespaces a new or deleted resume must be applied to: the active one,
+        plus the shadow namespace while a re-index is building it.
+        """
+        namespaces = [self.get_active_namespace(tenant_id)]
+        try:
+            building = self.get_building_namespace(tenant_id)
+        except Exception as e:
+            logger.warning(f"Could not read building namespace for tenant {tenant_id}: {e}")
+            building = None
+        if building and building not in namespaces:
+            namespaces.append(building)
+        return namespaces
+
+    def start_build(self, tenant_id, namespace):
+        self.redis_client.set(self._key(self.BUILDING_PREFIX, tenant_id), namespace)
+        # Every resume of a build gets its centroid, so its doc namespace will be complete
+        self.redis_client.set(self._key(self.CENTROIDS_PREFIX, namespace), 1)
+
+    def has_resume_centroids(self, namespace):
+        """
+        Whether every resume in namespace has its centroid in doc_namespace(namespace).
+        Namespaces built before centroids were stored need a re-index first.
+        """
+        now = time.monotonic()
+        key = self._key(self.CENTROIDS_PREFIX, namespace)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[1] > now:
+                return cached[0]
+        complete = bool(self.redis_client.get(key))
+        with self._lock:
+            self._cache[key] = (complete, now + self.cache_seconds)
+        return complete
+
+    def abandon_build(self, tenant_id):
+        self.redis_client.delete(self._key(self.BUILDING_PREFIX, tenant_id))
+
+    def activate(self, tenant_id, namespace):
+        """Atomically makes namespace the active one and returns the namespace it replaced."""
+        previous = self.get_active_namespace_uncached(tenant_id)
+        pipe = self.redis_client.pipeline()
+        pipe.set(self._key(self.PREVIOUS_PREFIX, tenant_id), previous)
+        pipe.set(self._key(self.ACTIVE_PREFIX, tenant_id), namespace)
+        pipe.delete(self._key(self.BUILDING_PREFIX, tenant_id))
+        pipe.execute()
+        with self._lock:
+            self._cache.pop(tenant_id, None)
+        logger.info(f"Tenant {tenant_id} now searches namespace {namespace} (was {previous})")
+        return previous
+
+    def get_active_namespace_uncached(self, tenant_id):
+        namespace = self._decode(self.redis_client.get(self._key(self.ACTIVE_PREFIX, tenant_id)))
+        return namespace or default_namespace(tenant_id)
+
+    def get_previous_namespace(self, tenant_id):
+        return self._decode(self.redis_client.get(self._key(self.PREVIOUS_PREFIX, tenant_id)))
+
+    @staticmethod
+    def _key(prefix, tenant_id):
+        return f"{prefix}{tenant_id}"
+
+    @staticmethod
+    def _decode(value):
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+_registry = None
+
+
+def get_vector_namespace_registry():
+    global _registry
+    if _registry is None:
+        from genfoundry.km.persist.redis_proxy import get_redis_client
+        _registry = VectorNamespaceRegistry(get_redis_client())
+    return _registry
+
+
+def get_tenant_namespace(tenant_id):
+    """Returns the Pinecone namespace the tenant's searches should use."""
+    try:
+        return get_vector_namespace_registry().get_active_namespace(tenant_id)
+    except Exception as e:
+        logger.warning(f"Vector namespace registry unavailable, using default namespace: {e}")
+        return default_namespace(tenant_id)
+
+
+def get_tenant_doc_namespace(tenant_id):
+    """
+    Returns the doc-level namespace for the tenant's searches, or None if the
+    active namespace has no complete set of resume centroids.
+    """
+    namespace = get_tenant_namespace(tenant_id)
+    try:
+        if get_vector_namespace_registry().has_resume_centroids(namespace):
+            return doc_namespace(namespace)
+    except Exception as e:
+        logger.warning(f"Vector namespace registry unavailable, not using resume centroids: {e}")
+    return None
@@ -3,6 +3,7 @@ import json
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_openai import ChatOpenAI
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
 
 candidate_research_prompt_json = '''
     You are a document transformer and you are tasked with standardizing resume text into a json string. The resume text will be provided as input and you must return a JSON string with the following format:
@@ -82,7 +83,7 @@ class CandidateResearcher:
         self.openai_api_key = openai_api_key
         self.langchain_api_key = langchain_api_key
         self.llm_model = llm_model
-        self.llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key)
+        self.llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key, **langchain_client_kwargs())
  
     def research(self, resume_str):
         """
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from genfoundry.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def compute_content_hash(file_path, chunk_size=1024 * 1024):
+    """
+    Returns the sha256 hex digest of the file contents at file_path.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DiskCacheBackend():
+    """
+    Stores cache entries as JSON files in a local directory.
+
+    The file modification time doubles as the last-access time, so eviction
+    removes the least recently used entries once the directory grows past
+    max_bytes or max_entries.
+    """
+
+    def __init__(self, cache_dir, max_bytes, max_entries) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read()
+            os.utime(path, None)
+            return value
+        except FileNotFoundError:
+            return None
+
+    def set(self, key, value):
+        # Write to a temp file first so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._evict()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total_bytes = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+                total_bytes += stat.st_size
+
+            entries.sort()
+            while entries and (total_bytes > self.max_bytes or len(entries) > self.max_entries):
+                _, size, name = entries.pop(0)
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                    logger.debug(f"Evicted parsed document cache entry: {name}")
+                except FileNotFoundError:
+                    pass
+                total_bytes -= size
+
+
+class RedisCacheBackend():
+    """
+    Stores cache entries in Redis so every web and worker process shares them.
+
+    A sorted set tracks last-access time per key and a counter tracks the
+    total stored size; the oldest entries are dropped once either bound is
+    exceeded.
+    """
+
+    KEY_PREFIX = "parse_cache:"
+    LRU_KEY = "parse_cache:__lru__"
+    BYTES_KEY = "parse_cache:__bytes__"
+
+    def __init__(self, redis_client, max_bytes, max_entries) -> None:
+        self.redis_client = redis_client
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    def get(self, key):
+        value = self.redis_client.get(self.KEY_PREFIX + key)
+        if value is None:
+            return None
+        self.redis_client.zadd(self.LRU_KEY, {key: time.time()})
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key, value):
+        size = len(value.encode("utf-8"))
+        previous_size = self.redis_client.strlen(self.KEY_PREFIX + key) or 0
+        pipe = self.redis_client.pipeline()
+        pipe.set(self.KEY_PREFIX + key, value)
+        pipe.zadd(self.LRU_KEY, {key: time.time()})
+        pipe.incrby(self.BYTES_KEY, size - previous_size)
+        pipe.execute()
+        self._evict()
+
+    def delete(self, key):
+        size = self.redis_client.strlen(self.KEY_PREFIX + key) or 0
+        pipe = self.redis_client.pipeline()
+        pipe.delete(self.KEY_PREFIX + key)
+        pipe.zrem(self.LRU_KEY, key)
+        pipe.decrby(self.BYTES_KEY, size)
+        pipe.execute()
+
+    def _evict(self):
+        while True:
+            total_bytes = int(self.redis_client.get(self.BYTES_KEY) or 0)
+            total_entries = self.redis_client.zcard(self.LRU_KEY)
+            if total_bytes <= self.max_bytes and total_entries <= self.max_entries:
+                return
+            oldest = self.redis_client.zpopmin(self.LRU_KEY)
+            if not oldest:
+                return
+            key = oldest[0][0]
+            key = key.decode("utf-8") if isinstance(key, bytes) else key
+            size = self.redis_client.strlen(self.KEY_PREFIX + key) or 0
+            pipe = self.redis_client.pipeline()
+            pipe.delete(self.KEY_PREFIX + key)
+            pipe.decrby(self.BYTES_KEY, size)
+            pipe.execute()
+            logger.debug(f"Evicted parsed document cache entry: {key}")
+
+
+class ParsedDocumentCache():
+    """
+    Content-hash keyed cache of parser output.
+
+    Keys combine the sha256 of the uploaded file with the parser name and
+    parser version, so the same file parsed by a newer parser is a miss.
+    Each entry holds the parsed text, the page count and the parser version.
+    Cache failures are logged and treated as misses; they never fail a parse.
+    """
+
+    def __init__(self, backend) -> None:
+        self.backend = backend
+
+    @staticmethod
+    def make_key(content_hash, parser_name, parser_version):
+        return f"{parser_name}:{parser_version}:{content_hash}".replace("/", "_")
+
+    def get(self, content_hash, parser_name, parser_version):
+        if self.backend is None:
+            return None
+        key = self.make_key(content_hash, parser_name, parser_version)
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Parsed document cache lookup failed for {key}: {e}")
+            return None
+        if value is None:
+            logger.debug(f"Parsed document cache miss: {key}")
+            return None
+        logger.debug(f"Parsed document cache hit: {key}")
+        return json.loads(value)
+
+    def put(self, content_hash, parser_name, parser_version, text, page_count=None):
+        if self.backend is None or text is None:
+            return
+        key = self.make_key(content_hash, parser_name, parser_version)
+        entry = {
+            "text": text,
+            "page_count": page_count,
+            "parser": parser_name,
+            "parser_version": parser_version,
+        }
+        try:
+            self.backend.set(key, json.dumps(entry))
+        except Exception as e:
+            logger.warning(f"Parsed document cache store failed for {key}: {e}")
+
+
+_parsed_document_cache = None
+_parsed_document_cache_lock = threading.Lock()
+
+
+def get_parsed_document_cache():
+    """
+    Returns the process-wide ParsedDocumentCache configured by Config.PARSE_CACHE_BACKEND
+    ("disk", "redis" or "none").
+    """
+    global _parsed_document_cache
+    if _parsed_document_cache is None:
+        with _parsed_document_cache_lock:
+            if _parsed_document_cache is None:
+                backend_name = (Config.PARSE_CACHE_BACKEND or "none").lower()
+                backend = None
+                try:
+                    if backend_name == "disk":
+                        backend = DiskCacheBackend(
+                            Config.PARSE_CACHE_DIR,
+                            Config.PARSE_CACHE_MAX_BYTES,
+                            Config.PARSE_CACHE_MAX_ENTRIES,
+                        )
+                    elif backend_name == "redis":
+                        from genfoundry.km.persist.redis_proxy import get_redis_client
+                        backend = RedisCacheBackend(
+                            get_redis_client(),
+                            Config.PARSE_CACHE_MAX_BYTES,
+                            Config.PARSE_CACHE_MAX_ENTRIES,
+                        )
+                except Exception as e:
+                    logger.error(f"Failed to initialize parsed document cache backend '{backend_name}': {e}")
+                    backend = None
+                logger.debug(f"Parsed document cache backend: {backend_name if backend else 'none'}")
+                _parsed_document_cache = ParsedDocumentCache(backend)
+    return _parsed_document_cache
@@ -0,0 +1,313 @@
+"""
+Token budgeting for resume prompts.
+
+ResumeCompressor splits a parsed resume into sections (the parser often
+collapses the whole resume onto one line, so headings are found inline),
+keeps the sections the prompt type needs and, only when the resume is over
+the budget left by the prompt template and the other inputs, removes page
+boilerplate and drops or trims low-value sections, always in the same order,
+until it fits. PromptBudget applies the per-prompt ceilings from
+Config.PROMPT_TOKEN_CEILINGS and invoke_with_usage reports the tokens each
+LLM call actually used.
+"""
+import logging
+import re
+import threading
+
+from genfoundry.config import Config
+from genfoundry.km.utils.token_counter import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+SECTION_HEADER = "header"
+
+# Heading phrases per section type. Longer phrases are matched first.
+SECTION_HEADINGS = {
+    "summary": ["professional summary", "executive summary", "career summary", "summary", "professional profile",
+                "profile", "about me", "career objective", "objective", "career highlights", "highlights"],
+    "experience": ["professional experience", "work experience", "relevant experience", "employment history",
+                   "work history", "career history", "experience", "employment"],
+    "education": ["education and training", "academic background", "academic qualifications", "education"],
+    "skills": ["technical skills", "leadership skills", "core competencies", "areas of expertise", "key skills",
+               "skills", "competencies", "technologies"],
+    "certifications": ["licenses and certifications", "certifications and licenses", "certifications",
+                       "certificates", "licenses"],
+    "projects": ["selected projects", "key projects", "projects"],
+    "awards": ["awards and honors", "honors and awards", "awards", "honors", "achievements"],
+    "publications": ["publications", "patents", "presentations"],
+    "volunteer": ["volunteer experience", "community involvement", "volunteering"],
+    "languages": ["languages"],
+    "interests": ["hobbies and interests", "personal interests", "interests", "hobbies"],
+    "references": ["references", "referees"],
+}
+
+# Order in which sections are dropped when a prompt is over budget
+DROP_ORDER = ["references", "interests", "volunteer", "publications", "awards", "languages", "projects",
+              "certifications", "summary", "skills"]
+
+# Order in which the remaining sections are trimmed, longest content first within each
+TRIM_ORDER = ["experience", "skills", "summary", "education", SECTION_HEADER]
+
+# Sections each prompt type needs; None keeps every section until the budget forces drops
+PROMPT_SECTION_PROFILES = {
+    # The metadata prompt extracts technical/leadership skills and certifications
+    "metadata": {SECTION_HEADER, "experience", "education", "skills", "certifications"},
+    "analyze": None,
+    "assess": None,
+    "pitch_notes": None,
+}
+
+_phrase_to_section = {
+    phrase: section for section, phrases in SECTION_HEADINGS.items() for phrase in phrases
+}
+_phrases = sorted(_phrase_to_section, key=len, reverse=True)
+_alternation = "|".join(re.escape(p) for p in _phrases)
+
+# Markdown headings ("## Work Experience") and bold headings ("**EDUCATION**"), any case
+_decorated_heading = re.compile(
+    rf"(?:#{{1,6}}\s*\**\s*({_alternation})\s*:?\s*\**|\*\*\s*({_alternation})\s*:?\s*\*\*)",
+    re.IGNORECASE,
+)
+# Plain ALL CAPS headings ("WORK EXPERIENCE"), which survive whitespace collapsing
+_upper_heading = re.compile(
+    rf"(?<![A-Za-z])({'|'.join(re.escape(p.upper()) for p in _phrases)}):?(?![A-Za-z])"
+)
+# Title case headings alone on a line ("Education" / "Skills:")
+_line_heading = re.compile(rf"^[ \t]*({_alternation})[ \t]*:?[ \t]*$", re.IGNORECASE | re.MULTILINE)
+
+_page_footer = re.compile(r"\bpage \d+ (?:of|/) \d+\b", re.IGNORECASE)
+
+_boilerplate = [
+    _page_footer,
+    re.compile(r"\bcurriculum vitae\b", re.IGNORECASE),
+    re.compile(r"(?:-{3,}|_{3,}|={3,}|\*{3,})"),
+    re.compile(r"\breferences (?:are )?available (?:up)?on request\.?", re.IGNORECASE),
+]
+
+
+def split_sections(text):
+    """
+    Splits resume text into [(section_type, text)] in document order. Text
+    before the first recognised heading is the "header" section.
+    """
+    matches = []
+    for regex in (_decorated_heading, _upper_heading, _line_heading):
+        for m in regex.finditer(text):
+            phrase = next(g for g in m.groups() if g)
+            matches.append((m.start(), m.end(), _phrase_to_section[phrase.lower()]))
+
+    # Keep the earliest, longest match where matches overlap
+    matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+    headings = []
+    for start, end, section in matches:
+        if headings and start < headings[-1][1]:
+            continue
+        headings.append((start, end, section))
+
+    sections = []
+    header_end = headings[0][0] if headings else len(text)
+    if text[:header_end].strip():
+        sections.append((SECTION_HEADER, text[:header_end].strip()))
+    for i, (start, end, section) in enumerate(headings):
+        body_end = headings[i + 1][0] if i + 1 < len(headings) else len(text)
+        sections.append((section, text[start:body_end].strip()))
+    return sections
+
+
+def split_pages(text):
+    """Splits text at form feeds, or else after each "Page N of M" footer."""
+    if "\f" in text:
+        pages = text.split("\f")
+    else:
+        ends = [m.end() for m in _page_footer.finditer(text)]
+        pages = [text[start:end] for start, end in zip([0] + ends, ends + [len(text)])]
+    return [page for page in pages if page.strip()]
+
+
+def _line_key(line):
+    for regex in _boilerplate:
+        line = regex.sub(" ", line)
+    return " ".join(line.split()).lower()
+
+
+def page_edge_lines(text, edge_lines=2):
+    """
+    Lines that open or close every page (running headers and footers such as
+    the candidate's name), as lowercased keys. Empty for single-page text.
+    """
+    pages = split_pages(text)
+    if len(pages) < 2:
+        return set()
+    repeated = None
+    for page in pages:
+        lines = [key for key in map(_line_key, page.split("\n")) if key]
+        edges = {key for key in lines[:edge_lines] + lines[-edge_lines:] if len(key) > 3}
+        repeated = edges if repeated is None else repeated & edges
+    return repeated
+
+
+def remove_boilerplate(text):
+    """Removes page footers, separators and the header/footer lines repeated on every page."""
+    running = page_edge_lines(text)
+    for regex in _boilerplate:
+        text = regex.sub(" ", text)
+
+    # Keep the first copy; repeated content lines (bullets, dates, locations) are never touched
+    seen = set()
+    lines = []
+    for line in text.split("\n"):
+        key = " ".join(line.split()).lower()
+        if key in running and key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    text = "\n".join(lines)
+
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n\s*\n+", "\n\n", text)
+    return text.strip()
+
+
+class ResumeCompressor():
+    """Deterministic, section-aware resume compressor."""
+
+    def __init__(self, model=None) -> None:
+        self.model = model or Config.LLM_MODEL
+
+    def compress(self, text, max_tokens, keep_sections=None):
+        """
+        Returns a dict with the compressed "text", "original_tokens", "tokens"
+        and the "dropped_sections" / "trimmed_sections" lists.
+        """
+        original_tokens = count_tokens(text, self.model)
+        result = {
+            "text": text,
+            "original_tokens": original_tokens,
+            "tokens": original_tokens,
+            "dropped_sections": [],
+            "trimmed_sections": [],
+        }
+        if not text or (original_tokens <= max_tokens and not keep_sections):
+            return result
+
+        # Within budget the resume is passed through as parsed
+        cleaned = remove_boilerplate(text) if original_tokens > max_tokens else text
+        sections = split_sections(cleaned)
+        # Without recognisable headings there is nothing to select from
+        if keep_sections and any(s != SECTION_HEADER for s, _ in sections):
+            result["dropped_sections"] = sorted({s for s, _ in sections if s not in keep_sections})
+            sections = [(s, body) for s, body in sections if s in keep_sections]
+
+        tokens = [count_tokens(body, self.model) for _, body in sections]
+
+        for section in DROP_ORDER:
+            if sum(tokens) <= max_tokens:
+                break
+            if any(s == section for s, _ in sections):
+                keep = [i for i, (s, _) in enumerate(sections) if s != section]
+                sections = [sections[i] for i in keep]
+                tokens = [tokens[i] for i in keep]
+                result["dropped_sections"].append(section)
+
+        for section in TRIM_ORDER:
+            excess = sum(tokens) - max_tokens
+            if excess <= 0:
+                break
+            # Trim the longest instance of the section first; resumes list the most recent roles first
+            for i in sorted((i for i, (s, _) in enumerate(sections) if s == section), key=lambda i: -tokens[i]):
+                if excess <= 0:
+                    break
+                keep_tokens = max(0, tokens[i] - excess)
+                trimmed = truncate_to_tokens(sections[i][1], keep_tokens, self.model)
+                excess -= tokens[i] - keep_tokens
+                sections[i] = (section, trimmed)
+                tokens[i] = keep_tokens
+                if section not in result["trimmed_sections"]:
+                    result["trimmed_sections"].append(section)
+
+        separator = "\n\n" if "\n" in cleaned else " "
+        compressed = separator.join(body for _, body in sections if body)
+        compressed = truncate_to_tokens(compressed, max_tokens, self.model)
+        result["text"] = compressed
+        result["tokens"] = count_tokens(compressed, self.model)
+        return result
+
+
+class PromptBudget():
+    """Fits a resume into the token ceiling configured for a prompt type."""
+
+    def __init__(self, model=None) -> None:
+        self.model = model or Config.LLM_MODEL
+        self.compressor = ResumeCompressor(self.model)
+
+    def fixed_tokens(self, template="", **other_inputs):
+        """Tokens of the template and the inputs other than the resume."""
+        return count_tokens(template, self.model) + sum(
+            count_tokens(str(value), self.model) for value in other_inputs.values() if value
+        )
+
+    def fit_resume(self, prompt_type, resume, template="", fixed_tokens=None, **other_inputs):
+        """
+        Returns the resume compressed so that template + other inputs + resume
+        stay within Config.PROMPT_TOKEN_CEILINGS[prompt_type]. The other inputs
+        are never trimmed. Callers fitting many resumes to the same template and
+        inputs can pass fixed_tokens (from fixed_tokens()) to count those once.
+        """
+        ceiling = Config.PROMPT_TOKEN_CEILINGS.get(prompt_type)
+        if not ceiling or not isinstance(resume, str):
+            return resume
+
+        if fixed_tokens is None:
+            fixed_tokens = self.fixed_tokens(template, **other_inputs)
+        available = max(Config.PROMPT_MIN_RESUME_TOKENS, ceiling - fixed_tokens)
+        keep_sections = PROMPT_SECTION_PROFILES.get(prompt_type)
+
+        result = self.compressor.compress(resume, available, keep_sections)
+        logger.info(
+            f"Prompt budget [{prompt_type}]: resume {result['original_tokens']} -> {result['tokens']} tokens "
+            f"(ceiling {ceiling}, fixed {fixed_tokens}, dropped {result['dropped_sections']}, "
+            f"trimmed {result['trimmed_sections']})"
+        )
+        return result["text"]
+
+
+class TokenUsageTracker():
+    """Process-wide totals of prompt and completion tokens per prompt type."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.totals = {}
+
+    def record(self, prompt_type, input_tokens, output_tokens):
+        with self._lock:
+            totals = self.totals.setdefault(prompt_type, {"calls": 0, "input_tokens": 0, "output_tokens": 0})
+            totals["calls"] += 1
+            totals["input_tokens"] += input_tokens or 0
+            totals["output_tokens"] += output_tokens or 0
+        logger.info(f"LLM usage [{prompt_type}]: input_tokens={input_tokens}, output_tokens={output_tokens}")
+
+    def snapshot(self):
+        with self._lock:
+            return {k: dict(v) for k, v in self.totals.items()}
+
+
+token_usage_tracker = TokenUsageTracker()
+
+
+def invoke_with_usage(prompt, llm, inputs, prompt_type):
+    """
+    Runs prompt | llm and returns the response text, recording the token usage
+    reported by the model (or a tiktoken estimate when none is reported).
+    """
+    message = (prompt | llm).invoke(inputs)
+    text = message.content if hasattr(message, "content") else str(message)
+
+    usage = getattr(message, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens")
+    output_tokens = usage.get("output_tokens")
+    if input_tokens is None:
+        model = getattr(llm, "model_name", None) or Config.LLM_MODEL
+        input_tokens = count_tokens(prompt.format(**inputs), model)
+        output_tokens = count_tokens(text, model)
+    token_usage_tracker.record(prompt_type, input_tokens, output_tokens)
+    return text
@@ -1,3 +1,4 @@
+import pymupdf
 import pymupdf4llm
 from docx import Document
 from reportlab.pdfgen import canvas
@@ -8,14 +9,30 @@ import tempfile
 import os
 import re
 
+from genfoundry.km.preprocess.parsed_document_cache import compute_content_hash, get_parsed_document_cache
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 class PyMuPDFDocumentParser():
-    def __init__(self) -> None:
+    PARSER_NAME = "pymupdf4llm"
+    # Bump when the post-processing below changes so cached output is invalidated
+    PARSER_VERSION = f"1-{pymupdf4llm.__version__}"
+
+    def __init__(self, cache=None) -> None:
         logger.debug("Inside PyMuPDFDocumentParser instance init")
+        self.cache = cache if cache is not None else get_parsed_document_cache()
 
     def parse_document(self, file_path):
+        parsed = self.parse_document_with_metadata(file_path)
+        return parsed["text"] if parsed else None
+
+    def parse_document_with_metadata(self, file_path):
+        """
+        Parses the document and returns a dict with "text", "page_count" and
+        "parser_version", serving repeat uploads of the same file from the
+        parsed document cache. Returns None if parsing fails.
+        """
         pdf_path = None
         original_file_path = file_path  # <=== Save the original uploaded file path
 
@@ -24,6 +41,11 @@ class PyMuPDFDocumentParser():
 
             assert os.path.exists(file_path), f"File {file_path} not found."
 
+            content_hash = compute_content_hash(file_path)
+            cached = self.cache.get(content_hash, self.PARSER_NAME, self.PARSER_VERSION)
+            if cached:
+                return cached
+
             if file_path.endswith('.docx'):
                 logger.debug("File is a .docx. Converting to PDF.")
                 pdf_path = os.path.join(tempfile.gettempdir(), os.path.basename(file_path).replace('.docx', '.pdf'))
@@ -37,9 +59,16 @@ class PyMuPDFDocumentParser():
             logger.debug(f"Loading data into PyMuPDF4LLM from {file_path}")
             docString = pymupdf4llm.to_markdown(f"{file_path}")
             docString = self.fix_mid_sentence_line_breaks(docString)
+            with pymupdf.open(file_path) as doc:
+                page_count = doc.page_count
 
             logger.debug(f"Document parsed successfully.")
-            return docString
+            self.cache.put(content_hash, self.PARSER_NAME, self.PARSER_VERSION, docString, page_count)
+            return {
+                "text": docString,
+                "page_count": page_count,
+                "parser_version": self.PARSER_VERSION
+            }
 
         except Exception as e:
             logger.error(f"Error parsing document: {e}")
@@ -0,0 +1,191 @@
+"""
+Section-aware chunking of parsed resumes for the vector store.
+
+The generic sentence splitter cuts wherever 512 tokens run out, so one role's
+bullets end up in two chunks and a chunk can start halfway through education.
+ResumeChunker instead splits on the section headings found by
+prompt_budget.split_sections, then on role boundaries inside experience-like
+sections, packs whole roles into chunks, merges tiny sections into a
+neighbour and tags every chunk with its section type.
+"""
+import re
+
+from genfoundry.config import Config
+from genfoundry.km.preprocess.prompt_budget import split_sections, SECTION_HEADER
+from genfoundry.km.utils.token_counter import count_tokens, truncate_to_tokens
+
+# Sections whose entries (roles, projects) are the units a chunk must not split
+ENTRY_SECTIONS = {"experience", "projects", "volunteer"}
+# Entries shorter than this are headings or dates belonging to the next entry
+ENTRY_MIN_TOKENS = 25
+
+# A role starts at a sub-heading or a bold title ("### Acme Corp", "**Senior Engineer**")
+_entry_start = re.compile(r"(?:(?<=\s)|^)(?:#{3,6}\s+\S|\*\*[^*\n]{2,120}\*\*)")
+# Date ranges such as "2019 - Present", "Jan 2015 – Dec 2018" or "03/2017 to 06/2020"
+_date_range = re.compile(
+    r"(?:\b(?:[A-Z][a-z]{2,8}\.?\s+)?(?:\d{1,2}/)?(?:19|20)\d{2})\s*(?:-|–|—|to)\s*"
+    r"(?:(?:[A-Z][a-z]{2,8}\.?\s+)?(?:\d{1,2}/)?(?:19|20)\d{2}\b|present\b|current\b|now\b|date\b)",
+    re.IGNORECASE,
+)
+# Sentence ends and bullet markers, used to split an entry that is too long on its own
+_sentence_break = re.compile(r"(?<=[.!?;])\s+|\s+(?=[-•▪●◦*]\s)")
+
+
+class ResumeChunker():
+    """Splits a resume into [{"text", "section_type", "sections"}] chunks."""
+
+    def __init__(self, max_tokens=None, min_tokens=None, model=None) -> None:
+        self.max_tokens = max_tokens or Config.VECTOR_CHUNK_MAX_TOKENS
+        self.min_tokens = min_tokens or Config.VECTOR_CHUNK_MIN_TOKENS
+        self.model = model or Config.TEXT_EMBEDDING_MODEL
+
+    def chunk(self, text, max_tokens=None):
+        max_tokens = max_tokens or self.max_tokens
+        if not text or not text.strip():
+            return []
+
+        chunks = []
+        for section_type, body in split_sections(text.strip()):
+            if section_type in ENTRY_SECTIONS:
+                # One role per chunk, so a role query matches that role alone;
+                # short roles are merged afterwards like any small chunk
+                for entry in self._entries(body):
+                    chunks.extend(self._pack(section_type, [entry], max_tokens))
+            else:
+                chunks.extend(self._pack(section_type, [body], max_tokens))
+        return self._merge_small(chunks, max_tokens)
+
+    def _entries(self, body):
+        """Splits an experience-like section at the start of each role."""
+        starts = [m.start() for m in _entry_start.finditer(body)]
+        if len(starts) < 2:
+            # No sub-headings: a role starts at the text just before each date range,
+            # so split right after the previous sentence or bullet
+            starts = []
+            for m in _date_range.finditer(body):
+                previous_break = max(
+                    (b.end() for b in _sentence_break.finditer(body, 0, m.start())), default=0
+                )
+                starts.append(previous_break)
+        starts = sorted(set(s for s in starts if s > 0))
+
+        entries = []
+        previous = 0
+        for start in starts:
+            entries.append(body[previous:start].strip())
+            previous = start
+        entries.append(body[previous:].strip())
+
+        # A title and company in separate bold spans are one role: fold short
+        # fragments into the entry that follows them
+        folded = []
+        carry = ""
+        for entry in (e for e in entries if e):
+            entry = f"{carry} {entry}".strip() if carry else entry
+            if count_tokens(entry, self.model) < ENTRY_MIN_TOKENS:
+                carry = entry
+            else:
+                folded.append(entry)
+                carry = ""
+        if carry:
+            if folded:
+                folded[-1] = f"{folded[-1]} {carry}"
+            else:
+                folded.append(carry)
+        return folded
+
+    def _pack(self, section_type, units, max_tokens):
+        """Packs whole units into chunks of up to max_tokens, splitting only oversized units."""
+        chunks = []
+        current, current_tokens = [], 0
+        for unit in units:
+            unit_tokens = count_tokens(unit, self.model)
+            if unit_tokens > max_tokens:
+                if current:
+                    chunks.append(self._make_chunk(section_type, current))
+                    current, current_tokens = [], 0
+                chunks.extend(self._make_chunk(section_type, [piece])
+                              for piece in self._split_oversized(unit, max_tokens))
+                continue
+            if current and current_tokens + unit_tokens > max_tokens:
+                chunks.append(self._make_chunk(section_type, current))
+                current, current_tokens = [], 0
+            current.append(unit)
+            current_tokens += unit_tokens
+        if current:
+            chunks.append(self._make_chunk(section_type, current))
+        return chunks
+
+    def _split_oversized(self, text, max_tokens):
+        pieces = []
+        current = ""
+        for sentence in _sentence_break.split(text):
+            if not sentence:
+                continue
+            candidate = f"{current} {sentence}".strip()
+            if count_tokens(candidate, self.model) <= max_tokens:
+                current = candidate
+                continue
+            if current:
+                pieces.append(current)
+            # A single sentence longer than a chunk is cut at the token limit
+            while count_tokens(sentence, self.model) > max_tokens:
+                head = truncate_to_tokens(sentence, max_tokens, self.model)
+                pieces.append(head)
+                sentence = sentence[len(head):].strip()
+            current = sentence
+        if current:
+            pieces.append(current)
+        return pieces
+
+    def _make_chunk(self, section_type, units):
+        text = " ".join(units) if "\n" not in "".join(units) else "\n\n".join(units)
+        return {
+            "text": text,
+            "section_type": section_type,
+            "sections": [section_type],
+            "tokens": count_tokens(text, self.model),
+        }
+
+    def _merge_small(self, chunks, max_tokens):
+        """Merges chunks under min_tokens into the following chunk (or the previous one at the end)."""
+        merged = []
+        pending = None
+        for chunk in chunks:
+            if pending:
+                combined = self._combine(pending, chunk, max_tokens)
+                if combined:
+                    chunk = combined
+                else:
+                    merged.append(pending)
+                pending = None
+            if chunk["tokens"] < self.min_tokens:
+                pending = chunk
+            else:
+                merged.append(chunk)
+        if pending:
+            combined = self._combine(merged[-1], pending, max_tokens) if merged else None
+            if combined:
+                merged[-1] = combined
+            else:
+                merged.append(pending)
+        return merged
+
+    def _combine(self, first, second, max_tokens):
+        if first["tokens"] + second["tokens"] > max_tokens:
+            return None
+        text = f"{first['text']}\n\n{second['text']}" if "\n" in first["text"] + second["text"] \
+            else f"{first['text']} {second['text']}"
+        sections = first["sections"] + [s for s in second["sections"] if s not in first["sections"]]
+        # The header (name, contact details) never names a merged chunk
+        dominant = max(
+            (c for c in (first, second) if c["section_type"] != SECTION_HEADER),
+            key=lambda c: c["tokens"],
+            default=first,
+        )
+        return {
+            "text": text,
+            "section_type": dominant["section_type"],
+            "sections": sections,
+            "tokens": count_tokens(text, self.model),
+        }
@@ -0,0 +1,174 @@
+"""
+Typed resume metadata.
+
+extract_metadata returns whatever JSON the LLM emits; ResumeMetadata
+validates it at ingest into values the vector index can filter on:
+
+  - years_of_experience: a number ("10+ years" -> 10)
+  - career_domain: one of CAREER_DOMAINS
+  - technical_skills / leadership_skills: lower-cased canonical tokens
+    ("ReactJS" -> "react", "K8s" -> "kubernetes")
+  - location_codes: hierarchical gazetteer codes for location
+    ("Toronto, ON" -> ["CA", "CA-ON", "CA-ON-TORONTO"])
+  - skill_ids / title_ids: taxonomy IDs of the skills and job titles, with
+    their parent categories ("Sr. Director of Engineering" ->
+    ["director_of_engineering", "engineering_leadership", ...])
+
+FilterNormalizer applies the same canonical_* functions to query filters,
+so both sides of a filter compare equal.
+"""
+import logging
+import re
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+
+from genfoundry.km.utils.location_gazetteer import resolve_location
+from genfoundry.km.utils.taxonomy import SKILLS, TITLES, get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+# The domains the metadata prompt asks the LLM to choose from
+CAREER_DOMAINS = [
+    "Technology", "Finance & Accounting", "Healthcare", "Education", "Sales & Marketing",
+    "Human Resources", "Legal", "Operations", "Engineering", "Design", "Customer Support",
+    "Product Management",
+]
+CAREER_DOMAIN_ALIASES = {
+    "information technology": "Technology", "it": "Technology", "software": "Technology",
+    "tech": "Technology", "finance": "Finance & Accounting", "accounting": "Finance & Accounting",
+    "banking": "Finance & Accounting", "sales": "Sales & Marketing", "marketing": "Sales & Marketing",
+    "hr": "Human Resources", "people": "Human Resources", "product": "Product Management",
+    "support": "Customer Support", "customer service": "Customer Support", "ux": "Design",
+}
+
+MAX_YEARS_OF_EXPERIENCE = 60
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def canonical_years(value) -> Optional[float]:
+    """Returns years of experience as a number, or None if it can't be read as one."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        years = float(value)
+    elif isinstance(value, str):
+        match = _NUMBER.search(value)
+        if not match:
+            return None
+        years = float(match.group())
+    else:
+        return None
+    if not 0 <= years <= MAX_YEARS_OF_EXPERIENCE:
+        return None
+    return int(years) if years.is_integer() else round(years, 1)
+
+
+def canonical_career_domain(value) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    key = value.strip().lower()
+    for domain in CAREER_DOMAINS:
+        if domain.lower() == key:
+            return domain
+    return CAREER_DOMAIN_ALIASES.get(key)
+
+
+def canonical_skill(value) -> Optional[str]:
+    """Returns the lower-cased taxonomy name for a known skill ("K8s" -> "kubernetes"), else the cleaned token."""
+    if not isinstance(value, str):
+        return None
+    token = re.sub(r"\s+", " ", value).strip().strip(".,;:").lower()
+    if not token:
+        return None
+    skill_id = get_taxonomy().lookup(SKILLS, token)
+    return get_taxonomy().name(SKILLS, skill_id).lower() if skill_id else token
+
+
+def canonical_skills(values) -> List[str]:
+    """Returns the canonical tokens for a list (or comma-separated string) of skills, de-duplicated."""
+    if isinstance(values, str):
+        values = values.split(",")
+    tokens = []
+    for value in values or []:
+        token = canonical_skill(value)
+        if token and token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def _text_list(values) -> List[str]:
+    if isinstance(values, str):
+        values = [values]
+    return [str(v).strip() for v in values or [] if v is not None and str(v).strip()]
+
+
+class ResumeMetadata(BaseModel):
+    # Keys the schema doesn't know (doc_id, future prompt fields) pass through unchanged
+    model_config = ConfigDict(extra="allow")
+
+    candidate_name: Optional[str] = None
+    latest_job_title: Optional[str] = None
+    other_job_titles: List[str] = []
+    career_domain: Optional[str] = None
+    years_of_experience: Optional[float] = None
+    technical_skills: List[str] = []
+    leadership_skills: List[str] = []
+    highest_education_level: Optional[str] = None
+    education: List[str] = []
+    certifications: List[str] = []
+    location: Optional[str] = None
+    location_codes: List[str] = []
+    skill_ids: List[str] = []
+    title_ids: List[str] = []
+
+    @field_validator("candidate_name", "latest_job_title", "highest_education_level", "location", mode="before")
+    @classmethod
+    def _strip_text(cls, value):
+        if value is None or isinstance(value, (list, dict)):
+            return None
+        return str(value).strip() or None
+
+    @field_validator("other_job_titles", "education", "certifications", mode="before")
+    @classmethod
+    def _text_lists(cls, value):
+        return _text_list(value)
+
+    @field_validator("career_domain", mode="before")
+    @classmethod
+    def _career_domain(cls, value):
+        domain = canonical_career_domain(value)
+        if value and domain is None:
+            logger.warning(f"Dropping unknown career_domain: {value!r}")
+        return domain
+
+    @field_validator("years_of_experience", mode="before")
+    @classmethod
+    def _years(cls, value):
+        years = canonical_years(value)
+        if value not in (None, "") and years is None:
+            logger.warning(f"Dropping unreadable years_of_experience: {value!r}")
+        return years
+
+    @field_validator("technical_skills", "leadership_skills", mode="before")
+    @classmethod
+    def _skills(cls, value):
+        return canonical_skills(value)
+
+    @model_validator(mode="after")
+    def _derived_codes(self):
+        # Always derived from the text fields, so re-normalizing picks up
+        # gazetteer and taxonomy changes
+        taxonomy = get_taxonomy()
+        self.location_codes = resolve_location(self.location)
+        self.skill_ids = taxonomy.resume_ids(SKILLS, self.technical_skills + self.leadership_skills)
+        self.title_ids = taxonomy.resume_ids(TITLES, [self.latest_job_title or "", *self.other_job_titles])
+        return self
+
+
+def normalize_resume_metadata(metadata: dict) -> dict:
+    """Returns the metadata validated by ResumeMetadata, leaving out empty fields."""
+    typed = ResumeMetadata.model_validate(metadata).model_dump()
+    if isinstance(typed.get("years_of_experience"), float) and typed["years_of_experience"].is_integer():
+        typed["years_of_experience"] = int(typed["years_of_experience"])
+    return {key: value for key, value in typed.items() if value not in (None, "", [])}
@@ -1,8 +1,10 @@
 import logging
 import json
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 from langchain_openai import ChatOpenAI
+from genfoundry.km.preprocess.prompt_budget import PromptBudget, invoke_with_usage
+from genfoundry.km.preprocess.resume_metadata_schema import normalize_resume_metadata
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
 
 resume_standardization_prompt_json = '''
     You are a document transformer and you are tasked with standardizing resume text into a json string. The resume text will be provided as input and you must return a JSON string with the following format:
@@ -246,7 +248,8 @@ class ResumeStandardizer:
         self.openai_api_key = openai_api_key
         self.langchain_api_key = langchain_api_key
         self.llm_model = llm_model
-        self.llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key)
+        self.llm = ChatOpenAI(model_name=llm_model, temperature=0, api_key=openai_api_key, **langchain_client_kwargs())
+        self.prompt_budget = PromptBudget(llm_model)
  
     """
     def standardize(self, resume_str):
@@ -268,24 +271,8 @@ class ResumeStandardizer:
         Returns a dictionary with both standardized resume content and metadata.
         """
         try:
-            logging.debug("Standardizing resume...")
-            if format == "markdown":
-                resume_standardization_prompt = resume_standardization_prompt_markdown
-            elif format == "json":
-                resume_standardization_prompt = resume_standardization_prompt_json
-            
             # Step 1: Standardize the resume
-            prompt = PromptTemplate(
-                input_variables=["resume", "question"], 
-                template=resume_standardization_prompt
-            )
-            question = "Standardize the resume text in the given format"
-            standardized_response = self.get_llm_response(prompt, resume_str, question)
-            
-            if format == "markdown":
-                standardized_resume = standardized_response.strip('"')
-            elif format == "json":
-                standardized_resume = json.loads(standardized_response)
+            standardized_resume = self.standardize_content(resume_str, format)
 
             # Step 2: Extract metadata
             metadata = self.extract_metadata(resume_str)
@@ -300,24 +287,54 @@ class ResumeStandardizer:
             logging.error(f"Error in standardization: {str(ex)}")
             return {"error": str(ex)}, 500
 
-    def extract_metadata(self, resume_str):
+    def standardize_content(self, resume_str, format="json"):
+        """
+            Runs only the standardization LLM call and returns the standardized resume
+            (a Markdown string or a parsed JSON dict). Errors are raised to the caller.
+        """
+        logging.debug("Standardizing resume...")
+        if format == "markdown":
+            resume_standardization_prompt = resume_standardization_prompt_markdown
+        elif format == "json":
+            resume_standardization_prompt = resume_standardization_prompt_json
+        else:
+            raise ValueError(f"Unsupported standardization format: {format}")
+
+        prompt = PromptTemplate(
+            input_variables=["resume", "question"], 
+            template=resume_standardization_prompt
+        )
+        question = "Standardize the resume text in the given format"
+        standardized_response = self.get_llm_response(prompt, resume_str, question)
+
+        if format == "markdown":
+            return standardized_response.strip('"')
+        return json.loads(standardized_response)
+
+    def extract_metadata(self, resume_str, raise_on_error=False):
         """
             Extracts metadata like job title, domain, years of experience, etc., from the resume text.
+            Returns {"error": ...} on failure unless raise_on_error is set.
         """
         try:
             logging.debug("Extracting metadata from resume...")
             
             prompt = PromptTemplate(input_variables=["resume"], template=metadata_prompt)
-            metadata_response = self.get_llm_response(prompt, resume_str, "")
+            # Metadata only needs the header, experience timeline and education
+            resume_str = self.prompt_budget.fit_resume("metadata", resume_str, metadata_prompt)
+            metadata_response = self.get_llm_response(prompt, resume_str, "", prompt_type="metadata")
             logging.debug(f"Metadata response: {metadata_response}")
-            metadata = json.loads(metadata_response)
+            # Typed and canonicalized, so the vector index can filter on it
+            metadata = normalize_resume_metadata(json.loads(metadata_response))
             return metadata
         except Exception as ex:
             logging.error(f"Error in extracting metadata: {str(ex)}")
+            if raise_on_error:
+                raise
             return {"error": str(ex)}
   
     
-    def get_llm_response(self, prompt, resume, question):
+    def get_llm_response(self, prompt, resume, question, prompt_type="standardize"):
         try:
             inputs = {
                 "resume": resume,
@@ -330,8 +347,7 @@ class ResumeStandardizer:
             if not isinstance(prompt, PromptTemplate):
                 raise ValueError("Prompt must be an instance of PromptTemplate")
             
-            chain = prompt| self.llm | StrOutputParser()
-            response = chain.invoke(inputs) 
+            response = invoke_with_usage(prompt, self.llm, inputs, prompt_type)
             return response
         except Exception as e:
             logging.error(f"Error in get_llm_response: {str(e)}")
@@ -0,0 +1,125 @@
+"""
+Embedding pre-screen of candidates before LLM assessment.
+
+The job description is embedded once and matched against the resume chunk
+vectors in the tenant's Pinecone namespace (restricted to a pool of resume
+IDs when one is given). When the tenant's doc-level namespace is complete,
+one query against the resume centroids scores whole resumes directly.
+Otherwise chunk similarities are aggregated per resume: the mean of its best
+Config.PRESCREEN_CHUNKS_PER_RESUME chunks, so a resume needs more than one
+lucky section to rank well. When search filters are given, the
+metadata fit from TieredResumeSearcher._score_soft_filters is blended in with
+weight Config.PRESCREEN_METADATA_WEIGHT.
+
+Resumes scoring at least the cutoff make the shortlist, best first, up to
+top_k; only those go on to ResumeAssessor.assess.
+"""
+import logging
+
+from genfoundry.config import Config
+from genfoundry.km.persist.resume_metadata_store import get_resume_metadata_store
+from genfoundry.km.persist.vector_namespace_registry import get_tenant_doc_namespace, get_tenant_namespace
+from genfoundry.km.query.helper.vector_matches import (
+    aggregate_chunk_scores, query_matches, resume_scores, timeout_kwargs
+)
+from genfoundry.km.utils.token_counter import truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class CandidatePreScreener():
+    def __init__(self, searcher, index=None, embed_model=None, metadata_store=None) -> None:
+        # A TieredResumeSearcher, for its filter splitting and soft filter scoring
+        self.searcher = searcher
+        self._index = index
+        self._embed_model = embed_model
+        self.metadata_store = metadata_store
+
+    @property
+    def index(self):
+        if self._index is None:
+            from pinecone import Pinecone
+            self._index = Pinecone(api_key=Config.PINECONE_API_KEY).Index(Config.PINECONE_INDEX)
+        return self._index
+
+    @property
+    def embed_model(self):
+        if self._embed_model is None:
+            from llama_index.embeddings.openai import OpenAIEmbedding
+            from genfoundry.km.utils.openai_rate_limiter import llama_index_client_kwargs
+            self._embed_model = OpenAIEmbedding(model=Config.TEXT_EMBEDDING_MODEL, api_key=Config.OPENAI_API_KEY,
+                                                **llama_index_client_kwargs())
+        return self._embed_model
+
+    def screen(self, tenant_id, job_description, resume_ids=None, filters=None, top_k=None, min_score=None):
+        """
+        Scores the pool (resume_ids, or every resume in the namespace with a
+        relevant chunk) against the job description and returns the
+        shortlist, the resumes screened out and how many LLM assessments
+        that saves. filters are search filters as /smart-search takes them.
+        """
+        top_k = top_k or Config.PRESCREEN_TOP_K
+        min_score = Config.PRESCREEN_MIN_SCORE if min_score is None else min_score
+
+        query = truncate_to_tokens(job_description, Config.PRESCREEN_QUERY_MAX_TOKENS, Config.TEXT_EMBEDDING_MODEL)
+        vector = self.embed_model.get_query_embedding(query)
+        pool_filter = {"doc_id": {"$in": list(resume_ids)}} if resume_ids else None
+        doc_namespace = get_tenant_doc_namespace(tenant_id)
+        if doc_namespace:
+            response = self.index.query(
+                vector=vector, top_k=len(resume_ids) if resume_ids else Config.PRESCREEN_CHUNK_TOP_K,
+                namespace=doc_namespace, include_metadata=True, filter=pool_filter, **timeout_kwargs(self.index.query),
+            )
+            similarities = resume_scores(query_matches(response))
+        else:
+            response = self.index.query(
+                vector=vector, top_k=Config.PRESCREEN_CHUNK_TOP_K, namespace=get_tenant_namespace(tenant_id),
+                include_metadata=True, filter=pool_filter, **timeout_kwargs(self.index.query),
+            )
+            similarities = aggregate_chunk_scores(query_matches(response))
+
+        fit = self._metadata_fit(tenant_id, similarities, filters) if filters else {}
+        weight = Config.PRESCREEN_METADATA_WEIGHT if fit else 0.0
+        scored = sorted((
+            {
+                "resume_id": resume_id,
+                "score": round((1 - weight) * similarity + weight * fit.get(resume_id, 0.0), 4),
+                "similarity": round(similarity, 4),
+                "metadata_fit": fit.get(resume_id) if fit else None,
+            }
+            for resume_id, (similarity, _) in similarities.items()
+        ), key=lambda c: c["score"], reverse=True)
+
+        shortlist = [c for c in scored if c["score"] >= min_score][:top_k]
+        shortlisted = {c["resume_id"] for c in shortlist}
+        pool = list(resume_ids) if resume_ids else [c["resume_id"] for c in scored]
+        # Resumes in the pool with no chunk among the matches score nothing
+        screened_out = [c for c in scored if c["resume_id"] not in shortlisted] + [
+            {"resume_id": resume_id, "score": 0.0, "similarity": None, "metadata_fit": None}
+            for resume_id in pool if resume_id not in similarities
+        ]
+        logger.info(f"Pre-screen for tenant {tenant_id}: {len(shortlist)} of {len(pool)} candidates shortlisted "
+                    f"(top_k={top_k}, min_score={min_score})")
+        return {
+            "candidates": len(pool),
+            "shortlist": shortlist,
+            "screened_out": screened_out,
+            "llm_calls_saved": len(pool) - len(shortlist),
+            "top_k": top_k,
+            "min_score": min_score,
+        }
+
+    def _metadata_fit(self, tenant_id, similarities, filters):
+        """{resume_id: share of the filters the resume's metadata meets}."""
+        strict_filters, soft_filters = self.searcher._split_filter_dict(filters)
+        scoring_filters = {**strict_filters, **soft_filters}
+        if not scoring_filters:
+            return {}
+        store = self.metadata_store or get_resume_metadata_store()
+        stored = store.get_many(tenant_id, list(similarities))
+        documents = [
+            {"metadata": {**similarities[resume_id][1], **stored.get(resume_id, {}), "doc_id": resume_id}}
+            for resume_id in similarities
+        ]
+        scored = self.searcher._score_soft_filters(documents, scoring_filters, use_fuzzy=True)
+        return {result["resume_id"]: result["score"] for result in scored}
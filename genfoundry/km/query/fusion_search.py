@@ -11,6 +11,7 @@ from llama_index.llms.openai import OpenAI
 from llama_index.core.llms import ChatMessage
 from llama_index.core import Settings
 import nest_asyncio
+from genfoundry.km.utils.openai_rate_limiter import llama_index_client_kwargs
 
 Temp = (
     """
@@ -48,8 +49,8 @@ class FusionRetrieverSearcher:
         self.resume_details_popup_url = os.getenv("RESUME_DETAILS_POPUP_URL")
         os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
         logging.debug("LLM model: " + self.llm_model)
-        Settings.llm = OpenAI(model=self.llm_model, temperature=0.0)
-        embed_model = OpenAIEmbedding(model="text-embedding-ada-002")
+        Settings.llm = OpenAI(model=self.llm_model, temperature=0.0, **llama_index_client_kwargs())
+        embed_model = OpenAIEmbedding(model="text-embedding-ada-002", **llama_index_client_kwargs())
         Settings.embed_model = embed_model
         nest_asyncio.apply()
         logging.debug("FusionRetrieverSearcher initialized.")
@@ -206,6 +207,6 @@ class FusionRetrieverSearcher:
         )
 
         messages = [ChatMessage(role="system", content=REFORMAT_PROMPT )]
-        resp = OpenAI().chat(messages)
+        resp = OpenAI(**llama_index_client_kwargs()).chat(messages)
         return resp
 
@@ -2,14 +2,16 @@ import json
 import logging
 from typing import Any, Dict, Optional
 from langchain.prompts import PromptTemplate
-from langchain_community.chat_models import ChatOpenAI
+from langchain_openai import ChatOpenAI
 from genfoundry.km.query.helper.filter_normalizer import FilterNormalizer
 import os
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
+from genfoundry.km.utils.taxonomy import TITLES, get_taxonomy
 
 class FilterExtractor:
     def __init__(self, llm: Optional[Any] = None):
         llm_model = os.getenv("LLM_MODEL")
-        self.llm = llm or ChatOpenAI(model=llm_model, temperature=0)
+        self.llm = llm or ChatOpenAI(model=llm_model, temperature=0, **langchain_client_kwargs())
         self.prompt = PromptTemplate(
             input_variables=["question"],
             template = """
@@ -28,7 +30,7 @@ Rules:
 
 
 Key definitions:
-- "job_title": Extract the job title(s) mentioned and include alternative industry titles (e.g. if "VP of Engineering", include ["VP of Engineering", "Director of Engineering", "Head of Engineering"]). Limit to 3–5 titles. Use `operator: "in"` with a list of titles.
+- "job_title": Extract the job title(s) mentioned, as stated. Do not add alternative titles; they are added from the title taxonomy. Use `operator: "in"` with a list of titles.
 - "career_domain": Choose from this predefined list only: ["Technology", "Finance & Accounting", "Healthcare", "Education", "Sales & Marketing", "Human Resources", "Legal", "Operations", "Engineering", "Design", "Customer Support", "Product Management"]. Do not invent new domains. If there is confusion between "Technology" and "Engineering", infer from the context - if the context is software or computer hardware, categorize it as "Technology" career_domain, else categorize it as "Engineering".
 - "technical_skills": Extract specific technologies, tools, frameworks, platforms, or domain experience (e.g. "B2B SaaS", "AWS", "React", "Cloud Infrastructure"). Include domain-specific or industry context if relevant.
 - "leadership_skills": Extract leadership traits or roles if mentioned (e.g. "Mentoring", "Team Management", "Strategy").
@@ -36,14 +38,12 @@ Key definitions:
     - 2 → 1 to 4
     - 5 → 3 to 7
     - 10 → 9 to 12
-    - 10+ → 10 to 15
     - 12 → 10 to 15
-    - 12+ → 12 to 15
     - 15 → 12 to 18
-    - 15+ → 15 to 20
     - 20 → 15 to 25
 - If the number is not in the list, use a buffer of ±2–3 years. For example, if the query states "17 years", return a range of 15 to 20 years.
-    Use `"operator": "range"` and a dict with "min" and "max".
+- "N+ years", "at least N years" or "more than N years" is open-ended: return only "min": N, with no "max".
+    Use `"operator": "range"` and a dict with "min" and "max" (only "min" when open-ended).
 - "highest_education_level": Extract degree level if stated (e.g. "PhD", "Master's", "Bachelor's").
 - "location": Use the city or region from the query.
 
@@ -63,7 +63,7 @@ Format:
   "filters": [
     {{
       "key": "job_title",
-      "value": ["VP of Engineering", "Director of Engineering", "Head of Engineering"],
+      "value": ["VP of Engineering"],
       "operator": "in"
     }},
     {{
@@ -116,6 +116,9 @@ Query: {question}
                 for f in parsed_result.get("filters", [])
                 if "key" in f and "value" in f
             }
+            if raw_filters.get("job_title"):
+                # Related titles come from the taxonomy rather than the LLM
+                raw_filters["job_title"] = get_taxonomy().expand(TITLES, raw_filters["job_title"])
 
             return FilterNormalizer.normalize(raw_filters)
 
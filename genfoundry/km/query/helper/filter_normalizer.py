@@ -1,5 +1,10 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from genfoundry.km.query.helper.constants import ResumeMetadataKeys
+from genfoundry.km.preprocess.resume_metadata_schema import (
+    canonical_career_domain, canonical_skills, canonical_years
+)
+from genfoundry.km.utils.location_gazetteer import resolve_location
+from genfoundry.km.utils.taxonomy import SKILLS, get_taxonomy
 import logging
 import json
 
@@ -44,6 +49,70 @@ class FilterNormalizer:
         buffer = 2 if years <= 5 else 3
         return {"min": max(0, years - buffer), "max": years + buffer}
 
+    @staticmethod
+    def to_index_filters(filters: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Canonicalizes filter values the way ResumeMetadata canonicalizes resume
+        metadata at ingest, so they can run as vector-index filters.
+
+        Returns (index_filters, unresolved). A filter whose value can't be fully
+        canonicalized (an unknown domain, a place not in the gazetteer) is
+        returned unchanged in unresolved, to be scored after retrieval instead.
+        """
+        index_filters = {}
+        unresolved = {}
+        for key, value in filters.items():
+            canonical = FilterNormalizer._index_filter(key, value)
+            if canonical is None:
+                unresolved[key] = value
+            else:
+                index_key, index_value = canonical
+                index_filters[index_key] = index_value
+        logger.debug(f"Index filters: {index_filters}, unresolved: {unresolved}")
+        return index_filters, unresolved
+
+    @staticmethod
+    def _index_filter(key: str, value: Any) -> Optional[Tuple[str, Any]]:
+        values = value if isinstance(value, list) else [value]
+
+        if key == ResumeMetadataKeys.YEARS_EXPERIENCE:
+            if isinstance(value, dict) and "value" in value:
+                value = value["value"]
+            if isinstance(value, dict):
+                bounds = {b: canonical_years(value[b]) for b in ("min", "max") if b in value}
+                if bounds and None not in bounds.values():
+                    return key, bounds
+                return None
+            years = canonical_years(value)
+            return (key, FilterNormalizer.normalize_years_of_experience(years)) if years is not None else None
+
+        if key == ResumeMetadataKeys.CAREER_DOMAIN:
+            domains = [canonical_career_domain(v) for v in values]
+            if not domains or None in domains:
+                return None
+            return key, domains if len(domains) > 1 else domains[0]
+
+        if key in (ResumeMetadataKeys.TECHNICAL_SKILLS, ResumeMetadataKeys.LEADERSHIP_SKILLS):
+            # Taxonomy IDs when every skill is known: resumes carry each skill's
+            # categories too, so "Cloud" matches AWS, Azure and GCP resumes
+            skill_ids, unknown = get_taxonomy().resolve(SKILLS, values)
+            if skill_ids and not unknown:
+                return "skill_ids", skill_ids
+            tokens = canonical_skills(values)
+            return (key, tokens) if tokens else None
+
+        if key == ResumeMetadataKeys.CURRENT_LOCATION:
+            codes = []
+            for place in values:
+                resolved = resolve_location(place)
+                if not resolved:
+                    return None
+                # The most specific codes: resumes carry every level, so this matches the place and anything in it
+                codes.extend(c for c in resolved if not any(o.startswith(c + "-") for o in resolved))
+            return ("location_codes", list(dict.fromkeys(codes))) if codes else None
+
+        return None
+
     @staticmethod
     def normalize(raw_filters):
         """Normalize filters into a flat dict, supporting both list and dict formats."""
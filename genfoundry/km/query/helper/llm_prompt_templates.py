@@ -148,14 +148,12 @@ Key definitions:
     - 2 → 1 to 4
     - 5 → 3 to 7
     - 10 → 9 to 12
-    - 10+ -> 10 to 15
     - 12 → 10 to 15
-    - 12+ → 12 to 15
     - 15 → 12 to 18
-    - 15+ → 15 to 20
     - 20 → 15 to 25
 - If the number is not in the list, use a buffer of ±2–3 years. For example, if the query states "17 years", return a range of 15 to 20 years.
-    Use `"operator": "range"` and a dict with "min" and "max".
+- "N+ years", "at least N years" or "more than N years" is open-ended: return only "min": N, with no "max".
+    Use `"operator": "range"` and a dict with "min" and "max" (only "min" when open-ended).
 - "highest_education_level": Extract degree level if stated (e.g. "PhD", "Master's", "Bachelor's").
 - "location": Use the city or region from the query.
 
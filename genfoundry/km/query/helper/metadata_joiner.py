@@ -0,0 +1,48 @@
+import logging
+from typing import Any, List, Optional
+
+from llama_index.core.bridge.pydantic import Field
+from llama_index.core.postprocessor.types import BaseNodePostprocessor
+from llama_index.core.schema import NodeWithScore, QueryBundle
+
+from genfoundry.km.persist.resume_metadata_store import get_resume_metadata_store
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeMetadataJoiner(BaseNodePostprocessor):
+    """
+    Fills each retrieved chunk's metadata with the resume's full metadata from
+    ResumeMetadataStore, since vectors only carry the filterable keys. Chunks of
+    resumes with no stored metadata keep the metadata their vector carries.
+    """
+
+    tenant_id: str
+    store: Any = Field(default=None, exclude=True)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ResumeMetadataJoiner"
+
+    def _postprocess_nodes(
+        self,
+        nodes: List[NodeWithScore],
+        query_bundle: Optional[QueryBundle] = None,
+    ) -> List[NodeWithScore]:
+        doc_ids = [n.node.metadata.get("doc_id") for n in nodes if n.node.metadata.get("doc_id")]
+        if not doc_ids:
+            return nodes
+        store = self.store or get_resume_metadata_store()
+        try:
+            metadata_by_id = store.get_many(self.tenant_id, doc_ids)
+        except Exception as e:
+            # Search still works on the vector metadata alone
+            logger.warning(f"Could not join resume metadata for tenant {self.tenant_id}: {e}")
+            return nodes
+
+        for n in nodes:
+            doc_id = n.node.metadata.get("doc_id")
+            if doc_id in metadata_by_id:
+                n.node.metadata = {**metadata_by_id[doc_id], **n.node.metadata}
+        logger.debug(f"Joined metadata for {len(metadata_by_id)} of {len(set(doc_ids))} resumes")
+        return nodes
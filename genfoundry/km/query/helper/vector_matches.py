@@ -0,0 +1,80 @@
+"""
+Chunk-level Pinecone query matches, grouped into resumes.
+"""
+import inspect
+
+from genfoundry.config import Config
+from genfoundry.km.utils.request_deadline import call_timeout
+
+
+def timeout_kwargs(method):
+    """
+    The keyword argument giving a Pinecone index call
+    Config.PINECONE_QUERY_TIMEOUT_SECONDS, capped at the request budget:
+    timeout in the current client, _request_timeout in pinecone-client 6.
+    """
+    seconds = call_timeout(Config.PINECONE_QUERY_TIMEOUT_SECONDS, "Pinecone query")
+    try:
+        parameters = inspect.signature(method).parameters
+    except (TypeError, ValueError):
+        return {}
+    if "timeout" in parameters:
+        return {"timeout": seconds}
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()):
+        return {"_request_timeout": seconds}
+    return {}
+
+
+def query_matches(response):
+    """The matches of a Pinecone query response, from either client version."""
+    return response.matches if hasattr(response, "matches") else response.get("matches", [])
+
+
+def _field(match, name):
+    return getattr(match, name, None) if not isinstance(match, dict) else match.get(name)
+
+
+def match_resume_id(match):
+    """The resume a chunk vector belongs to: its doc_id, or the "<resume_id>#chunk-..." ID prefix."""
+    metadata = _field(match, "metadata") or {}
+    return metadata.get("doc_id") or (_field(match, "id") or "").split("#", 1)[0] or None
+
+
+def aggregate_chunk_scores(matches, chunks_per_resume=None):
+    """Returns {resume_id: (similarity, vector metadata)}: the mean of the resume's best chunk scores."""
+    chunks_per_resume = chunks_per_resume or Config.PRESCREEN_CHUNKS_PER_RESUME
+    scores = {}
+    metadata = {}
+    for match in matches:
+        resume_id = match_resume_id(match)
+        if not resume_id:
+            continue
+        scores.setdefault(resume_id, []).append(_field(match, "score") or 0.0)
+        metadata.setdefault(resume_id, _field(match, "metadata") or {})
+    return {
+        resume_id: (sum(best) / len(best), metadata[resume_id])
+        for resume_id, values in scores.items()
+        for best in [sorted(values, reverse=True)[:chunks_per_resume]]
+    }
+
+
+def resume_scores(matches):
+    """
+    Returns {resume_id: (similarity, metadata)} for matches from a doc-level
+    namespace, where each resume is a single centroid vector.
+    """
+    scores = {}
+    for match in matches:
+        resume_id = match_resume_id(match)
+        if resume_id and resume_id not in scores:
+            scores[resume_id] = (_field(match, "score") or 0.0, _field(match, "metadata") or {})
+    return scores
+
+
+def fetched_values(response, vector_id):
+    """The values of vector_id in a Pinecone fetch response, or None if it was not found."""
+    vectors = response.vectors if hasattr(response, "vectors") else response.get("vectors", {})
+    vector = (vectors or {}).get(vector_id)
+    if vector is None:
+        return None
+    return _field(vector, "values")
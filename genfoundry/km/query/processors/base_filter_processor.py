@@ -5,14 +5,21 @@ from langchain.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
 from genfoundry.km.query.helper.filter_normalizer import FilterNormalizer
 import os
+from genfoundry.config import Config
 from genfoundry.km.query.helper.llm_prompt_templates import filter_extractor_prompt
+from genfoundry.km.query.processors.processor_pipeline import ALL_FILTERS
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
 
 class BaseFilterProcessor:
+    reads = ()
+    writes = ALL_FILTERS
+
     def __init__(self, llm: Optional[Any] = None):
         llm_model = os.getenv("LLM_MODEL")
         self.llm = llm or ChatOpenAI(model=llm_model, 
                                      openai_api_key = os.getenv("OPENAI_API_KEY"),
-                                     temperature=0)
+                                     temperature=0,
+                                     **langchain_client_kwargs())
 
     def extract(self, question: str) -> Dict[str, Any]:
         logging.debug(f"[BaseFilterProcessor] Extracting filters from question: {question}")
@@ -54,8 +61,19 @@ class BaseFilterProcessor:
         if not question:
             raise ValueError("[BaseFilterProcessor] Missing 'question' in input")
 
+        # RuleBasedFilterProcessor, when it runs first, may have resolved the query already
+        confidence = input_data.get("filter_confidence", 0)
+        if confidence >= Config.FILTER_RULES_CONFIDENCE_THRESHOLD:
+            logging.info(f"[BaseFilterProcessor] Using rule-based filters (confidence {confidence}), skipping LLM")
+            return input_data
+
         filters = self.extract(question)
+        if not filters:
+            # A failed or empty LLM answer keeps whatever the rules extracted
+            logging.warning("[BaseFilterProcessor] No filters from the LLM, keeping the rule-based filters")
+            return input_data
         return {
             **input_data,
-            "filters": filters
+            "filters": filters,
+            "filter_source": "llm",
         }
\ No newline at end of file
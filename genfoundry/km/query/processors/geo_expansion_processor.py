@@ -3,19 +3,47 @@ import json
 import os
 import logging
 import re
+import threading
+from collections import OrderedDict
 from typing import Any, Optional, Dict, List
 from genfoundry.km.query.helper.llm_prompt_templates import geo_location_expansion_prompt
+from genfoundry.km.utils.openai_rate_limiter import langchain_client_kwargs
+
+# Expansions of a place don't change, and a Resource (so this processor) is
+# built per request, so they are cached per process
+_EXPANSION_CACHE_SIZE = 1024
+_expansion_cache = OrderedDict()
+_expansion_cache_lock = threading.Lock()
 
 
 class GeoExpansionProcessor:
+    reads = ("location",)
+    writes = ("location",)
+
     def __init__(self, llm: Optional[Any] = None):
         llm_model = os.getenv("LLM_MODEL", "gpt-4-1106-preview")
         
         self.llm = llm or ChatOpenAI(model=llm_model, 
                                      openai_api_key = os.getenv("OPENAI_API_KEY"),
-                                     temperature=0)
+                                     temperature=0,
+                                     **langchain_client_kwargs())
 
     def expand_location(self, location: str) -> List[str]:
+        key = str(location).strip().lower()
+        with _expansion_cache_lock:
+            if key in _expansion_cache:
+                _expansion_cache.move_to_end(key)
+                return list(_expansion_cache[key])
+
+        expanded_locations = self._expand_with_llm(location)
+        if expanded_locations:
+            with _expansion_cache_lock:
+                _expansion_cache[key] = list(expanded_locations)
+                if len(_expansion_cache) > _EXPANSION_CACHE_SIZE:
+                    _expansion_cache.popitem(last=False)
+        return expanded_locations
+
+    def _expand_with_llm(self, location: str) -> List[str]:
         try:
             prompt_str = geo_location_expansion_prompt(location)
             result = self.llm.invoke(prompt_str)
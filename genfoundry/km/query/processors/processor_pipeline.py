@@ -1,8 +1,61 @@
+import contextvars
 import json
 import logging
-from typing import Any, Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List
+
+from genfoundry.config import Config
+from genfoundry.km.utils.request_deadline import (
+    EXPIRY_SLACK_SECONDS, DeadlineExceeded, call_timeout, get_deadline, reset_deadline, set_deadline
+)
+
+# Processors declare the filter keys they read and write as `reads` / `writes`
+# class attributes. ALL_FILTERS stands for every key, and is assumed for
+# processors that declare nothing, so they run on their own, in order.
+ALL_FILTERS = "*"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Shared by every pipeline: the runner builds a new pipeline per request
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=Config.FILTER_PIPELINE_MAX_WORKERS,
+                                               thread_name_prefix="filter-processor")
+    return _executor
+
+
+def _keys(processor, attribute: str) -> frozenset:
+    keys = getattr(processor, attribute, ALL_FILTERS)
+    return frozenset([keys] if isinstance(keys, str) else keys)
+
+
+def _overlaps(a: frozenset, b: frozenset) -> bool:
+    return bool(a & b) or (ALL_FILTERS in a and bool(b)) or (ALL_FILTERS in b and bool(a))
+
 
 class FilterProcessorPipeline:
+    """
+    Runs filter processors in stages. A processor goes in the stage after the
+    last earlier processor it conflicts with (one writes a key the other reads
+    or writes); the processors of a stage run concurrently on a shared thread
+    pool, so independent LLM calls (geo expansion, title expansion) overlap
+    instead of adding up. A stage of one processor runs on the request thread.
+
+    A processor that fails or runs past its timeout, or past the request
+    deadline, is skipped: its output is dropped and the pipeline carries on
+    with what it has. A stage that starts with no budget left raises
+    DeadlineExceeded. Timings and failures are reported in processor_timings /
+    processor_errors.
+    """
+
     def __init__(self):
         self.processors = []
 
@@ -13,35 +66,148 @@ class FilterProcessorPipeline:
         self.append(processor)
         return self
 
-    def _normalize_filter_values(self, filters: Dict[str, Any]) -> Dict[str, Any]:
-        normalized = {}
+    def stages(self) -> List[List[Any]]:
+        levels = []
+        for i, processor in enumerate(self.processors):
+            reads, writes = _keys(processor, "reads"), _keys(processor, "writes")
+            level = 0
+            for j in range(i):
+                other = self.processors[j]
+                other_reads, other_writes = _keys(other, "reads"), _keys(other, "writes")
+                if _overlaps(other_writes, reads | writes) or _overlaps(writes, other_reads):
+                    level = max(level, levels[j] + 1)
+            levels.append(level)
+        stages = [[] for _ in range(max(levels, default=-1) + 1)]
+        for processor, level in zip(self.processors, levels):
+            stages[level].append(processor)
+        return stages
+
+    @staticmethod
+    def _timeout(processor) -> float:
+        name = processor.__class__.__name__
+        return getattr(processor, "timeout", None) or Config.FILTER_PROCESSOR_TIMEOUTS.get(
+            name, Config.FILTER_PROCESSOR_DEFAULT_TIMEOUT_SECONDS)
+
+    @staticmethod
+    def _normalize_filter_values(filters: Dict[str, Any], keys=None) -> Dict[str, Any]:
+        # LLM processors sometimes return lists and ranges as JSON strings
         for k, v in filters.items():
-            logging.debug(f"[FilterProcessorPipeline] Normalizing filter key '{k}' with value: {v}")
-            if isinstance(v, str):
+            if (keys is None or k in keys) and isinstance(v, str) and v.lstrip()[:1] in ("[", "{"):
                 try:
-                    normalized_value = json.loads(v)
-                    logging.debug(f"[FilterProcessorPipeline] Parsed stringified value for '{k}': {normalized_value}")
-                    normalized[k] = normalized_value
-                except Exception as e:
+                    filters[k] = json.loads(v)
+                    logging.debug(f"[FilterProcessorPipeline] Parsed stringified value for '{k}': {filters[k]}")
+                except json.JSONDecodeError as e:
                     logging.debug(f"[FilterProcessorPipeline] Could not parse stringified filter value for '{k}': {v} (Error: {e})")
-                    normalized[k] = v
+        return filters
+
+    @staticmethod
+    def _timed(processor, data):
+        started = time.perf_counter()
+        result = processor.process(data)
+        return result, (time.perf_counter() - started) * 1000
+
+    def _merge(self, data: dict, processor, result: dict) -> None:
+        writes = _keys(processor, "writes")
+        filters = result.get("filters")
+        if isinstance(filters, dict):
+            if ALL_FILTERS in writes:
+                data["filters"] = self._normalize_filter_values(dict(filters))
             else:
-                normalized[k] = v
-        return normalized
+                merged = dict(data.get("filters") or {})
+                for key in writes:
+                    if key in filters:
+                        merged[key] = filters[key]
+                    else:
+                        merged.pop(key, None)
+                data["filters"] = self._normalize_filter_values(merged, writes)
+        for key, value in result.items():
+            if key != "filters":
+                data[key] = value
+
+    @staticmethod
+    def _snapshot(data: dict) -> dict:
+        # Each processor gets its own copy, so concurrent ones don't see each other's writes
+        return {**data, "filters": dict(data.get("filters") or {})}
+
+    def _run_inline(self, processor, data: dict):
+        """
+        Runs a processor on the request thread, under a deadline of its timeout
+        (capped at the request's), so its downstream calls give up in time.
+        Returns (result, elapsed_ms, error).
+        """
+        timeout = self._timeout(processor)
+        token = set_deadline(call_timeout(timeout))
+        started = time.perf_counter()
+        try:
+            result, elapsed_ms = self._timed(processor, data)
+        except DeadlineExceeded:
+            return None, (time.perf_counter() - started) * 1000, "timeout"
+        except Exception as e:
+            if get_deadline().remaining() <= EXPIRY_SLACK_SECONDS:
+                # A downstream call gave up at the processor's deadline
+                return None, (time.perf_counter() - started) * 1000, "timeout"
+            logging.exception(f"[FilterProcessorPipeline] {processor.__class__.__name__} failed, skipping it")
+            return None, (time.perf_counter() - started) * 1000, str(e) or e.__class__.__name__
+        finally:
+            reset_deadline(token)
+        if elapsed_ms > timeout * 1000:
+            return None, elapsed_ms, "timeout"
+        return result, elapsed_ms, None
+
+    def _run_pooled(self, stage: List[Any], data: dict):
+        """Runs a stage's processors concurrently on the shared pool; returns [(result, elapsed_ms, error)]."""
+        started = time.perf_counter()
+        # Each runs in a copy of the caller's context (OpenAI priority, request deadline)
+        futures = [_get_executor().submit(contextvars.copy_context().run, self._timed, processor, self._snapshot(data))
+                   for processor in stage]
+
+        outcomes = []
+        for processor, future in zip(stage, futures):
+            # Capped at what is left of the request's budget
+            remaining = call_timeout(self._timeout(processor) - (time.perf_counter() - started))
+            try:
+                result, elapsed_ms = future.result(timeout=max(0, remaining))
+            except FutureTimeoutError:
+                # Not started yet: never runs. Running: the thread can't be stopped; its result is ignored
+                future.cancel()
+                outcomes.append((None, (time.perf_counter() - started) * 1000, "timeout"))
+                continue
+            except Exception as e:
+                logging.exception(f"[FilterProcessorPipeline] {processor.__class__.__name__} failed, skipping it")
+                outcomes.append((None, (time.perf_counter() - started) * 1000, str(e) or e.__class__.__name__))
+                continue
+            outcomes.append((result, elapsed_ms, None))
+        return outcomes
+
+    def _run_stage(self, stage: List[Any], data: dict) -> None:
+        timings, errors = data["processor_timings"], data["processor_errors"]
+        # A stage of one has nothing to overlap with, so it runs on the request thread
+        if len(stage) == 1:
+            outcomes = [self._run_inline(stage[0], self._snapshot(data))]
+        else:
+            outcomes = self._run_pooled(stage, data)
+
+        for processor, (result, elapsed_ms, error) in zip(stage, outcomes):
+            name = processor.__class__.__name__
+            timings[name] = round(elapsed_ms, 2)
+            if error:
+                errors[name] = error
+                if error == "timeout":
+                    logging.warning(f"[FilterProcessorPipeline] {name} timed out after {elapsed_ms / 1000:.2f}s, skipping it")
+                continue
+            logging.debug(f"[FilterProcessorPipeline] {name} took {elapsed_ms:.2f} ms")
+            self._merge(data, processor, result)
 
     def run(self, data: Any) -> dict:
         if isinstance(data, str):
             data = {"question": data}
             logging.debug(f"[FilterProcessorPipeline] Wrapped string input into dict: {data}")
+        data = {**data, "processor_timings": {}, "processor_errors": {}}
 
-        for processor in self.processors:
-            logging.debug(f"[FilterProcessorPipeline] Running processor: {processor.__class__.__name__}")
-            data = processor.process(data)
-            logging.debug(f"[FilterProcessorPipeline] Data after {processor.__class__.__name__}: {data}")
-
-            if "filters" in data and isinstance(data["filters"], dict):
-                logging.debug(f"[FilterProcessorPipeline] Normalizing filters after {processor.__class__.__name__}")
-                data["filters"] = self._normalize_filter_values(data["filters"])
+        for stage in self.stages():
+            logging.debug(f"[FilterProcessorPipeline] Running stage: {[p.__class__.__name__ for p in stage]}")
+            self._run_stage(stage, data)
+            logging.debug(f"[FilterProcessorPipeline] Data after stage: {data}")
 
         logging.debug(f"[FilterProcessorPipeline] Final data after all processors: {data}")
         return data
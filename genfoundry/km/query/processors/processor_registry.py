@@ -1,11 +1,13 @@
 from genfoundry.km.query.processors.geo_expansion_processor import GeoExpansionProcessor
 from genfoundry.km.query.processors.base_filter_processor import BaseFilterProcessor
+from genfoundry.km.query.processors.rule_based_filter_processor import RuleBasedFilterProcessor
 from genfoundry.km.query.processors.processor_pipeline import FilterProcessorPipeline
 
 
 PROCESSOR_REGISTRY = {
     "BaseFilterProcessor": BaseFilterProcessor,  # Placeholder for the base processor
     "GeoExpansionProcessor": GeoExpansionProcessor,
+    "RuleBasedFilterProcessor": RuleBasedFilterProcessor,
     # add others here
 }
 
@@ -0,0 +1,190 @@
+import logging
+import re
+from typing import Any, Dict, List, Tuple
+
+from genfoundry.km.preprocess.resume_metadata_schema import CAREER_DOMAIN_ALIASES, CAREER_DOMAINS
+from genfoundry.km.query.processors.processor_pipeline import ALL_FILTERS
+from genfoundry.km.utils.location_gazetteer import find_places
+from genfoundry.km.utils.taxonomy import MIN_SCAN_LENGTH, SKILLS, TITLES, get_taxonomy
+
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+    "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fifteen": 15, "twenty": 20,
+}
+_NUM = r"(\d{1,2}|" + "|".join(_NUMBER_WORDS) + r")"
+_YEARS = r"\s*(?:years?|yrs?)\b"
+
+# Checked in order, the first match wins. Same conversions as filter_extractor_prompt.
+_YEARS_PATTERNS = [
+    ("range", re.compile(rf"\b(?:between\s+)?{_NUM}\s*(?:-|–|to|and)\s*{_NUM}\s*\+?{_YEARS}")),
+    ("max", re.compile(rf"\b(?:less than|fewer than|under|up to|at most|no more than|maximum(?: of)?)\s+{_NUM}\+?{_YEARS}")),
+    ("plus", re.compile(rf"\b{_NUM}\s*\+{_YEARS}")),
+    ("plus", re.compile(rf"\b(?:at least|minimum(?: of)?|min\.?|over|more than)\s+{_NUM}{_YEARS}")),
+    ("exact", re.compile(rf"\b{_NUM}{_YEARS}")),
+]
+_EXACT_YEARS = {2: (1, 4), 5: (3, 7), 10: (9, 12), 12: (10, 15), 15: (12, 18), 20: (15, 25)}
+
+_EDUCATION_PATTERNS = [
+    (re.compile(r"\b(?:ph\.?\s?d|doctorate|doctoral)\b"), "PhD"),
+    (re.compile(r"\bmba\b"), "MBA"),
+    (re.compile(r"\b(?:master'?s|msc|m\.sc|m\.s\.|meng|m\.eng)(?![\w])"), "Master's"),
+    (re.compile(r"\b(?:bachelor'?s|bsc|b\.sc|b\.s\.|beng|b\.eng|btech|b\.tech|undergraduate)(?![\w])"), "Bachelor's"),
+]
+
+# Domain words that are just as often a skill, title or plain word ("sales",
+# "design") only count next to a word that makes them a domain
+_AMBIGUOUS_DOMAIN_TERMS = {
+    "technology", "tech", "it", "software", "engineering", "design", "education", "operations",
+    "sales", "marketing", "people", "product", "support", "ux", "product management",
+}
+_DOMAIN_TERMS = sorted(
+    {d.lower(): d for d in CAREER_DOMAINS} | CAREER_DOMAIN_ALIASES,
+    key=len, reverse=True,
+)
+_DOMAIN_PATTERNS = [
+    (re.compile(rf"\b{re.escape(term)}\b" + ("" if term not in _AMBIGUOUS_DOMAIN_TERMS
+                                             else r"\s+(?:industry|domain|sector|space|background)\b")),
+     term)
+    for term in _DOMAIN_TERMS
+]
+
+# Words that carry no filter of their own ("find me candidates with ... in ...")
+_FILLER_WORDS = {
+    "a", "an", "the", "and", "or", "with", "in", "at", "from", "of", "for", "to", "on", "by", "as",
+    "who", "that", "which", "is", "are", "be", "has", "have", "having", "had", "any", "all", "some",
+    "find", "show", "me", "us", "get", "list", "search", "looking", "look", "need", "want", "hire",
+    "hiring", "candidates", "candidate", "people", "profiles", "profile", "resumes", "resume", "someone",
+    "experience", "experienced", "exp", "years", "year", "yrs", "plus", "least", "minimum", "min",
+    "more", "than", "over", "under", "between", "up", "based", "located", "living", "near", "around",
+    "area", "region", "degree", "skills", "skilled", "knowledge", "strong", "solid", "expert",
+    "expertise", "proficient", "proficiency", "background", "industry", "domain", "sector", "level",
+    "senior", "sr", "junior", "jr", "mid", "lead", "good", "great", "top", "best", "qualified",
+    "worked", "working", "work", "using", "used", "familiar", "hands-on", "field", "role", "roles",
+    "position", "positions", "please", "can", "you", "i", "we", "our", "my", "also", "both", "either",
+}
+_NEGATION = re.compile(r"\b(?:not|without|except|excluding|exclude|no|non|never|other than)\b")
+_TOKEN = re.compile(r"[\w+#&']+(?:[./-][\w+#&']+)*\+?")
+
+
+def _years_range(kind: str, numbers: List[int]) -> Dict[str, int]:
+    if kind == "range":
+        low, high = sorted(numbers)
+        return {"min": low, "max": high}
+    n = numbers[0]
+    if kind == "max":
+        return {"min": 0, "max": n}
+    if kind == "plus":
+        # Open-ended: more senior candidates still match
+        return {"min": n}
+    low, high = _EXACT_YEARS.get(n, (max(0, n - 2), n + (2 if n <= 5 else 3)))
+    return {"min": low, "max": high}
+
+
+def _to_int(value: str) -> int:
+    return int(value) if value.isdigit() else _NUMBER_WORDS[value]
+
+
+class RuleBasedFilterProcessor:
+    """
+    Deterministic fast path for filter extraction: experience ranges by regex,
+    places from the location gazetteer, skills and titles from the taxonomy,
+    degree and domain keywords. Adds a confidence score, the share of the
+    query's meaningful words that a rule recognized; BaseFilterProcessor only
+    calls the LLM when it is below Config.FILTER_RULES_CONFIDENCE_THRESHOLD.
+    """
+    reads = ()
+    writes = ALL_FILTERS
+
+    def __init__(self, taxonomy=None):
+        self.taxonomy = taxonomy or get_taxonomy()
+
+    def extract(self, question: str) -> Tuple[Dict[str, Any], float]:
+        """Returns (filters, confidence), confidence between 0 and 1."""
+        lowered = question.lower()
+        claimed = []
+        filters: Dict[str, Any] = {}
+
+        def claim(start, end):
+            if any(start < e and s < end for s, e in claimed):
+                return False
+            claimed.append((start, end))
+            return True
+
+        for kind, pattern in _YEARS_PATTERNS:
+            match = pattern.search(lowered)
+            if match:
+                claim(*match.span())
+                filters["years_of_experience"] = _years_range(kind, [_to_int(g) for g in match.groups()])
+                break
+
+        for pattern, level in _EDUCATION_PATTERNS:
+            match = pattern.search(lowered)
+            if match and claim(*match.span()):
+                filters["highest_education_level"] = level
+                break
+
+        places = [span for span in find_places(question) if claim(*span)]
+        if places:
+            start, end = places[0]
+            filters["location"] = question[start:end].strip(" ,")
+
+        title_ids = self._find_ids(TITLES, question, claim)
+        skill_ids = self._find_ids(SKILLS, question, claim)
+
+        for pattern, term in _DOMAIN_PATTERNS:
+            match = pattern.search(lowered)
+            if match and claim(*match.span()):
+                filters["career_domain"] = next(
+                    (d for d in CAREER_DOMAINS if d.lower() == term), CAREER_DOMAIN_ALIASES.get(term))
+                break
+
+        if title_ids:
+            names = [self.taxonomy.name(TITLES, i) for i in title_ids]
+            filters["job_title"] = self.taxonomy.expand(TITLES, names)
+        leadership = [i for i in skill_ids if i == "leadership" or "leadership" in self.taxonomy.ancestors(SKILLS, i)]
+        technical = [i for i in skill_ids if i not in leadership]
+        if technical:
+            filters["technical_skills"] = [self.taxonomy.name(SKILLS, i) for i in technical]
+        if leadership:
+            filters["leadership_skills"] = [self.taxonomy.name(SKILLS, i) for i in leadership]
+
+        return filters, self._confidence(question, lowered, filters, claimed)
+
+    def _find_ids(self, kind, question, claim) -> List[str]:
+        ids = []
+        matches = list(self.taxonomy.find_spans(kind, question))
+        # Short forms ("Go", "AI", "AE") are only read as a skill or title when capitalized
+        for match in _TOKEN.finditer(question):
+            token = match.group()
+            if len(token) < MIN_SCAN_LENGTH and token[0].isupper():
+                entry_id = self.taxonomy.lookup(kind, token)
+                if entry_id:
+                    matches.append((match.start(), match.end(), entry_id))
+        for start, end, entry_id in sorted(matches):
+            if claim(start, end) and entry_id not in ids:
+                ids.append(entry_id)
+        return ids
+
+    @staticmethod
+    def _confidence(question, lowered, filters, claimed) -> float:
+        if not filters or _NEGATION.search(lowered):
+            return 0.0
+        content = [m.span() for m in _TOKEN.finditer(lowered) if m.group() not in _FILLER_WORDS]
+        if not content:
+            return 1.0
+        covered = sum(1 for start, end in content if any(start < e and s < end for s, e in claimed))
+        return round(covered / len(content), 3)
+
+    def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        question = input_data.get("question")
+        if not question:
+            raise ValueError("[RuleBasedFilterProcessor] Missing 'question' in input")
+
+        filters, confidence = self.extract(question)
+        logging.debug(f"[RuleBasedFilterProcessor] Filters: {filters}, confidence: {confidence}")
+        return {
+            **input_data,
+            "filters": filters,
+            "filter_confidence": confidence,
+            "filter_source": "rules",
+        }
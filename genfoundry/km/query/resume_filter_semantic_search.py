@@ -18,6 +18,9 @@ from llama_index.core import Settings
 #from genfoundry.km.query.helper.filter_normalizer import FilterNormalizer
 #from genfoundry.km.query.helper.metadata_filter import MetadataFilter  
 from genfoundry.km.query.helper.llm_prompt_templates import resume_search_prompt
+from genfoundry.km.utils.openai_rate_limiter import llama_index_client_kwargs
+from genfoundry.km.persist.vector_namespace_registry import get_tenant_namespace
+from genfoundry.km.query.helper.metadata_joiner import ResumeMetadataJoiner
 
 
 class ResumeFilterSemanticSearcher:
@@ -29,8 +32,8 @@ class ResumeFilterSemanticSearcher:
         self.resume_details_popup_url = os.getenv("RESUME_DETAILS_POPUP_URL")
         os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 
-        Settings.llm = OpenAI(model=self.llm_model, temperature=0.0)
-        Settings.embed_model = OpenAIEmbedding(model="text-embedding-ada-002")
+        Settings.llm = OpenAI(model=self.llm_model, temperature=0.0, **llama_index_client_kwargs())
+        Settings.embed_model = OpenAIEmbedding(model="text-embedding-ada-002", **llama_index_client_kwargs())
         self.similarity_cutoff = similarity_cutoff
 
     def search(self, tenant_id: str, question: str, filter_dict: Dict[str, Any]):
@@ -52,7 +55,7 @@ class ResumeFilterSemanticSearcher:
                     "message": "No matching resumes found for the given filters."
                 }
 
-            query_engine = self._build_query_engine(retriever)
+            query_engine = self._build_query_engine(retriever, tenant_id)
 
             llm_question = self._format_llm_query(question)
             result = query_engine.query(llm_question)
@@ -78,7 +81,7 @@ class ResumeFilterSemanticSearcher:
             raise
 
     def _init_vector_index(self, tenant_id: str):
-        pinecone_namespace = f"{tenant_id}_Resumes_NS"
+        pinecone_namespace = get_tenant_namespace(tenant_id)
         logging.debug(f"Initializing vector index for namespace: {pinecone_namespace}")
         vector_store = PineconeVectorStore(
             index_name=self.pinecone_index,
@@ -227,11 +230,15 @@ class ResumeFilterSemanticSearcher:
             filters=filters
         )
 
-    def _build_query_engine(self, retriever):
+    def _build_query_engine(self, retriever, tenant_id: str):
         return RetrieverQueryEngine(
             retriever=retriever,
             response_synthesizer=get_response_synthesizer(),
-            node_postprocessors=[SimilarityPostprocessor(similarity_cutoff=self.similarity_cutoff)]
+            node_postprocessors=[
+                SimilarityPostprocessor(similarity_cutoff=self.similarity_cutoff),
+                # Vectors carry only the filterable keys; add the rest before synthesis
+                ResumeMetadataJoiner(tenant_id=tenant_id),
+            ]
         )
 
     def _format_llm_query(self, question: str) -> str:
@@ -11,6 +11,9 @@ from llama_index.core.vector_stores import MetadataFilter, MetadataFilters
 from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.llms.openai import OpenAI
 from llama_index.core import Settings
+from genfoundry.km.utils.openai_rate_limiter import llama_index_client_kwargs
+from genfoundry.km.persist.vector_namespace_registry import get_tenant_namespace
+from genfoundry.km.query.helper.metadata_joiner import ResumeMetadataJoiner
 
 
 class ResumeSearcher:
@@ -22,8 +25,8 @@ class ResumeSearcher:
         self.resume_details_popup_url = os.getenv("RESUME_DETASILS_POPUP_URL")
         os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
         logging.debug("LLM model: " + self.llm_model)
-        Settings.llm = OpenAI(model=self.llm_model, temperature=0.0)
-        embed_model = OpenAIEmbedding(model="text-embedding-ada-002")
+        Settings.llm = OpenAI(model=self.llm_model, temperature=0.0, **llama_index_client_kwargs())
+        embed_model = OpenAIEmbedding(model="text-embedding-ada-002", **llama_index_client_kwargs())
         Settings.embed_model = embed_model
         logging.debug("ResumeSearch initialized.")
 
@@ -44,7 +47,8 @@ class ResumeSearcher:
 
             # To set the threshold, set it in vector_store_kwargs       
             query_engine = RetrieverQueryEngine(
-                retriever=retriever, response_synthesizer=response_synthesizer, node_postprocessors=[postprocessor])
+                retriever=retriever, response_synthesizer=response_synthesizer,
+                node_postprocessors=[postprocessor, ResumeMetadataJoiner(tenant_id=namespace)])
             logging.debug("Running query engine with question.")
             
             # To set the threshold, set it in vector_store_kwargs
@@ -94,7 +98,7 @@ You are an expert talent acquisition professional analyzing a vector database of
 
     def get_tenant_vectorestore(self, tenant_id):
         """Returns the Pinecone namespace for the tenant."""
-        pinecone_namespace = f"{tenant_id}_Resumes_NS"  # Per-tenant namespace
+        pinecone_namespace = get_tenant_namespace(tenant_id)  # Per-tenant namespace
         vector_store = PineconeVectorStore(
             index_name=self.pinecone_index,
             api_key=self.pinecone_api_key,
@@ -0,0 +1,102 @@
+"""
+"More like this candidate": resumes whose chunk vectors lie closest to a
+given resume's, using only the vectors already stored in the tenant's
+Pinecone namespace and the metadata in Mongo. Nothing is embedded and no LLM
+is involved.
+
+When the tenant's doc-level namespace is complete, the resume's stored
+centroid is matched against the other centroids: one fetch and one query.
+Otherwise the resume's chunk vectors are averaged into a centroid on the fly,
+which is matched against every other resume's chunks; each neighbour scores
+the mean of its best Config.SIMILAR_CANDIDATES_CHUNKS_PER_RESUME chunk matches.
+"""
+import logging
+import threading
+
+from genfoundry.config import Config
+from genfoundry.km.persist.resume_metadata_store import get_resume_metadata_store
+from genfoundry.km.persist.vector_db_proxy import centroid
+from genfoundry.km.persist.vector_namespace_registry import get_tenant_doc_namespace, get_tenant_namespace
+from genfoundry.km.query.helper.vector_matches import (
+    aggregate_chunk_scores, fetched_values, query_matches, resume_scores, timeout_kwargs
+)
+from genfoundry.km.query.tiered_resume_search import candidate_match
+
+logger = logging.getLogger(__name__)
+
+# Index dimension, read once per process for the probe queries
+_dimension = None
+_dimension_lock = threading.Lock()
+
+
+class SimilarCandidateFinder():
+    def __init__(self, index=None, metadata_store=None, resume_details_popup_url=None) -> None:
+        self._index = index
+        self.metadata_store = metadata_store
+        self.resume_details_popup_url = resume_details_popup_url or Config.RESUME_DETAILS_POPUP_URL
+
+    @property
+    def index(self):
+        if self._index is None:
+            from pinecone import Pinecone
+            self._index = Pinecone(api_key=Config.PINECONE_API_KEY).Index(Config.PINECONE_INDEX)
+        return self._index
+
+    def _index_dimension(self):
+        global _dimension
+        if _dimension is None:
+            with _dimension_lock:
+                if _dimension is None:
+                    _dimension = self.index.describe_index_stats().dimension
+        return _dimension
+
+    def resume_vectors(self, namespace, resume_id):
+        """The stored chunk vectors of a resume (any ID scheme, so legacy vectors are found too)."""
+        dimension = self._index_dimension()
+        # Any non-zero vector will do; the filter picks the resume's chunks
+        probe = [1.0] + [0.0] * (dimension - 1)
+        response = self.index.query(vector=probe, top_k=Config.SIMILAR_CANDIDATES_MAX_SOURCE_CHUNKS,
+                                    namespace=namespace, include_values=True,
+                                    filter={"doc_id": {"$eq": resume_id}}, **timeout_kwargs(self.index.query))
+        return [match.values if hasattr(match, "values") else match.get("values")
+                for match in query_matches(response)]
+
+    def find(self, tenant_id, resume_id, top_k=None):
+        """
+        Returns the resumes most similar to resume_id, best first, as
+        TieredResumeSearcher matches (score is the similarity), or None if the
+        resume has no vectors in the tenant's namespace.
+        """
+        top_k = top_k or Config.SIMILAR_CANDIDATES_TOP_K
+        exclude_self = {"doc_id": {"$ne": resume_id}}
+        similarities = None
+
+        doc_namespace = get_tenant_doc_namespace(tenant_id)
+        if doc_namespace:
+            fetched = self.index.fetch(ids=[resume_id], namespace=doc_namespace, **timeout_kwargs(self.index.fetch))
+            vector = fetched_values(fetched, resume_id)
+            if vector:
+                response = self.index.query(vector=vector, top_k=top_k, namespace=doc_namespace,
+                                            include_metadata=True, filter=exclude_self,
+                                            **timeout_kwargs(self.index.query))
+                similarities = resume_scores(query_matches(response))
+
+        if similarities is None:
+            namespace = get_tenant_namespace(tenant_id)
+            vector = centroid(self.resume_vectors(namespace, resume_id))
+            if vector is None:
+                return None
+            response = self.index.query(vector=vector, top_k=Config.SIMILAR_CANDIDATES_CHUNK_TOP_K,
+                                        namespace=namespace, include_metadata=True, filter=exclude_self,
+                                        **timeout_kwargs(self.index.query))
+            similarities = aggregate_chunk_scores(query_matches(response), Config.SIMILAR_CANDIDATES_CHUNKS_PER_RESUME)
+        similarities.pop(resume_id, None)
+        ranked = sorted(similarities.items(), key=lambda item: item[1][0], reverse=True)[:top_k]
+
+        store = self.metadata_store or get_resume_metadata_store()
+        stored = store.get_many(tenant_id, [neighbour for neighbour, _ in ranked])
+        return [
+            candidate_match(neighbour, {**vector_metadata, **stored.get(neighbour, {})}, similarity,
+                            self.resume_details_popup_url)
+            for neighbour, (similarity, vector_metadata) in ranked
+        ]
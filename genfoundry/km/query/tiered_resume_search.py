@@ -15,10 +15,47 @@ from llama_index.core.vector_stores.types import MetadataFilter, MetadataFilters
 from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.llms.openai import OpenAI
 from llama_index.core import Settings
+from llama_index.core.schema import QueryBundle
 
 from genfoundry.km.query.helper.filter_normalizer import FilterNormalizer
 #from genfoundry.km.query.helper.metadata_filter import MetadataFilter  
 from genfoundry.km.query.helper.llm_prompt_templates import resume_search_prompt
+from genfoundry.config import Config
+from genfoundry.km.utils.openai_rate_limiter import llama_index_client_kwargs
+from genfoundry.km.utils.request_deadline import deadline_stage, has_budget
+from genfoundry.km.persist.vector_namespace_registry import get_tenant_namespace
+from genfoundry.km.query.helper.metadata_joiner import ResumeMetadataJoiner
+from genfoundry.km.utils.taxonomy import SKILLS, TITLES, get_taxonomy
+
+# Soft filters matched through the taxonomy: filter key -> (taxonomy kind, metadata key of the IDs)
+TAXONOMY_KEYS = {
+    "job_title": (TITLES, "title_ids"),
+    "technical_skills": (SKILLS, "skill_ids"),
+    "leadership_skills": (SKILLS, "skill_ids"),
+}
+# Filters whose values are alternatives rather than requirements
+ALTERNATIVE_VALUE_KEYS = {"job_title"}
+# Strict filters the index applies as "any of" ($in), scored by how many of their values match
+SCORED_INDEX_KEYS = {"technical_skills", "leadership_skills"}
+
+
+def candidate_match(doc_id, metadata, score, resume_details_popup_url, matched_count=0, total_required=0):
+    """One entry of the "matches" list returned by the search endpoints."""
+    return {
+        "resume_id": doc_id,
+        "name": metadata.get("candidate_name"),
+        "job_title": metadata.get("latest_job_title"),
+        "career_domain": metadata.get("career_domain"),
+        "years_of_experience": metadata.get("years_of_experience"),
+        "location": metadata.get("location"),
+        "technical_skills": metadata.get("technical_skills", []),
+        "leadership_skills": metadata.get("leadership_skills", []),
+        "education": metadata.get("highest_education_level"),
+        "resume_link": f"{resume_details_popup_url}?ID={doc_id}",
+        "score": round(score, 2),
+        "matched_count": matched_count,
+        "total_required": total_required
+    }
 
 
 class TieredResumeSearcher:
@@ -30,11 +67,13 @@ class TieredResumeSearcher:
         self.resume_details_popup_url = os.getenv("RESUME_DETAILS_POPUP_URL")
         #os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 
-        Settings.llm = OpenAI(model=self.llm_model, temperature=0.0)
-        Settings.embed_model = OpenAIEmbedding(model="text-embedding-ada-002")
+        Settings.llm = OpenAI(model=self.llm_model, temperature=0.0, **llama_index_client_kwargs())
+        Settings.embed_model = OpenAIEmbedding(model="text-embedding-ada-002", **llama_index_client_kwargs())
         self.similarity_cutoff = similarity_cutoff
         #self.strict_filter_fields = ['location', 'years_of_experience', 'career_domain']
-        self.strict_filter_fields = ['location', 'career_domain']
+        # Filters pushed down to the vector index once FilterNormalizer has
+        # canonicalized them; everything else is scored after retrieval
+        self.strict_filter_fields = ['location', 'career_domain', 'years_of_experience', 'technical_skills']
 
     """
     def search(self, tenant_id: str, question: str, filter_dict: Dict[str, Any]):
@@ -51,7 +90,7 @@ class TieredResumeSearcher:
             # Step 3: Tier 1 - Strict + Semantic
             logging.info("Tier 1: Trying strict filters with semantic search")
             retriever = self._create_retriever(vector_index, metadata_filters)
-            query_engine = self._build_query_engine(retriever)
+            query_engine = self._build_query_engine(retriever, tenant_id)
             llm_question = self._format_llm_query(question)
             result = query_engine.query(llm_question)
             top_documents = result.source_nodes
@@ -66,7 +105,7 @@ class TieredResumeSearcher:
             # Tier 2 - Semantic only, score with soft filters
             logging.info("Tier 1 failed, falling back to Tier 2: No strict filters")
             retriever = self._create_retriever(vector_index, metadata_filters=None)
-            query_engine = self._build_query_engine(retriever)
+            query_engine = self._build_query_engine(retriever, tenant_id)
             result = query_engine.query(llm_question)
             top_documents = result.source_nodes
 
@@ -84,7 +123,7 @@ class TieredResumeSearcher:
             # Tier 3 - Pure semantic fallback
             logging.info("Tier 2 failed, falling back to Tier 3: Unfiltered semantic search")
             retriever = self._create_retriever(vector_index)
-            query_engine = self._build_query_engine(retriever)
+            query_engine = self._build_query_engine(retriever, tenant_id)
             result = query_engine.query(llm_question)
             top_documents = result.source_nodes
 
@@ -112,23 +151,36 @@ class TieredResumeSearcher:
             # Step 1: Split filters
             strict_filters, soft_filters = self._split_filter_dict(filter_dict)
 
-            # Step 2: Build metadata filters (strict only)
+            # Step 2: Build metadata filters (strict only). Values that can't be
+            # canonicalized for the index are scored with the soft filters instead
             normalized_filters = FilterNormalizer.normalize(strict_filters)
             logging.debug("Normalized filters: %s", normalized_filters)
-            metadata_filters = self._build_metadata_filters(normalized_filters)
+            index_filters, unresolved_filters = FilterNormalizer.to_index_filters(normalized_filters)
+            for key in unresolved_filters:
+                soft_filters[key] = strict_filters.pop(key)
+            metadata_filters = self._build_metadata_filters(index_filters)
             logging.debug("Metadata filters: %s", metadata_filters)
             # Step 3: Tiered Search Logic
-            for tier_name, filters in [
+            tiers = [
                 ("Tier 1", metadata_filters),
                 ("Tier 2", None),
                 ("Tier 3", None)  # Tier 3 is fallback; semantic only
-            ]:
+            ]
+            for position, (tier_name, filters) in enumerate(tiers):
+                # A fallback tier is only started with enough of the request budget left for it
+                if position and not has_budget(Config.SEARCH_TIER_MIN_SECONDS):
+                    skipped = [name for name, _ in tiers[position:]]
+                    logging.warning(f"Request deadline nearly spent, skipping {skipped}")
+                    return {"matches": [], "message": "No results found before the request deadline",
+                            "tier": "None", "skipped_tiers": skipped}
+
                 logging.info(f"{tier_name}: {'Using strict filters' if filters else 'Unfiltered semantic search'}")
                 retriever = self._create_retriever(vector_index, filters)
-                query_engine = self._build_query_engine(retriever)
+                query_engine = self._build_query_engine(retriever, tenant_id)
                 llm_question = self._format_llm_query(question)
-                result = query_engine.query(llm_question)
-                top_documents = result.source_nodes
+                # Only the retrieved nodes are used, so no answer is synthesized from them
+                with deadline_stage(f"{tier_name} retrieval"):
+                    top_documents = query_engine.retrieve(QueryBundle(llm_question))
 
                 if top_documents:
                     logging.info(f"{tier_name} succeeded")
@@ -147,7 +199,11 @@ class TieredResumeSearcher:
 
                     # ✅ Score soft filters on top of best matches
                     logging.debug(f"Soft filters before scoring: {json.dumps(soft_filters, indent=2)}")
-                    scored_resumes = self._score_soft_filters(list(resume_map.values()), soft_filters, use_fuzzy=True)
+                    # Without the index filters, the strict criteria are scored like soft ones.
+                    # Skills pushed down only require one match, so they are still scored
+                    scoring_filters = {**strict_filters, **soft_filters} if not filters else {
+                        **{k: v for k, v in strict_filters.items() if k in SCORED_INDEX_KEYS}, **soft_filters}
+                    scored_resumes = self._score_soft_filters(list(resume_map.values()), scoring_filters, use_fuzzy=True)
 
                     # ✅ Top N (avoid ties messing up sort)
                     top_n = sorted(scored_resumes, key=lambda x: x["score"], reverse=True)[:20]
@@ -168,7 +224,7 @@ class TieredResumeSearcher:
 
 
     def _init_vector_index(self, tenant_id: str):
-        pinecone_namespace = f"{tenant_id}_Resumes_NS"
+        pinecone_namespace = get_tenant_namespace(tenant_id)
         logging.debug(f"Initializing vector index for namespace: {pinecone_namespace}")
         vector_store = PineconeVectorStore(
             index_name=self.pinecone_index,
@@ -337,12 +393,13 @@ class TieredResumeSearcher:
         if isinstance(filters, dict):
             for key, value in filters.items():
                 # ✅ First, check for range format
-                if isinstance(value, dict) and "min" in value and "max" in value:
-                    min_value = value["min"]
-                    max_value = value["max"]
-                    if isinstance(min_value, (int, float)) and isinstance(max_value, (int, float)):
-                        filter_list.append(MetadataFilter(key=key, value=min_value, operator=FilterOperator.GTE))
-                        filter_list.append(MetadataFilter(key=key, value=max_value, operator=FilterOperator.LTE))
+                if isinstance(value, dict) and ("min" in value or "max" in value):
+                    # Either bound may be open: "10+ years" is {"min": 10}
+                    bounds = [(value.get("min"), FilterOperator.GTE), (value.get("max"), FilterOperator.LTE)]
+                    if all(b is None or isinstance(b, (int, float)) for b, _ in bounds):
+                        for bound, operator in bounds:
+                            if bound is not None:
+                                filter_list.append(MetadataFilter(key=key, value=bound, operator=operator))
                     else:
                         logging.warning(f"Invalid range filter for key '{key}': min/max must be numeric.")
                 # ✅ Second, handle list values (IN operator)
@@ -385,11 +442,15 @@ class TieredResumeSearcher:
             filters=metadata_filters
         )
 
-    def _build_query_engine(self, retriever):
+    def _build_query_engine(self, retriever, tenant_id: str):
         return RetrieverQueryEngine(
             retriever=retriever,
             response_synthesizer=get_response_synthesizer(),
-            node_postprocessors=[SimilarityPostprocessor(similarity_cutoff=self.similarity_cutoff)]
+            node_postprocessors=[
+                SimilarityPostprocessor(similarity_cutoff=self.similarity_cutoff),
+                # Vectors carry only the filterable keys; add the rest before synthesis
+                ResumeMetadataJoiner(tenant_id=tenant_id),
+            ]
         )
 
     def _format_llm_query(self, question: str) -> str:
@@ -518,6 +579,23 @@ class TieredResumeSearcher:
         return strict_filters, soft_filters
 
 
+    @staticmethod
+    def _taxonomy_match(kind, value, candidate_ids):
+        """
+        Scores a filter value against a resume's taxonomy IDs: 100 if the resume
+        has the value's ID, 75 if it has a title in the same category, 0 if
+        neither, or None if the value isn't in the taxonomy.
+        """
+        taxonomy = get_taxonomy()
+        value_ids = taxonomy.find_ids(kind, value)
+        if not value_ids:
+            return None
+        if candidate_ids.intersection(value_ids):
+            return 100
+        if kind == TITLES and any(candidate_ids.intersection(taxonomy.parents(kind, i)) for i in value_ids):
+            return 75
+        return 0
+
     def _score_soft_filters(self, documents, soft_filters, use_fuzzy=False, threshold=80):
         """
         Scores resumes based on how many soft filter items match.
@@ -557,32 +635,46 @@ class TieredResumeSearcher:
 
                 # Backward-compatible list filter (e.g., skills or locations)
                 if isinstance(filter_spec, list):
-                    required_values = [v.lower() for v in filter_spec]
+                    required_values = [str(v).lower() for v in filter_spec]
                     candidate_values = candidate_value or []
                     if not isinstance(candidate_values, list):
                         candidate_values = [str(candidate_value)]
-                    candidate_values = [v.lower() for v in candidate_values]
+                    candidate_values = [str(v).lower() for v in candidate_values]
 
-                    matched_score = 0
+                    # Resumes ingested with the taxonomy carry skill/title IDs: known
+                    # terms are matched by ID, only unknown ones fall back to fuzzy
+                    kind, ids_key = TAXONOMY_KEYS.get(key, (None, None))
+                    candidate_ids = set(metadata.get(ids_key) or []) if kind else set()
+
+                    req_scores = []
                     for req in required_values:
-                        best_score = 0
-                        for cand in candidate_values:
-                            if use_fuzzy:
-                                score = fuzz.token_set_ratio(req, cand)
-                                best_score = max(best_score, score)
-                            else:
-                                if req == cand:
-                                    best_score = 100
-                                    break
-                        matched_score += best_score / 100.0  # normalize to 0–1
-
-                    score += matched_score
-                    total_possible += len(required_values)
+                        best_score = self._taxonomy_match(kind, req, candidate_ids) if candidate_ids else None
+                        if best_score is None:
+                            best_score = 0
+                            for cand in candidate_values:
+                                if use_fuzzy:
+                                    ratio = fuzz.token_set_ratio(req, cand)
+                                    best_score = max(best_score, ratio)
+                                else:
+                                    if req == cand:
+                                        best_score = 100
+                                        break
+                        req_scores.append(best_score / 100.0)  # normalize to 0–1
+
+                    if key in ALTERNATIVE_VALUE_KEYS:
+                        # Alternative titles: matching any one of them is a full match
+                        score += max(req_scores, default=0)
+                        total_possible += 1 if req_scores else 0
+                    else:
+                        score += sum(req_scores)
+                        total_possible += len(required_values)
 
                 # Dict-based filter (supports operator like "range")
                 elif isinstance(filter_spec, dict):
                     operator = filter_spec.get("operator")
                     value = filter_spec.get("value")
+                    if operator is None and ("min" in filter_spec or "max" in filter_spec):
+                        operator, value = "range", filter_spec
 
                     if operator == "range" and isinstance(value, dict):
                         try:
@@ -597,21 +689,8 @@ class TieredResumeSearcher:
 
             normalized_score = score / total_possible if total_possible else 0
 
-            scored.append({
-                "resume_id": doc_id,
-                "name": metadata.get("candidate_name"),
-                "job_title": metadata.get("latest_job_title"),
-                "career_domain": metadata.get("career_domain"),
-                "years_of_experience": metadata.get("years_of_experience"),
-                "location": metadata.get("location"),
-                "technical_skills": metadata.get("technical_skills", []),
-                "leadership_skills": metadata.get("leadership_skills", []),
-                "education": metadata.get("highest_education_level"),
-                "resume_link": f"{self.resume_details_popup_url}?ID={doc_id}",
-                "score": round(normalized_score, 2),
-                "matched_count": score,
-                "total_required": total_possible
-            })
+            scored.append(candidate_match(doc_id, metadata, normalized_score, self.resume_details_popup_url,
+                                          matched_count=score, total_required=total_possible))
 
         return scored
     
@@ -1,16 +1,28 @@
 from llama_parse import LlamaParse
 from llama_index.core import SimpleDirectoryReader
+import hashlib
 import logging
 import tempfile
 import os
 import nest_asyncio
+import pymupdf
+
+from genfoundry.km.preprocess.parsed_document_cache import compute_content_hash, get_parsed_document_cache
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 
 class DocumentParser():
-    def __init__(self, llama_cloud_api_key, parsingInstruction=None) -> None:
+    PARSER_NAME = "llamaparse"
+    # Bump when the LlamaParse settings below change so cached output is invalidated
+    PARSER_VERSION = "1-text"
+
+    def __init__(self, llama_cloud_api_key, parsingInstruction=None, cache=None) -> None:
         logging.debug("Inside DocumentParser instance init")
+        self.cache = cache if cache is not None else get_parsed_document_cache()
+        # The parsing instruction changes the output, so it is part of the cache key
+        instruction_hash = hashlib.sha256((parsingInstruction or "").encode("utf-8")).hexdigest()[:12]
+        self.parser_version = f"{self.PARSER_VERSION}-{instruction_hash}"
         self.parser = LlamaParse(
                 api_key=llama_cloud_api_key,
                 result_type= "text",
@@ -25,16 +37,19 @@ class DocumentParser():
         try:
             logging.debug(f"Inside parse_document method. Parsing document: {file}")
             
-            # Save the file to a temporary location
-            temp_dir = tempfile.gettempdir()
-            file_path = os.path.join(temp_dir, file.filename)
-                
-            # Save the file to the temporary location with its original name
-            with open(file_path, "wb") as temp_file:
+            # Save the file to a temporary file of its own, keeping the extension
+            # the parser goes by; concurrent requests may upload the same name
+            fd, file_path = tempfile.mkstemp(suffix=os.path.splitext(file.filename or "")[1])
+            with os.fdopen(fd, "wb") as temp_file:
                 file.save(temp_file)
                 
             logging.debug(f"======> Saved {file.filename} to local disk at: {file_path}")
             assert os.path.exists(file_path), f"File {file_path} not found."
+
+            content_hash = compute_content_hash(file_path)
+            cached = self.cache.get(content_hash, self.PARSER_NAME, self.parser_version)
+            if cached:
+                return cached["text"]
             
             # Read and parse the document
             logging.debug(f"Loading data into LlamaParser from {file_path}")
@@ -44,6 +59,8 @@ class DocumentParser():
             # Extract the text from the first document
             docString = documents[0].text
             logging.debug(f"Document parsed successfully. Content: {docString[:5000]}...")  # Log a snippet
+
+            self.cache.put(content_hash, self.PARSER_NAME, self.parser_version, docString, self._count_pages(file_path))
             return docString
 
         except Exception as e:
@@ -55,3 +72,11 @@ class DocumentParser():
             if file_path and os.path.exists(file_path):
                 logging.debug(f"Removing temporary file: {file_path}")
                 os.remove(file_path)
+
+    def _count_pages(self, file_path):
+        try:
+            with pymupdf.open(file_path) as doc:
+                return doc.page_count
+        except Exception as e:
+            logging.debug(f"Could not determine page count for {file_path}: {e}")
+            return None
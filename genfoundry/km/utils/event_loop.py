@@ -0,0 +1,64 @@
+"""
+One persistent asyncio event loop per process, running on a daemon thread.
+
+Sync request handlers use run_coroutine() to run async client code (such as
+AsyncTavilyClient searches) instead of asyncio.run(), which creates and
+closes a loop, and the connection pools bound to it, on every call. Any
+number of worker threads can wait on the loop at once and their I/O overlaps.
+
+The loop is created on first use, and again after a fork, so a gunicorn or
+Celery worker never drives a loop inherited from its parent.
+"""
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+_loop = None
+_loop_pid = None
+_loop_thread = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop():
+    """The process's persistent event loop, started if it is not running yet."""
+    global _loop, _loop_pid, _loop_thread
+    if _loop is None or _loop_pid != os.getpid():
+        with _loop_lock:
+            if _loop is None or _loop_pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="event-loop", daemon=True)
+                thread.start()
+                _loop, _loop_pid, _loop_thread = loop, os.getpid(), thread
+                logger.debug(f"Started the event loop for process {_loop_pid}")
+    return _loop
+
+
+async def _in_context(context, coroutine):
+    # Tasks start from the loop thread's context; carry over the caller's
+    # context variables (e.g. the OpenAI request priority)
+    for variable, value in context.items():
+        variable.set(value)
+    return await coroutine
+
+
+def run_coroutine(coroutine, timeout=None):
+    """
+    Runs coroutine on the process's event loop and returns its result,
+    blocking the calling thread meanwhile. Raises what the coroutine raises,
+    or TimeoutError after timeout seconds, in which case it is cancelled.
+    """
+    loop = get_event_loop()
+    if threading.current_thread() is _loop_thread:
+        coroutine.close()
+        raise RuntimeError("run_coroutine() cannot be called from the event loop thread; await instead")
+    future = asyncio.run_coroutine_threadsafe(_in_context(contextvars.copy_context(), coroutine), loop)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"Coroutine did not finish within {timeout} seconds")
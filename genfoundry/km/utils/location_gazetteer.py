@@ -0,0 +1,189 @@
+"""
+Resolves free-text locations ("Toronto, ON", "Greater Toronto Area",
+"Bay Area, California", "Remote - Canada") to hierarchical codes:
+
+    ["CA", "CA-ON", "CA-ON-TORONTO"]
+
+Resumes store every level, so a filter on any level ("Canada", "Ontario" or
+"Toronto") is a single $in match in the vector index. Places that are not in
+the gazetteer resolve to no codes; callers fall back to fuzzy text matching.
+"""
+import re
+from functools import lru_cache
+
+COUNTRIES = {
+    "CA": ["canada"],
+    "US": ["united states", "united states of america", "usa", "u.s.a.", "u.s.", "us", "america"],
+    "GB": ["united kingdom", "uk", "u.k.", "great britain", "britain", "wales"],
+    "IE": ["ireland"],
+    "IN": ["india"],
+    "DE": ["germany", "deutschland"],
+    "FR": ["france"],
+    "NL": ["netherlands", "the netherlands", "holland"],
+    "AU": ["australia"],
+    "SG": ["singapore"],
+    "AE": ["united arab emirates", "uae"],
+    "MX": ["mexico"],
+    "BR": ["brazil"],
+}
+
+# "<country>-<region>": aliases. Two-letter postal abbreviations are only
+# matched in their upper-case form (see _ABBREVIATIONS) so "in" or "me" in a
+# sentence is not read as a state.
+REGIONS = {
+    "CA-AB": ["alberta"], "CA-BC": ["british columbia"], "CA-MB": ["manitoba"],
+    "CA-NB": ["new brunswick"], "CA-NL": ["newfoundland", "newfoundland and labrador"],
+    "CA-NS": ["nova scotia"], "CA-ON": ["ontario"], "CA-PE": ["prince edward island", "pei"],
+    "CA-QC": ["quebec", "québec"], "CA-SK": ["saskatchewan"],
+    "US-AZ": ["arizona"], "US-CA": ["california"], "US-CO": ["colorado"], "US-DC": ["district of columbia"],
+    "US-FL": ["florida"], "US-GA": ["georgia"], "US-IL": ["illinois"], "US-MA": ["massachusetts"],
+    "US-MI": ["michigan"], "US-MN": ["minnesota"], "US-NC": ["north carolina"], "US-NJ": ["new jersey"],
+    "US-NY": ["new york state"], "US-OH": ["ohio"], "US-OR": ["oregon"], "US-PA": ["pennsylvania"],
+    "US-TX": ["texas"], "US-UT": ["utah"], "US-VA": ["virginia"], "US-WA": ["washington state"],
+    "GB-ENG": ["england"], "GB-SCT": ["scotland"],
+    "IN-KA": ["karnataka"], "IN-MH": ["maharashtra"], "IN-TG": ["telangana"], "IN-TN": ["tamil nadu"],
+    "IN-DL": ["delhi ncr", "ncr"],
+}
+_ABBREVIATIONS = {
+    "CA": ["AB", "BC", "MB", "NB", "NL", "NS", "ON", "PE", "QC", "SK"],
+    "US": ["AZ", "CA", "CO", "DC", "FL", "GA", "IL", "MA", "MI", "MN", "NC", "NJ", "NY", "OH", "OR", "PA",
+           "TX", "UT", "VA", "WA"],
+}
+
+# "<country>-<region>-<city>": aliases
+CITIES = {
+    "CA-ON-TORONTO": ["toronto", "gta", "greater toronto area", "north york", "scarborough", "etobicoke"],
+    "CA-ON-MISSISSAUGA": ["mississauga"], "CA-ON-BRAMPTON": ["brampton"], "CA-ON-MARKHAM": ["markham"],
+    "CA-ON-VAUGHAN": ["vaughan"], "CA-ON-OAKVILLE": ["oakville"], "CA-ON-OTTAWA": ["ottawa"],
+    "CA-ON-WATERLOO": ["waterloo", "kitchener", "kitchener-waterloo"], "CA-ON-HAMILTON": ["hamilton"],
+    "CA-ON-LONDON": ["london, on", "london, ontario"],
+    "CA-QC-MONTREAL": ["montreal", "montréal"], "CA-QC-QUEBEC": ["quebec city", "québec city"],
+    "CA-BC-VANCOUVER": ["vancouver", "burnaby", "surrey", "richmond, bc"], "CA-BC-VICTORIA": ["victoria, bc"],
+    "CA-AB-CALGARY": ["calgary"], "CA-AB-EDMONTON": ["edmonton"], "CA-MB-WINNIPEG": ["winnipeg"],
+    "CA-NS-HALIFAX": ["halifax"], "CA-SK-SASKATOON": ["saskatoon"], "CA-SK-REGINA": ["regina"],
+    "US-NY-NEW_YORK": ["new york", "new york city", "nyc", "manhattan", "brooklyn"],
+    "US-CA-SAN_FRANCISCO": ["san francisco", "sf", "bay area", "sf bay area", "san francisco bay area"],
+    "US-CA-SAN_JOSE": ["san jose", "silicon valley", "palo alto", "mountain view", "sunnyvale", "santa clara"],
+    "US-CA-LOS_ANGELES": ["los angeles"], "US-CA-SAN_DIEGO": ["san diego"],
+    "US-WA-SEATTLE": ["seattle", "bellevue", "redmond"], "US-MA-BOSTON": ["boston", "cambridge, ma"],
+    "US-IL-CHICAGO": ["chicago"], "US-TX-AUSTIN": ["austin"], "US-TX-DALLAS": ["dallas", "dallas-fort worth"],
+    "US-TX-HOUSTON": ["houston"], "US-GA-ATLANTA": ["atlanta"], "US-CO-DENVER": ["denver", "boulder"],
+    "US-DC-WASHINGTON": ["washington, dc", "washington dc", "washington d.c."], "US-FL-MIAMI": ["miami"],
+    "US-PA-PHILADELPHIA": ["philadelphia"], "US-MN-MINNEAPOLIS": ["minneapolis"],
+    "US-NC-CHARLOTTE": ["charlotte"], "US-NC-RALEIGH": ["raleigh", "research triangle"],
+    "US-OR-PORTLAND": ["portland"], "US-AZ-PHOENIX": ["phoenix"], "US-MI-DETROIT": ["detroit"],
+    "GB-ENG-LONDON": ["london"], "GB-ENG-MANCHESTER": ["manchester"], "GB-SCT-EDINBURGH": ["edinburgh"],
+    "IE-DUBLIN": ["dublin"],
+    "IN-KA-BENGALURU": ["bengaluru", "bangalore"], "IN-MH-MUMBAI": ["mumbai", "bombay"],
+    "IN-MH-PUNE": ["pune"], "IN-TG-HYDERABAD": ["hyderabad"], "IN-TN-CHENNAI": ["chennai", "madras"],
+    "IN-DL-DELHI": ["delhi", "new delhi", "gurgaon", "gurugram", "noida"],
+    "DE-BERLIN": ["berlin"], "DE-MUNICH": ["munich", "münchen"], "FR-PARIS": ["paris"],
+    "NL-AMSTERDAM": ["amsterdam"], "AU-SYDNEY": ["sydney"], "AU-MELBOURNE": ["melbourne"],
+    "SG-SINGAPORE": ["singapore"], "AE-DUBAI": ["dubai"], "MX-MEXICO_CITY": ["mexico city"],
+    "BR-SAO_PAULO": ["são paulo", "sao paulo"],
+}
+
+
+def _ancestors(code):
+    parts = code.split("-")
+    return ["-".join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def _pattern(alias):
+    return re.compile(r"(?<![\w])" + re.escape(alias) + r"(?![\w])")
+
+
+def _build_entries():
+    entries = []
+    for table in (COUNTRIES, REGIONS, CITIES):
+        for code, aliases in table.items():
+            for alias in aliases:
+                entries.append((_pattern(alias), code, len(alias)))
+    # Longest aliases first, so "new york city" wins over "new york" and "york"
+    entries.sort(key=lambda entry: -entry[2])
+    return entries
+
+
+_ENTRIES = _build_entries()
+_ABBREVIATION_PATTERNS = [
+    (re.compile(rf"(?:,|\b)\s*{abbr}\b(?![a-z])"), f"{country}-{abbr}")
+    for country, abbrs in _ABBREVIATIONS.items() for abbr in abbrs
+]
+
+
+def resolve_location(text):
+    """
+    Returns the hierarchical codes for a location string, most general first
+    within each place, or [] if nothing in it is known.
+    """
+    if not text or not isinstance(text, str):
+        return []
+    return list(_resolve(text.strip()))
+
+
+def find_places(text):
+    """
+    Returns the (start, end) spans of the places mentioned in free text such
+    as a search query, with the parts of one place ("Toronto, ON") merged.
+    Unlike a location field, a query is mostly not a place, so short aliases
+    ("us", "sf") only count in upper case and a postal abbreviation only right
+    after a place it qualifies.
+    """
+    if not text or not isinstance(text, str):
+        return []
+    lowered = text.lower()
+    spans = []
+    for pattern, _, length in _ENTRIES:
+        for match in pattern.finditer(lowered):
+            start, end = match.span()
+            if length <= 3 and not text[start:end].isupper():
+                continue
+            if any(start < e and s < end for s, e in spans):
+                continue
+            spans.append((start, end))
+    spans.sort()
+    merged = []
+    for start, end in spans:
+        if merged and re.fullmatch(r"[\s,]*", text[merged[-1][1]:start]):
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    for pattern, _ in _ABBREVIATION_PATTERNS:
+        for match in pattern.finditer(text):
+            for i, (start, end) in enumerate(merged):
+                if re.fullmatch(r"[\s,]*", text[end:match.end() - 2]):
+                    merged[i] = (start, max(end, match.end()))
+    return merged
+
+
+@lru_cache(maxsize=4096)
+def _resolve(text):
+    lowered = text.lower()
+    matched = []
+    spans = []
+    for pattern, code, _ in _ENTRIES:
+        for match in pattern.finditer(lowered):
+            # A shorter alias inside a longer match ("york" in "new york") is not a second place
+            if any(start <= match.start() and match.end() <= end for start, end in spans):
+                continue
+            spans.append(match.span())
+            matched.append(code)
+    for pattern, code in _ABBREVIATION_PATTERNS:
+        if pattern.search(text):
+            # "CA" after a Canadian place is the country, not California
+            if code == "US-CA" and any(c.split("-")[0] == "CA" for c in matched):
+                code = "CA"
+            matched.append(code)
+
+    # A city is kept only if it agrees with the country/region named alongside
+    # it: "Paris, Texas" is not Paris, France
+    broad = {code for code in matched if code not in CITIES}
+    codes = []
+    for code in matched:
+        ancestors = _ancestors(code)
+        if code in CITIES and broad and not broad & set(ancestors):
+            continue
+        for ancestor in ancestors:
+            if ancestor not in codes:
+                codes.append(ancestor)
+    return tuple(codes)
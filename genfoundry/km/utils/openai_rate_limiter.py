@@ -0,0 +1,583 @@
+"""
+Cluster-wide rate limiting for OpenAI calls.
+
+Every ChatOpenAI / OpenAI / OpenAIEmbedding client in the app is built with an
+httpx client from this module. Its transport:
+
+  1. estimates the request's token cost from the request body,
+  2. takes one request and that many tokens from per-model token buckets
+     (shared through Redis, falling back to in-process buckets),
+  3. waits for a slot in an AIMD concurrency limiter, which halves on 429s
+     and slow responses and grows back by one slot per window of successes,
+  4. reconciles the token bucket with the usage OpenAI reports.
+
+Within an API request, waiting for budget and the call itself are both cut
+short at the request's deadline (genfoundry.km.utils.request_deadline).
+
+Interactive traffic may use the whole budget. Bulk traffic (marked with
+openai_priority(PRIORITY_BULK)) must leave OPENAI_INTERACTIVE_RESERVE of every
+bucket and of the concurrency limit untouched.
+"""
+import asyncio
+import contextlib
+import contextvars
+import json
+import logging
+import threading
+import time
+import weakref
+
+import httpx
+
+from genfoundry.config import Config
+from genfoundry.km.utils.request_deadline import call_timeout, remaining_seconds
+from genfoundry.km.utils.token_counter import count_tokens
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BULK = "bulk"
+
+_request_priority = contextvars.ContextVar("openai_request_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextlib.contextmanager
+def openai_priority(priority):
+    """Marks OpenAI calls made inside the block as interactive or bulk."""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def get_request_priority():
+    return _request_priority.get()
+
+
+class OpenAIRateLimitTimeout(Exception):
+    """Raised when a request cannot get rate limit budget within OPENAI_ACQUIRE_TIMEOUT_SECONDS."""
+
+
+# Refills both buckets, then takes cost from each only if both can pay it and
+# still keep `reserve` of their capacity. Returns 0 on success, otherwise the
+# number of milliseconds to wait before trying again.
+_TAKE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local reserve = tonumber(ARGV[2])
+local cooldown = redis.call('PTTL', KEYS[3])
+if cooldown > 0 then
+    return cooldown
+end
+local wait_ms = 0
+local levels = {}
+for i = 1, 2 do
+    local capacity = tonumber(ARGV[3 + (i - 1) * 3])
+    local rate = tonumber(ARGV[4 + (i - 1) * 3])
+    local cost = tonumber(ARGV[5 + (i - 1) * 3])
+    local state = redis.call('HMGET', KEYS[i], 'level', 'ts')
+    local level = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    level = math.min(capacity, level + math.max(0, now - ts) * rate)
+    levels[i] = level
+    local floor = capacity * reserve
+    -- A single request larger than the whole bucket only waits for a full bucket
+    local needed = math.min(cost, capacity - floor)
+    if level - needed < floor then
+        wait_ms = math.max(wait_ms, math.ceil((floor + needed - level) / rate * 1000))
+    end
+end
+if wait_ms > 0 then
+    return wait_ms
+end
+for i = 1, 2 do
+    local cost = tonumber(ARGV[5 + (i - 1) * 3])
+    redis.call('HSET', KEYS[i], 'level', levels[i] - cost, 'ts', now)
+    redis.call('EXPIRE', KEYS[i], 120)
+end
+return 0
+"""
+
+
+class RedisTokenBuckets():
+    """Request and token buckets per model, shared by every process through Redis."""
+
+    KEY_PREFIX = "openai_rl:"
+
+    def __init__(self, redis_client) -> None:
+        self.redis_client = redis_client
+        self._take = redis_client.register_script(_TAKE_SCRIPT)
+
+    def try_take(self, model, limits, tokens, reserve):
+        """Returns 0 if the budget was taken, else seconds to wait."""
+        keys = [f"{self.KEY_PREFIX}{model}:requests", f"{self.KEY_PREFIX}{model}:tokens", f"{self.KEY_PREFIX}{model}:cooldown"]
+        args = [
+            time.time(), reserve,
+            limits["rpm"], limits["rpm"] / 60.0, 1,
+            limits["tpm"], limits["tpm"] / 60.0, tokens,
+        ]
+        return int(self._take(keys=keys, args=args)) / 1000.0
+
+    def adjust_tokens(self, model, delta):
+        # Positive delta refunds over-estimated tokens, negative charges the shortfall.
+        # An expired bucket is already full, so there is nothing to adjust.
+        key = f"{self.KEY_PREFIX}{model}:tokens"
+        if self.redis_client.exists(key):
+            self.redis_client.hincrbyfloat(key, "level", delta)
+
+    def cool_down(self, model, seconds):
+        self.redis_client.set(f"{self.KEY_PREFIX}{model}:cooldown", 1, px=max(1, int(seconds * 1000)))
+
+
+class LocalTokenBuckets():
+    """Process-local equivalent of RedisTokenBuckets, used when Redis is unavailable."""
+
+    def __init__(self) -> None:
+        self._buckets = {}
+        self._cooldown_until = {}
+        self._lock = threading.Lock()
+
+    def try_take(self, model, limits, tokens, reserve):
+        now = time.time()
+        with self._lock:
+            cooldown = self._cooldown_until.get(model, 0) - now
+            if cooldown > 0:
+                return cooldown
+
+            specs = [("requests", limits["rpm"], 1), ("tokens", limits["tpm"], tokens)]
+            wait = 0.0
+            levels = {}
+            for name, capacity, cost in specs:
+                rate = capacity / 60.0
+                level, ts = self._buckets.get((model, name), (capacity, now))
+                level = min(capacity, level + max(0.0, now - ts) * rate)
+                levels[name] = level
+                floor = capacity * reserve
+                needed = min(cost, capacity - floor)
+                if level - needed < floor:
+                    wait = max(wait, (floor + needed - level) / rate)
+            if wait > 0:
+                return wait
+
+            for name, _, cost in specs:
+                self._buckets[(model, name)] = (levels[name] - cost, now)
+            return 0.0
+
+    def adjust_tokens(self, model, delta):
+        with self._lock:
+            level, ts = self._buckets.get((model, "tokens"), (None, None))
+            if level is not None:
+                self._buckets[(model, "tokens")] = (level + delta, ts)
+
+    def cool_down(self, model, seconds):
+        with self._lock:
+            self._cooldown_until[model] = time.time() + seconds
+
+
+class AdaptiveConcurrencyLimiter():
+    """
+    Per-process AIMD limit on in-flight OpenAI requests.
+
+    The limit grows by one after a full window of successful requests and is
+    halved on a 429 or a response slower than OPENAI_LATENCY_TARGET_SECONDS.
+    """
+
+    def __init__(self, initial_limit, min_limit, max_limit, latency_target) -> None:
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def _capacity(self, reserve):
+        return max(1, int(self.limit * (1 - reserve)))
+
+    def try_acquire(self, reserve=0.0):
+        with self._cond:
+            if self.in_flight < self._capacity(reserve):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self, reserve=0.0, timeout=None):
+        deadline = time.time() + timeout if timeout is not None else None
+        with self._cond:
+            while self.in_flight >= self._capacity(reserve):
+                remaining = deadline - time.time() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            return True
+
+    def release(self, throttled=False, latency=None):
+        with self._cond:
+            self.in_flight -= 1
+            now = time.time()
+            if throttled or (latency is not None and latency > self.latency_target):
+                # Only back off once per latency window so one burst of 429s does not collapse the limit
+                if now - self._last_decrease > self.latency_target:
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self._last_decrease = now
+                    logger.warning(f"OpenAI concurrency limit decreased to {self.limit:.1f}")
+            else:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+class OpenAIRateLimiter():
+    """Ties the token buckets and the concurrency limiter together for one process."""
+
+    def __init__(self, buckets, concurrency, fallback_buckets=None) -> None:
+        self.buckets = buckets
+        self.fallback_buckets = fallback_buckets or LocalTokenBuckets()
+        self.concurrency = concurrency
+        self.acquire_timeout = Config.OPENAI_ACQUIRE_TIMEOUT_SECONDS
+
+    @staticmethod
+    def limits_for(model):
+        return Config.OPENAI_RATE_LIMITS.get(model, Config.OPENAI_DEFAULT_RATE_LIMIT)
+
+    @staticmethod
+    def reserve_for(priority):
+        return Config.OPENAI_INTERACTIVE_RESERVE if priority == PRIORITY_BULK else 0.0
+
+    def _try_take(self, model, tokens, reserve):
+        try:
+            return self.buckets.try_take(model, self.limits_for(model), tokens, reserve)
+        except Exception as e:
+            logger.debug(f"Shared rate limiter unavailable, using local buckets: {e}")
+            return self.fallback_buckets.try_take(model, self.limits_for(model), tokens, reserve)
+
+    def _call_buckets(self, method, *args):
+        try:
+            getattr(self.buckets, method)(*args)
+        except Exception:
+            getattr(self.fallback_buckets, method)(*args)
+
+    def acquire(self, model, tokens, priority):
+        reserve = self.reserve_for(priority)
+        deadline = time.time() + call_timeout(self.acquire_timeout, "OpenAI rate limit wait")
+        while True:
+            wait = self._try_take(model, tokens, reserve)
+            if wait <= 0:
+                break
+            if time.time() + wait > deadline:
+                raise OpenAIRateLimitTimeout(f"Timed out waiting for OpenAI rate limit budget for {model}")
+            time.sleep(min(wait, 5.0))
+        if not self.concurrency.acquire(reserve, timeout=max(0.0, deadline - time.time())):
+            raise OpenAIRateLimitTimeout(f"Timed out waiting for an OpenAI concurrency slot for {model}")
+
+    async def acquire_async(self, model, tokens, priority):
+        reserve = self.reserve_for(priority)
+        deadline = time.time() + call_timeout(self.acquire_timeout, "OpenAI rate limit wait")
+        while True:
+            wait = self._try_take(model, tokens, reserve)
+            if wait <= 0:
+                break
+            if time.time() + wait > deadline:
+                raise OpenAIRateLimitTimeout(f"Timed out waiting for OpenAI rate limit budget for {model}")
+            await asyncio.sleep(min(wait, 5.0))
+        while not self.concurrency.try_acquire(reserve):
+            if time.time() > deadline:
+                raise OpenAIRateLimitTimeout(f"Timed out waiting for an OpenAI concurrency slot for {model}")
+            await asyncio.sleep(0.05)
+
+    def release(self, model, estimated_tokens, response, latency):
+        throttled = response is not None and response.status_code == 429
+        if throttled:
+            retry_after = _retry_after_seconds(response)
+            logger.warning(f"OpenAI returned 429 for {model}, cooling down for {retry_after}s")
+            self._call_buckets("cool_down", model, retry_after)
+        elif response is not None:
+            actual_tokens = _usage_tokens(response)
+            if actual_tokens is not None:
+                self._call_buckets("adjust_tokens", model, estimated_tokens - actual_tokens)
+        self.concurrency.release(throttled=throttled, latency=latency)
+
+
+def _retry_after_seconds(response):
+    for header in ("retry-after-ms", "retry-after"):
+        value = response.headers.get(header)
+        if value:
+            try:
+                seconds = float(value)
+                return seconds / 1000.0 if header == "retry-after-ms" else seconds
+            except ValueError:
+                pass
+    return 1.0
+
+
+def _usage_tokens(response):
+    try:
+        usage = json.loads(response.content).get("usage") or {}
+        return usage.get("total_tokens")
+    except Exception:
+        return None
+
+
+def estimate_request(request):
+    """
+    Returns (model, estimated_tokens, is_stream) for an OpenAI API request, or
+    (None, 0, False) if the request is not a model call (e.g. listing models).
+    """
+    try:
+        body = json.loads(request.content or b"{}")
+    except (ValueError, UnicodeDecodeError):
+        return None, 0, False
+    if not isinstance(body, dict) or not body.get("model"):
+        return None, 0, False
+    model = body["model"]
+    is_stream = bool(body.get("stream"))
+
+    texts = []
+    for message in body.get("messages") or []:
+        content = message.get("content")
+        if isinstance(content, str):
+            texts.append(content)
+        elif isinstance(content, list):
+            texts.extend(part.get("text", "") for part in content if isinstance(part, dict))
+    if "prompt" in body:
+        texts.append(str(body["prompt"]))
+
+    embedding_input = body.get("input")
+    prompt_tokens = 0
+    if isinstance(embedding_input, str):
+        texts.append(embedding_input)
+    elif isinstance(embedding_input, list):
+        for item in embedding_input:
+            if isinstance(item, str):
+                texts.append(item)
+            elif isinstance(item, list):
+                prompt_tokens += len(item)  # Already tokenized
+
+    prompt_tokens += sum(count_tokens(text, model) for text in texts)
+    # Chat messages carry a few tokens of framing each
+    prompt_tokens += 4 * len(body.get("messages") or [])
+    if embedding_input is not None:
+        return model, prompt_tokens, is_stream
+
+    completion_tokens = body.get("max_completion_tokens") or body.get("max_tokens") or Config.OPENAI_DEFAULT_COMPLETION_TOKENS
+    return model, prompt_tokens + completion_tokens, is_stream
+
+
+def apply_request_deadline(request):
+    """Caps the request's httpx timeouts at what is left of the API request's budget, if it has one."""
+    if remaining_seconds() is None:
+        return
+    timeouts = request.extensions.get("timeout") or dict.fromkeys(("connect", "read", "write", "pool"))
+    request.extensions["timeout"] = {phase: call_timeout(seconds, "OpenAI call") for phase, seconds in timeouts.items()}
+
+
+def _release_once(limiter, model, tokens, response, latency):
+    """
+    Returns a callable that releases the call's limiter budget the first time it
+    is called. Latency is measured up to the response headers, so a long stream
+    is not mistaken for a slow model by the concurrency limiter.
+    """
+    lock = threading.Lock()
+    released = []
+
+    def release():
+        with lock:
+            if released:
+                return
+            released.append(True)
+        limiter.release(model, tokens, response, latency)
+    return release
+
+
+class ReleasingByteStream(httpx.SyncByteStream):
+    """
+    Wraps a streamed response body so the concurrency slot is held until the
+    body has been read to the end or closed, rather than only until the headers.
+    """
+
+    def __init__(self, stream, release) -> None:
+        self.stream = stream
+        self.release = release
+
+    def __iter__(self):
+        for chunk in self.stream:
+            yield chunk
+        self.release()
+
+    def close(self):
+        try:
+            self.stream.close()
+        finally:
+            self.release()
+
+
+class AsyncReleasingByteStream(httpx.AsyncByteStream):
+    """Async counterpart of ReleasingByteStream."""
+
+    def __init__(self, stream, release) -> None:
+        self.stream = stream
+        self.release = release
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            yield chunk
+        self.release()
+
+    async def aclose(self):
+        try:
+            await self.stream.aclose()
+        finally:
+            self.release()
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    def __init__(self, limiter, transport=None) -> None:
+        self.limiter = limiter
+        self.transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request):
+        model, tokens, is_stream = estimate_request(request)
+        if not model:
+            apply_request_deadline(request)
+            return self.transport.handle_request(request)
+
+        self.limiter.acquire(model, tokens, get_request_priority())
+        started = time.time()
+        response = None
+        try:
+            apply_request_deadline(request)
+            response = self.transport.handle_request(request)
+            if not is_stream:
+                # Read the body here so the reported usage can reconcile the bucket
+                response.read()
+        except BaseException:
+            self.limiter.release(model, tokens, response, time.time() - started)
+            raise
+        release = _release_once(self.limiter, model, tokens, response, time.time() - started)
+        if not is_stream:
+            release()
+            return response
+        response.stream = ReleasingByteStream(response.stream, release)
+        return response
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Async counterpart of RateLimitedTransport. Connection pools are bound to an
+    event loop, and callers such as asyncio.run() create a new loop per call, so
+    one inner transport is kept per running loop.
+    """
+
+    def __init__(self, limiter) -> None:
+        self.limiter = limiter
+        self._transports = weakref.WeakKeyDictionary()
+
+    def _transport(self):
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get(loop)
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport()
+            self._transports[loop] = transport
+        return transport
+
+    async def handle_async_request(self, request):
+        transport = self._transport()
+        model, tokens, is_stream = estimate_request(request)
+        if not model:
+            apply_request_deadline(request)
+            return await transport.handle_async_request(request)
+
+        await self.limiter.acquire_async(model, tokens, get_request_priority())
+        started = time.time()
+        response = None
+        try:
+            apply_request_deadline(request)
+            response = await transport.handle_async_request(request)
+            if not is_stream:
+                await response.aread()
+        except BaseException:
+            self.limiter.release(model, tokens, response, time.time() - started)
+            raise
+        release = _release_once(self.limiter, model, tokens, response, time.time() - started)
+        if not is_stream:
+            release()
+            return response
+        response.stream = AsyncReleasingByteStream(response.stream, release)
+        return response
+
+    async def aclose(self):
+        transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_openai_rate_limiter():
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                buckets = None
+                if (Config.OPENAI_RATE_LIMIT_BACKEND or "").lower() == "redis":
+                    try:
+                        from genfoundry.km.persist.redis_proxy import get_redis_client
+                        buckets = RedisTokenBuckets(get_redis_client())
+                    except Exception as e:
+                        logger.error(f"Failed to set up shared OpenAI rate limiter, using local buckets: {e}")
+                concurrency = AdaptiveConcurrencyLimiter(
+                    initial_limit=Config.OPENAI_MAX_CONCURRENCY,
+                    min_limit=Config.OPENAI_MIN_CONCURRENCY,
+                    max_limit=Config.OPENAI_MAX_CONCURRENCY,
+                    latency_target=Config.OPENAI_LATENCY_TARGET_SECONDS,
+                )
+                local_buckets = LocalTokenBuckets()
+                _limiter = OpenAIRateLimiter(buckets or local_buckets, concurrency, fallback_buckets=local_buckets)
+    return _limiter
+
+
+_http_client = None
+_async_http_client = None
+
+
+def get_openai_http_client():
+    """Shared httpx.Client whose requests go through the OpenAI rate limiter."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            transport=RateLimitedTransport(get_openai_rate_limiter()),
+            timeout=httpx.Timeout(Config.OPENAI_REQUEST_TIMEOUT_SECONDS, connect=10.0),
+        )
+    return _http_client
+
+
+def get_openai_async_http_client():
+    """Shared httpx.AsyncClient whose requests go through the OpenAI rate limiter."""
+    global _async_http_client
+    if _async_http_client is None:
+        _async_http_client = httpx.AsyncClient(
+            transport=AsyncRateLimitedTransport(get_openai_rate_limiter()),
+            timeout=httpx.Timeout(Config.OPENAI_REQUEST_TIMEOUT_SECONDS, connect=10.0),
+        )
+    return _async_http_client
+
+
+def langchain_client_kwargs():
+    """Keyword arguments that route a langchain_openai.ChatOpenAI through the limiter."""
+    return {
+        "http_client": get_openai_http_client(),
+        "http_async_client": get_openai_async_http_client(),
+    }
+
+
+def llama_index_client_kwargs():
+    """Keyword arguments that route a LlamaIndex OpenAI / OpenAIEmbedding through the limiter."""
+    return {
+        "http_client": get_openai_http_client(),
+        "async_http_client": get_openai_async_http_client(),
+    }
@@ -0,0 +1,159 @@
+"""
+Per-request latency budgets.
+
+Each API request gets a deadline, from the Config.REQUEST_DEADLINE_HEADER
+header or the endpoint's default budget (Config.REQUEST_DEADLINE_SECONDS),
+held in a context variable. It follows the request into the thread pools and
+the event loop, which run work in a copy of the caller's context.
+
+Downstream calls size their timeouts with call_timeout(), which caps the
+client's usual timeout at what is left of the budget. Long-running work runs
+its steps inside deadline_stage(), so when the budget runs out the request
+ends with a 504 naming the stage that overran. Otherwise gunicorn would kill
+the worker and nothing would be returned.
+"""
+import contextvars
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+from flask import Response, request
+from werkzeug.exceptions import HTTPException
+
+from genfoundry.config import Config
+
+logger = logging.getLogger(__name__)
+
+# A call that failed this close to the deadline is taken to have run out of budget
+EXPIRY_SLACK_SECONDS = 0.1
+
+
+class DeadlineExceeded(HTTPException):
+    """The request's latency budget ran out during stage. Renders as a JSON 504."""
+
+    code = 504
+    description = "Request deadline exceeded"
+
+    def __init__(self, stage, budget, elapsed) -> None:
+        super().__init__()
+        self.stage = stage
+        # Flask-RESTful returns an HTTPException's data as the response body
+        self.data = {
+            "error": self.description,
+            "stage": stage,
+            "budget_ms": round(budget * 1000),
+            "elapsed_ms": round(elapsed * 1000),
+        }
+
+    def get_response(self, environ=None, scope=None):
+        return Response(json.dumps(self.data), self.code, mimetype="application/json")
+
+
+class Deadline():
+    def __init__(self, seconds) -> None:
+        self.budget = seconds
+        self.started = time.monotonic()
+        self.expires = self.started + seconds
+
+    def remaining(self):
+        return self.expires - time.monotonic()
+
+    def exceeded(self, stage):
+        return DeadlineExceeded(stage, self.budget, time.monotonic() - self.started)
+
+
+_deadline = contextvars.ContextVar("request_deadline", default=None)
+_stage = contextvars.ContextVar("request_stage", default=None)
+
+
+def set_deadline(seconds):
+    """Starts a budget of seconds for the current context (None for no deadline); returns the reset token."""
+    return _deadline.set(Deadline(seconds) if seconds else None)
+
+
+def reset_deadline(token):
+    _deadline.reset(token)
+
+
+def get_deadline():
+    return _deadline.get()
+
+
+def remaining_seconds():
+    """Seconds left in the current request's budget, or None if it has no deadline."""
+    deadline = _deadline.get()
+    return deadline.remaining() if deadline else None
+
+
+def has_budget(seconds):
+    """Whether at least seconds of the budget are left (always True without a deadline)."""
+    remaining = remaining_seconds()
+    return remaining is None or remaining >= seconds
+
+
+def call_timeout(default, stage=None):
+    """
+    The timeout for one downstream call: default (None for no timeout),
+    capped at what is left of the budget. Raises DeadlineExceeded if nothing
+    is left, naming the enclosing deadline_stage, or stage outside of one.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise deadline.exceeded(_stage.get() or stage)
+    return remaining if default is None else min(default, remaining)
+
+
+@contextmanager
+def deadline_stage(name):
+    """
+    Runs one stage of the request under its deadline. Raises
+    DeadlineExceeded(name) if the budget is already spent, and turns an error
+    from a downstream call that ran out of budget during the stage into
+    DeadlineExceeded(name).
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        yield
+        return
+    if deadline.remaining() <= 0:
+        raise deadline.exceeded(name)
+    token = _stage.set(name)
+    try:
+        yield
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        if deadline.remaining() <= EXPIRY_SLACK_SECONDS:
+            logger.warning(f"Request deadline exceeded during {name}: {e}")
+            raise deadline.exceeded(name) from e
+        raise
+    finally:
+        _stage.reset(token)
+
+
+def request_budget_seconds():
+    """The current request's budget: the header's, capped, or the endpoint's default."""
+    budget = Config.REQUEST_DEADLINE_SECONDS.get(request.path, Config.REQUEST_DEADLINE_DEFAULT_SECONDS)
+    header = request.headers.get(Config.REQUEST_DEADLINE_HEADER)
+    if header:
+        try:
+            budget = float(header) / 1000
+        except ValueError:
+            logger.warning(f"Ignoring invalid {Config.REQUEST_DEADLINE_HEADER} header: {header}")
+    if budget is None:
+        return None
+    return max(0.001, min(budget, Config.REQUEST_DEADLINE_MAX_SECONDS))
+
+
+def start_request_deadline():
+    """before_request hook: starts the request's deadline."""
+    set_deadline(request_budget_seconds())
+
+
+def end_request_deadline(exc=None):
+    """teardown_request hook: worker threads are reused, so the deadline must not outlive the request."""
+    _deadline.set(None)
@@ -0,0 +1,273 @@
+"""
+Skills and job-title taxonomy.
+
+taxonomy.json (extendable with Config.TAXONOMY_EXTENSION_PATH, same format)
+lists each skill and title under a canonical ID with its synonyms and parent
+categories:
+
+    "kubernetes": {"name": "Kubernetes", "synonyms": ["k8s", "eks"], "parents": ["devops", "cloud"]}
+
+All surface forms are compiled into an Aho-Corasick automaton, so a skill or
+title string is mapped to IDs in one pass over it ("Sr. Director of
+Engineering, Platform" -> director_of_engineering). Resumes store the IDs
+with all their ancestors at ingest; query filters are mapped to IDs, and
+matching is a set intersection instead of pairwise fuzzy comparison.
+"""
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+
+from genfoundry.config import Config
+
+logger = logging.getLogger(__name__)
+
+SKILLS = "skills"
+TITLES = "titles"
+TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "taxonomy.json")
+
+# Short alphanumeric surface forms ("go", "js", "ae") only match a whole
+# skill or title, never inside a longer string; "c#" is distinctive enough
+MIN_SCAN_LENGTH = 3
+
+
+def normalize_term(text):
+    return re.sub(r"\s+", " ", str(text)).strip().strip(",;:").lower()
+
+
+def _plural(term):
+    """"engineering manager" -> "engineering managers", "vp of sales" -> "vps of sales"."""
+    words = term.split(" ")
+    i = words.index("of") - 1 if "of" in words[1:] else len(words) - 1
+    word = words[i]
+    if word.endswith(("s", "x", "ch", "sh")):
+        word += "es"
+    elif word.endswith("y") and word[-2:-1] not in ("a", "e", "i", "o", "u"):
+        word = word[:-1] + "ies"
+    else:
+        word += "s"
+    return " ".join(words[:i] + [word] + words[i + 1:])
+
+
+def _is_word_char(ch):
+    return ch.isalnum()
+
+
+class AhoCorasick():
+    """Multi-pattern matcher returning leftmost-longest, whole-word matches."""
+
+    def __init__(self, patterns) -> None:
+        """patterns: {surface form: value}."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for pattern, value in patterns.items():
+            self._add(pattern, value)
+        self._build_failure_links()
+
+    def _add(self, pattern, value):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), value))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text):
+        """Returns [(start, end, value)] for non-overlapping whole-word matches, leftmost-longest first."""
+        matches = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, value in self._out[node]:
+                start, end = i - length + 1, i + 1
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+                    continue
+                matches.append((start, end, value))
+
+        matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        selected = []
+        last_end = -1
+        for start, end, value in matches:
+            if start >= last_end:
+                selected.append((start, end, value))
+                last_end = end
+        return selected
+
+
+class Taxonomy():
+    def __init__(self, data) -> None:
+        self.entries = {SKILLS: {}, TITLES: {}}
+        self._exact = {SKILLS: {}, TITLES: {}}
+        self._ancestors = {SKILLS: {}, TITLES: {}}
+        self._matchers = {}
+        self.extend(data)
+
+    def extend(self, data):
+        """Merges taxonomy data: new IDs are added, synonyms and parents of existing IDs are appended."""
+        for kind in (SKILLS, TITLES):
+            for entry_id, entry in (data.get(kind) or {}).items():
+                current = self.entries[kind].setdefault(entry_id, {"name": entry_id, "synonyms": [], "parents": []})
+                current["name"] = entry.get("name", current["name"])
+                for field in ("synonyms", "parents"):
+                    current[field] += [v for v in entry.get(field, []) if v not in current[field]]
+        self._compile()
+
+    def _compile(self):
+        for kind, entries in self.entries.items():
+            exact = {}
+            for entry_id, entry in entries.items():
+                for surface in [entry["name"], *entry["synonyms"]]:
+                    term = normalize_term(surface)
+                    if exact.setdefault(term, entry_id) != entry_id:
+                        logger.warning(f"Taxonomy {kind} term {term!r} is used by both {exact[term]} and {entry_id}")
+            if kind == TITLES:
+                # Queries ask for titles in the plural ("Java developers")
+                for term, entry_id in list(exact.items()):
+                    if len(term) >= MIN_SCAN_LENGTH:
+                        exact.setdefault(_plural(term), entry_id)
+            self._exact[kind] = exact
+            self._matchers[kind] = AhoCorasick({
+                t: i for t, i in exact.items() if len(t) >= MIN_SCAN_LENGTH or not t.isalnum()
+            })
+            self._ancestors[kind] = {entry_id: self._walk_ancestors(kind, entry_id) for entry_id in entries}
+
+    def _walk_ancestors(self, kind, entry_id):
+        ancestors = []
+        pending = list(self.entries[kind][entry_id]["parents"])
+        while pending:
+            parent = pending.pop(0)
+            if parent in ancestors or parent == entry_id or parent not in self.entries[kind]:
+                continue
+            ancestors.append(parent)
+            pending.extend(self.entries[kind][parent]["parents"])
+        return ancestors
+
+    def name(self, kind, entry_id):
+        return self.entries[kind][entry_id]["name"]
+
+    def parents(self, kind, entry_id):
+        return list(self.entries[kind].get(entry_id, {}).get("parents", []))
+
+    def ancestors(self, kind, entry_id):
+        return list(self._ancestors[kind].get(entry_id, []))
+
+    def lookup(self, kind, term):
+        """Returns the ID for a term that is exactly a known surface form, else None."""
+        return self._exact[kind].get(normalize_term(term))
+
+    def find_ids(self, kind, text):
+        """Returns the IDs mentioned in text: the whole text if it is a known term, else every term found in it."""
+        if not isinstance(text, str) or not text.strip():
+            return []
+        exact = self.lookup(kind, text)
+        if exact:
+            return [exact]
+        return list(dict.fromkeys(value for _, _, value in self._matchers[kind].find(normalize_term(text))))
+
+    def find_spans(self, kind, text):
+        """Returns [(start, end, id)] for the terms found in text, offsets into text itself."""
+        if not isinstance(text, str) or not text:
+            return []
+        return self._matchers[kind].find(text.lower())
+
+    def resume_ids(self, kind, values):
+        """IDs to store on a resume: every ID found in values, with all its ancestor categories."""
+        if isinstance(values, str):
+            values = [values]
+        ids = []
+        for value in values or []:
+            for entry_id in self.find_ids(kind, value):
+                for i in [entry_id, *self._ancestors[kind][entry_id]]:
+                    if i not in ids:
+                        ids.append(i)
+        return ids
+
+    def resolve(self, kind, values):
+        """Maps query values to IDs. Returns (ids, unresolved values)."""
+        if isinstance(values, str):
+            values = [values]
+        ids, unresolved = [], []
+        for value in values or []:
+            found = self.find_ids(kind, value)
+            if found:
+                ids.extend(i for i in found if i not in ids)
+            else:
+                unresolved.append(value)
+        return ids, unresolved
+
+    def related(self, kind, entry_id):
+        """IDs sharing a parent category with entry_id (e.g. other engineering leadership titles)."""
+        parents = set(self.parents(kind, entry_id))
+        return [
+            other for other, entry in self.entries[kind].items()
+            if other != entry_id and parents & set(entry["parents"])
+        ]
+
+
+    def expand(self, kind, values, limit=5):
+        """
+        Query-time expansion: the given values followed by the names of related
+        entries (same parent category), up to limit in total. Values not in the
+        taxonomy are kept as they are.
+        """
+        if isinstance(values, str):
+            values = [values]
+        expanded = list(values or [])
+        seen = {normalize_term(v) for v in expanded}
+        for value in values or []:
+            for entry_id in self.find_ids(kind, value):
+                for related in self.related(kind, entry_id):
+                    name = self.name(kind, related)
+                    if len(expanded) >= limit:
+                        return expanded
+                    if normalize_term(name) not in seen:
+                        seen.add(normalize_term(name))
+                        expanded.append(name)
+        return expanded
+
+
+def load_taxonomy(path=TAXONOMY_PATH, extension_path=None):
+    with open(path, encoding="utf-8") as f:
+        taxonomy = Taxonomy(json.load(f))
+    if extension_path:
+        with open(extension_path, encoding="utf-8") as f:
+            taxonomy.extend(json.load(f))
+        logger.info(f"Extended taxonomy from {extension_path}")
+    return taxonomy
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy():
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = load_taxonomy(extension_path=Config.TAXONOMY_EXTENSION_PATH)
+    return _taxonomy
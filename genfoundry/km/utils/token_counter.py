@@ -0,0 +1,48 @@
+import logging
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+_encodings = {}
+
+
+def get_encoding(model):
+    """
+    Returns the tiktoken encoding for model, or None if it cannot be loaded
+    (e.g. the BPE file cannot be downloaded and is not in TIKTOKEN_CACHE_DIR).
+    """
+    if model not in _encodings:
+        try:
+            try:
+                encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.warning(f"Could not load tiktoken encoding for {model}, estimating from characters: {e}")
+            encoding = None
+        _encodings[model] = encoding
+    return _encodings[model]
+
+
+def count_tokens(text, model):
+    """Counts the tokens in text for model, falling back to ~4 characters per token."""
+    if not text:
+        return 0
+    encoding = get_encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text, max_tokens, model):
+    """Returns the longest prefix of text that fits in max_tokens."""
+    if max_tokens <= 0 or not text:
+        return ""
+    encoding = get_encoding(model)
+    if encoding is None:
+        return text[:max_tokens * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
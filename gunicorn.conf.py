@@ -0,0 +1,25 @@
+# gunicorn.conf.py
+#
+# Serving model for the API container. Most requests spend their time waiting
+# on OpenAI, Pinecone, Mongo or Tavily, so each worker process serves many
+# requests at once on threads (gthread): a request waiting on the network
+# holds a thread, not a whole process. Async client code runs on the one
+# persistent event loop per process (genfoundry.km.utils.event_loop).
+#
+# Capacity is WEB_WORKERS x WEB_THREADS concurrent requests per container.
+import os
+
+bind = os.getenv("WEB_BIND", "0.0.0.0:80")
+workers = int(os.getenv("WEB_WORKERS", "4"))
+worker_class = "gthread"
+threads = int(os.getenv("WEB_THREADS", "16"))
+
+# gthread workers heartbeat from their main thread, so the timeout only
+# catches a hung worker; a slow LLM call does not get its worker killed
+timeout = int(os.getenv("WEB_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to bound memory growth from parser and model caches
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", "2000"))
+max_requests_jitter = 200
@@ -15,3 +15,104 @@ sys.modules["firebase_admin"] = firebase_mock
 sys.modules["firebase_admin.credentials"] = firebase_credentials_mock
 sys.modules["firebase_admin.firestore"] = firebase_firestore_mock
 sys.modules["firebase_admin.initialize_app"] = firebase_initialize_mock
+
+
+import fnmatch
+import time
+
+import pytest
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of redis-py used by the app."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def _live(self, key):
+        if key in self.expiry and self.expiry[key] < time.time():
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+        return self.data.get(key)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def get(self, key):
+        return self._live(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and self._live(key) is not None:
+            return None
+        self.data[key] = value
+        if ex:
+            self.expiry[key] = time.time() + ex
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+
+    def expire(self, key, seconds):
+        self.expiry[key] = time.time() + seconds
+
+    def incr(self, key, amount=1):
+        self.data[key] = int(self._live(key) or 0) + amount
+        return self.data[key]
+
+    def incrby(self, key, amount):
+        return self.incr(key, amount)
+
+    def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(values)
+
+    def lpush(self, key, *values):
+        for value in values:
+            self.data.setdefault(key, []).insert(0, value)
+
+    def lpop(self, key):
+        items = self._live(key)
+        return items.pop(0) if items else None
+
+    def llen(self, key):
+        return len(self._live(key) or [])
+
+    def sadd(self, key, *values):
+        self.data.setdefault(key, set()).update(values)
+
+    def srem(self, key, *values):
+        self.data.setdefault(key, set()).difference_update(values)
+
+    def smembers(self, key):
+        return set(self._live(key) or set())
+
+    def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = value
+
+    def hgetall(self, key):
+        return dict(self._live(key) or {})
+
+    def keys(self, pattern="*"):
+        return [k for k in self.data if fnmatch.fnmatch(k, pattern)]
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
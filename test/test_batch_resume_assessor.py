@@ -0,0 +1,96 @@
+# test/test_batch_resume_assessor.py
+import json
+import threading
+import time
+from io import BytesIO
+
+from werkzeug.datastructures import FileStorage
+
+from genfoundry.km.api.assess.batch_assessor_runner import load_candidates
+from genfoundry.km.api.assess.batch_resume_assessor import BatchResumeAssessor, batch_candidate, ndjson
+from genfoundry.km.persist.resume_content_codec import encode_resume_content
+from genfoundry.km.persist.stored_resume_loader import StoredResumeLoader
+from genfoundry.km.utils.openai_rate_limiter import PRIORITY_BULK, get_request_priority
+
+SCORES = {"alice": [9, 8], "bob": [6, 7], "carol": [8, 9.5], "dave": [5, 5], "erin": [7, 8]}
+
+
+class FakeAssessor:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.fixed_token_calls = 0
+        self.priorities = set()
+
+    def fixed_tokens(self, job_description, criteria, question):
+        self.fixed_token_calls += 1
+        return 1234
+
+    def assess(self, job_description, criteria, resume, question, fixed_tokens=None):
+        assert fixed_tokens == 1234
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.priorities.add(get_request_priority())
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        if resume == "garbled":
+            return "not json"
+        return "json " + json.dumps({
+            "candidate_name": resume.title(),
+            "evaluation": [{"criteria": "c", "score": s} for s in SCORES[resume]],
+        })
+
+
+def test_batch_is_bounded_streams_every_candidate_and_ranks_by_average_score():
+    assessor = FakeAssessor()
+    candidates = [batch_candidate(f"Doc:{name}", "resume_id", resume=name) for name in SCORES]
+    candidates.append(batch_candidate("Doc:x", "resume_id", resume="garbled"))
+    candidates.append(batch_candidate("Doc:404", "resume_id", error="Resume not found"))
+
+    lines = [json.loads(line) for line in ndjson(
+        BatchResumeAssessor(assessor, max_concurrency=2).run("JD", "criteria", candidates)
+    )]
+
+    assert assessor.peak == 2
+    assert assessor.fixed_token_calls == 1
+    assert assessor.priorities == {PRIORITY_BULK}
+    assert [line["type"] for line in lines[:-1]].count("result") == 5
+    assert sorted(line["index"] for line in lines[:-1]) == list(range(7))
+
+    summary = lines[-1]
+    assert summary["type"] == "summary" and summary["assessed"] == 5
+    assert [r["candidate_name"] for r in summary["ranking"]] == ["Carol", "Alice", "Erin", "Bob", "Dave"]
+    assert summary["ranking"][0] == {
+        "rank": 1, "index": 2, "candidate": "Doc:carol", "candidate_name": "Carol", "average_score": 8.75,
+    }
+    assert [(f["index"], f["candidate"]) for f in summary["failed"]] == [(5, "Doc:x"), (6, "Doc:404")]
+
+
+class FakeMongoProxy:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = 0
+
+    def get_resume_documents(self, tenant_id, resume_ids, projection=None):
+        self.queries += 1
+        return {i: self.docs[i] for i in resume_ids if i in self.docs}
+
+
+def test_candidates_mix_uploads_and_stored_resumes(tmp_path):
+    proxy = FakeMongoProxy({
+        "Doc:1": {"_id": "Doc:1", **encode_resume_content("# Jane Doe")},
+        "Doc:2": {"_id": "Doc:2", "content": "not json {"},
+    })
+    upload = FileStorage(stream=BytesIO(b"%PDF-1.4"), filename="john.pdf")
+
+    candidates = load_candidates(StoredResumeLoader(proxy), "acme", [upload], ["Doc:1", "Doc:2", "Doc:3"], str(tmp_path))
+
+    assert proxy.queries == 1
+    assert candidates[0]["source"] == "upload" and candidates[0]["path"].endswith("_john.pdf")
+    assert (tmp_path / candidates[0]["path"].rsplit("/", 1)[-1]).read_bytes() == b"%PDF-1.4"
+    assert candidates[1]["resume"] == "# Jane Doe"
+    assert candidates[2]["error"] == "Resume has no content"
+    assert candidates[3]["error"] == "Resume not found"
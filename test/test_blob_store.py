@@ -0,0 +1,88 @@
+# test/test_blob_store.py
+import io
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from genfoundry.km.persist.blob_store import LocalBlobStore, S3BlobStore, remove_local_copy
+from genfoundry.km.persist.upload_lease_store import RedisUploadLeaseStore
+
+
+class FakeS3Client:
+    """Minimal stand-in for an S3-compatible client."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[(Bucket, Key)] = Body
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise KeyError(Key)
+        return {}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+@pytest.fixture(params=["local", "s3"])
+def blob_store(request, tmp_path):
+    if request.param == "local":
+        return LocalBlobStore(str(tmp_path / "blobs"))
+    return S3BlobStore("resumes", client=FakeS3Client(), prefix="env")
+
+
+def test_uploads_are_content_addressed(blob_store):
+    first = FileStorage(stream=io.BytesIO(b"%PDF resume"), filename="Jane Doe.PDF")
+    second = FileStorage(stream=io.BytesIO(b"%PDF resume"), filename="jane-copy.pdf")
+
+    key, content_hash = blob_store.put_upload("tenant1", first)
+    second_key, _ = blob_store.put_upload("tenant1", second)
+
+    assert key == f"uploads/tenant1/{content_hash}.pdf"
+    assert second_key == key
+    assert blob_store.get_bytes(key) == b"%PDF resume"
+
+
+def test_shared_blob_is_kept_until_every_lease_is_returned(blob_store, fake_redis, monkeypatch):
+    leases = RedisUploadLeaseStore(fake_redis, ttl_seconds=60)
+    monkeypatch.setattr("genfoundry.km.persist.blob_store.get_upload_lease_store", lambda: leases)
+    key, _ = blob_store.put_upload("tenant1", FileStorage(stream=io.BytesIO(b"%PDF resume"), filename="cv.pdf"), "task-1")
+    blob_store.put_upload("tenant1", FileStorage(stream=io.BytesIO(b"%PDF resume"), filename="cv.pdf"), "task-2")
+
+    def delete_blob():
+        blob_store.delete(key)
+
+    # Returning a lease twice must not release the other upload's lease
+    assert not leases.release(key, "task-1", delete_blob)
+    assert not leases.release(key, "task-1", delete_blob)
+    assert blob_store.get_bytes(key) == b"%PDF resume"
+
+    assert leases.release(key, "task-2", delete_blob)
+    assert not blob_store.exists(key)
+
+    # A re-upload after the delete stores the blob again
+    blob_store.put_upload("tenant1", FileStorage(stream=io.BytesIO(b"%PDF resume"), filename="cv.pdf"), "task-3")
+    assert blob_store.get_bytes(key) == b"%PDF resume"
+
+
+def test_download_and_delete(blob_store):
+    blob_store.put_bytes("uploads/t/abc.docx", b"data")
+
+    local_path = blob_store.download_to_tempfile("uploads/t/abc.docx")
+    assert local_path.endswith("abc.docx")
+    with open(local_path, "rb") as f:
+        assert f.read() == b"data"
+    remove_local_copy(local_path)
+
+    blob_store.delete("uploads/t/abc.docx")
+    assert not blob_store.exists("uploads/t/abc.docx")
+
+
+def test_local_store_rejects_keys_outside_root(tmp_path):
+    with pytest.raises(ValueError):
+        LocalBlobStore(str(tmp_path)).put_bytes("../escape", b"x")
@@ -0,0 +1,118 @@
+# test/test_candidate_prescreen.py
+from types import SimpleNamespace
+
+import pytest
+
+from genfoundry.km.persist import vector_namespace_registry
+from genfoundry.km.persist.vector_namespace_registry import VectorNamespaceRegistry
+from genfoundry.km.api.assess.batch_resume_assessor import ranked_summary
+from genfoundry.km.query.candidate_prescreen import CandidatePreScreener
+from genfoundry.km.query.helper.vector_matches import aggregate_chunk_scores
+from genfoundry.km.query.tiered_resume_search import TieredResumeSearcher
+
+
+@pytest.fixture(autouse=True)
+def registry(fake_redis, monkeypatch):
+    registry = VectorNamespaceRegistry(fake_redis, cache_seconds=0)
+    monkeypatch.setattr(vector_namespace_registry, "_registry", registry)
+    return registry
+
+
+def chunk(resume_id, n, score, **metadata):
+    return SimpleNamespace(id=f"{resume_id}#chunk-{n}-abc", score=score, metadata={"doc_id": resume_id, **metadata})
+
+
+MATCHES = [
+    chunk("Doc:1", 0, 0.91, location="Toronto"), chunk("Doc:1", 1, 0.88, location="Toronto"),
+    chunk("Doc:1", 2, 0.86, location="Toronto"), chunk("Doc:1", 3, 0.40, location="Toronto"),
+    chunk("Doc:2", 0, 0.95, location="Vancouver"), chunk("Doc:2", 1, 0.70, location="Vancouver"),
+    chunk("Doc:3", 0, 0.80, location="Toronto"), chunk("Doc:3", 1, 0.79, location="Toronto"),
+    # Legacy vector: no doc_id in the metadata, the resume is the ID prefix
+    SimpleNamespace(id="Doc:4#chunk-0-def", score=0.60, metadata={}),
+]
+
+
+class FakeIndex:
+    def __init__(self):
+        self.queries = []
+
+    def query(self, **kwargs):
+        self.queries.append(kwargs)
+        ids = (kwargs.get("filter") or {}).get("doc_id", {}).get("$in")
+        return SimpleNamespace(matches=[m for m in MATCHES if ids is None or m.metadata.get("doc_id") in ids])
+
+
+class FakeEmbedModel:
+    calls = 0
+
+    def get_query_embedding(self, text):
+        FakeEmbedModel.calls += 1
+        return [0.1, 0.2]
+
+
+class FakeMetadataStore:
+    def get_many(self, tenant_id, resume_ids):
+        return {"Doc:3": {"latest_job_title": "VP Engineering"}}
+
+
+def make_screener():
+    searcher = TieredResumeSearcher.__new__(TieredResumeSearcher)
+    searcher.resume_details_popup_url = "https://example.com/resume"
+    searcher.strict_filter_fields = ['location', 'career_domain', 'years_of_experience', 'technical_skills']
+    return CandidatePreScreener(searcher, FakeIndex(), FakeEmbedModel(), FakeMetadataStore())
+
+
+def test_chunk_scores_aggregate_to_the_mean_of_each_resumes_best_chunks():
+    scores = aggregate_chunk_scores(MATCHES, chunks_per_resume=3)
+
+    assert round(scores["Doc:1"][0], 4) == 0.8833
+    assert round(scores["Doc:2"][0], 4) == 0.825  # one strong chunk is not enough to win
+    assert scores["Doc:4"][0] == 0.60
+
+
+def test_shortlist_is_top_k_above_the_cutoff_and_reports_llm_calls_saved():
+    screener = make_screener()
+    FakeEmbedModel.calls = 0
+
+    result = screener.screen("acme", "VP Engineering in Toronto", ["Doc:1", "Doc:2", "Doc:3", "Doc:5"],
+                             top_k=2, min_score=0.75)
+
+    assert FakeEmbedModel.calls == 1
+    assert screener.index.queries[0]["filter"] == {"doc_id": {"$in": ["Doc:1", "Doc:2", "Doc:3", "Doc:5"]}}
+    assert [c["resume_id"] for c in result["shortlist"]] == ["Doc:1", "Doc:2"]
+    assert {c["resume_id"] for c in result["screened_out"]} == {"Doc:3", "Doc:5"}
+    assert (result["candidates"], result["llm_calls_saved"]) == (4, 2)
+
+
+def test_filter_fit_reorders_the_shortlist():
+    screener = make_screener()
+    filters = [{"name": "location", "value": ["Toronto"]}, {"name": "job_title", "value": ["VP Engineering"]}]
+
+    result = screener.screen("acme", "VP Engineering in Toronto", filters=filters, top_k=3, min_score=0)
+
+    # Doc:3 has both the location and (from Mongo) the title; Doc:2 has neither
+    assert [c["resume_id"] for c in result["shortlist"]] == ["Doc:3", "Doc:1", "Doc:2"]
+    assert result["shortlist"][0]["metadata_fit"] == 1.0
+    assert result["candidates"] == 4 and result["llm_calls_saved"] == 1
+
+    summary = ranked_summary([
+        {"type": "result", "index": 0, "candidate": "Doc:3", "candidate_name": "Ann", "average_score": 8.0},
+    ], prescreen=result)
+    assert summary["ranking"][0]["prescreen_score"] == result["shortlist"][0]["score"]
+    assert summary["prescreen"]["shortlisted"] == 3 and summary["prescreen"]["llm_calls_saved"] == 1
+
+
+def test_complete_doc_namespace_scores_whole_resumes_in_one_query(registry):
+    screener = make_screener()
+    registry.start_build("acme", "acme_Resumes")
+    registry.activate("acme", "acme_Resumes")
+    centroids = [SimpleNamespace(id="Doc:2", score=0.9, metadata={"doc_id": "Doc:2"}),
+                 SimpleNamespace(id="Doc:1", score=0.8, metadata={"doc_id": "Doc:1"})]
+    screener.index.query = lambda **kwargs: screener.index.queries.append(kwargs) or SimpleNamespace(matches=centroids)
+
+    result = screener.screen("acme", "VP Engineering", ["Doc:1", "Doc:2", "Doc:3"], top_k=5, min_score=0.5)
+
+    query, = screener.index.queries
+    assert query["namespace"] == "acme_Resumes__docs" and query["top_k"] == 3
+    assert [c["resume_id"] for c in result["shortlist"]] == ["Doc:2", "Doc:1"]
+    assert result["screened_out"] == [{"resume_id": "Doc:3", "score": 0.0, "similarity": None, "metadata_fit": None}]
@@ -0,0 +1,53 @@
+# test/test_event_loop.py
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from genfoundry.km.utils.event_loop import get_event_loop, run_coroutine
+from genfoundry.km.utils.openai_rate_limiter import PRIORITY_BULK, get_request_priority, openai_priority
+
+
+async def sleepy(seconds, value):
+    await asyncio.sleep(seconds)
+    return value, asyncio.get_running_loop(), get_request_priority()
+
+
+def test_threads_share_one_loop_and_their_waits_overlap():
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda i: run_coroutine(sleepy(0.2, i)), range(8)))
+    elapsed = time.perf_counter() - started
+
+    assert [value for value, _, _ in results] == list(range(8))
+    assert {loop for _, loop, _ in results} == {get_event_loop()}
+    assert elapsed < 1.0
+
+
+def test_caller_context_is_carried_over_and_errors_propagate():
+    with openai_priority(PRIORITY_BULK):
+        _, _, priority = run_coroutine(sleepy(0, None))
+    assert priority == PRIORITY_BULK
+
+    async def fail():
+        raise ValueError("no results")
+
+    with pytest.raises(ValueError, match="no results"):
+        run_coroutine(fail())
+
+
+def test_timeout_cancels_the_coroutine():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(TimeoutError):
+        run_coroutine(slow(), timeout=0.05)
+    time.sleep(0.05)
+    assert cancelled == [True]
@@ -0,0 +1,129 @@
+# test/test_openai_rate_limiter.py
+import asyncio
+import json
+
+import httpx
+
+from genfoundry.km.utils.openai_rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    AsyncRateLimitedTransport,
+    LocalTokenBuckets,
+    OpenAIRateLimiter,
+    RateLimitedTransport,
+    estimate_request,
+)
+
+LIMITS = {"rpm": 60, "tpm": 1000}
+
+
+def test_bulk_cannot_use_the_interactive_reserve():
+    buckets = LocalTokenBuckets()
+
+    assert buckets.try_take("m", LIMITS, 700, reserve=0.2) == 0
+    # 300 tokens left: bulk must keep 200 back, interactive may use them all
+    assert buckets.try_take("m", LIMITS, 150, reserve=0.2) > 0
+    assert buckets.try_take("m", LIMITS, 150, reserve=0.0) == 0
+
+
+def test_cool_down_blocks_all_traffic():
+    buckets = LocalTokenBuckets()
+    buckets.cool_down("m", 5)
+
+    assert buckets.try_take("m", LIMITS, 1, reserve=0.0) > 4
+
+
+def test_aimd_halves_on_throttle_and_grows_back():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, min_limit=1, max_limit=8, latency_target=30)
+
+    assert limiter.acquire(timeout=0)
+    limiter.release(throttled=True)
+    assert limiter.limit == 4
+
+    for _ in range(20):
+        limiter.acquire(timeout=0)
+        limiter.release(latency=1.0)
+    assert 4 < limiter.limit <= 8
+
+
+def test_estimate_counts_prompt_and_completion_tokens():
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions", content=json.dumps({
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": "hello world"}],
+        "max_tokens": 100,
+    }))
+
+    model, tokens, is_stream = estimate_request(request)
+
+    assert model == "gpt-4o-mini"
+    assert 100 < tokens < 120
+    assert not is_stream
+
+
+def test_transport_reconciles_reported_usage_and_backs_off_on_429():
+    responses = [
+        httpx.Response(200, json={"usage": {"total_tokens": 20}}),
+        httpx.Response(429, headers={"retry-after": "2"}),
+    ]
+    inner = httpx.MockTransport(lambda request: responses.pop(0))
+    buckets = LocalTokenBuckets()
+    concurrency = AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=1, max_limit=4, latency_target=30)
+    limiter = OpenAIRateLimiter(buckets, concurrency, fallback_buckets=buckets)
+    client = httpx.Client(transport=RateLimitedTransport(limiter, transport=inner))
+    body = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "hi"}], "max_tokens": 500}
+
+    client.post("https://api.openai.com/v1/chat/completions", json=body)
+    level, _ = buckets._buckets[("gpt-4o-mini", "tokens")]
+    capacity = OpenAIRateLimiter.limits_for("gpt-4o-mini")["tpm"]
+    # Only the 20 reported tokens stay charged, not the 500+ estimate
+    assert capacity - level < 25
+
+    response = client.post("https://api.openai.com/v1/chat/completions", json=body)
+    assert response.status_code == 429
+    assert concurrency.limit == 2
+    assert concurrency.in_flight == 0
+    assert buckets.try_take("gpt-4o-mini", LIMITS, 1, reserve=0.0) > 1
+
+
+def make_streaming_limiter():
+    buckets = LocalTokenBuckets()
+    concurrency = AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=1, max_limit=4, latency_target=30)
+    return OpenAIRateLimiter(buckets, concurrency, fallback_buckets=buckets), concurrency
+
+
+def stream_response(request):
+    return httpx.Response(200, stream=httpx.ByteStream(b"data: {}\n\ndata: [DONE]\n\n"))
+
+
+STREAM_BODY = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "hi"}], "stream": True}
+
+
+def test_streamed_response_holds_its_slot_until_the_body_is_read():
+    limiter, concurrency = make_streaming_limiter()
+    client = httpx.Client(transport=RateLimitedTransport(limiter, transport=httpx.MockTransport(stream_response)))
+
+    with client.stream("POST", "https://api.openai.com/v1/chat/completions", json=STREAM_BODY) as response:
+        assert concurrency.in_flight == 1
+        assert b"[DONE]" in response.read()
+        assert concurrency.in_flight == 0
+    assert concurrency.in_flight == 0
+
+    # A stream closed before its end gives the slot back as well
+    with client.stream("POST", "https://api.openai.com/v1/chat/completions", json=STREAM_BODY):
+        assert concurrency.in_flight == 1
+    assert concurrency.in_flight == 0
+
+
+def test_async_streamed_response_holds_its_slot_until_closed():
+    limiter, concurrency = make_streaming_limiter()
+    transport = AsyncRateLimitedTransport(limiter)
+
+    async def call():
+        transport._transports[asyncio.get_running_loop()] = httpx.MockTransport(stream_response)
+        async with httpx.AsyncClient(transport=transport) as client:
+            async with client.stream("POST", "https://api.openai.com/v1/chat/completions", json=STREAM_BODY):
+                in_flight_while_open = concurrency.in_flight
+        return in_flight_while_open
+
+    assert asyncio.run(call()) == 1
+    assert concurrency.in_flight == 0
+
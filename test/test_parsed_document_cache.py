@@ -0,0 +1,62 @@
+# test/test_parsed_document_cache.py
+import os
+import time
+
+from genfoundry.km.preprocess.parsed_document_cache import (
+    DiskCacheBackend,
+    ParsedDocumentCache,
+    compute_content_hash,
+)
+
+
+def test_cache_roundtrip_and_version_invalidation(tmp_path):
+    cache = ParsedDocumentCache(DiskCacheBackend(str(tmp_path), max_bytes=10**6, max_entries=10))
+
+    cache.put("abc123", "pymupdf4llm", "1", "# Resume", page_count=2)
+
+    entry = cache.get("abc123", "pymupdf4llm", "1")
+    assert entry["text"] == "# Resume"
+    assert entry["page_count"] == 2
+    assert entry["parser_version"] == "1"
+
+    # A parser upgrade must not be served the old parse output
+    assert cache.get("abc123", "pymupdf4llm", "2") is None
+    assert cache.get("abc123", "llamaparse", "1") is None
+
+
+def test_disk_backend_evicts_least_recently_used(tmp_path):
+    backend = DiskCacheBackend(str(tmp_path), max_bytes=10**6, max_entries=2)
+    cache = ParsedDocumentCache(backend)
+
+    cache.put("a", "p", "1", "first")
+    cache.put("b", "p", "1", "second")
+    # Age both entries, then touch "a" so "b" becomes the least recently used
+    for name in os.listdir(tmp_path):
+        os.utime(os.path.join(tmp_path, name), (time.time() - 60, time.time() - 60))
+    assert cache.get("a", "p", "1")["text"] == "first"
+
+    cache.put("c", "p", "1", "third")
+
+    assert cache.get("b", "p", "1") is None
+    assert cache.get("a", "p", "1") is not None
+    assert cache.get("c", "p", "1") is not None
+
+
+def test_disk_backend_respects_byte_limit(tmp_path):
+    backend = DiskCacheBackend(str(tmp_path), max_bytes=300, max_entries=100)
+    cache = ParsedDocumentCache(backend)
+
+    for i in range(5):
+        cache.put(str(i), "p", "1", "x" * 100)
+
+    total = sum(os.path.getsize(os.path.join(tmp_path, n)) for n in os.listdir(tmp_path))
+    assert total <= 300
+
+
+def test_content_hash_ignores_file_name(tmp_path):
+    first = tmp_path / "resume.pdf"
+    second = tmp_path / "copy-of-resume.pdf"
+    first.write_bytes(b"%PDF-1.4 same bytes")
+    second.write_bytes(b"%PDF-1.4 same bytes")
+
+    assert compute_content_hash(str(first)) == compute_content_hash(str(second))
@@ -0,0 +1,58 @@
+# test/test_planned_tool_executor.py
+import json
+import time
+
+from genfoundry.km.api.assess.planned_tool_executor import (
+    LOCATION_TOOL, RESUME_TOOL, PlannedToolExecutor, agent_input, merge_assessments, plan_tools
+)
+from genfoundry.km.utils.openai_rate_limiter import PRIORITY_BULK, get_request_priority, openai_priority
+
+
+class SlowTool:
+    def __init__(self, seconds, output):
+        self.seconds = seconds
+        self.output = output
+        self.priorities = []
+
+    def _run(self, **arguments):
+        self.priorities.append(get_request_priority())
+        time.sleep(self.seconds)
+        return self.output
+
+
+RESUME = {"evaluation": [{"criteria": "Technical Skills", "score": 8}, {"criteria": "Location", "score": 2}],
+          "summary": "Strong engineer."}
+LOCATION = {"evaluation": [{"criteria": "Location", "score": 9}]}
+
+
+def test_location_tool_is_planned_only_when_the_criteria_mention_location():
+    assert [key for key, _ in plan_tools("JD", "Python, 5+ years", "resume", "Q")] == [RESUME_TOOL]
+    plan = dict(plan_tools("JD", "Python. Must be able to relocate to Toronto", "resume", "Q"))
+    assert list(plan) == [RESUME_TOOL, LOCATION_TOOL]
+    assert plan[LOCATION_TOOL] == {"resume": "resume", "criteria": "Python. Must be able to relocate to Toronto"}
+
+
+def test_tools_run_concurrently_and_merge_in_plan_order():
+    # The location tool finishes first but still merges second
+    tools = {RESUME_TOOL: SlowTool(0.3, json.dumps(RESUME)), LOCATION_TOOL: SlowTool(0.1, json.dumps(LOCATION))}
+    executor = PlannedToolExecutor(tools)
+
+    started = time.perf_counter()
+    with openai_priority(PRIORITY_BULK):
+        assessments, failures = executor.run(plan_tools("JD", "Location: Toronto", "resume", "Q"))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.35 and not failures
+    assert tools[RESUME_TOOL].priorities == [PRIORITY_BULK]
+    merged = merge_assessments(assessments.values())
+    assert merged == {"evaluation": RESUME["evaluation"], "summary": "Strong engineer."}
+
+
+def test_failed_tool_is_reported_for_an_agent_follow_up():
+    tools = {RESUME_TOOL: SlowTool(0, json.dumps(RESUME)), LOCATION_TOOL: SlowTool(0, "Unknown, Unknown")}
+
+    assessments, failures = PlannedToolExecutor(tools).run(plan_tools("JD", "Location: Toronto", "resume", "Q"))
+
+    assert list(assessments) == [RESUME_TOOL] and list(failures) == [LOCATION_TOOL]
+    (role, message), = agent_input("JD", "Location: Toronto", "resume", "Q", assessments.values())["messages"]
+    assert role == "user" and "already done" in message and "Strong engineer." in message
@@ -0,0 +1,131 @@
+# test/test_processor_pipeline.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from genfoundry.km.api.extract_filters.extract_filters_runner import server_timing
+from genfoundry.km.query.processors.base_filter_processor import BaseFilterProcessor
+from genfoundry.km.query.processors.geo_expansion_processor import GeoExpansionProcessor
+from genfoundry.km.query.processors import processor_pipeline
+from genfoundry.km.query.processors.processor_pipeline import ALL_FILTERS, FilterProcessorPipeline
+from genfoundry.km.query.processors.rule_based_filter_processor import RuleBasedFilterProcessor
+from genfoundry.km.utils.openai_rate_limiter import PRIORITY_BULK, get_request_priority, openai_priority
+
+
+class SetFilters:
+    reads = ()
+    writes = ALL_FILTERS
+
+    def process(self, data):
+        return {**data, "filters": {"location": "Toronto", "job_title": '["Engineer"]'}}
+
+
+class Expand:
+    """Rewrites one filter after a delay, like an LLM expansion processor."""
+
+    def __init__(self, key, suffix, delay=0.2, timeout=None):
+        self.reads = self.writes = (key,)
+        self.key, self.suffix, self.delay = key, suffix, delay
+        if timeout:
+            self.timeout = timeout
+
+    def process(self, data):
+        time.sleep(self.delay)
+        filters = data["filters"]
+        value = filters[self.key]
+        filters[self.key] = [v + self.suffix for v in (value if isinstance(value, list) else [value])]
+        return data
+
+
+class Broken:
+    reads = writes = ("job_title",)
+
+    def process(self, data):
+        raise RuntimeError("boom")
+
+
+def build(*processors):
+    pipeline = FilterProcessorPipeline()
+    for processor in processors:
+        pipeline += processor
+    return pipeline
+
+
+def test_processors_on_different_keys_run_concurrently():
+    pipeline = build(SetFilters(), Expand("location", " area"), Expand("job_title", " II"))
+
+    assert [len(stage) for stage in pipeline.stages()] == [1, 2]
+    started = time.perf_counter()
+    result = pipeline.run("anything")
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.35
+    # The stringified list from SetFilters was parsed before Expand saw it
+    assert result["filters"] == {"location": ["Toronto area"], "job_title": ["Engineer II"]}
+    assert set(result["processor_timings"]) == {"SetFilters", "Expand"}
+
+
+def test_slow_or_failing_processors_are_skipped():
+    pipeline = build(SetFilters(), Expand("location", " area", delay=1, timeout=0.05), Broken())
+
+    result = pipeline.run("anything")
+
+    assert result["filters"] == {"location": "Toronto", "job_title": ["Engineer"]}
+    assert result["processor_errors"] == {"Expand": "timeout", "Broken": "boom"}
+    assert 'Expand;dur=' in server_timing(result["processor_timings"], result["processor_errors"])
+
+
+class RecordPriority:
+    reads = writes = ("job_title",)
+
+    def process(self, data):
+        return {**data, "priority": get_request_priority()}
+
+
+def test_processors_run_in_the_callers_context():
+    with openai_priority(PRIORITY_BULK):
+        result = build(RecordPriority()).run("anything")
+
+    assert result["priority"] == PRIORITY_BULK
+
+
+class RecordThread:
+    reads = writes = ("job_title",)
+
+    def __init__(self, delay=0, timeout=None):
+        self.delay = delay
+        self.threads = []
+        if timeout:
+            self.timeout = timeout
+
+    def process(self, data):
+        self.threads.append(threading.current_thread())
+        time.sleep(self.delay)
+        return data
+
+
+def test_single_processor_stages_run_on_the_request_thread():
+    processor = RecordThread()
+
+    build(processor).run("anything")
+
+    assert processor.threads == [threading.current_thread()]
+
+
+def test_processors_still_queued_at_their_timeout_never_run(monkeypatch):
+    monkeypatch.setattr(processor_pipeline, "_executor", ThreadPoolExecutor(max_workers=1))
+    busy, queued = RecordThread(delay=0.3, timeout=0.05), RecordThread(timeout=0.1)
+    queued.reads = queued.writes = ("location",)
+
+    result = build(busy, queued).run("anything")
+    time.sleep(0.4)
+
+    assert result["processor_errors"] == {"RecordThread": "timeout"}
+    assert len(busy.threads) == 1 and queued.threads == []
+
+
+def test_extraction_processors_run_in_order():
+    pipeline = build(RuleBasedFilterProcessor(), BaseFilterProcessor(llm=object()), GeoExpansionProcessor(llm=object()))
+
+    assert [[p.__class__.__name__ for p in stage] for stage in pipeline.stages()] == [
+        ["RuleBasedFilterProcessor"], ["BaseFilterProcessor"], ["GeoExpansionProcessor"]]
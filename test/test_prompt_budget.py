@@ -0,0 +1,98 @@
+# test/test_prompt_budget.py
+from genfoundry.km.preprocess.prompt_budget import PROMPT_SECTION_PROFILES, ResumeCompressor, split_sections
+from genfoundry.km.utils.token_counter import count_tokens
+
+# The PyMuPDF parser collapses all whitespace, so headings appear inline
+COLLAPSED_RESUME = (
+    "# Jane Doe Toronto, ON | jane@example.com "
+    "## PROFESSIONAL SUMMARY Engineering leader with 12 years of experience. "
+    "## WORK EXPERIENCE **Director of Engineering** Acme Corp 2019 - Present Led 40 engineers. "
+    + "Built payment systems at scale. " * 40 +
+    "**Senior Engineer** Beta Inc 2014 - 2019 Built APIs. "
+    "## SKILLS Python, Kafka, Kubernetes "
+    "## EDUCATION B.Sc. Computer Science, University of Toronto, 2012 "
+    "## HOBBIES Sailing, chess Page 1 of 2 "
+    "## REFERENCES John Smith, VP Engineering, Acme Corp"
+)
+
+
+def test_split_sections_finds_inline_headings():
+    sections = [name for name, _ in split_sections(COLLAPSED_RESUME)]
+
+    assert sections == ["header", "summary", "experience", "skills", "education", "interests", "references"]
+
+
+def test_metadata_profile_keeps_header_experience_and_education():
+    result = ResumeCompressor("gpt-4o-mini").compress(
+        COLLAPSED_RESUME, max_tokens=10000, keep_sections={"header", "experience", "education"})
+
+    assert "Jane Doe" in result["text"]
+    assert "Director of Engineering" in result["text"]
+    assert "University of Toronto" in result["text"]
+    assert "Sailing" not in result["text"]
+    assert "Kafka" not in result["text"]
+    assert result["tokens"] < result["original_tokens"]
+
+
+def test_over_budget_drops_low_value_sections_before_trimming_experience():
+    compressor = ResumeCompressor("gpt-4o-mini")
+    full = compressor.compress(COLLAPSED_RESUME, max_tokens=10000)
+    budget = full["tokens"] - 20
+
+    result = compressor.compress(COLLAPSED_RESUME, max_tokens=budget)
+
+    assert result["dropped_sections"][:2] == ["references", "interests"]
+    assert result["trimmed_sections"] == []
+    assert "Page 1 of 2" not in result["text"]
+    assert count_tokens(result["text"], "gpt-4o-mini") <= budget
+
+
+def test_tight_budget_trims_experience_but_keeps_education():
+    result = ResumeCompressor("gpt-4o-mini").compress(
+        COLLAPSED_RESUME, max_tokens=120, keep_sections={"header", "experience", "education"})
+
+    assert "experience" in result["trimmed_sections"]
+    assert "University of Toronto" in result["text"]
+    assert result["tokens"] <= 120
+
+
+def test_compression_is_deterministic():
+    compressor = ResumeCompressor("gpt-4o-mini")
+
+    assert compressor.compress(COLLAPSED_RESUME, 150)["text"] == compressor.compress(COLLAPSED_RESUME, 150)["text"]
+
+
+def test_metadata_profile_keeps_skills_and_certifications():
+    resume = ("# Jane Doe\n## EXPERIENCE\nDirector, Acme\n## TECHNICAL SKILLS\nPython, Kafka\n"
+              "## CERTIFICATIONS\nAWS Solutions Architect\n## HOBBIES\nSailing")
+
+    result = ResumeCompressor("gpt-4o-mini").compress(resume, 10000, PROMPT_SECTION_PROFILES["metadata"])
+
+    assert "Kafka" in result["text"] and "AWS Solutions Architect" in result["text"]
+    assert result["dropped_sections"] == ["interests"]
+
+
+MULTI_PAGE_RESUME = (
+    "Jane Doe | jane@example.com\n## EXPERIENCE\n**Director** Acme 2019 - Present\n- Led team of 5 engineers\n"
+    "Toronto, ON\nPage 1 of 2\f"
+    "Jane Doe | jane@example.com\n**Manager** Beta 2014 - 2019\n- Led team of 5 engineers\nToronto, ON\n"
+    + "Built payment systems at scale.\n" * 20 + "Page 2 of 2"
+)
+
+
+def test_repeated_lines_are_kept_within_budget():
+    result = ResumeCompressor("gpt-4o-mini").compress(MULTI_PAGE_RESUME, max_tokens=10000)
+
+    assert result["text"] == MULTI_PAGE_RESUME
+
+
+def test_over_budget_removes_running_headers_but_not_repeated_bullets():
+    compressor = ResumeCompressor("gpt-4o-mini")
+    budget = count_tokens(MULTI_PAGE_RESUME, "gpt-4o-mini") - 5
+
+    text = compressor.compress(MULTI_PAGE_RESUME, max_tokens=budget)["text"]
+
+    assert text.count("Jane Doe | jane@example.com") == 1
+    assert text.count("Led team of 5 engineers") == 2
+    assert text.count("Toronto, ON") == 2
+    assert "Page 1 of 2" not in text
@@ -0,0 +1,188 @@
+# test/test_request_deadline.py
+import time
+
+import httpx
+import pytest
+from flask import Flask
+from flask_restful import Api, Resource
+
+from genfoundry.config import Config
+from genfoundry.km.query.helper.vector_matches import timeout_kwargs
+from genfoundry.km.query.processors.processor_pipeline import ALL_FILTERS, FilterProcessorPipeline
+from genfoundry.km.query.tiered_resume_search import TieredResumeSearcher
+from genfoundry.km.utils.openai_rate_limiter import (
+    AdaptiveConcurrencyLimiter, LocalTokenBuckets, OpenAIRateLimiter, RateLimitedTransport
+)
+from genfoundry.km.utils.request_deadline import (
+    DeadlineExceeded, call_timeout, deadline_stage, end_request_deadline, remaining_seconds, reset_deadline, set_deadline,
+    start_request_deadline
+)
+
+
+class SlowSearch(Resource):
+    def get(self):
+        with deadline_stage("Tier 1 retrieval"):
+            time.sleep(0.1)
+            # A downstream client timing out at the deadline
+            raise httpx.ReadTimeout("timed out")
+
+
+class SlowProcessor:
+    """An LLM filter processor whose call outlasts the request's budget; its client honours the deadline."""
+
+    reads = ()
+    writes = ALL_FILTERS
+
+    def __init__(self, delay=1, timeout=30):
+        self.delay = delay
+        self.timeout = timeout
+
+    def process(self, data):
+        timeout = call_timeout(60)
+        if timeout < self.delay:
+            time.sleep(timeout)
+            raise httpx.ReadTimeout("timed out")
+        time.sleep(self.delay)
+        return {**data, "filters": {"location": "Toronto"}}
+
+
+def slow_pipeline(stages):
+    pipeline = FilterProcessorPipeline()
+    for _ in range(stages):
+        pipeline += SlowProcessor()
+    return pipeline
+
+
+class FilterExtraction(Resource):
+    def get(self):
+        with deadline_stage("filter extraction"):
+            return slow_pipeline(2).run("engineers in Toronto")
+
+
+class Budget(Resource):
+    def get(self):
+        return {"remaining": remaining_seconds()}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(Config, "REQUEST_DEADLINE_SECONDS",
+                        {"/slow": 0.05, "/filters": 0.2, "/batch": None})
+    app = Flask(__name__)
+    app.before_request(start_request_deadline)
+    app.teardown_request(end_request_deadline)
+    api = Api(app)
+    api.add_resource(SlowSearch, "/slow")
+    api.add_resource(FilterExtraction, "/filters")
+    api.add_resource(Budget, "/budget", "/batch")
+    return app.test_client()
+
+
+def test_overrun_returns_a_504_naming_the_stage(client):
+    response = client.get("/slow")
+
+    assert response.status_code == 504
+    body = response.get_json()
+    assert body["stage"] == "Tier 1 retrieval" and body["budget_ms"] == 50
+    assert body["elapsed_ms"] >= 50
+
+
+def test_slow_filter_processor_degrades_within_the_budget():
+    token = set_deadline(0.2)
+    started = time.perf_counter()
+    try:
+        result = slow_pipeline(1).run("engineers in Toronto")
+    finally:
+        reset_deadline(token)
+
+    assert time.perf_counter() - started < 0.5
+    assert result["processor_errors"] == {"SlowProcessor": "timeout"}
+    assert "filters" not in result
+
+
+def test_filter_extraction_with_no_budget_left_returns_a_504(client):
+    started = time.perf_counter()
+    response = client.get("/filters")
+
+    assert time.perf_counter() - started < 0.5
+    assert response.status_code == 504
+    assert response.get_json()["stage"] == "filter extraction"
+
+
+def test_budget_comes_from_the_header_or_the_endpoint_default(client):
+    assert client.get("/budget").get_json()["remaining"] > Config.REQUEST_DEADLINE_DEFAULT_SECONDS - 1
+    assert client.get("/budget", headers={"X-Request-Timeout-Ms": "2500"}).get_json()["remaining"] <= 2.5
+    # Capped below the worker timeout, and off for endpoints without a deadline
+    assert client.get("/budget", headers={"X-Request-Timeout-Ms": "600000"}).get_json()["remaining"] <= 110
+    assert client.get("/batch").get_json()["remaining"] is None
+    assert remaining_seconds() is None
+
+
+def test_openai_calls_are_capped_at_the_remaining_budget():
+    seen = []
+
+    def respond(request):
+        seen.append(request.extensions["timeout"])
+        return httpx.Response(200, json={"usage": {"total_tokens": 5}})
+
+    concurrency = AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=1, max_limit=4, latency_target=30)
+    limiter = OpenAIRateLimiter(LocalTokenBuckets(), concurrency, fallback_buckets=LocalTokenBuckets())
+    client = httpx.Client(transport=RateLimitedTransport(limiter, transport=httpx.MockTransport(respond)),
+                          timeout=httpx.Timeout(120, connect=10))
+    body = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "hi"}], "max_tokens": 10}
+
+    token = set_deadline(2)
+    try:
+        client.post("https://api.openai.com/v1/chat/completions", json=body)
+        assert 0 < seen[0]["read"] <= 2 and seen[0]["connect"] <= 2
+
+        set_deadline(0.001)
+        time.sleep(0.01)
+        with pytest.raises(DeadlineExceeded):
+            client.post("https://api.openai.com/v1/chat/completions", json=body)
+        assert concurrency.in_flight == 0
+    finally:
+        reset_deadline(token)
+
+
+class EmptyEngine:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def retrieve(self, query_bundle):
+        self.calls.append(query_bundle.query_str)
+        time.sleep(0.05)
+        return []
+
+
+def test_fallback_tiers_are_skipped_when_the_budget_is_nearly_spent(monkeypatch):
+    calls = []
+    searcher = TieredResumeSearcher.__new__(TieredResumeSearcher)
+    searcher.resume_details_popup_url = "https://example.com/resume"
+    searcher.strict_filter_fields = ['location', 'career_domain', 'years_of_experience', 'technical_skills']
+    searcher._init_vector_index = lambda tenant_id: None
+    searcher._create_retriever = lambda index, filters=None: None
+    searcher._build_query_engine = lambda retriever, tenant_id: EmptyEngine(calls)
+    searcher._format_llm_query = lambda question: question
+    monkeypatch.setattr(Config, "SEARCH_TIER_MIN_SECONDS", 0.2)
+
+    token = set_deadline(0.22)
+    try:
+        result = searcher.search("acme", "VP Engineering", [])
+    finally:
+        reset_deadline(token)
+
+    assert calls == ["VP Engineering"]
+    assert result["skipped_tiers"] == ["Tier 2", "Tier 3"] and result["matches"] == []
+
+
+def test_pinecone_timeout_keyword_follows_the_client_version():
+    def current(*, top_k, timeout=None):
+        pass
+
+    def legacy(*, top_k, **kwargs):
+        pass
+
+    assert timeout_kwargs(current) == {"timeout": Config.PINECONE_QUERY_TIMEOUT_SECONDS}
+    assert timeout_kwargs(legacy) == {"_request_timeout": Config.PINECONE_QUERY_TIMEOUT_SECONDS}
+    assert timeout_kwargs(lambda top_k: None) == {}
@@ -0,0 +1,60 @@
+# test/test_resume_chunker.py
+from llama_index.core.schema import MetadataMode
+
+from genfoundry.km.persist.resume_metadata_store import slim_vector_metadata
+from genfoundry.km.persist.vector_db_proxy import build_resume_nodes
+from genfoundry.km.preprocess.resume_chunker import ResumeChunker
+
+ACME_ROLE = "**Director of Engineering** **Acme Corp** 2019 - Present " + "- Led the payments platform team. " * 12
+BETA_ROLE = "**Senior Engineer** **Beta Inc** 2014 - 2019 " + "- Built the fraud detection APIs in Go. " * 12
+
+# Collapsed onto one line, as the PyMuPDF parser returns it
+RESUME = (
+    "# Jane Doe Toronto, ON | jane@example.com "
+    "## SUMMARY Engineering leader. "
+    f"## WORK EXPERIENCE {ACME_ROLE}{BETA_ROLE}"
+    "## SKILLS Python, Go, Kafka "
+    "## EDUCATION B.Sc. Computer Science, University of Toronto, 2012"
+)
+
+
+def test_each_role_is_kept_whole_in_its_own_chunk():
+    chunks = ResumeChunker(max_tokens=512, min_tokens=40, model="text-embedding-ada-002").chunk(RESUME)
+
+    acme = [c for c in chunks if "Acme Corp" in c["text"]]
+    beta = [c for c in chunks if "Beta Inc" in c["text"]]
+    assert len(acme) == 1 and ACME_ROLE.strip() in acme[0]["text"]
+    assert len(beta) == 1 and BETA_ROLE.strip() in beta[0]["text"]
+    assert acme[0] is not beta[0]
+    assert acme[0]["section_type"] == "experience"
+
+
+def test_small_sections_are_merged_and_tagged():
+    chunks = ResumeChunker(max_tokens=512, min_tokens=40, model="text-embedding-ada-002").chunk(RESUME)
+
+    # Header and summary are too small for a chunk of their own and join the first role;
+    # skills and education are folded into the last chunk
+    assert len(chunks) == 2
+    assert chunks[0]["text"].startswith("# Jane Doe")
+    assert chunks[0]["section_type"] == "experience"
+    assert chunks[0]["sections"] == ["header", "summary", "experience"]
+    assert chunks[-1]["sections"] == ["experience", "skills", "education"]
+
+
+def test_oversized_role_is_split_at_bullets_within_the_limit():
+    long_role = "**Staff Engineer** **Gamma** 2010 - 2014 " + "- Designed the ledger service for settlements. " * 80
+    chunks = ResumeChunker(max_tokens=200, min_tokens=20, model="text-embedding-ada-002").chunk(
+        f"## EXPERIENCE {long_role}")
+
+    assert len(chunks) > 1
+    assert all(c["tokens"] <= 200 for c in chunks)
+    assert all(c["text"].endswith("settlements.") for c in chunks)
+
+
+def test_vectors_keep_the_tags_of_merged_sections():
+    nodes = build_resume_nodes("Doc:1", RESUME, {"candidate_name": "Jane Doe"})
+
+    assert any({"skills", "education"} <= set(node.metadata["sections"]) for node in nodes)
+    assert "sections" in slim_vector_metadata(nodes[-1].metadata)
+    # The tags filter the chunk but are not embedded with its text
+    assert "sections" not in nodes[-1].get_content(metadata_mode=MetadataMode.EMBED)
@@ -0,0 +1,85 @@
+# test/test_resume_content_codec.py
+import json
+from types import SimpleNamespace
+
+from genfoundry.km.persist.migrate_resume_content import migrate_tenant
+from genfoundry.km.persist.resume_content_codec import content_hash, encode_resume_content, resume_display, resume_markdown
+
+SHORT = "# Jane Doe\n\nToronto, ON"
+LONG = "\n".join(
+    f"## Role {i}\n- Led the \"Platform\" team of {i} engineers\n- Shipped Kubernetes migration — café ☕"
+    for i in range(60)
+)
+
+
+def legacy_clean(content):
+    """What ResumeRetrieverRunner.clean_markdown_content returned for a legacy document."""
+    content = content.strip().strip('"').replace('\\n', '\n').replace('\\"', '"')
+    return content.encode().decode('unicode_escape')
+
+
+def test_round_trip_compresses_only_large_resumes():
+    short, long = encode_resume_content(SHORT), encode_resume_content(LONG)
+
+    assert short == {"markdown": SHORT, "content_format": 2, "content_hash": content_hash(SHORT)}
+    assert long["content_codec"] == "lz4" and isinstance(long["markdown"], bytes)
+    assert len(long["markdown"]) < len(json.dumps(LONG)) / 2
+    assert resume_display(short) == resume_markdown(short) == SHORT
+    assert resume_display(long) == resume_markdown(long) == LONG
+
+
+def test_legacy_documents_read_as_before():
+    ascii_markdown = "# Jane Doe\n\n## Experience\n- \"Staff\" Engineer"
+    legacy = {"content": json.dumps(ascii_markdown)}
+
+    assert resume_display(legacy) == legacy_clean(legacy["content"]) == ascii_markdown
+    assert resume_markdown(legacy) == ascii_markdown
+    # Non-ASCII text, which the unicode_escape clean-up used to garble, now survives
+    assert resume_display({"content": json.dumps(LONG)}) == LONG
+    assert resume_display({}) == "No details available."
+
+
+class FakeCursor(list):
+    def sort(self, key, direction):
+        return FakeCursor(sorted(self, key=lambda d: d[key]))
+
+    def limit(self, n):
+        return FakeCursor(self[:n])
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = {d["_id"]: d for d in docs}
+
+    def find(self, filter, projection=None):
+        return FakeCursor(
+            dict(d) for d in self.docs.values()
+            if "content" in d and d.get("content_format") != 2
+            and ("_id" not in filter or d["_id"] > filter["_id"]["$gt"])
+        )
+
+    def bulk_write(self, updates, ordered=True):
+        for update in updates:
+            doc = self.docs[update._filter["_id"]]
+            doc.update(update._doc["$set"])
+            doc.pop("content")
+        return SimpleNamespace(modified_count=len(updates))
+
+
+def test_migration_converts_legacy_documents_and_can_be_rerun():
+    coll = FakeCollection([
+        {"_id": "Doc:1", "content": json.dumps(LONG), "metadata": {"location": "Toronto"}},
+        {"_id": "Doc:2", "content": json.dumps(SHORT)},
+        {"_id": "Doc:3", "content": "not json {"},
+        {"_id": "Doc:4", **encode_resume_content(SHORT)},
+    ])
+    proxy = SimpleNamespace(get_tenant_resume_collection=lambda tenant_id: coll)
+
+    stats = migrate_tenant(proxy, "acme", batch_size=2)
+
+    assert (stats["migrated"], stats["failed"]) == (2, 1)
+    assert stats["bytes_after"] < stats["bytes_before"]
+    assert "content" not in coll.docs["Doc:1"] and coll.docs["Doc:1"]["metadata"] == {"location": "Toronto"}
+    assert resume_display(coll.docs["Doc:1"]) == LONG
+    assert resume_display(coll.docs["Doc:2"]) == SHORT
+    assert migrate_tenant(proxy, "acme")["migrated"] == 0
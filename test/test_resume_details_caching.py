@@ -0,0 +1,63 @@
+# test/test_resume_details_caching.py
+import json
+
+from flask import Flask, jsonify
+
+from genfoundry.km.api.retrieve.retrieve_resume import cacheable, load_resumes, not_modified
+from genfoundry.km.persist.resume_content_codec import HASH_PROJECTION, encode_resume_content
+
+app = Flask(__name__)
+
+
+class FakeMongoProxy:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def get_resume_documents(self, tenant_id, resume_ids, projection=None):
+        self.queries.append(projection)
+        return {i: self.docs[i] for i in resume_ids if i in self.docs}
+
+
+DOCS = {
+    "Doc:1": {"_id": "Doc:1", **encode_resume_content("# Jane Doe\n\n## Experience")},
+    "Doc:2": {"_id": "Doc:2", **encode_resume_content("# John Roe" + "\n- Kubernetes" * 200)},
+    "Doc:legacy": {"_id": "Doc:legacy", "content": json.dumps("# Old Resume")},
+}
+
+
+def test_bulk_fetch_is_one_query_and_a_matching_etag_returns_304_without_content():
+    proxy = FakeMongoProxy(DOCS)
+    with app.test_request_context("/resumedetails/bulk"):
+        etag, resumes = load_resumes(proxy, "acme", ["Doc:1", "Doc:2", "Doc:404"])
+        response = cacheable(jsonify({"AIResponse": resumes}), etag)
+
+    assert len(proxy.queries) == 1
+    assert resumes == {"Doc:1": "# Jane Doe\n\n## Experience", "Doc:2": "# John Roe" + "\n- Kubernetes" * 200}
+    assert response.headers["ETag"] == f'"{etag}"'
+    assert response.headers["Cache-Control"] == "private, max-age=300"
+
+    proxy.queries.clear()
+    with app.test_request_context("/resumedetails/bulk", headers={"If-None-Match": f'"{etag}"'}):
+        again, resumes = load_resumes(proxy, "acme", ["Doc:1", "Doc:2", "Doc:404"])
+        assert not_modified(again).status_code == 304
+
+    assert again == etag and resumes is None
+    # Only the stored hashes were read
+    assert proxy.queries == [HASH_PROJECTION]
+
+
+def test_etag_changes_with_content_and_covers_legacy_documents():
+    proxy = FakeMongoProxy(DOCS)
+    with app.test_request_context("/resumedetails"):
+        legacy_etag, resumes = load_resumes(proxy, "acme", ["Doc:legacy"])
+        first, _ = load_resumes(proxy, "acme", ["Doc:1"])
+        proxy.docs = {**DOCS, "Doc:1": {"_id": "Doc:1", **encode_resume_content("# Jane Doe, updated")}}
+        second, _ = load_resumes(proxy, "acme", ["Doc:1"])
+
+    assert resumes == {"Doc:legacy": "# Old Resume"}
+    assert first != second
+
+    with app.test_request_context("/resumedetails", headers={"If-None-Match": f'"{legacy_etag}"'}):
+        _, resumes = load_resumes(proxy, "acme", ["Doc:legacy"])
+    assert resumes is None
@@ -0,0 +1,123 @@
+# test/test_resume_id_allocator.py
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from genfoundry.config import Config
+from genfoundry.km.persist.mongo_proxy import MongoProxy, format_resume_id
+from genfoundry.km.persist.seed_resume_id_counters import seed_counters
+
+
+class FakeCollection:
+    """
+    Applies $inc and $max atomically per document, as the server does. Every
+    other read or write yields between reading and writing the document, so an
+    allocator built on a read-modify-write would hand out duplicate IDs.
+    """
+
+    ATOMIC_OPERATORS = {"$inc", "$max"}
+
+    def __init__(self, docs=()):
+        self.docs = {d["_id"]: dict(d) for d in docs}
+        self.lock = threading.Lock()
+
+    def find_one_and_update(self, filter, update, upsert=False, return_document=None):
+        if set(update) <= self.ATOMIC_OPERATORS:
+            with self.lock:
+                return self._apply(filter, update, upsert)
+        return self._apply(filter, update, upsert)
+
+    def _apply(self, filter, update, upsert):
+        doc = self.docs.get(filter["_id"])
+        if doc is None:
+            if not upsert:
+                return None
+            doc = self.docs.setdefault(filter["_id"], {"_id": filter["_id"]})
+        seq = doc.get("seq", 0)
+        time.sleep(0.0001)
+        if "$inc" in update:
+            doc["seq"] = seq + update["$inc"]["seq"]
+        if "$max" in update:
+            doc["seq"] = max(seq, update["$max"]["seq"])
+        if "$set" in update:
+            doc.update(update["$set"])
+        return dict(doc)
+
+    def find_one(self, filter):
+        doc = self.docs.get(filter["_id"])
+        time.sleep(0.0001)
+        return dict(doc) if doc else None
+
+    def update_one(self, filter, update, upsert=False):
+        self._apply(filter, update, upsert)
+
+    def find(self, filter, projection=None):
+        pattern = filter["$or"][0]["_id"]["$regex"]
+        return [d for d in self.docs.values() if re.fullmatch(pattern, d["_id"])]
+
+
+class FakeDB(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+    def list_collection_names(self):
+        return list(self)
+
+
+def make_proxy(db):
+    proxy = MongoProxy.__new__(MongoProxy)
+    proxy.db = db
+    return proxy
+
+
+def test_parallel_workers_never_get_the_same_id():
+    proxy = make_proxy(FakeDB())
+
+    def worker(i):
+        # A mix of single allocations and batch-ingestion blocks
+        return proxy.reserve_resume_ids("acme", 1 + i % 5)
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        blocks = list(executor.map(worker, range(2000)))
+
+    ids = [resume_id for block in blocks for resume_id in block]
+    assert len(ids) == len(set(ids)) == sum(1 + i % 5 for i in range(2000))
+    assert sorted(ids) == [format_resume_id(n) for n in range(len(ids))]
+    # Each block is consecutive
+    assert all(block == sorted(block) for block in blocks)
+
+
+def test_counter_is_seeded_past_existing_ids():
+    db = FakeDB()
+    db["acme_Resumes"] = FakeCollection([{"_id": "AA00041"}, {"_id": "AB00007"}, {"_id": "Doc:3f2a"}])
+    db["globex_Resumes"] = FakeCollection([{"_id": "Doc:9b1c"}])
+    proxy = make_proxy(db)
+
+    # The first allocation seeds the missing counter without the migration
+    assert proxy.get_next_resume_id("acme") == "AB00008"
+
+    assert seed_counters(proxy) == {"acme": "AB00009", "globex": "AA00000"}
+    assert proxy.get_next_resume_id("acme") == "AB00009"
+    # Re-running never moves a counter back
+    assert seed_counters(proxy, ["acme"]) == {"acme": "AB00010"}
+    assert db[Config.MONGO_COUNTER_COLLECTION].docs["acme:resume_id"]["seq"] == 100010
+
+
+def test_concurrent_first_allocations_seed_the_counter_once():
+    db = FakeDB()
+    db["acme_Resumes"] = FakeCollection([{"_id": "AA00041"}])
+    proxy = make_proxy(db)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        ids = list(executor.map(lambda _: proxy.get_next_resume_id("acme"), range(64)))
+
+    assert sorted(ids) == [format_resume_id(n) for n in range(42, 42 + 64)]
+
+
+def test_invalid_block_size_is_rejected():
+    with pytest.raises(ValueError):
+        make_proxy(FakeDB()).reserve_resume_ids("acme", 0)
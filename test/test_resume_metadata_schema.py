@@ -0,0 +1,117 @@
+# test/test_resume_metadata_schema.py
+from genfoundry.km.preprocess.resume_metadata_schema import normalize_resume_metadata
+from genfoundry.km.query.helper.filter_normalizer import FilterNormalizer
+from genfoundry.km.query.tiered_resume_search import TieredResumeSearcher
+from genfoundry.km.utils.location_gazetteer import resolve_location
+
+# Shaped like real extract_metadata output before validation
+LLM_METADATA = {
+    "candidate_name": " Jane Doe ",
+    "latest_job_title": "Director of Engineering",
+    "other_job_titles": "Engineering Manager",
+    "career_domain": "information technology",
+    "years_of_experience": "12+ years",
+    "technical_skills": ["ReactJS", "K8s", "AWS", "aws", " Python. "],
+    "leadership_skills": "Mentoring, Team Management",
+    "highest_education_level": "Master's",
+    "location": "Toronto, ON",
+    "doc_id": "Doc:1",
+}
+
+
+def test_llm_metadata_is_typed_and_canonicalized():
+    metadata = normalize_resume_metadata(LLM_METADATA)
+
+    assert metadata["candidate_name"] == "Jane Doe"
+    assert metadata["other_job_titles"] == ["Engineering Manager"]
+    assert metadata["career_domain"] == "Technology"
+    assert metadata["years_of_experience"] == 12 and isinstance(metadata["years_of_experience"], int)
+    assert metadata["technical_skills"] == ["react", "kubernetes", "aws", "python"]
+    assert metadata["leadership_skills"] == ["mentoring", "team management"]
+    assert metadata["location"] == "Toronto, ON"
+    assert metadata["location_codes"] == ["CA", "CA-ON", "CA-ON-TORONTO"]
+    assert metadata["doc_id"] == "Doc:1"
+    # Normalizing again changes nothing
+    assert normalize_resume_metadata(metadata) == metadata
+
+
+def test_unreadable_values_are_dropped_not_guessed():
+    metadata = normalize_resume_metadata({"career_domain": "Astrology", "years_of_experience": "many",
+                                          "location": "Somewhere"})
+
+    assert metadata == {"location": "Somewhere"}
+
+
+def test_gazetteer_uses_the_broader_place_to_pick_the_city():
+    assert resolve_location("London, Ontario") == ["CA", "CA-ON", "CA-ON-LONDON"]
+    assert resolve_location("London, UK") == ["GB", "GB-ENG", "GB-ENG-LONDON"]
+    assert resolve_location("Paris, Texas") == ["US", "US-TX"]
+    assert resolve_location("San Jose, CA") == ["US", "US-CA", "US-CA-SAN_JOSE"]
+
+
+def test_query_filters_are_canonicalized_to_match_resume_metadata():
+    index_filters, unresolved = FilterNormalizer.to_index_filters({
+        "years_of_experience": {"min": "10", "max": 15},
+        "technical_skills": ["React.js", "Kubernetes"],
+        "career_domain": "Tech",
+        "location": ["Ontario"],
+        "job_title": ["VP of Engineering"],
+    })
+
+    assert index_filters == {
+        "years_of_experience": {"min": 10, "max": 15},
+        "skill_ids": ["react", "kubernetes"],
+        "career_domain": "Technology",
+        "location_codes": ["CA-ON"],
+    }
+    assert unresolved == {"job_title": ["VP of Engineering"]}
+    # A Toronto resume carries every level of its location, so an Ontario filter matches it
+    assert set(index_filters["location_codes"]) <= set(normalize_resume_metadata(LLM_METADATA)["location_codes"])
+
+
+def test_unknown_places_stay_out_of_the_index_filters():
+    index_filters, unresolved = FilterNormalizer.to_index_filters({"location": ["Toronto", "Atlantis"]})
+
+    assert index_filters == {}
+    assert unresolved == {"location": ["Toronto", "Atlantis"]}
+
+
+def test_open_ended_experience_ranges_become_a_single_bound():
+    searcher = TieredResumeSearcher.__new__(TieredResumeSearcher)
+
+    for years, expected in (({"min": 5}, [("years_of_experience", 5, ">=")]),
+                            ({"max": 3}, [("years_of_experience", 3, "<=")]),
+                            ({"min": 3, "max": 7}, [("years_of_experience", 3, ">="), ("years_of_experience", 7, "<=")])):
+        index_filters, _ = FilterNormalizer.to_index_filters({"years_of_experience": years})
+        metadata_filters = searcher._build_metadata_filters(index_filters)
+
+        assert [(f.key, f.value, f.operator.value) for f in metadata_filters.filters] == expected
+
+
+class RetrievedNode:
+    def __init__(self, doc_id, skills, score):
+        self.metadata = {"doc_id": doc_id, "technical_skills": skills, "skill_ids": skills}
+        self.text = doc_id
+        self.score = score
+
+
+def test_tier_one_still_ranks_by_how_many_pushed_down_skills_match():
+    searcher = TieredResumeSearcher.__new__(TieredResumeSearcher)
+    searcher.resume_details_popup_url = "https://example.com/resume"
+    searcher.strict_filter_fields = ["technical_skills"]
+    nodes = [RetrievedNode("Doc:one", ["python"], 0.9), RetrievedNode("Doc:all", ["python", "kafka", "aws"], 0.8)]
+    seen_filters = []
+
+    class Engine:
+        def retrieve(self, query_bundle):
+            return nodes
+
+    searcher._init_vector_index = lambda tenant_id: None
+    searcher._create_retriever = lambda index, filters=None: seen_filters.append(filters)
+    searcher._build_query_engine = lambda retriever, tenant_id: Engine()
+    searcher._format_llm_query = lambda question: question
+
+    result = searcher.search("acme", "engineers", [{"name": "technical_skills", "value": ["Python", "Kafka", "AWS"]}])
+
+    assert result["tier"] == "Tier 1" and seen_filters[0] is not None
+    assert [m["resume_id"] for m in result["matches"]] == ["Doc:all", "Doc:one"]
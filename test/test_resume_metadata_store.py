@@ -0,0 +1,88 @@
+# test/test_resume_metadata_store.py
+import json
+
+from llama_index.core.schema import NodeRelationship, NodeWithScore, TextNode
+from llama_index.core.vector_stores.utils import node_to_metadata_dict
+
+from genfoundry.km.persist.resume_metadata_store import ResumeMetadataStore
+from genfoundry.km.persist.vector_db_proxy import build_resume_nodes
+from genfoundry.km.query.helper.metadata_joiner import ResumeMetadataJoiner
+
+RESUME = (
+    "# Jane Doe ## WORK EXPERIENCE **Director** **Acme Corp** 2019 - Present "
+    + "- Led the payments platform team. " * 15
+)
+METADATA = {
+    "candidate_name": "Jane Doe",
+    "latest_job_title": "Director",
+    "career_domain": "Technology",
+    "technical_skills": ["Go", "Kafka"],
+    "education": ["B.Sc. Computer Science, University of Toronto"],
+    "certifications": ["PMP"],
+}
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query["_id"]["$in"])
+        return [{"_id": i, "metadata": self.docs[i]} for i in query["_id"]["$in"] if i in self.docs]
+
+
+class FakeMongoProxy:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get_tenant_resume_collection(self, tenant_id):
+        return self.collection
+
+
+def make_store(docs, **kwargs):
+    collection = FakeCollection(docs)
+    return ResumeMetadataStore(mongo_proxy=FakeMongoProxy(collection), **kwargs), collection
+
+
+def test_misses_are_fetched_in_one_query_and_then_served_from_the_lru():
+    store, collection = make_store({"Doc:1": {"a": 1}, "Doc:2": {"a": 2}}, max_entries=10, ttl_seconds=60)
+
+    assert store.get_many("t1", ["Doc:1", "Doc:2", "Doc:1", "Doc:3"]) == {"Doc:1": {"a": 1}, "Doc:2": {"a": 2}}
+    assert collection.queries == [["Doc:1", "Doc:2", "Doc:3"]]
+
+    assert store.get_many("t1", ["Doc:1", "Doc:2"]) == {"Doc:1": {"a": 1}, "Doc:2": {"a": 2}}
+    assert len(collection.queries) == 1
+    assert store.hits == 2
+
+
+def test_lru_evicts_the_least_recently_used_resume():
+    store, collection = make_store({f"Doc:{i}": {"i": i} for i in range(3)}, max_entries=2, ttl_seconds=60)
+
+    store.get("t1", "Doc:0")
+    store.get("t1", "Doc:1")
+    store.get("t1", "Doc:0")
+    store.get("t1", "Doc:2")  # evicts Doc:1
+    store.get("t1", "Doc:0")
+    store.get("t1", "Doc:1")
+
+    assert collection.queries == [["Doc:0"], ["Doc:1"], ["Doc:2"], ["Doc:1"]]
+
+
+def test_vectors_carry_only_filterable_metadata_and_the_joiner_restores_the_rest():
+    nodes = build_resume_nodes("Doc:1", RESUME, dict(METADATA))
+
+    payload = node_to_metadata_dict(nodes[0], remove_text=False, flat_metadata=False)
+    assert "education" not in payload and "certifications" not in payload
+    assert payload["doc_id"] == "Doc:1" and payload["technical_skills"] == ["Go", "Kafka"]
+    assert "certifications" not in json.dumps(payload)
+    assert nodes[0].relationships[NodeRelationship.SOURCE].node_id == "Doc:1"
+
+    store, _ = make_store({"Doc:1": {**METADATA, "doc_id": "Doc:1"}})
+    legacy = TextNode(text="older vector", metadata={"doc_id": "Doc:9", "education": ["MBA"]})
+    results = ResumeMetadataJoiner(tenant_id="t1", store=store).postprocess_nodes(
+        [NodeWithScore(node=nodes[0], score=0.9), NodeWithScore(node=legacy, score=0.8)])
+
+    assert results[0].node.metadata["certifications"] == ["PMP"]
+    assert results[0].node.metadata["section_type"] == "experience"
+    assert results[1].node.metadata == {"doc_id": "Doc:9", "education": ["MBA"]}
@@ -0,0 +1,92 @@
+# test/test_resume_processing_task.py
+import io
+from unittest.mock import MagicMock
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from genfoundry.km.api.standardize.resume_processing_task import ResumeTaskProcessor, ResumeProcessingError
+from genfoundry.km.persist.blob_store import LocalBlobStore
+from genfoundry.km.persist.ingestion_checkpoint_store import InMemoryCheckpointStore
+from genfoundry.km.persist.upload_lease_store import InMemoryUploadLeaseStore
+
+
+def make_processor(blob_store):
+    processor = ResumeTaskProcessor.__new__(ResumeTaskProcessor)
+    processor.doc_parser = MagicMock()
+    processor.doc_parser.parse_document.return_value = "Jane Doe Senior Engineer"
+    processor.standardizer = MagicMock()
+    processor.standardizer.standardize_content.return_value = "# Jane Doe"
+    processor.standardizer.extract_metadata.return_value = {"candidate_name": "Jane Doe"}
+    processor.mongo_proxy = MagicMock()
+    processor.vectorizer = MagicMock()
+    processor.checkpoint_store = InMemoryCheckpointStore(ttl_seconds=60)
+    processor.blob_store = blob_store
+    return processor
+
+
+def test_retry_resumes_after_last_completed_stage(tmp_path, monkeypatch):
+    blob_store = LocalBlobStore(str(tmp_path))
+    monkeypatch.setattr("genfoundry.km.api.standardize.resume_processing_task.get_blob_store", lambda: blob_store)
+    monkeypatch.setattr("genfoundry.km.api.standardize.resume_processing_task.get_upload_lease_store", InMemoryUploadLeaseStore)
+    blob_key = "uploads/tenant1/hash1.pdf"
+    blob_store.put_bytes(blob_key, b"%PDF-1.4 resume")
+    processor = make_processor(blob_store)
+    processor.vectorizer.vectorize_and_store_text_resume.side_effect = [TimeoutError("openai timeout"), None]
+
+    with pytest.raises(TimeoutError):
+        processor.process_task(blob_key, "tenant1")
+
+    result = processor.process_task(blob_key, "tenant1")
+
+    # The LLM stages and the parse ran exactly once across both attempts
+    assert processor.doc_parser.parse_document.call_count == 1
+    assert processor.standardizer.standardize_content.call_count == 1
+    assert processor.standardizer.extract_metadata.call_count == 1
+    assert processor.mongo_proxy.insert_resume.call_count == 1
+
+    # The retry cleaned up partial vectors under the same resume ID before upserting again
+    first_id = processor.vectorizer.vectorize_and_store_text_resume.call_args_list[0][0][0]
+    processor.vectorizer.delete_resume.assert_called_once_with(first_id, "tenant1")
+    assert result["resume_id"] == first_id
+
+    # Upload blob is removed and the checkpoint is cleared on success
+    assert not blob_store.exists(blob_key)
+    assert processor.checkpoint_store.load("tenant1", "hash1") == {}
+
+
+def test_unparseable_upload_is_a_permanent_failure(tmp_path):
+    blob_store = LocalBlobStore(str(tmp_path))
+    blob_store.put_bytes("uploads/tenant1/hash2.pdf", b"not a pdf")
+    processor = make_processor(blob_store)
+    processor.doc_parser.parse_document.return_value = None
+
+    with pytest.raises(ResumeProcessingError):
+        processor.process_task("uploads/tenant1/hash2.pdf", "tenant1")
+
+    with pytest.raises(ResumeProcessingError):
+        processor.process_task("uploads/tenant1/missing.pdf", "tenant1")
+
+    processor.standardizer.standardize_content.assert_not_called()
+
+
+def test_duplicate_uploads_are_processed_independently(tmp_path, monkeypatch):
+    blob_store = LocalBlobStore(str(tmp_path))
+    leases = InMemoryUploadLeaseStore()
+    monkeypatch.setattr("genfoundry.km.api.standardize.resume_processing_task.get_blob_store", lambda: blob_store)
+    monkeypatch.setattr("genfoundry.km.api.standardize.resume_processing_task.get_upload_lease_store", lambda: leases)
+    monkeypatch.setattr("genfoundry.km.persist.blob_store.get_upload_lease_store", lambda: leases)
+    upload = FileStorage(stream=io.BytesIO(b"%PDF-1.4 resume"), filename="cv.pdf")
+    blob_key, _ = blob_store.put_upload("tenant1", upload, "task-1")
+    upload.stream.seek(0)
+    assert blob_store.put_upload("tenant1", upload, "task-2")[0] == blob_key
+    processor = make_processor(blob_store)
+
+    # The first task to finish keeps the shared blob and the second task's checkpoint
+    first = processor.process_task(blob_key, "tenant1", "task-1")
+    assert blob_store.exists(blob_key)
+    second = processor.process_task(blob_key, "tenant1", "task-2")
+
+    assert first["resume_id"] != second["resume_id"]
+    assert processor.doc_parser.parse_document.call_count == 2
+    assert not blob_store.exists(blob_key)
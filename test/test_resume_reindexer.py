@@ -0,0 +1,164 @@
+# test/test_resume_reindexer.py
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from genfoundry.km.api.admin.reindex.resume_reindexer import ResumeReindexer, STATUS_RUNNING, STATUS_SWITCHED
+from genfoundry.km.persist.vector_namespace_registry import VectorNamespaceRegistry
+from genfoundry.km.utils.openai_rate_limiter import PRIORITY_BULK, get_request_priority, openai_priority
+
+
+class FakeMongo:
+    def __init__(self, docs):
+        self.docs = sorted(docs, key=lambda d: d["_id"])
+
+    def count_resumes(self, tenant_id):
+        return len(self.docs)
+
+    def get_resume_batch(self, tenant_id, after_id=None, batch_size=100):
+        return [d for d in self.docs if not after_id or d["_id"] > after_id][:batch_size]
+
+    def update_resume_metadata(self, tenant_id, resume_id, metadata):
+        next(d for d in self.docs if d["_id"] == resume_id)["metadata"] = metadata
+
+
+class FakeVectorStore:
+    def __init__(self):
+        self.vectors = {}
+
+    def add(self, nodes):
+        for node in nodes:
+            self.vectors[f"{node.ref_doc_id}#{node.id_}"] = node.embedding
+
+
+class FakeVectorizer:
+    def __init__(self):
+        self.stores = {}
+        self.centroids = {}
+        self.embed_calls = 0
+        self.fail_on_embed_call = None
+        self.priorities = []
+        self._lock = threading.Lock()
+        self.fetch_resume_metadata = MagicMock(return_value={"candidate_name": "From Pinecone"})
+
+    def build_resume_nodes(self, resume_id, resume, metadata):
+        return [SimpleNamespace(id_=f"chunk-{i}", ref_doc_id=resume_id, text=part, embedding=None)
+                for i, part in enumerate(resume.split("|"))]
+
+    def embed_nodes(self, nodes, embed_model=None):
+        with self._lock:
+            self.priorities.append(get_request_priority())
+            self.embed_calls += 1
+            call = self.embed_calls
+        if call == self.fail_on_embed_call:
+            raise TimeoutError("embeddings timeout")
+        for node in nodes:
+            node.embedding = [float(len(node.text))]
+        return nodes
+
+    def get_namespace_vectorstore(self, namespace):
+        return self.stores.setdefault(namespace, FakeVectorStore())
+
+    def store_resume_centroids(self, namespace, nodes):
+        resume_ids = {node.ref_doc_id for node in nodes}
+        self.centroids.setdefault(namespace, set()).update(resume_ids)
+        return len(resume_ids)
+
+
+def make_docs(count):
+    docs = []
+    for i in range(count):
+        doc = {"_id": f"Doc:{i:03d}", "content": json.dumps(f"# Resume {i}|Experience {i}")}
+        if i != 3:
+            doc["metadata"] = {"candidate_name": f"Candidate {i}"}
+        docs.append(doc)
+    return docs
+
+
+def make_reindexer(fake_redis, docs):
+    registry = VectorNamespaceRegistry(fake_redis, cache_seconds=0)
+    vectorizer = FakeVectorizer()
+    reindexer = ResumeReindexer(fake_redis, FakeMongo(docs), vectorizer, registry,
+                                batch_size=4, embed_batch_size=3, embed_concurrency=2)
+    return reindexer, vectorizer, registry
+
+
+def test_backfill_resumes_after_failure_and_switches_namespace(fake_redis):
+    reindexer, vectorizer, registry = make_reindexer(fake_redis, make_docs(10))
+    progress = reindexer.start("tenant1")
+    shadow = progress["namespace"]
+
+    # New uploads go to both namespaces while the shadow is being built
+    assert registry.get_write_namespaces("tenant1") == ["tenant1_Resumes_NS", shadow]
+
+    # Batch 1 (three embeddings requests) stores, batch 2 fails on its first request
+    vectorizer.fail_on_embed_call = 4
+    with pytest.raises(TimeoutError):
+        reindexer.run("tenant1", progress["build_id"])
+
+    progress = reindexer.get_progress("tenant1")
+    assert progress["last_id"] == "Doc:003"
+    assert progress["processed"] == 4
+    assert progress["status"] == STATUS_RUNNING
+    assert "embeddings timeout" in progress["last_error"]
+    assert registry.get_active_namespace("tenant1") == "tenant1_Resumes_NS"
+
+    # The retry continues from the checkpoint, one batch per task
+    progress = reindexer.run("tenant1", progress["build_id"], max_batches=1)
+    assert progress["last_id"] == "Doc:007"
+    progress = reindexer.run("tenant1", progress["build_id"], max_batches=5)
+
+    assert progress["status"] == STATUS_SWITCHED
+    assert progress["processed"] == 10
+    assert progress["vectors"] == 20
+    assert progress["previous_namespace"] == "tenant1_Resumes_NS"
+    assert len(vectorizer.stores[shadow].vectors) == 20
+    assert all(v is not None for v in vectorizer.stores[shadow].vectors.values())
+    assert registry.get_active_namespace("tenant1") == shadow
+    assert registry.get_write_namespaces("tenant1") == [shadow]
+    # The rebuilt namespace has every resume's centroid, so doc-level ranking can use it
+    assert len(vectorizer.centroids[shadow]) == 10
+    assert registry.has_resume_centroids(shadow) and not registry.has_resume_centroids("tenant1_Resumes_NS")
+
+    # A resume stored without metadata took it from the current vectors, once
+    vectorizer.fetch_resume_metadata.assert_called_once_with("tenant1_Resumes_NS", "Doc:003")
+    assert progress["metadata_recovered"] == 1
+
+
+def test_concurrent_embedding_batches_keep_the_bulk_priority(fake_redis):
+    reindexer, vectorizer, _ = make_reindexer(fake_redis, make_docs(4))
+    progress = reindexer.start("tenant1")
+
+    with openai_priority(PRIORITY_BULK):
+        reindexer.run("tenant1", progress["build_id"])
+
+    assert len(vectorizer.priorities) > 1
+    assert set(vectorizer.priorities) == {PRIORITY_BULK}
+
+
+def test_unreadable_resume_holds_the_switch_for_review(fake_redis):
+    docs = make_docs(3)
+    docs[1]["content"] = "not json {"
+    reindexer, vectorizer, registry = make_reindexer(fake_redis, docs)
+    progress = reindexer.start("tenant1")
+
+    progress = reindexer.run("tenant1", progress["build_id"])
+
+    assert progress["status"] == "needs_review"
+    assert progress["failed_ids"] == ["Doc:001"]
+    assert registry.get_active_namespace("tenant1") == "tenant1_Resumes_NS"
+
+    progress = reindexer.activate("tenant1")
+    assert registry.get_active_namespace("tenant1") == progress["namespace"]
+
+
+def test_run_skips_when_another_worker_holds_the_lock(fake_redis):
+    reindexer, vectorizer, registry = make_reindexer(fake_redis, make_docs(2))
+    progress = reindexer.start("tenant1")
+    fake_redis.set(f"{ResumeReindexer.LOCK_PREFIX}tenant1", "other-worker")
+
+    assert reindexer.run("tenant1", progress["build_id"]) is None
+    assert vectorizer.embed_calls == 0
@@ -0,0 +1,116 @@
+# test/test_rule_based_filter_processor.py
+import json
+import os
+import statistics
+import time
+
+from genfoundry.config import Config
+from genfoundry.km.query.processors.base_filter_processor import BaseFilterProcessor
+from genfoundry.km.query.processors.processor_pipeline import FilterProcessorPipeline
+from genfoundry.km.query.processors.rule_based_filter_processor import RuleBasedFilterProcessor
+from genfoundry.km.utils.location_gazetteer import resolve_location
+from genfoundry.km.utils.taxonomy import SKILLS, TITLES, get_taxonomy
+
+# Queries labelled with the filters filter_extractor_prompt asks the LLM for;
+# "rules" marks the ones the rule-based extractor is expected to resolve alone
+with open(os.path.join(os.path.dirname(__file__), "filter_query_corpus.json"), encoding="utf-8") as f:
+    CORPUS = json.load(f)
+
+
+def field_agrees(key, got, want):
+    """Compares a filter the way search uses it: titles and skills by taxonomy ID, places by gazetteer code."""
+    taxonomy = get_taxonomy()
+
+    def terms(kind, values):
+        ids, unresolved = taxonomy.resolve(kind, values)
+        return set(ids) | {v.lower() for v in unresolved}
+
+    if key == "job_title":
+        # The first title is the one asked for, the rest are alternatives
+        return bool(terms(TITLES, want[:1]) & terms(TITLES, got))
+    if key in ("technical_skills", "leadership_skills"):
+        return terms(SKILLS, got) == terms(SKILLS, want)
+    if key == "location":
+        return resolve_location(got) == resolve_location(want)
+    return got == want
+
+
+class LabelledLLM:
+    """Answers filter_extractor_prompt with the corpus label, i.e. an LLM that is always right."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        case = next(c for c in CORPUS if c["question"] in prompt)
+        filters = [{"key": k, "value": v} for k, v in case["filters"].items()]
+        return json.dumps({"filters": filters})
+
+
+def test_rules_agree_with_labels_on_every_query_they_resolve():
+    processor = RuleBasedFilterProcessor()
+    threshold = Config.FILTER_RULES_CONFIDENCE_THRESHOLD
+
+    resolved = 0
+    for case in CORPUS:
+        filters, confidence = processor.extract(case["question"])
+        assert (confidence >= threshold) == case["rules"], (case["question"], confidence)
+        if confidence < threshold:
+            continue
+        resolved += 1
+        assert set(filters) == set(case["filters"]), case["question"]
+        for key, want in case["filters"].items():
+            assert field_agrees(key, filters[key], want), (case["question"], key, filters[key])
+
+    assert resolved >= 0.7 * len(CORPUS)
+
+
+def test_llm_only_runs_for_queries_the_rules_are_unsure_of():
+    llm = LabelledLLM()
+    pipeline = FilterProcessorPipeline()
+    pipeline += RuleBasedFilterProcessor()
+    pipeline += BaseFilterProcessor(llm=llm)
+
+    for case in CORPUS:
+        result = pipeline.run(case["question"])
+        # An LLM answer without filters keeps the rules' result
+        assert result["filter_source"] == ("llm" if not case["rules"] and case["filters"] else "rules")
+        for key, want in case["filters"].items():
+            assert field_agrees(key, result["filters"][key], want), (case["question"], key)
+
+    assert llm.calls == sum(1 for c in CORPUS if not c["rules"])
+
+
+class FailingLLM:
+    def invoke(self, prompt):
+        raise TimeoutError("openai timeout")
+
+
+def test_llm_failure_keeps_the_rule_based_filters():
+    case = next(c for c in CORPUS if not c["rules"])
+    pipeline = FilterProcessorPipeline()
+    pipeline += RuleBasedFilterProcessor()
+    pipeline += BaseFilterProcessor(llm=FailingLLM())
+    rule_filters, _ = RuleBasedFilterProcessor().extract(case["question"])
+
+    result = pipeline.run(case["question"])
+
+    assert rule_filters and result["filters"] == rule_filters
+    assert result["filter_source"] == "rules"
+
+
+def test_rule_extraction_is_sub_millisecond():
+    processor = RuleBasedFilterProcessor()
+    processor.extract(CORPUS[0]["question"])
+
+    timings = []
+    for case in CORPUS:
+        best = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            processor.extract(case["question"])
+            best = min(best, time.perf_counter() - started)
+        timings.append(best)
+
+    assert statistics.median(timings) < 0.001
@@ -0,0 +1,115 @@
+# test/test_similar_candidates.py
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from genfoundry.km.persist import vector_namespace_registry
+from genfoundry.km.persist.vector_db_proxy import resume_centroid_records
+from genfoundry.km.persist.vector_namespace_registry import VectorNamespaceRegistry
+from genfoundry.km.query.similar_candidates import SimilarCandidateFinder, centroid
+
+VECTORS = {
+    "Doc:1#chunk-0-a": ("Doc:1", [1.0, 0.0, 0.0]),
+    "Doc:1#chunk-1-b": ("Doc:1", [0.0, 1.0, 0.0]),
+    "Doc:2#chunk-0-c": ("Doc:2", [0.8, 0.6, 0.0]),
+    "Doc:2#chunk-1-d": ("Doc:2", [0.0, 0.0, 1.0]),
+    "Doc:3#chunk-0-e": ("Doc:3", [0.6, 0.8, 0.0]),
+    "Doc:3#chunk-1-f": ("Doc:3", [0.7, 0.7, 0.1]),
+    "Doc:4#chunk-0-g": ("Doc:4", [0.0, 0.0, 1.0]),
+}
+
+
+def cosine(a, b):
+    return sum(x * y for x, y in zip(a, b)) / (math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b)))
+
+
+@pytest.fixture
+def registry(fake_redis, monkeypatch):
+    registry = VectorNamespaceRegistry(fake_redis, cache_seconds=0)
+    monkeypatch.setattr(vector_namespace_registry, "_registry", registry)
+    return registry
+
+
+class FakeIndex:
+    def __init__(self):
+        self.queries = []
+        self.namespaces = []
+        # The doc-level namespace: one centroid per resume, keyed by resume ID
+        self.centroids = {}
+
+    def describe_index_stats(self):
+        return SimpleNamespace(dimension=3)
+
+    def query(self, vector, top_k, namespace, filter, include_values=False, include_metadata=False):
+        self.queries.append(filter)
+        self.namespaces.append(namespace)
+        (op, value), = filter["doc_id"].items()
+        keep = (lambda doc_id: doc_id == value) if op == "$eq" else (lambda doc_id: doc_id != value)
+        vectors = VECTORS
+        if namespace.endswith("__docs"):
+            vectors = {doc_id: (doc_id, values) for doc_id, values in self.centroids.items()}
+        matches = [
+            SimpleNamespace(id=vector_id, score=cosine(vector, values), values=values,
+                            metadata={"doc_id": doc_id, "location": "Toronto"})
+            for vector_id, (doc_id, values) in vectors.items() if keep(doc_id)
+        ]
+        return SimpleNamespace(matches=sorted(matches, key=lambda m: m.score, reverse=True)[:top_k])
+
+    def fetch(self, ids, namespace):
+        return SimpleNamespace(vectors={i: SimpleNamespace(values=self.centroids[i])
+                                        for i in ids if i in self.centroids})
+
+
+class FakeMetadataStore:
+    def get_many(self, tenant_id, resume_ids):
+        return {"Doc:3": {"candidate_name": "Jane Doe", "latest_job_title": "Staff Engineer"}}
+
+
+def test_centroid_is_the_normalized_mean():
+    assert centroid([[1.0, 0.0], [0.0, 1.0]]) == [1 / math.sqrt(2), 1 / math.sqrt(2)]
+    assert centroid([]) is None
+
+
+def test_neighbours_exclude_the_resume_itself_and_come_back_as_search_matches(registry):
+    index = FakeIndex()
+    finder = SimilarCandidateFinder(index, FakeMetadataStore(), "https://example.com/resume")
+
+    matches = finder.find("acme", "Doc:1", top_k=2)
+
+    assert index.queries == [{"doc_id": {"$eq": "Doc:1"}}, {"doc_id": {"$ne": "Doc:1"}}]
+    assert [m["resume_id"] for m in matches] == ["Doc:3", "Doc:2"]
+    assert matches[0]["name"] == "Jane Doe" and matches[0]["location"] == "Toronto"
+    assert matches[0]["resume_link"] == "https://example.com/resume?ID=Doc:3"
+    assert matches[0]["score"] > matches[1]["score"]
+    assert finder.find("acme", "Doc:404") is None
+
+
+def test_centroid_records_hold_one_vector_per_resume():
+    nodes = [SimpleNamespace(ref_doc_id=doc_id, embedding=values, metadata={"section_type": "summary"}) for doc_id, values in VECTORS.values()]
+
+    records = {record["id"]: record for record in resume_centroid_records(nodes)}
+
+    assert set(records) == {"Doc:1", "Doc:2", "Doc:3", "Doc:4"}
+    assert records["Doc:1"]["values"] == centroid([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    assert records["Doc:1"]["metadata"]["doc_id"] == "Doc:1"
+
+
+def test_complete_doc_namespace_is_matched_centroid_to_centroid(registry):
+    index = FakeIndex()
+    nodes = [SimpleNamespace(ref_doc_id=doc_id, embedding=values, metadata={"section_type": "summary"}) for doc_id, values in VECTORS.values()]
+    index.centroids = {record["id"]: record["values"] for record in resume_centroid_records(nodes)}
+    finder = SimilarCandidateFinder(index, FakeMetadataStore(), "https://example.com/resume")
+
+    # Centroids present but the namespace was never marked complete: chunk path
+    finder.find("acme", "Doc:1", top_k=2)
+    assert not any(namespace.endswith("__docs") for namespace in index.namespaces)
+
+    registry.start_build("acme", "acme_Resumes")
+    registry.activate("acme", "acme_Resumes")
+    index.queries, index.namespaces = [], []
+    matches = finder.find("acme", "Doc:1", top_k=2)
+
+    assert index.namespaces == ["acme_Resumes__docs"]
+    assert [m["resume_id"] for m in matches] == ["Doc:3", "Doc:2"]
+    assert matches[0]["name"] == "Jane Doe"
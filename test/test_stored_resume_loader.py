@@ -0,0 +1,59 @@
+# test/test_stored_resume_loader.py
+from genfoundry.km.persist.resume_content_codec import MARKDOWN_PROJECTION, encode_resume_content
+from genfoundry.km.persist.stored_resume_loader import StoredResumeLoader
+
+LONG = "# Jane Doe\n" + "\n- Led the Kubernetes migration" * 100
+
+
+class FakeMongoProxy:
+    def __init__(self, tenants):
+        self.tenants = tenants
+        self.queries = []
+
+    def get_resume_documents(self, tenant_id, resume_ids, projection=None):
+        self.queries.append((tenant_id, list(resume_ids), projection))
+        docs = self.tenants.get(tenant_id, {})
+        return {i: docs[i] for i in resume_ids if i in docs}
+
+
+def make_proxy():
+    return FakeMongoProxy({
+        "acme": {
+            "Doc:1": {"_id": "Doc:1", **encode_resume_content(LONG)},
+            "Doc:2": {"_id": "Doc:2", **encode_resume_content("# John Roe")},
+            "Doc:bad": {"_id": "Doc:bad", "content": "not json {"},
+        },
+        "globex": {"Doc:1": {"_id": "Doc:1", **encode_resume_content("# Someone Else")}},
+    })
+
+
+def test_hot_resumes_are_served_without_a_query():
+    proxy = make_proxy()
+    loader = StoredResumeLoader(proxy)
+
+    assert loader.get_many("acme", ["Doc:1", "Doc:2", "Doc:404", "Doc:bad"]) == {
+        "Doc:1": LONG, "Doc:2": "# John Roe", "Doc:bad": None,
+    }
+    assert proxy.queries == [("acme", ["Doc:1", "Doc:2", "Doc:404", "Doc:bad"], MARKDOWN_PROJECTION)]
+
+    assert loader.get("acme", "Doc:1") == LONG
+    assert loader.get("globex", "Doc:1") == "# Someone Else"
+    assert loader.get("acme", "Doc:bad") is None
+    # Only the other tenant's copy and the unreadable resume went back to Mongo
+    assert [q[:2] for q in proxy.queries[1:]] == [("globex", ["Doc:1"]), ("acme", ["Doc:bad"])]
+    assert loader.hits == 1
+
+
+def test_entries_expire_and_the_cache_is_bounded():
+    proxy = make_proxy()
+    loader = StoredResumeLoader(proxy, max_entries=1, ttl_seconds=0)
+    loader.get("acme", "Doc:1")
+    loader.get("acme", "Doc:1")
+    assert len(proxy.queries) == 2
+
+    loader = StoredResumeLoader(proxy, max_entries=1)
+    loader.get_many("acme", ["Doc:1", "Doc:2"])
+    assert list(loader._cache) == [("acme", "Doc:2")]
+
+    loader.invalidate("acme", "Doc:2")
+    assert not loader._cache
@@ -0,0 +1,63 @@
+# test/test_taxonomy.py
+from genfoundry.km.preprocess.resume_metadata_schema import normalize_resume_metadata
+from genfoundry.km.query.tiered_resume_search import TieredResumeSearcher
+from genfoundry.km.utils.taxonomy import SKILLS, TITLES, AhoCorasick, get_taxonomy, load_taxonomy
+
+
+def test_matcher_finds_leftmost_longest_whole_words():
+    matcher = AhoCorasick({"new york": "ny", "york": "york", "new york city": "nyc", "go": "go"})
+
+    assert [m[2] for m in matcher.find("new york city and york")] == ["nyc", "york"]
+    assert matcher.find("going to gotham") == []
+
+
+def test_resume_ids_include_categories_and_ignore_ambiguous_short_forms():
+    taxonomy = get_taxonomy()
+
+    assert taxonomy.resume_ids(SKILLS, ["K8s"]) == ["kubernetes", "devops", "cloud"]
+    assert taxonomy.find_ids(SKILLS, "Python, Django and REST APIs") == ["python", "django", "rest_api"]
+    assert taxonomy.find_ids(SKILLS, "C++ / C#") == ["cpp", "csharp"]
+    # "go" only matches a skill that is exactly "Go"
+    assert taxonomy.find_ids(SKILLS, "Go-to-market planning") == []
+    assert taxonomy.find_ids(TITLES, "Sr. Director of Engineering, Platform") == ["director_of_engineering"]
+
+
+def test_extension_adds_synonyms_to_existing_entries(tmp_path):
+    extension = tmp_path / "extra.json"
+    extension.write_text('{"skills": {"kubernetes": {"synonyms": ["openshift"]}}}')
+
+    taxonomy = load_taxonomy(extension_path=str(extension))
+
+    assert taxonomy.lookup(SKILLS, "OpenShift") == "kubernetes"
+    assert taxonomy.lookup(SKILLS, "k8s") == "kubernetes"
+
+
+def test_soft_filters_match_by_taxonomy_ids_instead_of_fuzzy_text():
+    searcher = TieredResumeSearcher.__new__(TieredResumeSearcher)
+    searcher.resume_details_popup_url = "https://example.com/resume"
+    vp = normalize_resume_metadata({"latest_job_title": "Vice President, Engineering",
+                                    "technical_skills": ["Amazon Web Services", "Golang"], "doc_id": "Doc:1"})
+    director = normalize_resume_metadata({"latest_job_title": "Engineering Director",
+                                          "technical_skills": ["Azure"], "doc_id": "Doc:2"})
+    developer = normalize_resume_metadata({"latest_job_title": "Software Developer",
+                                           "technical_skills": ["AWS"], "doc_id": "Doc:3"})
+
+    scored = searcher._score_soft_filters(
+        [{"metadata": m} for m in (vp, director, developer)],
+        {"job_title": ["VP Eng"], "technical_skills": ["AWS", "Go"]},
+        use_fuzzy=True,
+    )
+
+    by_id = {s["resume_id"]: s for s in scored}
+    assert by_id["Doc:1"]["score"] == 1.0
+    # Same leadership category but a different title, and neither skill
+    assert by_id["Doc:2"]["score"] == round(0.75 / 3, 2)
+    assert by_id["Doc:3"]["score"] == round(1 / 3, 2)
+
+
+def test_query_titles_are_expanded_from_the_taxonomy():
+    expanded = get_taxonomy().expand(TITLES, ["VP of Engineering"])
+
+    assert expanded[0] == "VP of Engineering"
+    assert "Director of Engineering" in expanded and "Head of Engineering" in expanded
+    assert len(expanded) <= 5
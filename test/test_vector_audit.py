@@ -0,0 +1,92 @@
+# test/test_vector_audit.py
+import json
+from types import SimpleNamespace
+
+from genfoundry.km.persist.vector_audit import VectorAuditor
+from genfoundry.km.persist.vector_db_proxy import PineconeVectorizer, build_resume_nodes
+
+RESUME = (
+    "# Jane Doe ## WORK EXPERIENCE **Director** **Acme Corp** 2019 - Present "
+    + "- Led the payments platform team. " * 15
+    + "**Engineer** **Beta Inc** 2014 - 2019 " + "- Built fraud detection APIs. " * 15
+)
+
+
+class FakeIndex:
+    """Pinecone index stand-in holding {namespace: {id: metadata}}."""
+
+    def __init__(self):
+        self.namespaces = {}
+
+    def add(self, namespace, vector_id, doc_id, text):
+        self.namespaces.setdefault(namespace, {})[vector_id] = {
+            "doc_id": doc_id, "_node_content": json.dumps({"text": text})
+        }
+
+    def list(self, prefix=None, namespace=""):
+        ids = sorted(v for v in self.namespaces.get(namespace, {}) if not prefix or v.startswith(prefix))
+        for i in range(0, len(ids), 2):  # small pages to exercise pagination
+            yield ids[i:i + 2]
+
+    def fetch(self, ids, namespace=""):
+        stored = self.namespaces.get(namespace, {})
+        return SimpleNamespace(vectors={v: SimpleNamespace(metadata=stored[v]) for v in ids if v in stored})
+
+    def delete(self, ids, namespace=""):
+        for vector_id in ids:
+            self.namespaces.get(namespace, {}).pop(vector_id, None)
+
+
+def make_vectorizer(index):
+    vectorizer = PineconeVectorizer.__new__(PineconeVectorizer)
+    vectorizer.pinecone_client = SimpleNamespace(Index=lambda name: index)
+    vectorizer.pinecone_index_name = "test"
+    return vectorizer
+
+
+def test_chunk_ids_depend_only_on_resume_text():
+    first = build_resume_nodes("Doc:1", RESUME, {"candidate_name": "Jane"})
+    again = build_resume_nodes("Doc:1", RESUME, {"candidate_name": "Jane"})
+    edited = build_resume_nodes("Doc:1", RESUME.replace("Beta Inc", "Gamma Ltd"), {"candidate_name": "Jane"})
+
+    assert [n.node_id for n in first] == [n.node_id for n in again]
+    assert first[0].node_id.startswith("chunk-0-")
+    assert first[0].node_id == edited[0].node_id
+    assert first[-1].node_id != edited[-1].node_id
+
+
+def test_reconcile_removes_stale_and_legacy_chunks_only_for_that_resume():
+    index = FakeIndex()
+    nodes = build_resume_nodes("Doc:1", RESUME, {})
+    for node in nodes:
+        index.add("ns", f"Doc:1#{node.node_id}", "Doc:1", node.get_content())
+    index.add("ns", "Doc:1#chunk-2-0123456789ab", "Doc:1", "old third chunk")
+    index.add("ns", "Doc:1#5f0c6f1e-legacy-uuid", "Doc:1", "legacy copy")
+    index.add("ns", "Doc:10#chunk-0-0123456789ab", "Doc:10", "another resume")
+
+    removed = make_vectorizer(index).reconcile_resume("ns", "Doc:1", nodes)
+
+    assert removed == 2
+    assert set(index.namespaces["ns"]) == {f"Doc:1#{n.node_id}" for n in nodes} | {"Doc:10#chunk-0-0123456789ab"}
+
+
+def test_audit_reports_and_fixes_duplicates_keeping_canonical_ids():
+    index = FakeIndex()
+    index.add("ns", "Doc:1#chunk-0-aaaaaaaaaaaa", "Doc:1", "Director at Acme")
+    index.add("ns", "Doc:1#3b1e-legacy", "Doc:1", "Director at Acme")
+    index.add("ns", "Doc:1#9f2c-legacy", "Doc:1", "Director at Acme")
+    index.add("ns", "Doc:2#chunk-0-bbbbbbbbbbbb", "Doc:2", "Engineer at Beta")
+
+    report = VectorAuditor(index, "ns").audit()
+
+    assert report["vectors"] == 4
+    assert report["resumes"] == 2
+    assert report["legacy_ids"] == 2
+    assert report["duplicate_vectors"] == 2
+    assert report["duplicates_by_resume"] == {"Doc:1": 2}
+    assert len(index.namespaces["ns"]) == 4
+
+    report = VectorAuditor(index, "ns").audit(fix=True)
+
+    assert report["deleted"] == 2
+    assert set(index.namespaces["ns"]) == {"Doc:1#chunk-0-aaaaaaaaaaaa", "Doc:2#chunk-0-bbbbbbbbbbbb"}